@@ -1,12 +1,12 @@
 from fastapi import APIRouter
-import strawberry
 from strawberry.fastapi import GraphQLRouter
+from .loaders import get_context
 from .schema import schema
 
 router = APIRouter()
 
-# Create GraphQL router
-graphql_app = GraphQLRouter(schema)
+# Create GraphQL router; every request gets its own DataLoaders
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
 
 # Add GraphQL routes
 router.include_router(graphql_app, prefix="/graphql")
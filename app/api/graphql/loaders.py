@@ -0,0 +1,66 @@
+from typing import Any, Dict, List, Tuple
+import asyncio
+import logging
+
+from strawberry.dataloader import DataLoader
+
+from app.datasources.base import COMPANY_INFO_SECTIONS
+from app.services.company_service import CompanyService
+
+logger = logging.getLogger(__name__)
+
+# CompanyService methods a company section is loaded with
+SECTION_METHODS = tuple(COMPANY_INFO_SECTIONS.values())
+
+
+class CompanyLoaders:
+    """Per-request DataLoaders for company sections, keyed by (symbol, source).
+
+    Each CompanyService section method has its own DataLoader. All loads of a
+    section made while resolving one level of a query are collected into one
+    batch and deduplicated, and the batch fetches its keys concurrently. A
+    query for 20 tickers' profiles and officers therefore makes one service
+    call per (symbol, section), all at once. A failed key fails only the fields
+    that need it.
+    """
+
+    def __init__(self, service: CompanyService = None):
+        """Initialize the loaders
+
+        Args:
+            service: Company service to load from; a new CompanyService by default
+        """
+        self.service = service or CompanyService()
+        self._loaders: Dict[str, DataLoader] = {
+            method: DataLoader(load_fn=self._batch_loader(method)) for method in SECTION_METHODS
+        }
+        self.batches: List[Tuple[str, int]] = []  # (method, keys) per batch, for stats and tests
+
+    def _batch_loader(self, method: str):
+        async def load_many(keys: List[Tuple[str, str]]) -> List[Any]:
+            self.batches.append((method, len(keys)))
+            fetch = getattr(self.service, method)
+            results = await asyncio.gather(*(fetch(symbol, source) for symbol, source in keys), return_exceptions=True)
+            for (symbol, source), result in zip(keys, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"GraphQL {method} for {symbol} from {source} failed: {result}")
+            return list(results)
+        return load_many
+
+    async def load(self, method: str, symbol: str, source: str) -> Any:
+        """Load one section of one company
+
+        Args:
+            method: CompanyService method, e.g. "get_company_officers"
+            symbol: Stock ticker symbol
+            source: Data source identifier
+
+        Returns:
+            What the service method returns for the symbol
+        """
+        return await self._loaders[method].load((symbol.upper(), source))
+
+
+async def get_context() -> Dict[str, Any]:
+    """Build the context of one GraphQL request"""
+    return {"loaders": CompanyLoaders()}
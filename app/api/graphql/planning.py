@@ -0,0 +1,242 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import logging
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    value_from_ast_untyped,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+from strawberry.utils.str_converters import to_snake_case
+
+from app.core.config import settings
+from app.datasources.base import SOURCE_UNIFIED
+from .types import DataSource, PROFILE_PROVIDER_FIELDS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_METHOD = "get_company_profile"
+
+# Company fields and the CompanyService method each one loads
+COMPANY_SECTIONS: Dict[str, str] = {
+    "profile": PROFILE_METHOD,
+    "officers": "get_company_officers",
+    "shareholders": "get_shareholders",
+    "insiderTrading": "get_insider_trading",
+    "subsidiaries": "get_subsidiaries",
+    "events": "get_company_events",
+    "news": "get_company_news",
+    "dividends": "get_dividends",
+}
+
+# Query fields that load one section of one company
+ROOT_SECTIONS: Dict[str, str] = {
+    "companyProfile": PROFILE_METHOD,
+    "companyOfficers": "get_company_officers",
+    "shareholders": "get_shareholders",
+    "insiderTrading": "get_insider_trading",
+    "subsidiaries": "get_subsidiaries",
+    "companyEvents": "get_company_events",
+    "companyNews": "get_company_news",
+    "dividends": "get_dividends",
+}
+
+
+def profile_source(fields: Iterable[str], source: str) -> Optional[str]:
+    """Pick the source a profile has to be loaded from to answer the selected fields
+
+    A unified profile calls both providers. When every selected field is one
+    that a single provider supplies, that provider alone is enough.
+
+    Args:
+        fields: Selected CompanyProfile fields (Python names)
+        source: Source the query asked for
+
+    Returns:
+        The source to load from, or None if no selected field needs a fetch
+    """
+    supplied = frozenset().union(*PROFILE_PROVIDER_FIELDS.values())
+    needed = {name for name in fields if name in supplied}
+    if not needed:
+        return None
+    if source != SOURCE_UNIFIED:
+        return source
+    for provider in settings.UNIFIED_MERGE_PRECEDENCE:
+        if needed <= PROFILE_PROVIDER_FIELDS.get(provider, frozenset()):
+            return provider
+    return SOURCE_UNIFIED
+
+
+def selected_names(selections: Iterable[Any]) -> Set[str]:
+    """Python names of the fields in a Strawberry selection, fragments included"""
+    names: Set[str] = set()
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            if not selection.name.startswith("__"):
+                names.add(to_snake_case(selection.name))
+        elif isinstance(selection, (FragmentSpread, InlineFragment)):
+            names |= selected_names(selection.selections)
+    return names
+
+
+def _source_value(value: Any) -> str:
+    """The source identifier of a DataSource argument (enum name, e.g. "TCBS")"""
+    if isinstance(value, str) and value in DataSource.__members__:
+        return DataSource[value].value
+    return SOURCE_UNIFIED
+
+
+@dataclass
+class QueryPlan:
+    """The upstream work a query will do, worked out from the document alone"""
+
+    loads: Set[Tuple[str, str, str]] = field(default_factory=set)  # (method, symbol, source)
+    complexity: int = 0
+
+    @property
+    def cost(self) -> int:
+        """Upstream provider calls: two for a unified profile, one for any other load"""
+        return sum(2 if method == PROFILE_METHOD and source == SOURCE_UNIFIED else 1 for method, _, source in self.loads)
+
+
+class QueryPlanner:
+    """Walk one operation of a GraphQL document and collect the loads it needs"""
+
+    def __init__(self, document: DocumentNode, variables: Optional[Mapping[str, Any]] = None):
+        self.variables = dict(variables or {})
+        self.fragments: Dict[str, FragmentDefinitionNode] = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        self.plan = QueryPlan()
+
+    def _fields(self, selection_set: Optional[SelectionSetNode], seen: Tuple[str, ...] = ()) -> List[FieldNode]:
+        """Field nodes of a selection set with fragments inlined"""
+        nodes: List[FieldNode] = []
+        for selection in selection_set.selections if selection_set else ():
+            if isinstance(selection, FieldNode):
+                nodes.append(selection)
+            elif isinstance(selection, InlineFragmentNode):
+                nodes.extend(self._fields(selection.selection_set, seen))
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in self.fragments and name not in seen:
+                    nodes.extend(self._fields(self.fragments[name].selection_set, seen + (name,)))
+        return nodes
+
+    def _argument(self, node: FieldNode, name: str) -> Any:
+        for argument in node.arguments or ():
+            if argument.name.value == name:
+                return value_from_ast_untyped(argument.value, self.variables)
+        return None
+
+    def _count(self, node: FieldNode, multiplier: int) -> None:
+        """Add a field and everything below it to the complexity"""
+        self.plan.complexity += multiplier
+        for child in self._fields(node.selection_set):
+            if not child.name.value.startswith("__"):
+                self._count(child, multiplier)
+
+    def _load(self, method: str, node: FieldNode, symbol: str, source: str) -> None:
+        if method == PROFILE_METHOD:
+            names = {to_snake_case(child.name.value) for child in self._fields(node.selection_set)}
+            source = profile_source(names, source)
+            if source is None:
+                return
+        self.plan.loads.add((method, symbol.upper(), source))
+
+    def _company(self, node: FieldNode, symbols: List[str], source: str) -> None:
+        for child in self._fields(node.selection_set):
+            method = COMPANY_SECTIONS.get(child.name.value)
+            if method:
+                for symbol in symbols:
+                    self._load(method, child, symbol, source)
+
+    def visit(self, operation: OperationDefinitionNode) -> QueryPlan:
+        """Plan one operation
+
+        Args:
+            operation: The operation that is about to run
+
+        Returns:
+            The plan; loads are deduplicated like the DataLoaders deduplicate them
+        """
+        for node in self._fields(operation.selection_set):
+            name = node.name.value
+            if name.startswith("__"):
+                continue
+            source = _source_value(self._argument(node, "source"))
+            if name == "companies":
+                symbols = list(dict.fromkeys(str(symbol).upper() for symbol in self._argument(node, "symbols") or []))
+                self._company(node, symbols, source)
+                self._count(node, max(len(symbols), 1))
+                continue
+            symbol = str(self._argument(node, "symbol") or "")
+            if name == "company":
+                self._company(node, [symbol], source)
+            elif name in ROOT_SECTIONS:
+                self._load(ROOT_SECTIONS[name], node, symbol, source)
+            self._count(node, 1)
+        return self.plan
+
+
+def plan_query(document: DocumentNode, variables: Optional[Mapping[str, Any]] = None, operation_name: Optional[str] = None) -> QueryPlan:
+    """Plan the operation of a document that would run
+
+    Args:
+        document: Parsed GraphQL document
+        variables: Variable values of the request
+        operation_name: Operation to run; may be omitted if there is only one
+
+    Returns:
+        The plan of that operation; an empty plan if it cannot be told which one runs
+    """
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if operation_name:
+        operations = [d for d in operations if d.name and d.name.value == operation_name]
+    if len(operations) != 1:
+        return QueryPlan()
+    return QueryPlanner(document, variables).visit(operations[0])
+
+
+class QueryCostLimiter(SchemaExtension):
+    """Reject queries over the cost or complexity limit before they execute
+
+    The plan is worked out after validation and before any resolver runs, so
+    a rejected query makes no upstream call. The limits are read from the
+    settings on every request. Accepted queries report their plan under
+    `extensions.cost` of the response.
+    """
+
+    plan: Optional[QueryPlan] = None
+
+    def on_execute(self):
+        context = self.execution_context
+        self.plan = plan_query(context.graphql_document, context.variables, context.operation_name)
+        if self.plan.cost > settings.GRAPHQL_MAX_COST:
+            logger.info(f"Rejected GraphQL query of cost {self.plan.cost}")
+            raise GraphQLError(
+                f"Query cost {self.plan.cost} exceeds the limit of {settings.GRAPHQL_MAX_COST}",
+                extensions={"code": "QUERY_TOO_EXPENSIVE", "cost": self.plan.cost, "limit": settings.GRAPHQL_MAX_COST},
+            )
+        if self.plan.complexity > settings.GRAPHQL_MAX_COMPLEXITY:
+            logger.info(f"Rejected GraphQL query of complexity {self.plan.complexity}")
+            raise GraphQLError(
+                f"Query complexity {self.plan.complexity} exceeds the limit of {settings.GRAPHQL_MAX_COMPLEXITY}",
+                extensions={"code": "QUERY_TOO_COMPLEX", "complexity": self.plan.complexity, "limit": settings.GRAPHQL_MAX_COMPLEXITY},
+            )
+        yield
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.plan is None:
+            return {}
+        return {"cost": {"requested": self.plan.cost, "limit": settings.GRAPHQL_MAX_COST, "complexity": self.plan.complexity}}
@@ -1,8 +1,13 @@
 import strawberry
+from strawberry.extensions import QueryDepthLimiter
+from strawberry.types import Info
 from typing import List, Optional
 import logging
-from datetime import datetime
+from app.core.config import settings
+from .loaders import CompanyLoaders
+from .planning import PROFILE_METHOD, QueryCostLimiter, profile_source, selected_names
 from .types import (
+    DataSource,
     CompanyProfile,
     CompanyOfficer,
     Shareholder,
@@ -10,11 +15,79 @@ from .types import (
     Subsidiary,
     CompanyEvent,
     CompanyNews,
-    Dividend
+    Dividend,
+    from_record,
+    from_records,
 )
 
 logger = logging.getLogger(__name__)
 
+
+def _loaders(info: Info) -> CompanyLoaders:
+    return info.context["loaders"]
+
+
+async def _profile(info: Info, symbol: str, source: str) -> Optional[CompanyProfile]:
+    """Load a profile from the fewest providers that supply the selected fields"""
+    load_source = profile_source(selected_names(info.selected_fields[0].selections), source)
+    if load_source is None:
+        # Only fields no provider fetch is needed for, e.g. `symbol`
+        return CompanyProfile(symbol=symbol.upper())
+    try:
+        record = await _loaders(info).load(PROFILE_METHOD, symbol, load_source)
+    except Exception as e:
+        if load_source == source:
+            raise
+        # The one provider picked for the fields failed; the unified profile falls back to the other
+        logger.info(f"GraphQL profile for {symbol} from {load_source} failed, loading {source}: {e}")
+        record = await _loaders(info).load(PROFILE_METHOD, symbol, source)
+    return from_record(CompanyProfile, record or {}, symbol=symbol.upper()) if record is not None else None
+
+
+async def _section(info: Info, method: str, cls: type, symbol: str, source: str) -> List:
+    return from_records(cls, await _loaders(info).load(method, symbol, source))
+
+
+@strawberry.type
+class Company:
+    """One company; each section is loaded only if the query selects it"""
+
+    symbol: str
+    source: strawberry.Private[str]
+
+    @strawberry.field
+    async def profile(self, info: Info) -> Optional[CompanyProfile]:
+        return await _profile(info, self.symbol, self.source)
+
+    @strawberry.field
+    async def officers(self, info: Info) -> List[CompanyOfficer]:
+        return await _section(info, "get_company_officers", CompanyOfficer, self.symbol, self.source)
+
+    @strawberry.field
+    async def shareholders(self, info: Info) -> List[Shareholder]:
+        return await _section(info, "get_shareholders", Shareholder, self.symbol, self.source)
+
+    @strawberry.field
+    async def insider_trading(self, info: Info) -> List[InsiderTrading]:
+        return await _section(info, "get_insider_trading", InsiderTrading, self.symbol, self.source)
+
+    @strawberry.field
+    async def subsidiaries(self, info: Info) -> List[Subsidiary]:
+        return await _section(info, "get_subsidiaries", Subsidiary, self.symbol, self.source)
+
+    @strawberry.field
+    async def events(self, info: Info) -> List[CompanyEvent]:
+        return await _section(info, "get_company_events", CompanyEvent, self.symbol, self.source)
+
+    @strawberry.field
+    async def news(self, info: Info) -> List[CompanyNews]:
+        return await _section(info, "get_company_news", CompanyNews, self.symbol, self.source)
+
+    @strawberry.field
+    async def dividends(self, info: Info) -> List[Dividend]:
+        return await _section(info, "get_dividends", Dividend, self.symbol, self.source)
+
+
 @strawberry.type
 class Query:
     @strawberry.field
@@ -22,88 +95,57 @@ class Query:
         return "Hello World"
 
     @strawberry.field
-    def company_profile(self, symbol: str) -> CompanyProfile:
-        """Return mock company profile data for development"""
-        # Return mock data for FPT
-        if symbol.upper() == "FPT":
-            return CompanyProfile(
-                symbol="FPT",
-                company_name="FPT Corporation",
-                exchange="HOSE",
-                industry="Technology",
-                established_year="2002",
-                no_employees=48878,
-                website="https://www.fpt.com.vn",
-                business_summary="Leading technology company in Vietnam",
-                short_name="FPT Corp"
-            )
-        # Default mock data for other symbols
-        return CompanyProfile(
-            symbol=symbol.upper(),
-            company_name=f"{symbol.upper()} Corporation",
-            exchange="HOSE",
-            industry="Unknown",
-            established_year="2000",
-            website=f"https://www.{symbol.lower()}.com",
-            business_summary=f"Mock data for {symbol.upper()}"
-        )
-
-    @strawberry.field
-    def company_officers(self, symbol: str) -> List[CompanyOfficer]:
-        """Return mock company officers data for development"""
-        return [
-            CompanyOfficer(
-                name="John Doe",
-                position="CEO",
-                age=45,
-                nationality="Vietnamese",
-                shares=100000
-            ),
-            CompanyOfficer(
-                name="Jane Smith",
-                position="CTO",
-                age=40,
-                nationality="Vietnamese",
-                shares=80000
-            )
-        ]
-
-    @strawberry.field
-    def shareholders(self, symbol: str) -> List[Shareholder]:
-        """Return mock shareholders data for development"""
-        return [
-            Shareholder(
-                name="Investment Group A",
-                shares=1000000,
-                percentage=30.5,
-                type="Organization"
-            ),
-            Shareholder(
-                name="Investment Group B",
-                shares=800000,
-                percentage=24.2,
-                type="Organization"
-            )
-        ]
-
-    @strawberry.field
-    def insider_trading(self, symbol: str) -> List[InsiderTrading]:
-        """Return mock insider trading data for development"""
-        return [
-            InsiderTrading(
-                date=datetime.now(),
-                type="Buy",
-                shares=10000,
-                price=85.2,
-                value=852000.0
-            ),
-            InsiderTrading(
-                date=datetime.now(),
-                type="Sell",
-                shares=5000,
-                price=86.4,
-                value=432000.0
-            )
-        ]
-
-schema = strawberry.Schema(query=Query) 
\ No newline at end of file
+    def company(self, symbol: str, source: DataSource = DataSource.ALL) -> Company:
+        """Get one company; select the sections you need"""
+        return Company(symbol=symbol.upper(), source=source.value)
+
+    @strawberry.field
+    def companies(self, symbols: List[str], source: DataSource = DataSource.ALL) -> List[Company]:
+        """Get several companies; each selected section is fetched once per symbol, concurrently"""
+        unique = dict.fromkeys(symbol.upper() for symbol in symbols)
+        return [Company(symbol=symbol, source=source.value) for symbol in unique]
+
+    @strawberry.field
+    async def company_profile(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> Optional[CompanyProfile]:
+        """Get the company profile"""
+        return await _profile(info, symbol, source.value)
+
+    @strawberry.field
+    async def company_officers(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[CompanyOfficer]:
+        """Get the company officers"""
+        return await _section(info, "get_company_officers", CompanyOfficer, symbol, source.value)
+
+    @strawberry.field
+    async def shareholders(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[Shareholder]:
+        """Get the major shareholders"""
+        return await _section(info, "get_shareholders", Shareholder, symbol, source.value)
+
+    @strawberry.field
+    async def insider_trading(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[InsiderTrading]:
+        """Get insider trading activity"""
+        return await _section(info, "get_insider_trading", InsiderTrading, symbol, source.value)
+
+    @strawberry.field
+    async def subsidiaries(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[Subsidiary]:
+        """Get subsidiaries and affiliates"""
+        return await _section(info, "get_subsidiaries", Subsidiary, symbol, source.value)
+
+    @strawberry.field
+    async def company_events(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[CompanyEvent]:
+        """Get corporate events"""
+        return await _section(info, "get_company_events", CompanyEvent, symbol, source.value)
+
+    @strawberry.field
+    async def company_news(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[CompanyNews]:
+        """Get company news"""
+        return await _section(info, "get_company_news", CompanyNews, symbol, source.value)
+
+    @strawberry.field
+    async def dividends(self, info: Info, symbol: str, source: DataSource = DataSource.ALL) -> List[Dividend]:
+        """Get the dividend history"""
+        return await _section(info, "get_dividends", Dividend, symbol, source.value)
+
+schema = strawberry.Schema(
+    query=Query,
+    extensions=[QueryDepthLimiter(max_depth=settings.GRAPHQL_MAX_DEPTH), QueryCostLimiter],
+)
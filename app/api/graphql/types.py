@@ -1,9 +1,13 @@
-from typing import Optional, List
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+import dataclasses
+import math
 import strawberry
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 from app.datasources.base import SOURCE_TCBS, SOURCE_VCI, SOURCE_UNIFIED
 
+T = TypeVar("T")
+
 @strawberry.enum
 class DataSource(Enum):
     TCBS = SOURCE_TCBS
@@ -42,56 +46,201 @@ class CompanyProfile:
     key_developments: Optional[str] = None
     promise: Optional[str] = None
     employees: Optional[int] = None
+    charter_capital: Optional[float] = None
 
 @strawberry.type
 class CompanyOfficer:
     name: str
-    position: str
+    position: Optional[str] = None
     age: Optional[int] = None
     nationality: Optional[str] = None
     shares: Optional[int] = None
+    own_percent: Optional[float] = None
+    update_date: Optional[datetime] = None
 
 @strawberry.type
 class Shareholder:
     name: str
-    shares: int
-    percentage: float
+    shares: Optional[int] = None
+    percentage: Optional[float] = None
     type: Optional[str] = None
+    update_date: Optional[datetime] = None
 
 @strawberry.type
 class InsiderTrading:
-    date: datetime
-    type: str
-    shares: int
-    price: float
-    value: float
+    date: Optional[datetime] = None
+    type: Optional[str] = None
+    shares: Optional[int] = None
+    price: Optional[float] = None
+    value: Optional[float] = None
+    insider_name: Optional[str] = None
+    method: Optional[str] = None
+    ratio: Optional[float] = None
 
 @strawberry.type
 class Subsidiary:
     name: str
     symbol: Optional[str] = None
-    ownership_percentage: float
+    ownership_percentage: Optional[float] = None
     business_type: Optional[str] = None
 
 @strawberry.type
 class CompanyEvent:
-    date: datetime
-    type: str
-    description: str
+    date: Optional[datetime] = None
+    type: Optional[str] = None
+    description: Optional[str] = None
     impact: Optional[str] = None
+    title: Optional[str] = None
+    record_date: Optional[datetime] = None
+    ex_date: Optional[datetime] = None
 
 @strawberry.type
 class CompanyNews:
-    date: datetime
+    date: Optional[datetime] = None
     title: str
-    content: str
-    source: str
+    content: Optional[str] = None
+    source: Optional[str] = None
     url: Optional[str] = None
 
 @strawberry.type
 class Dividend:
-    date: datetime
-    type: str
-    amount: float
+    date: Optional[datetime] = None
+    type: Optional[str] = None
+    amount: Optional[float] = None
     payment_date: Optional[datetime] = None
-    ex_date: Optional[datetime] = None 
\ No newline at end of file
+    ex_date: Optional[datetime] = None
+    cash_year: Optional[int] = None
+
+
+# Record fields (TCBS and VCI column names) each GraphQL field is read from, first present wins.
+# Fields not listed are read from the column of the same name.
+FIELD_SOURCES: Dict[type, Dict[str, Tuple[str, ...]]] = {
+    CompanyProfile: {
+        "industry": ("industry", "icb_name3"),
+        "issue_share": ("issue_share", "financial_ratio_issue_share"),
+        "charter_capital": ("charter_capital", "financial_ratio_charter_capital"),
+        "business_summary": ("business_summary", "company_profile"),
+        "history": ("history", "history_dev"),
+    },
+    CompanyOfficer: {
+        "name": ("officer_name", "name"),
+        "position": ("officer_position", "position"),
+        "shares": ("quantity", "shares"),
+        "own_percent": ("officer_own_percent", "own_percent"),
+    },
+    Shareholder: {
+        "name": ("share_holder", "name"),
+        "shares": ("quantity", "shares"),
+        "percentage": ("share_own_percent", "percentage"),
+    },
+    InsiderTrading: {
+        "date": ("deal_announce_date", "an_date", "date"),
+        "type": ("deal_action", "type"),
+        "shares": ("deal_quantity", "quantity", "shares"),
+        "price": ("deal_price", "price"),
+        "insider_name": ("name", "insider_name", "trader_name"),
+        "method": ("deal_method", "method"),
+        "ratio": ("deal_ratio", "ratio"),
+    },
+    Subsidiary: {
+        "name": ("sub_company_name", "organ_name", "name"),
+        "symbol": ("sub_organ_code", "symbol"),
+        "ownership_percentage": ("sub_own_percent", "ownership_percent"),
+        "business_type": ("type", "business_type"),
+    },
+    CompanyEvent: {
+        "date": ("notify_date", "public_date", "date"),
+        "type": ("event_code", "event_list_code", "type"),
+        "description": ("event_desc", "event_title", "event_name"),
+        "title": ("event_name", "event_title", "event_list_name"),
+        "record_date": ("reg_final_date", "record_date"),
+        "ex_date": ("exer_right_date", "exright_date"),
+    },
+    CompanyNews: {
+        "date": ("publish_date", "public_date", "date"),
+        "title": ("title", "news_title"),
+        "content": ("news_short_content", "content"),
+        "source": ("source", "news_source_link"),
+        "url": ("news_source_link", "url"),
+    },
+    Dividend: {
+        "date": ("exercise_date", "date"),
+        "type": ("issue_method", "type"),
+        "amount": ("cash_dividend_percentage", "amount"),
+        "ex_date": ("exercise_date", "ex_date"),
+    },
+}
+
+
+# CompanyProfile fields each provider's overview supplies. A unified profile query that selects
+# only fields of one provider is served by that provider alone (see planning.profile_source).
+PROFILE_PROVIDER_FIELDS: Dict[str, FrozenSet[str]] = {
+    SOURCE_TCBS: frozenset({
+        "exchange", "industry", "company_type", "no_shareholders", "foreign_percent",
+        "outstanding_share", "issue_share", "established_year", "no_employees", "stock_rating",
+        "delta_in_week", "delta_in_month", "delta_in_year", "short_name", "website",
+        "industry_id", "industry_id_v2",
+    }),
+    SOURCE_VCI: frozenset({"industry", "issue_share", "charter_capital", "business_summary", "history"}),
+}
+
+
+def _convert(value: Any, target: Any) -> Any:
+    """Convert a record value to a field type; None if it is missing or does not convert"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if get_origin(target) is Union:
+        target = next(arg for arg in get_args(target) if arg is not type(None))
+    try:
+        if target is datetime:
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime(value.year, value.month, value.day)
+            return datetime.fromisoformat(str(value)[:19])
+        if target is int:
+            return int(value)
+        if target is float:
+            return float(value)
+        if target is str:
+            return str(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def from_record(cls: Type[T], record: Mapping[str, Any], **overrides: Any) -> T:
+    """Build a GraphQL object from a record returned by the services
+
+    Args:
+        cls: A type of this module
+        record: One record as returned by CompanyService
+        **overrides: Field values that take precedence over the record
+
+    Returns:
+        The object; required string fields missing from the record become ""
+    """
+    hints = get_type_hints(cls)
+    sources = FIELD_SOURCES.get(cls, {})
+    values = {}
+    for field in dataclasses.fields(cls):
+        if field.name in overrides:
+            values[field.name] = overrides[field.name]
+            continue
+        names = sources.get(field.name, (field.name,))
+        value = next((record[name] for name in names if record.get(name) is not None), None)
+        value = _convert(value, hints[field.name])
+        if value is None and field.default is dataclasses.MISSING:
+            value = ""
+        values[field.name] = value
+    return cls(**values)
+
+
+def from_records(cls: Type[T], records: Optional[Sequence[Mapping[str, Any]]]) -> List[T]:
+    """Build GraphQL objects from a list of records"""
+    objects = [from_record(cls, record) for record in records or [] if isinstance(record, Mapping)]
+    if cls is InsiderTrading:
+        for item in objects:
+            if item.value is None and item.price is not None and item.shares is not None:
+                item.value = item.price * item.shares
+    return objects
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Pattern, Tuple
+import hashlib
+import logging
+import math
+import re
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.websockets import WebSocketClose
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError, ServiceOverloadedError, VNStockAPIException
+from app.infrastructure.rate_limit import admission_control, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+def compile_costs(costs: Dict[str, float]) -> List[Tuple[Pattern, float]]:
+    """Compile endpoint cost settings such as {"/api/v1/companies/{symbol}": 8} to path patterns"""
+    compiled = []
+    for template, cost in costs.items():
+        pattern = re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(template))
+        compiled.append((re.compile(f"^{pattern}/?$"), cost))
+    return compiled
+
+
+class RateLimitMiddleware:
+    """Per-client rate limiting and admission control for the API.
+
+    Each request under ``RATE_LIMIT_PATHS`` (except ``RATE_LIMIT_EXEMPT_PATHS``) is
+    checked before it reaches the router:
+
+    1. Admission: at most ``ADMISSION_MAX_IN_FLIGHT`` requests in flight in the
+       process (503 ``ServiceOverloadedError`` beyond that) and
+       ``ADMISSION_MAX_IN_FLIGHT_PER_CLIENT`` per client (429).
+    2. Rate: a sliding window per client, weighted by endpoint cost
+       (``RATE_LIMIT_ENDPOINT_COSTS``); 429 ``RateLimitExceededError`` when over.
+
+    Clients sending a known ``X-API-Key`` are limited per key
+    (``RATE_LIMIT_API_KEY_PER_MIN``); everyone else per IP (``RATE_LIMIT_PER_MIN``).
+    Rejections are answered at once instead of queueing until a timeout.
+    WebSocket handshakes go through the same checks; a refused one is closed
+    with 1013 (overload) or 1008, and an accepted one holds its admission
+    slot until it closes. Written as plain ASGI so the admission slot is held until the response,
+    including a streamed body, has been sent.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self.prefixes = tuple(settings.RATE_LIMIT_PATHS)
+        self.costs = compile_costs(settings.RATE_LIMIT_ENDPOINT_COSTS)
+        self.api_keys = {self._digest(key) for key in settings.RATE_LIMIT_API_KEYS}
+        self.admission = admission_control
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        """Short hash of an API key, so raw keys never end up in limiter keys or logs"""
+        return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+    def cost(self, path: str) -> float:
+        """Weight of a request to ``path``"""
+        for pattern, cost in self.costs:
+            if pattern.match(path):
+                return cost
+        return 1
+
+    def identify(self, scope: Dict[str, Any]) -> Tuple[str, float]:
+        """Get the client identity and its limit per window"""
+        headers = dict(scope.get("headers") or [])
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            digest = self._digest(api_key.decode("latin-1"))
+            if digest in self.api_keys:
+                return f"key:{digest}", settings.RATE_LIMIT_API_KEY_PER_MIN
+        ip = None
+        if settings.RATE_LIMIT_TRUST_FORWARDED:
+            forwarded = headers.get(b"x-forwarded-for")
+            if forwarded:
+                ip = forwarded.decode("latin-1").split(",")[0].strip()
+        if not ip:
+            client = scope.get("client")
+            ip = client[0] if client else "unknown"
+        return f"ip:{ip}", settings.RATE_LIMIT_PER_MIN
+
+    def _limited(self, path: str) -> bool:
+        if not path.startswith(self.prefixes):
+            return False
+        return not any(path.startswith(exempt) for exempt in settings.RATE_LIMIT_EXEMPT_PATHS)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] not in ("http", "websocket") or not settings.RATE_LIMIT_ENABLED or not self._limited(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        identity, limit = self.identify(scope)
+        rejected = self.admission.try_acquire(identity)
+        try:
+            if rejected == "overload":
+                raise ServiceOverloadedError()
+            if rejected == "client":
+                raise RateLimitExceededError(
+                    limit=settings.ADMISSION_MAX_IN_FLIGHT_PER_CLIENT,
+                    reset_time=datetime.now(timezone.utc).isoformat(),
+                    retry_after=1,
+                    message=f"Too many concurrent requests. Limit: {settings.ADMISSION_MAX_IN_FLIGHT_PER_CLIENT} in flight",
+                )
+            allowed, remaining, retry_after = await get_rate_limiter().hit(identity, self.cost(scope["path"]), limit)
+            if not allowed:
+                raise RateLimitExceededError(
+                    limit=int(limit),
+                    reset_time=(datetime.now(timezone.utc) + timedelta(seconds=retry_after)).isoformat(),
+                    retry_after=math.ceil(retry_after),
+                )
+        except VNStockAPIException as e:
+            if rejected is None:
+                self.admission.release(identity)
+            logger.info(f"Rejected {scope['path']} for {identity}: {e.status_code}")
+            if scope["type"] == "websocket":
+                # Closing before the handshake is accepted refuses the connection
+                code = status.WS_1013_TRY_AGAIN_LATER if rejected == "overload" else status.WS_1008_POLICY_VIOLATION
+                await WebSocketClose(code=code, reason=e.detail["error"]["message"])(scope, receive, send)
+                return
+            response = JSONResponse(e.detail, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        if scope["type"] == "websocket":
+            # A connection holds its admission slot until it closes
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.admission.release(identity)
+            return
+
+        rate_headers = [
+            (b"x-ratelimit-limit", str(int(limit)).encode()),
+            (b"x-ratelimit-remaining", str(int(remaining)).encode()),
+        ]
+
+        async def send_with_headers(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *rate_headers]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            self.admission.release(identity)
+
@@ -0,0 +1,462 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import base64
+import binascii
+import logging
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi import Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.datasources.formats import (
+    FORMAT_COLUMNS,
+    FORMAT_DATAFRAME,
+    FORMAT_RECORDS,
+    dataframe_to_columns,
+    flatten_column_name,
+)
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MEDIA_TYPE_PARQUET = "application/x-parquet"
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+BINARY_MEDIA_TYPES = (MEDIA_TYPE_ARROW_STREAM, MEDIA_TYPE_PARQUET)
+# Media types the route answers from the DataFrame itself
+TABLE_MEDIA_TYPES = BINARY_MEDIA_TYPES + (MEDIA_TYPE_NDJSON,)
+_JSON_MEDIA_RANGES = (MEDIA_TYPE_JSON, "application/*", "*/*")
+
+# OpenAPI entry for routes that can also answer with Arrow IPC or Parquet
+BINARY_RESPONSES = {
+    200: {
+        "description": "Successful response; Arrow IPC stream, Parquet or NDJSON when requested via Accept",
+        "content": {MEDIA_TYPE_ARROW_STREAM: {}, MEDIA_TYPE_PARQUET: {}, MEDIA_TYPE_NDJSON: {}},
+    },
+}
+
+# NaN/Infinity become null; numpy scalars and arrays are encoded natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively (pandas types, Decimal)"""
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (datetime, date, time)):
+        # pandas.Timestamp is a datetime subclass, which orjson does not serialize
+        return value.isoformat()
+    if isinstance(value, (timedelta, pd.Timedelta)):
+        return value.total_seconds()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """Encode content as JSON the way FastJSONResponse does"""
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Handles the values produced by ``DataFrame.to_dict``: NaN and NaT become
+    null, numpy scalars become plain numbers and timestamps become ISO strings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def api_response(data: Dict[str, Any], meta: Dict[str, Any], status_code: int = 200) -> FastJSONResponse:
+    """Build the standard ``{"data", "meta"}`` response
+
+    Routes keep ``response_model=ApiResponse`` for the OpenAPI schema, but return
+    this response directly so the payload is not re-validated and re-encoded
+    through pydantic.
+
+    Args:
+        data: Response data
+        meta: Response metadata
+        status_code: HTTP status code
+
+    Returns:
+        A response serialized with orjson
+    """
+    return FastJSONResponse({"data": data, "meta": meta}, status_code=status_code)
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """Split an Accept header into ``(media_type, q)`` pairs in header order"""
+    entries = []
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        entries.append((media_type.lower(), q))
+    return entries
+
+
+def negotiate_media_type(
+    accept: Optional[str] = Header(
+        None,
+        description=f"JSON by default; {MEDIA_TYPE_ARROW_STREAM} or {MEDIA_TYPE_PARQUET} for binary tables, "
+                    f"{MEDIA_TYPE_NDJSON} for one streamed JSON object per row",
+    ),
+) -> str:
+    """Choose the response media type for a tabular endpoint
+
+    Used as a route dependency. JSON is returned unless the Accept header prefers
+    Arrow IPC, Parquet or NDJSON; ties go to the type listed first.
+
+    Args:
+        accept: The request's Accept header
+
+    Returns:
+        One of MEDIA_TYPE_JSON, MEDIA_TYPE_ARROW_STREAM, MEDIA_TYPE_PARQUET or MEDIA_TYPE_NDJSON
+
+    Raises:
+        HTTPException: 406 if a binary type is preferred but pyarrow is not installed
+    """
+    if not accept:
+        return MEDIA_TYPE_JSON
+    best, best_q = MEDIA_TYPE_JSON, 0.0
+    for media_type, q in _parse_accept(accept):
+        if media_type in _JSON_MEDIA_RANGES:
+            if q > best_q:
+                best, best_q = MEDIA_TYPE_JSON, q
+        elif media_type in TABLE_MEDIA_TYPES and q > best_q:
+            best, best_q = media_type, q
+    if best == MEDIA_TYPE_JSON or best_q <= 0:
+        return MEDIA_TYPE_JSON
+    if best == MEDIA_TYPE_NDJSON:
+        return best
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=406,
+            detail=f"{best} responses require pyarrow, which is not installed on this server",
+        )
+    return best
+
+
+def sparse_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated columns to return, e.g. `ticker,roe,pe`; all columns by default. "
+                    "Names that match no column are ignored.",
+    ),
+) -> Optional[List[str]]:
+    """Parse the ``fields`` query parameter of a tabular endpoint
+
+    Used as a route dependency; the result is passed down to the service so the
+    datasource projects the DataFrame before converting it.
+
+    Args:
+        fields: The raw parameter
+
+    Returns:
+        The distinct field names in request order, or None for all columns
+    """
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    return names or None
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of a paginated listing: ``limit`` rows from ``offset``
+
+    ``after`` is the key of the last row of the previous page. It lets a
+    cursor find its place again after the list was refreshed.
+    """
+
+    limit: int
+    offset: int = 0
+    after: Optional[str] = None
+
+
+class StaleCursorError(ValueError):
+    """Raised when the row a cursor continues after is no longer in the list"""
+
+
+def encode_cursor(offset: int, after: Optional[str] = None) -> str:
+    """Encode a row offset, and the key of the row before it, as an opaque cursor"""
+    payload: Dict[str, Any] = {"offset": offset}
+    if after is not None:
+        payload["after"] = after
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[str]]:
+    """Decode a cursor made by ``encode_cursor``
+
+    Returns:
+        The row offset and the key of the row before it, if the cursor has one
+
+    Raises:
+        ValueError: If the cursor was not made by ``encode_cursor``
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = orjson.loads(raw)
+        offset = payload["offset"]
+        after = payload.get("after")
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid cursor: {e}") from e
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("invalid cursor offset")
+    if after is not None and not isinstance(after, str):
+        raise ValueError("invalid cursor key")
+    return offset, after
+
+
+def page_params(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.PAGE_MAX_LIMIT,
+        description="Rows per page; without limit and cursor the whole list is returned",
+    ),
+    cursor: Optional[str] = Query(None, description="`nextCursor` of the previous page"),
+) -> Optional[Page]:
+    """Parse the pagination parameters of a listing endpoint
+
+    Used as a route dependency.
+
+    Args:
+        limit: Rows per page; PAGE_DEFAULT_LIMIT if only a cursor is given
+        cursor: Opaque cursor returned with the previous page
+
+    Returns:
+        The requested page, or None if the request is not paginated
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    if limit is None and cursor is None:
+        return None
+    try:
+        offset, after = decode_cursor(cursor) if cursor else (0, None)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return Page(limit=limit or settings.PAGE_DEFAULT_LIMIT, offset=offset, after=after)
+
+
+def output_format_for(media_type: str, output_format: str, page: Optional[Page] = None) -> str:
+    """Return the output format a service should produce for ``media_type``
+
+    Table media types and paginated requests need the DataFrame itself, which
+    the route slices and converts.
+    """
+    if media_type in TABLE_MEDIA_TYPES or page is not None:
+        return FORMAT_DATAFRAME
+    return output_format
+
+
+def _to_arrow_table(df: pd.DataFrame, meta: Dict[str, Any]) -> Any:
+    """Build an Arrow table from a DataFrame, with ``meta`` in the schema metadata"""
+    import pyarrow as pa
+
+    df = df.copy(deep=False)
+    df.columns = [flatten_column_name(column) for column in df.columns]
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # vnstock object columns sometimes mix numbers and strings
+        logger.debug(f"Falling back to string object columns: {e}")
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].astype("string")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"vnstock_api.meta"] = orjson.dumps(meta, default=_orjson_default)
+    return table.replace_schema_metadata(metadata)
+
+
+def dataframe_response(df: pd.DataFrame, media_type: str, meta: Dict[str, Any]) -> Response:
+    """Serialize a DataFrame as an Arrow IPC stream or a Parquet file
+
+    The DataFrame is converted column by column; no per-row objects are built.
+    The response ``meta`` is stored in the schema metadata under
+    ``vnstock_api.meta`` and the row count in the ``X-Total-Count`` header.
+
+    Args:
+        df: DataFrame returned by the service
+        media_type: MEDIA_TYPE_ARROW_STREAM or MEDIA_TYPE_PARQUET
+        meta: Response metadata
+
+    Returns:
+        A binary response
+    """
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+
+    table = _to_arrow_table(df, meta)
+    sink = pa.BufferOutputStream()
+    if media_type == MEDIA_TYPE_PARQUET:
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=media_type,
+        headers={"X-Total-Count": str(table.num_rows)},
+    )
+
+
+def _ndjson_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    """Encode a DataFrame as NDJSON, ``chunk_rows`` rows at a time"""
+    names = [flatten_column_name(column) for column in df.columns]
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        chunk = chunk.set_axis(names, axis=1)
+        yield b"".join(
+            orjson.dumps(record, default=_orjson_default, option=ORJSON_OPTIONS) + b"\n"
+            for record in chunk.to_dict(orient="records")
+        )
+
+
+def ndjson_response(df: pd.DataFrame, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Stream a DataFrame as newline-delimited JSON, one object per row
+
+    Rows are converted and written in chunks of NDJSON_CHUNK_ROWS, so memory
+    per request does not grow with the table and the first rows go out before
+    the last ones are converted. The generator runs in the threadpool.
+
+    Args:
+        df: DataFrame returned by the service
+        headers: Extra response headers
+
+    Returns:
+        A streaming ``application/x-ndjson`` response
+    """
+    return StreamingResponse(
+        _ndjson_chunks(df, max(settings.NDJSON_CHUNK_ROWS, 1)),
+        media_type=MEDIA_TYPE_NDJSON,
+        headers={"X-Total-Count": str(len(df)), **(headers or {})},
+    )
+
+
+def _row_keys(df: pd.DataFrame) -> Optional[pd.Series]:
+    """Column identifying the rows of a list: ``symbol`` if present, else the first column"""
+    if len(df.columns) == 0:
+        return None
+    columns = list(df.columns)
+    return df.iloc[:, columns.index("symbol") if "symbol" in columns else 0]
+
+
+def _resume_offset(page: Page, keys: Optional[pd.Series]) -> int:
+    """Offset of the row after ``page.after``
+
+    The cursor's offset is used while the row before it still has the
+    cursor's key. If the list changed in between (e.g. the cached listing was
+    refreshed), the page continues after the row with that key instead.
+
+    Raises:
+        StaleCursorError: If no single row has the cursor's key any more
+    """
+    if page.after is None or page.offset == 0 or keys is None:
+        return page.offset
+    if page.offset <= len(keys) and str(keys.iat[page.offset - 1]) == page.after:
+        return page.offset
+    matches = np.flatnonzero(keys.astype(str).to_numpy() == page.after)
+    if len(matches) != 1:
+        raise StaleCursorError("The list changed since the cursor was issued; start again without a cursor")
+    return int(matches[0]) + 1
+
+
+def paginate(df: pd.DataFrame, page: Page) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Slice one page out of a DataFrame
+
+    Returns:
+        The rows of the page and the cursor of the next page (None on the last page)
+
+    Raises:
+        StaleCursorError: If the cursor's row is no longer in ``df``
+    """
+    keys = _row_keys(df)
+    start = _resume_offset(page, keys)
+    end = start + page.limit
+    next_cursor = None
+    if end < len(df):
+        next_cursor = encode_cursor(end, None if keys is None else str(keys.iat[end - 1]))
+    return df.iloc[start:end], next_cursor
+
+
+def negotiated_response(
+    data: Any,
+    meta: Dict[str, Any],
+    media_type: str = MEDIA_TYPE_JSON,
+    output_format: str = FORMAT_RECORDS,
+    page: Optional[Page] = None,
+) -> Response:
+    """Build the response for ``media_type`` from data returned by a service
+
+    With ``page``, a DataFrame is sliced before anything is converted: the JSON
+    body carries the page's rows, ``totalCount`` of the whole list and
+    ``meta.pagination.nextCursor``; every media type also gets an
+    ``X-Next-Cursor`` header. A cursor whose row is gone from the list is
+    answered with 400.
+
+    Args:
+        data: Response data; a DataFrame (or list of records) for table media types
+        meta: Response metadata
+        media_type: Media type chosen by ``negotiate_media_type``
+        output_format: JSON format ("records" or "columns") to convert a DataFrame to
+        page: Page to return, from ``page_params``
+
+    Returns:
+        A binary table for Arrow/Parquet, a stream for NDJSON, otherwise the standard JSON response
+
+    Raises:
+        ValueError: If a table media type was requested for non-tabular data
+    """
+    headers: Dict[str, str] = {}
+    if page is not None and isinstance(data, pd.DataFrame):
+        total = len(data)
+        try:
+            data, next_cursor = paginate(data, page)
+        except StaleCursorError as e:
+            return FastJSONResponse(status_code=400, content={"detail": str(e)})
+        meta = {**meta, "pagination": {"limit": page.limit, "totalCount": total, "nextCursor": next_cursor}}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+    if media_type not in TABLE_MEDIA_TYPES:
+        if isinstance(data, pd.DataFrame):
+            total = meta.get("pagination", {}).get("totalCount", len(data))
+            if output_format == FORMAT_COLUMNS:
+                data = {**dataframe_to_columns(data), "totalCount": total}
+            else:
+                data = {"totalCount": total, "records": data.to_dict(orient="records")}
+        response = api_response(data=data, meta=meta)
+        response.headers.update(headers)
+        return response
+    if isinstance(data, list):
+        data = pd.DataFrame(data)
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError(f"{media_type} is only available for tabular data")
+    if media_type == MEDIA_TYPE_NDJSON:
+        return ndjson_response(data, headers)
+    response = dataframe_response(data, media_type, meta)
+    response.headers.update(headers)
+    return response
@@ -5,6 +5,10 @@ from fastapi import APIRouter
 from app.api.rest.v1.companies.routes import router as companies_router
 from app.api.rest.v1.financial.routes import router as financial_router
 from app.api.rest.v1.listing import router as listing_router
+from app.api.rest.v1.ops import router as ops_router
+from app.api.rest.v1.quotes import router as quotes_router
+from app.api.rest.v1.screener import router as screener_router
+from app.api.rest.v1.ws import router as ws_router
 
 # Create v1 router
 v1_router = APIRouter(prefix="/v1")
@@ -13,5 +17,9 @@ v1_router = APIRouter(prefix="/v1")
 v1_router.include_router(companies_router, prefix="/companies", tags=["Companies"])
 v1_router.include_router(financial_router, prefix="/financial", tags=["Financial"])
 v1_router.include_router(listing_router, prefix="/listing", tags=["Listing"])
+v1_router.include_router(quotes_router, prefix="/quotes", tags=["Quotes"])
+v1_router.include_router(screener_router, prefix="/screener", tags=["Screener"])
+v1_router.include_router(ws_router, prefix="/ws", tags=["WebSocket"])
+v1_router.include_router(ops_router, prefix="/ops", tags=["Ops"])
 
 __all__ = ["v1_router"]
\ No newline at end of file
@@ -4,7 +4,9 @@ from datetime import datetime
 import logging
 from app.datasources.base import SOURCE_UNIFIED
 from app.models.schemas.listing import ApiResponse, ApiErrorResponse
-from app.services.company_service import CompanyService
+from app.api.rest.responses import api_response, sparse_fields
+from app.datasources.formats import project_records
+from app.services.company_service import CompanyService, STRATEGY_ADAPTIVE, UNIFIED_STRATEGY_PATTERN
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -17,6 +19,12 @@ router = APIRouter(
     },
 )
 
+STRATEGY_DESCRIPTION = (
+    "How source=unified picks a provider: adaptive (only the provider with the best recent latency, "
+    "asking the other one when it is slow), all (query VCI and TCBS, prefer VCI) or "
+    "fastest (VCI if it answers within the latency budget, otherwise the first good answer)"
+)
+
 async def get_company_service(source: str = Query(SOURCE_UNIFIED, description="Data source to use")):
     """Dependency to get the company service with the specified source."""
     try:
@@ -41,7 +49,7 @@ async def get_company_info(
     service, source = service_and_source
     try:
         data = await service.get_company_info(symbol, source)
-        return ApiResponse(
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -71,13 +79,15 @@ async def get_company_info(
 )
 async def get_company_profile(
     symbol: str = Path(..., description="Company stock symbol"),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get detailed company profile."""
     service, source = service_and_source
     try:
         data = await service.get_company_profile(symbol, source)
-        return ApiResponse(
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -107,13 +117,16 @@ async def get_company_profile(
 )
 async def get_company_officers(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get company management information."""
     service, source = service_and_source
     try:
-        data = await service.get_company_officers(symbol, source)
-        return ApiResponse(
+        data = await service.get_company_officers(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -143,13 +156,16 @@ async def get_company_officers(
 )
 async def get_shareholders(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get major shareholders information."""
     service, source = service_and_source
     try:
-        data = await service.get_shareholders(symbol, source)
-        return ApiResponse(
+        data = await service.get_shareholders(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -179,13 +195,16 @@ async def get_shareholders(
 )
 async def get_insider_trading(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get insider trading information."""
     service, source = service_and_source
     try:
-        data = await service.get_insider_trading(symbol, source)
-        return ApiResponse(
+        data = await service.get_insider_trading(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -215,13 +234,16 @@ async def get_insider_trading(
 )
 async def get_subsidiaries(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get company subsidiaries."""
     service, source = service_and_source
     try:
-        data = await service.get_subsidiaries(symbol, source)
-        return ApiResponse(
+        data = await service.get_subsidiaries(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -251,13 +273,16 @@ async def get_subsidiaries(
 )
 async def get_company_events(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get company events."""
     service, source = service_and_source
     try:
-        data = await service.get_company_events(symbol, source)
-        return ApiResponse(
+        data = await service.get_company_events(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -287,13 +312,16 @@ async def get_company_events(
 )
 async def get_company_news(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get company news."""
     service, source = service_and_source
     try:
-        data = await service.get_company_news(symbol, source)
-        return ApiResponse(
+        data = await service.get_company_news(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -323,13 +351,16 @@ async def get_company_news(
 )
 async def get_dividends(
     symbol: str = Path(..., description="Company stock symbol"),
+    strategy: str = Query(STRATEGY_ADAPTIVE, pattern=UNIFIED_STRATEGY_PATTERN, description=STRATEGY_DESCRIPTION),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service_and_source: tuple = Depends(get_company_service)
 ):
     """Get dividend history."""
     service, source = service_and_source
     try:
-        data = await service.get_dividends(symbol, source)
-        return ApiResponse(
+        data = await service.get_dividends(symbol, source, strategy)
+        data = project_records(data, fields)
+        return api_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
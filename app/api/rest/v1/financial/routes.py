@@ -5,6 +5,15 @@ import logging
 from app.services.financial_service import FinancialService
 from app.datasources.base import SOURCE_UNIFIED, SOURCE_TCBS
 from app.models.schemas.listing import ApiResponse, ApiErrorResponse
+from app.models.schemas.financial import FinancialBatchRequest
+from app.api.rest.responses import (
+    BINARY_RESPONSES,
+    negotiate_media_type,
+    negotiated_response,
+    output_format_for,
+    sparse_fields,
+)
+from app.datasources.formats import FORMAT_RECORDS, OUTPUT_FORMAT_PATTERN
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -14,10 +23,11 @@ router = APIRouter(
     responses={
         404: {"model": ApiErrorResponse, "description": "Not found"},
         500: {"model": ApiErrorResponse, "description": "Internal server error"},
+        **BINARY_RESPONSES,
     },
 )
 
-async def get_financial_service(source: str = Query(SOURCE_TCBS, description="Data source to use")) -> FinancialService:
+async def get_financial_service(source: str = Query(SOURCE_TCBS, description="Data source to use (tcbs, vci, or unified: TCBS with fallback to VCI)")) -> FinancialService:
     """Dependency injection for FinancialService"""
     try:
         return FinancialService(source=source)
@@ -40,6 +50,9 @@ async def get_balance_sheet(
     dropna: bool = Query(True, description="Drop rows with all NaN values"),
     to_df: bool = Query(True, description="Return as DataFrame"),
     show_log: bool = Query(False, description="Show debug logs"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service: FinancialService = Depends(get_financial_service)
 ) -> Dict:
     """Get balance sheet data for a company"""
@@ -49,9 +62,11 @@ async def get_balance_sheet(
             period=period,
             dropna=dropna,
             to_df=to_df,
-            show_log=show_log
+            show_log=show_log,
+            output_format=output_format_for(media_type, output_format),
+            fields=fields
         )
-        return ApiResponse(
+        return negotiated_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -59,7 +74,8 @@ async def get_balance_sheet(
                 "source": service.source,
                 "symbol": symbol,
                 "period": period
-            }
+            },
+            media_type=media_type,
         )
     except NotImplementedError as e:
         logger.warning(f"Get balance sheet not implemented for source {service.source}: {str(e)}")
@@ -84,6 +100,9 @@ async def get_income_statement(
     dropna: bool = Query(True, description="Drop rows with all NaN values"),
     to_df: bool = Query(True, description="Return as DataFrame"),
     show_log: bool = Query(False, description="Show debug logs"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service: FinancialService = Depends(get_financial_service)
 ) -> Dict:
     """Get income statement data for a company"""
@@ -93,9 +112,11 @@ async def get_income_statement(
             period=period,
             dropna=dropna,
             to_df=to_df,
-            show_log=show_log
+            show_log=show_log,
+            output_format=output_format_for(media_type, output_format),
+            fields=fields
         )
-        return ApiResponse(
+        return negotiated_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -103,7 +124,8 @@ async def get_income_statement(
                 "source": service.source,
                 "symbol": symbol,
                 "period": period
-            }
+            },
+            media_type=media_type,
         )
     except NotImplementedError as e:
         logger.warning(f"Get income statement not implemented for source {service.source}: {str(e)}")
@@ -128,6 +150,9 @@ async def get_cash_flow(
     dropna: bool = Query(True, description="Drop rows with all NaN values"),
     to_df: bool = Query(True, description="Return as DataFrame"),
     show_log: bool = Query(False, description="Show debug logs"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service: FinancialService = Depends(get_financial_service)
 ) -> Dict:
     """Get cash flow data for a company"""
@@ -137,9 +162,11 @@ async def get_cash_flow(
             period=period,
             dropna=dropna,
             to_df=to_df,
-            show_log=show_log
+            show_log=show_log,
+            output_format=output_format_for(media_type, output_format),
+            fields=fields
         )
-        return ApiResponse(
+        return negotiated_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -147,7 +174,8 @@ async def get_cash_flow(
                 "source": service.source,
                 "symbol": symbol,
                 "period": period
-            }
+            },
+            media_type=media_type,
         )
     except NotImplementedError as e:
         logger.warning(f"Get cash flow not implemented for source {service.source}: {str(e)}")
@@ -172,6 +200,9 @@ async def get_ratios(
     dropna: bool = Query(True, description="Drop rows with all NaN values"),
     to_df: bool = Query(True, description="Return as DataFrame"),
     show_log: bool = Query(False, description="Show debug logs"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
     service: FinancialService = Depends(get_financial_service)
 ) -> Dict:
     """Get financial ratios data for a company"""
@@ -181,9 +212,11 @@ async def get_ratios(
             period=period,
             dropna=dropna,
             to_df=to_df,
-            show_log=show_log
+            show_log=show_log,
+            output_format=output_format_for(media_type, output_format),
+            fields=fields
         )
-        return ApiResponse(
+        return negotiated_response(
             data={"records": data} if isinstance(data, list) else data,
             meta={
                 "version": "1.0",
@@ -191,7 +224,8 @@ async def get_ratios(
                 "source": service.source,
                 "symbol": symbol,
                 "period": period
-            }
+            },
+            media_type=media_type,
         )
     except NotImplementedError as e:
         logger.warning(f"Get ratios not implemented for source {service.source}: {str(e)}")
@@ -201,4 +235,54 @@ async def get_ratios(
         )
     except Exception as e:
         logger.error(f"Error in get_ratios for {symbol}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+
+@router.post(
+    "/batch",
+    response_model=ApiResponse,
+    summary="Get financial statements for several companies",
+    description="Fetch statement types for a list of symbols concurrently and return them as one long-format table "
+                "(symbol, statement, year, quarter, item, value). Failed symbols are listed in `errors`."
+)
+async def get_statements_batch(
+    request: FinancialBatchRequest,
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    service: FinancialService = Depends(get_financial_service)
+) -> Dict:
+    """Get financial statements for several companies"""
+    try:
+        data, errors = await service.get_statements_batch(
+            symbols=request.symbols,
+            statements=request.statements,
+            period=request.period,
+            lang=request.lang,
+            dropna=request.dropna,
+            output_format=output_format_for(media_type, output_format)
+        )
+        meta = {
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+            "source": service.source,
+            "symbols": request.symbols,
+            "statements": request.statements,
+            "period": request.period
+        }
+        if isinstance(data, list):
+            data = {"totalCount": len(data), "records": data}
+        if isinstance(data, dict):
+            data["errors"] = errors
+        else:
+            # Binary tables carry the errors in their schema metadata
+            meta["errors"] = errors
+        return negotiated_response(data=data, meta=meta, media_type=media_type)
+    except NotImplementedError as e:
+        logger.warning(f"Financial batch not implemented for source {service.source}: {str(e)}")
+        raise HTTPException(
+            status_code=501,
+            detail=f"Not implemented for this source: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_statements_batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,19 @@
 from fastapi import APIRouter, Depends, Query, Path, HTTPException
+from typing import List, Optional
 from datetime import datetime
 import logging
 from app.services.listing_service import ListingService
 from app.models.schemas.listing import ApiResponse, ApiErrorResponse, ResponseModel
+from app.api.rest.responses import (
+    BINARY_RESPONSES,
+    Page,
+    negotiate_media_type,
+    negotiated_response,
+    output_format_for,
+    page_params,
+    sparse_fields,
+)
+from app.datasources.formats import FORMAT_RECORDS, OUTPUT_FORMAT_PATTERN
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -12,6 +23,7 @@ router = APIRouter(
     responses={
         404: {"model": ApiErrorResponse, "description": "Not found"},
         500: {"model": ApiErrorResponse, "description": "Internal server error"},
+        **BINARY_RESPONSES,
     },
 )
 
@@ -32,18 +44,25 @@ async def get_listing_service(source: str = Query("vci", description="Data sourc
     description="Get a list of all available symbols including stock code, company name, exchange, industry, etc.",
 )
 async def get_all_symbols(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get all available symbols."""
     try:
-        data = await service.get_all_symbols()
-        return ApiResponse(
+        data = await service.get_all_symbols(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -61,18 +80,25 @@ async def get_all_symbols(
     description="Get symbols organized by their respective industries.",
 )
 async def get_symbols_by_industries(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get symbols grouped by industry."""
     try:
-        data = await service.get_symbols_by_industries()
-        return ApiResponse(
+        data = await service.get_symbols_by_industries(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -90,18 +116,25 @@ async def get_symbols_by_industries(
     description="Get symbols organized by their respective exchanges.",
 )
 async def get_symbols_by_exchange(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get symbols grouped by exchange."""
     try:
-        data = await service.get_symbols_by_exchange()
-        return ApiResponse(
+        data = await service.get_symbols_by_exchange(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -120,19 +153,26 @@ async def get_symbols_by_exchange(
 )
 async def get_symbols_by_group(
     group: str = Path(..., description="Group name (e.g., VN30, HNX30)"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get symbols in a specific group."""
     try:
-        data = await service.get_symbols_by_group(group=group)
-        return ApiResponse(
+        data = await service.get_symbols_by_group(group=group, output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
                 "group": group,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -150,18 +190,25 @@ async def get_symbols_by_group(
     description="Get industry classification benchmark data.",
 )
 async def get_industries_icb(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get industry classification benchmark data."""
     try:
-        data = await service.get_industries_icb()
-        return ApiResponse(
+        data = await service.get_industries_icb(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -179,18 +226,25 @@ async def get_industries_icb(
     description="Get all available future indices.",
 )
 async def get_all_future_indices(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get all future indices."""
     try:
-        data = await service.get_all_future_indices()
-        return ApiResponse(
+        data = await service.get_all_future_indices(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -208,18 +262,25 @@ async def get_all_future_indices(
     description="Get all available covered warrants.",
 )
 async def get_all_covered_warrant(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get all covered warrants."""
     try:
-        data = await service.get_all_covered_warrant()
-        return ApiResponse(
+        data = await service.get_all_covered_warrant(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -237,18 +298,25 @@ async def get_all_covered_warrant(
     description="Get all available bonds.",
 )
 async def get_all_bonds(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get all bonds."""
     try:
-        data = await service.get_all_bonds()
-        return ApiResponse(
+        data = await service.get_all_bonds(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -266,18 +334,25 @@ async def get_all_bonds(
     description="Get all available government bonds.",
 )
 async def get_all_government_bonds(
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
     service: ListingService = Depends(get_listing_service)
 ):
     """Get all government bonds."""
     try:
-        data = await service.get_all_government_bonds()
-        return ApiResponse(
+        data = await service.get_all_government_bonds(output_format=output_format_for(media_type, output_format, page), fields=fields)
+        return negotiated_response(
             data=data,
             meta={
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
                 "source": service.source,
-            }
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
         )
     except NotImplementedError as e:
         raise HTTPException(
@@ -0,0 +1,3 @@
+from app.api.rest.v1.ops.routes import router
+
+__all__ = ["router"]
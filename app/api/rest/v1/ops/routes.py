@@ -0,0 +1,71 @@
+from fastapi import APIRouter
+from datetime import datetime
+import logging
+from app.datasources.registry import datasource_registry
+from app.infrastructure.cache import get_cache
+from app.infrastructure.circuit_breaker import circuit_breakers
+from app.infrastructure.executor import executor_registry
+from app.infrastructure.history_store import get_history_store
+from app.infrastructure.provider_router import provider_router
+from app.infrastructure.rate_limit import admission_control
+from app.infrastructure.scheduler import upstream_scheduler
+from app.infrastructure.singleflight import upstream_flight
+from app.models.schemas.listing import ApiResponse
+from app.services.indicators import indicator_cache
+from app.services.price_board import price_board_hub
+from app.services.screener import screener_snapshots
+from app.api.rest.responses import api_response
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter()
+
+
+@router.get(
+    "/stats",
+    response_model=ApiResponse,
+    summary="Get runtime statistics",
+    description="Executor queues, response cache hit rates, upstream request coalescing counters, the datasource registry, circuit breakers, provider latency, upstream rate limiters, inbound admission control, the quote history store, the indicator series cache, the screener snapshots and the price board pollers.",
+)
+async def get_stats():
+    """Get runtime statistics for the shared infrastructure components."""
+    cache = get_cache()
+    return api_response(
+        data={
+            "executor": executor_registry.stats(),
+            "cache": cache.stats() if cache is not None else None,
+            "singleflight": upstream_flight.stats(),
+            "registry": datasource_registry.stats(),
+            "circuits": circuit_breakers.stats(),
+            "providers": provider_router.stats(),
+            "upstream": upstream_scheduler.stats(),
+            "admission": admission_control.stats(),
+            "history_store": get_history_store().stats(),
+            "indicators": indicator_cache.stats(),
+            "screener": screener_snapshots.stats(),
+            "price_board": price_board_hub.stats(),
+        },
+        meta={
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+        }
+    )
+
+
+@router.get(
+    "/circuits",
+    response_model=ApiResponse,
+    summary="Get circuit breaker states",
+    description="State, recent error rate and latency of the circuit breaker for each (provider, operation) used by source=unified.",
+)
+async def get_circuits():
+    """Get the circuit breaker state for each provider and operation."""
+    return api_response(
+        data=circuit_breakers.stats(),
+        meta={
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+        }
+    )
@@ -0,0 +1,197 @@
+from fastapi import APIRouter, Depends, Query, Path, HTTPException
+from typing import List, Optional, Tuple
+from datetime import date, datetime
+import logging
+from app.services.indicators import IndicatorSpec, parse_indicators
+from app.services.quote_service import QUOTE_INTERVAL_PATTERN, SYMBOL_PATTERN, QuoteService
+from app.models.schemas.listing import ApiResponse, ApiErrorResponse
+from app.models.schemas.quote import IndicatorBatchRequest
+from app.api.rest.responses import (
+    BINARY_RESPONSES,
+    Page,
+    negotiate_media_type,
+    negotiated_response,
+    output_format_for,
+    page_params,
+    sparse_fields,
+)
+from app.datasources.formats import FORMAT_RECORDS, OUTPUT_FORMAT_PATTERN, project_columns
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(
+    responses={
+        400: {"model": ApiErrorResponse, "description": "Invalid request"},
+        500: {"model": ApiErrorResponse, "description": "Internal server error"},
+        **BINARY_RESPONSES,
+    },
+)
+
+async def get_quote_service(source: str = Query("vci", description="Data source to use (vci, tcbs)")):
+    """Dependency to get the quote service with the specified source."""
+    try:
+        return QuoteService(source=source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid source: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error creating quote service: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error creating quote service")
+
+async def history_window(
+    start: date = Query(..., description="First day of the window (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Last day of the window (YYYY-MM-DD, inclusive); today by default"),
+) -> Tuple[date, Optional[date]]:
+    """Dependency that validates the requested date window."""
+    if end is not None and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start, end
+
+async def indicator_specs(
+    indicators: str = Query("sma:20,ema:20,rsi:14", description="Comma-separated indicators with optional parameters: sma:20, ema:20, rsi:14, macd:12:26:9, bbands:20:2, atr:14"),
+) -> List[IndicatorSpec]:
+    """Dependency that parses the requested indicators."""
+    try:
+        return parse_indicators(indicators)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get(
+    "/{symbol}/history",
+    response_model=ApiResponse,
+    summary="Get price history",
+    description="OHLCV bars of a symbol. Bars are kept in an on-disk store; only the days of the window that were never fetched before are requested from the provider. Intervals the store does not hold for the window, including 1W and 1M, are resampled from finer stored bars along the exchange's trading sessions.",
+)
+async def get_history(
+    symbol: str = Path(..., pattern=SYMBOL_PATTERN, description="Stock ticker symbol"),
+    window: Tuple[date, Optional[date]] = Depends(history_window),
+    interval: str = Query("1D", pattern=QUOTE_INTERVAL_PATTERN, description="Bar interval: 1m, 5m, 15m, 30m, 1H, 1D, 1W or 1M; intervals not stored are resampled from finer stored bars"),
+    exchange: Optional[str] = Query(None, pattern="^(HOSE|HSX|HNX|UPCOM)$", description="Exchange whose trading sessions intraday bars are resampled by; looked up from the listing by default"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
+    service: QuoteService = Depends(get_quote_service)
+):
+    """Get the OHLCV history of a symbol."""
+    start, end = window
+    try:
+        data = await service.get_history(symbol, start, end, interval=interval, fields=fields, exchange=exchange)
+        return negotiated_response(
+            data=data,
+            meta={
+                "version": "1.0",
+                "timestamp": datetime.now().isoformat(),
+                "source": service.source,
+                "symbol": symbol.upper(),
+                "interval": interval,
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
+        )
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=501, 
+            detail=f"Not implemented for this source: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_history: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get(
+    "/{symbol}/indicators",
+    response_model=ApiResponse,
+    summary="Get technical indicators",
+    description="SMA, EMA, RSI, MACD, Bollinger Bands and ATR over the price history of a symbol, one row per bar. Series are cached by window start and extended with new bars instead of being recomputed.",
+)
+async def get_indicators(
+    symbol: str = Path(..., pattern=SYMBOL_PATTERN, description="Stock ticker symbol"),
+    window: Tuple[date, Optional[date]] = Depends(history_window),
+    indicators: List[IndicatorSpec] = Depends(indicator_specs),
+    interval: str = Query("1D", pattern=QUOTE_INTERVAL_PATTERN, description="Bar interval: 1m, 5m, 15m, 30m, 1H, 1D, 1W or 1M"),
+    exchange: Optional[str] = Query(None, pattern="^(HOSE|HSX|HNX|UPCOM)$", description="Exchange whose trading sessions intraday bars are resampled by; looked up from the listing by default"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
+    service: QuoteService = Depends(get_quote_service)
+):
+    """Get technical indicators of a symbol."""
+    start, end = window
+    try:
+        data = await service.get_indicators(symbol, start, indicators, end=end, interval=interval, exchange=exchange)
+        return negotiated_response(
+            data=project_columns(data, fields),
+            meta={
+                "version": "1.0",
+                "timestamp": datetime.now().isoformat(),
+                "source": service.source,
+                "symbol": symbol.upper(),
+                "interval": interval,
+                "indicators": [str(spec) for spec in indicators],
+            },
+            media_type=media_type,
+            output_format=output_format,
+            page=page,
+        )
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=501, 
+            detail=f"Not implemented for this source: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_indicators: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/indicators/batch",
+    response_model=ApiResponse,
+    summary="Get technical indicators for several symbols",
+    description="Evaluate the same indicators over the price history of a list of symbols concurrently and return one table "
+                "with a symbol column. Failed symbols are listed in `errors`.",
+)
+async def get_indicators_batch(
+    request: IndicatorBatchRequest,
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    service: QuoteService = Depends(get_quote_service)
+):
+    """Get technical indicators for several symbols."""
+    if request.end is not None and request.start > request.end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    try:
+        indicators = parse_indicators(request.indicators)
+        data, errors = await service.get_indicators_batch(
+            symbols=request.symbols,
+            start=request.start,
+            indicators=indicators,
+            end=request.end,
+            interval=request.interval,
+            output_format=output_format_for(media_type, output_format),
+        )
+        meta = {
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+            "source": service.source,
+            "symbols": request.symbols,
+            "interval": request.interval,
+            "indicators": [str(spec) for spec in indicators],
+        }
+        if isinstance(data, list):
+            data = {"totalCount": len(data), "records": data}
+        if isinstance(data, dict):
+            data["errors"] = errors
+        else:
+            # Binary tables carry the errors in their schema metadata
+            meta["errors"] = errors
+        return negotiated_response(data=data, meta=meta, media_type=media_type)
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=501, 
+            detail=f"Not implemented for this source: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_indicators_batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import List, Optional
+from datetime import datetime
+import logging
+from app.core.config import settings
+from app.services.screener import ALIASES, ScreenerTable, SnapshotUnavailableError
+from app.services.screener_service import ScreenerService
+from app.models.schemas.listing import ApiResponse, ApiErrorResponse
+from app.api.rest.responses import (
+    BINARY_RESPONSES,
+    Page,
+    api_response,
+    negotiate_media_type,
+    negotiated_response,
+    page_params,
+    sparse_fields,
+)
+from app.datasources.formats import FORMAT_RECORDS, OUTPUT_FORMAT_PATTERN
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(
+    responses={
+        400: {"model": ApiErrorResponse, "description": "Invalid request"},
+        500: {"model": ApiErrorResponse, "description": "Internal server error"},
+        503: {"model": ApiErrorResponse, "description": "Screener snapshot not available yet"},
+        **BINARY_RESPONSES,
+    },
+)
+
+async def get_screener_service(source: Optional[str] = Query(None, pattern="^(tcbs|vci)$", description="Source of the financial ratios (tcbs, vci); SCREENER_SOURCE by default")):
+    """Dependency to get the screener service with the specified source."""
+    return ScreenerService(source=source)
+
+async def get_snapshot(service: ScreenerService = Depends(get_screener_service)) -> ScreenerTable:
+    """Dependency that returns today's screener snapshot, building it if needed."""
+    try:
+        return await service.get_table()
+    except SnapshotUnavailableError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(settings.SCREENER_BUILD_WAIT_SECONDS)))},
+        )
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=501, 
+            detail=f"Not implemented for this source: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error building the screener snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get(
+    "",
+    response_model=ApiResponse,
+    summary="Screen stocks",
+    description="Filter the listed stocks of HOSE, HNX and UPCOM by their latest financial ratios and listing metadata, "
+                "e.g. `pe < 20 and roe > 0.15 and exchange == 'HOSE'`. Filters run in process over a snapshot taken once a day; "
+                "see `/screener/fields` for the columns.",
+)
+async def screen(
+    expression: Optional[str] = Query(None, alias="filter", max_length=2000, description="Filter expression: columns, numbers, 'strings', + - * /, < <= > >= == !=, in [...], and, or, not"),
+    sort: Optional[str] = Query(None, description="Column to sort by, prefixed with - for descending, e.g. -roe"),
+    output_format: str = Query(FORMAT_RECORDS, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Output format: records (row objects) or columns (column arrays plus schema)"),
+    media_type: str = Depends(negotiate_media_type),
+    fields: Optional[List[str]] = Depends(sparse_fields),
+    page: Optional[Page] = Depends(page_params),
+    service: ScreenerService = Depends(get_screener_service),
+    table: ScreenerTable = Depends(get_snapshot),
+):
+    """Screen stocks with a filter expression."""
+    try:
+        data, matched = table.select(expression, sort=sort, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return negotiated_response(
+        data=data,
+        meta={
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+            "source": service.source,
+            "filter": expression,
+            "sort": sort,
+            "matched": matched,
+            "universe": len(table),
+            "snapshot": table.built_on.isoformat(),
+        },
+        media_type=media_type,
+        output_format=output_format,
+        page=page,
+    )
+
+@router.get(
+    "/fields",
+    response_model=ApiResponse,
+    summary="Get screener columns",
+    description="Columns of the screener snapshot with their type (number or text), and the short aliases accepted in filters.",
+)
+async def get_fields(
+    service: ScreenerService = Depends(get_screener_service),
+    table: ScreenerTable = Depends(get_snapshot),
+):
+    """Get the columns that filters can use."""
+    return api_response(
+        data={
+            "columns": table.columns,
+            "aliases": {alias: column for alias, column in ALIASES.items() if column in table.columns},
+        },
+        meta={
+            "version": "1.0",
+            "timestamp": datetime.now().isoformat(),
+            "source": service.source,
+            "snapshot": table.built_on.isoformat(),
+        }
+    )
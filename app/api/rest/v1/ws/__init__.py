@@ -0,0 +1,3 @@
+from app.api.rest.v1.ws.routes import router
+
+__all__ = ["router"]
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import pandas as pd
+from app.core.config import settings
+from app.datasources.base import SOURCE_VCI
+from app.datasources.formats import FORMAT_DATAFRAME
+from app.services.listing_service import ListingService
+from app.services.price_board import BoardLimitError, Subscriber, price_board_hub
+from app.api.rest.responses import dump_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter()
+
+
+class SubscriptionError(ValueError):
+    """The requested board cannot be watched; the socket is closed with the message as reason"""
+
+
+async def board_symbols(symbols: Optional[str], group: Optional[str]) -> List[str]:
+    """Symbols of a price board subscription, from an explicit list or a listing group
+
+    Raises:
+        SubscriptionError: If neither or both are given, the group is unknown or there are too many symbols
+    """
+    if bool(symbols) == bool(group):
+        raise SubscriptionError("Pass either symbols or group")
+    if group:
+        try:
+            members = await ListingService(SOURCE_VCI).get_symbols_by_group(group=group.upper(), output_format=FORMAT_DATAFRAME)
+        except ValueError as e:
+            raise SubscriptionError(str(e))
+        names = members["symbol"] if isinstance(members, pd.DataFrame) else members
+        result = [str(name).upper() for name in names]
+    else:
+        result = [name.strip().upper() for name in symbols.split(",") if name.strip()]
+    result = list(dict.fromkeys(result))
+    if not result:
+        raise SubscriptionError("No symbols to watch")
+    if len(result) > settings.PRICE_BOARD_MAX_SYMBOLS:
+        raise SubscriptionError(f"At most {settings.PRICE_BOARD_MAX_SYMBOLS} symbols per board")
+    return result
+
+
+async def _send(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    """Send one JSON message, giving up after PRICE_BOARD_SEND_TIMEOUT seconds"""
+    message["timestamp"] = datetime.now().isoformat()
+    await asyncio.wait_for(websocket.send_text(dump_json(message).decode()), timeout=settings.PRICE_BOARD_SEND_TIMEOUT)
+
+
+async def _close(websocket: WebSocket, code: int, reason: str) -> None:
+    """Close the socket, giving up after PRICE_BOARD_SEND_TIMEOUT seconds on a client that stopped reading"""
+    try:
+        await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=settings.PRICE_BOARD_SEND_TIMEOUT)
+    except Exception as e:
+        logger.debug(f"Could not close a price board socket cleanly: {str(e)}")
+
+
+async def _forward(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Send the subscriber's updates until the connection fails"""
+    while True:
+        changes, error = await subscriber.next()
+        if error is not None:
+            await _send(websocket, {"type": "error", "detail": error})
+        if changes:
+            await _send(websocket, {"type": "update", "data": changes})
+
+
+async def _drain(websocket: WebSocket) -> None:
+    """Read and ignore client messages until the client disconnects"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/price-board")
+async def price_board(
+    websocket: WebSocket,
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols to watch, e.g. VCB,FPT,HPG"),
+    group: Optional[str] = Query(None, description="Listing group to watch instead of symbols, e.g. VN30 or HNX30"),
+    source: str = Query("vci", pattern="^(vci|tcbs)$", description="Data source to use (vci, tcbs)"),
+):
+    """Stream the price board of a symbol set.
+
+    The first message is a ``snapshot`` with the full row of every symbol,
+    followed by ``update`` messages holding only the fields that changed
+    since the previous message. All clients watching the same symbol set
+    share one upstream poll every PRICE_BOARD_POLL_INTERVAL seconds, and at
+    most PRICE_BOARD_MAX_BOARDS distinct boards are polled at once. A slow
+    client receives the changes merged into fewer updates; one that does not
+    accept a message within PRICE_BOARD_SEND_TIMEOUT seconds is disconnected.
+    """
+    await websocket.accept()
+    try:
+        watched = await board_symbols(symbols, group)
+    except SubscriptionError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+    except Exception as e:
+        logger.error(f"Error resolving price board symbols: {str(e)}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Could not resolve the symbols")
+        return
+
+    try:
+        async with price_board_hub.subscribe(source, watched) as (snapshot, subscriber):
+            await _send(websocket, {"type": "snapshot", "source": source, "symbols": watched, "data": snapshot})
+            tasks = [asyncio.ensure_future(_forward(websocket, subscriber)), asyncio.ensure_future(_drain(websocket))]
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            for task in done:
+                task.result()
+    except WebSocketDisconnect:
+        pass
+    except BoardLimitError as e:
+        await _close(websocket, status.WS_1013_TRY_AGAIN_LATER, str(e))
+    except asyncio.TimeoutError:
+        logger.warning(f"Disconnecting a price board client that fell {settings.PRICE_BOARD_SEND_TIMEOUT}s behind")
+        await _close(websocket, status.WS_1013_TRY_AGAIN_LATER, "Client too slow")
+    except Exception as e:
+        logger.error(f"Error in price board stream: {str(e)}")
+        await _close(websocket, status.WS_1011_INTERNAL_ERROR, "Price board stream failed")
@@ -33,13 +33,115 @@ class Settings(BaseSettings):
     # Cache settings
     CACHE_ENABLED: bool = True
     CACHE_DEFAULT_TIMEOUT: int = 3600  # 1 hour
+    CACHE_L1_MAX_ENTRIES: int = 2048  # in-process LRU size
+    CACHE_TTL_LISTING: int = 86400  # listings and ICB: 1 day
+    CACHE_TTL_FINANCIAL_YEAR: int = 604800  # annual statements: 1 week
+    CACHE_TTL_FINANCIAL_QUARTER: int = 86400  # quarterly statements: 1 day
+    CACHE_TTL_NEWS: int = 300  # news, events and insider deals: 5 minutes
+    # Stale-while-revalidate: the TTLs above are soft; stale copies are served up to the hard TTL
+    CACHE_HARD_TTL_FINANCIAL: int = 7776000  # financial statements and ratios: 90 days
+    CACHE_HARD_TTL_PROFILE: int = 604800  # company profiles: 1 week
+    CACHE_SWR_REFRESH_BACKOFF: int = 60  # first retry delay after a failed background refresh
+    CACHE_SWR_REFRESH_BACKOFF_MAX: int = 3600  # cap for the exponential retry delay
     
     # Supabase configuration
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
     
-    # API rate limiting
-    RATE_LIMIT_PER_MIN: int = 60
+    # API rate limiting (sliding window per client, weighted by endpoint cost)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MIN: int = 60  # per client IP
+    RATE_LIMIT_API_KEY_PER_MIN: int = 600  # per known X-API-Key
+    RATE_LIMIT_API_KEYS: List[str] = []
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared, needs REDIS_HOST)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # identify clients by X-Forwarded-For (behind a proxy)
+    RATE_LIMIT_ENDPOINT_COSTS: Dict[str, float] = {"/api/v1/companies/{symbol}": 8}
+    RATE_LIMIT_PATHS: List[str] = ["/api/v1", "/graphql"]
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/api/v1/ops"]
+    RATE_LIMIT_MAX_CLIENTS: int = 100000  # in-process limiter: clients tracked before idle ones are dropped
+    # Admission control: requests in flight before new ones are rejected (503 overall, 429 per client)
+    ADMISSION_MAX_IN_FLIGHT: int = 256
+    ADMISSION_MAX_IN_FLIGHT_PER_CLIENT: int = 16
+    
+    # GraphQL query limits, checked before any upstream call is made
+    GRAPHQL_MAX_DEPTH: int = 6  # nesting levels below the root fields (introspection is not counted)
+    GRAPHQL_MAX_COST: int = 100  # upstream provider calls one query may plan
+    GRAPHQL_MAX_COMPLEXITY: int = 2000  # fields one query may resolve, lists of companies multiplied out
+    
+    # Executor settings (worker threads for blocking vnstock calls, per source)
+    EXECUTOR_TCBS_MAX_WORKERS: int = 8
+    EXECUTOR_VCI_MAX_WORKERS: int = 8
+    EXECUTOR_DEFAULT_MAX_WORKERS: int = 4
+    
+    # Outbound rate limits per provider (token bucket), shared by all upstream calls
+    UPSTREAM_RATE_LIMIT_ENABLED: bool = True
+    UPSTREAM_TCBS_RATE_PER_MIN: float = 300
+    UPSTREAM_VCI_RATE_PER_MIN: float = 300
+    UPSTREAM_DEFAULT_RATE_PER_MIN: float = 120
+    UPSTREAM_BURST: float = 20  # calls that may start back to back after an idle period
+    # Longest wait for a token per priority class (seconds); calls that would wait longer fail at once
+    UPSTREAM_QUEUE_TIMEOUT: float = 5.0  # interactive requests
+    UPSTREAM_BACKGROUND_QUEUE_TIMEOUT: float = 60.0  # stale-while-revalidate refreshes
+    UPSTREAM_BATCH_QUEUE_TIMEOUT: float = 120.0  # POST /financial/batch
+    
+    # Pool of reusable vnstock client objects, keyed by (symbol, source)
+    VNSTOCK_CLIENT_POOL_SIZE: int = 256
+    VNSTOCK_CLIENT_MAX_AGE: int = 300  # seconds; vnstock memoizes per client, so clients are rebuilt after this
+    
+    # Timeout for each section fetched by get_company_info (seconds)
+    COMPANY_SECTION_TIMEOUT: float = 10.0
+    
+    # Circuit breakers per (provider, operation), used to route source=unified requests
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_WINDOW_SIZE: int = 20  # recent calls considered
+    CIRCUIT_MIN_CALLS: int = 5  # calls needed before the circuit can open
+    CIRCUIT_FAILURE_RATE: float = 0.5  # share of failed or slow calls that opens the circuit
+    CIRCUIT_SLOW_CALL_SECONDS: float = 5.0  # calls slower than this count as failed
+    CIRCUIT_OPEN_SECONDS: float = 30  # first open period; doubles after each failed probe
+    CIRCUIT_OPEN_SECONDS_MAX: float = 300
+    CIRCUIT_HALF_OPEN_PROBES: int = 1  # trial calls allowed when the open period ends
+    
+    # Latency-aware provider selection for source=unified (strategy=adaptive)
+    UNIFIED_ROUTER_WINDOW: int = 100  # latency samples kept per provider and operation
+    UNIFIED_ROUTER_MIN_SAMPLES: int = 10  # samples needed before the ranking is trusted
+    UNIFIED_ROUTER_EXPLORE_RATE: float = 0.05  # share of calls that try a provider other than the best one first
+    UNIFIED_HEDGE_DELAY: float = 1.0  # seconds before asking the next provider, until p95 is known
+    UNIFIED_HEDGE_DELAY_MIN: float = 0.2  # lower bound for the p95-based hedge delay
+    
+    # Merging unified company info: provider precedence, overridable per "field" or "section.field"
+    UNIFIED_MERGE_PRECEDENCE: List[str] = ["tcbs", "vci"]
+    UNIFIED_MERGE_FIELD_PRECEDENCE: Dict[str, List[str]] = {}
+    
+    # strategy=fastest: how long (seconds) to wait for the preferred provider before taking another answer
+    UNIFIED_FASTEST_BUDGET: float = 1.0
+    
+    # POST /financial/batch: symbols per request and statements fetched at once
+    FINANCIAL_BATCH_MAX_SYMBOLS: int = 100
+    FINANCIAL_BATCH_CONCURRENCY: int = 8
+    
+    # Listing pagination (?limit=&cursor=) and NDJSON streaming
+    PAGE_DEFAULT_LIMIT: int = 1000  # page size when only a cursor is given
+    PAGE_MAX_LIMIT: int = 10000
+    NDJSON_CHUNK_ROWS: int = 1000  # rows converted and written per chunk of a stream
+    
+    # On-disk store of OHLCV history (/quotes/{symbol}/history); a temp directory by default
+    QUOTE_STORE_DIR: Optional[str] = None
+    # Technical indicators (/quotes/{symbol}/indicators and /quotes/indicators/batch)
+    INDICATOR_CACHE_MAX_ENTRIES: int = 1024  # computed series kept in process and extended with new bars
+    QUOTE_BATCH_MAX_SYMBOLS: int = 100
+    QUOTE_BATCH_CONCURRENCY: int = 8
+    # In-process screener (/screener) over a daily snapshot of listing metadata and ratios
+    SCREENER_SOURCE: str = "tcbs"  # source of the financial ratios
+    SCREENER_RATIO_PERIOD: str = "quarter"  # ratios of the latest quarter or year
+    SCREENER_CONCURRENCY: int = 16  # ratio fetches in flight while a snapshot is built
+    SCREENER_MAX_FAILED_RATIO: float = 0.2  # share of symbols whose ratios may fail before a build is discarded
+    SCREENER_RETRY_SECONDS: int = 300  # wait before refetching failed symbols or retrying a failed build
+    SCREENER_BUILD_WAIT_SECONDS: float = 10.0  # how long a request waits on the first build before a 503
+    # Price board WebSocket (/ws/price-board); one shared poller per symbol set
+    PRICE_BOARD_POLL_INTERVAL: float = 3.0  # seconds between two upstream polls of a board
+    PRICE_BOARD_MAX_SYMBOLS: int = 500
+    PRICE_BOARD_MAX_BOARDS: int = 50  # distinct symbol sets polled at once
+    PRICE_BOARD_SEND_TIMEOUT: float = 10.0  # a client that takes longer to accept one message is disconnected
     
     # Environment
     ENVIRONMENT: str = "development"
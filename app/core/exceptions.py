@@ -53,12 +53,26 @@ class DateRangeInvalidError(VNStockAPIException):
 class RateLimitExceededError(VNStockAPIException):
     """Exception raised when rate limit is exceeded."""
     
-    def __init__(self, limit: int, reset_time: str):
+    def __init__(self, limit: int, reset_time: str, retry_after: int = None, message: str = None):
+        headers = {"X-RateLimit-Limit": str(limit), "X-RateLimit-Reset": reset_time}
+        if retry_after is not None:
+            headers["Retry-After"] = str(retry_after)
         super().__init__(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Limit: {limit} requests per minute",
+            detail=message or f"Rate limit exceeded. Limit: {limit} requests per minute",
             error_code="RATE_LIMIT_EXCEEDED",
-            headers={"X-RateLimit-Reset": reset_time},
+            headers=headers,
+        )
+
+class ServiceOverloadedError(VNStockAPIException):
+    """Exception raised when the server is too busy to accept a request."""
+    
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is overloaded, please retry later",
+            error_code="SERVICE_OVERLOADED",
+            headers={"Retry-After": str(retry_after)},
         )
 
 class ExternalAPIError(VNStockAPIException):
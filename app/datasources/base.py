@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
+import asyncio
 import logging
+import pandas as pd
+from app.core.config import settings
+from app.datasources.formats import FORMAT_RECORDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -10,9 +14,73 @@ SOURCE_TCBS = "tcbs"
 SOURCE_VCI = "vci"
 SOURCE_UNIFIED = "unified"
 
+# Sections of the comprehensive company info, mapped to the method that fetches each one
+COMPANY_INFO_SECTIONS = {
+    "profile": "get_company_profile",
+    "listKeyOfficer": "get_company_officers",
+    "listShareHolder": "get_shareholders",
+    "listInsiderDealing": "get_insider_trading",
+    "listSubCompany": "get_subsidiaries",
+    "listEventNews": "get_company_events",
+    "listActivityNews": "get_company_news",
+    "listDividendPaymentHis": "get_dividends",
+}
+
+
+def section_error(code: str, message: str) -> Dict:
+    """Build the error marker returned in place of a section that could not be fetched"""
+    return {"error": {"code": code, "message": message}}
+
+
+def is_section_error(value: Any) -> bool:
+    """Check whether a section value is an error marker"""
+    return isinstance(value, dict) and set(value) == {"error"}
+
+
 class CompanyDataSource(ABC):
     """Abstract interface for company data sources"""
 
+    async def _gather_company_info(self, symbol: str, timeout: Optional[float] = None) -> Dict:
+        """Fetch all company info sections concurrently
+        
+        Each section runs under its own timeout. A section that fails or times out is
+        returned as an error marker (see ``section_error``) instead of failing the whole
+        aggregate; only when every section fails is the error raised.
+        
+        Args:
+            symbol: Stock ticker symbol
+            timeout: Per-section timeout in seconds (default: COMPANY_SECTION_TIMEOUT)
+            
+        Returns:
+            Company information keyed by section name
+        """
+        timeout = settings.COMPANY_SECTION_TIMEOUT if timeout is None else timeout
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(getattr(self, method)(symbol), timeout)
+                for method in COMPANY_INFO_SECTIONS.values()
+            ),
+            return_exceptions=True
+        )
+
+        info = {}
+        errors = []
+        for section, result in zip(COMPANY_INFO_SECTIONS, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"Section {section} for {symbol} timed out after {timeout}s")
+                info[section] = section_error("SECTION_TIMEOUT", f"Timed out after {timeout}s")
+                errors.append(result)
+            elif isinstance(result, Exception):
+                logger.warning(f"Section {section} for {symbol} failed: {result}")
+                info[section] = section_error("SECTION_FETCH_FAILED", str(result))
+                errors.append(result)
+            else:
+                info[section] = result
+
+        if len(errors) == len(results):
+            raise errors[0]
+        return info
+
     @abstractmethod
     async def get_company_info(self, symbol: str) -> Dict:
         """Get comprehensive company information"""
@@ -69,7 +137,9 @@ class FinancialDataSource(ABC):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> Dict:
         """Get balance sheet data"""
         pass
@@ -82,7 +152,9 @@ class FinancialDataSource(ABC):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> Dict:
         """Get income statement data"""
         pass
@@ -94,7 +166,9 @@ class FinancialDataSource(ABC):
         period: str = "year",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> Dict:
         """Get cash flow data"""
         pass
@@ -107,7 +181,9 @@ class FinancialDataSource(ABC):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> Dict:
         """Get financial ratios data"""
         pass
@@ -116,59 +192,75 @@ class ListingDataSource(ABC):
     """Abstract interface for listing data sources."""
 
     @abstractmethod
-    async def get_all_symbols(self, show_log: bool = False) -> Dict:
+    async def get_all_symbols(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get list of all available symbols."""
         pass
 
 
     @abstractmethod
     async def get_symbols_by_industries(self, 
-                                        show_log: bool = False) -> Dict:
+                                        show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by industry."""
         pass
 
     @abstractmethod
     async def get_symbols_by_exchange(self, 
-                                     show_log: bool = False) -> Dict:
+                                     show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by exchange."""
         pass
 
     @abstractmethod
     async def get_symbols_by_group(self, group: str = 'VN30', 
-                                  show_log: bool = False) -> Dict:
+                                  show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols in a specific group like VN30, HNX30, etc."""
         pass
 
     @abstractmethod
     async def get_industries_icb(self, 
-                                show_log: bool = False) -> Dict:
+                                show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get industry classification benchmark data."""
         pass
 
     @abstractmethod
     async def get_all_future_indices(self, 
-                                    show_log: bool = False) -> Dict:
+                                    show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all future indices."""
         pass
 
     @abstractmethod
     async def get_all_covered_warrant(self, 
-                                     show_log: bool = False) -> Dict:
+                                     show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all covered warrants."""
         pass
 
     @abstractmethod
     async def get_all_bonds(self, 
-                           show_log: bool = False) -> Dict:
+                           show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all bonds."""
         pass
 
     @abstractmethod
     async def get_all_government_bonds(self, 
-                                      show_log: bool = False) -> Dict:
+                                      show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all government bonds."""
         pass
 
+class QuoteDataSource(ABC):
+    """Abstract interface for quote (price history) data sources"""
+
+    @abstractmethod
+    async def get_history(self, symbol: str, start: str, end: str, interval: str = "1D") -> pd.DataFrame:
+        """Get OHLCV bars of [start, end] (YYYY-MM-DD, inclusive) with the columns time, open, high, low, close, volume"""
+        pass
+
+class TradingDataSource(ABC):
+    """Abstract interface for trading (price board) data sources"""
+
+    @abstractmethod
+    async def get_price_board(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the current price board of the symbols, one row per symbol with flat columns, "symbol" first"""
+        pass
+
 class DataSourceFactory:
     """Factory class for creating data source instances."""
 
@@ -1,9 +1,13 @@
 from typing import Dict, Type, Optional
-from app.datasources.base import CompanyDataSource, FinancialDataSource, SOURCE_TCBS, SOURCE_VCI, SOURCE_UNIFIED
+from app.datasources.base import CompanyDataSource, FinancialDataSource, QuoteDataSource, TradingDataSource, SOURCE_TCBS, SOURCE_VCI, SOURCE_UNIFIED
 from app.datasources.tcbs.company import TcbsCompanyDataSource
 from app.datasources.tcbs.financial import TCBSFinancialDataSource
+from app.datasources.tcbs.quote import TCBSQuoteDataSource
+from app.datasources.tcbs.trading import TCBSTradingDataSource
 from app.datasources.vci.company import VciCompanyDataSource
 from app.datasources.vci.financial import VCIFinancialDataSource
+from app.datasources.vci.quote import VCIQuoteDataSource
+from app.datasources.vci.trading import VCITradingDataSource
 import logging
 
 logger = logging.getLogger(__name__)
@@ -89,4 +93,24 @@ class DataSourceFactory:
         elif source == SOURCE_VCI:
             return VCIFinancialDataSource()
         else:
-            raise ValueError(f"Unsupported data source: {source}") 
\ No newline at end of file
+            raise ValueError(f"Unsupported data source: {source}")
+
+    @staticmethod
+    def create_quote_datasource(source: str = SOURCE_VCI) -> QuoteDataSource:
+        """Create a quote data source based on the specified source type"""
+        if source == SOURCE_TCBS:
+            return TCBSQuoteDataSource()
+        elif source == SOURCE_VCI:
+            return VCIQuoteDataSource()
+        else:
+            raise ValueError(f"Unsupported data source: {source}")
+
+    @staticmethod
+    def create_trading_datasource(source: str = SOURCE_VCI) -> TradingDataSource:
+        """Create a trading data source based on the specified source type"""
+        if source == SOURCE_TCBS:
+            return TCBSTradingDataSource()
+        elif source == SOURCE_VCI:
+            return VCITradingDataSource()
+        else:
+            raise ValueError(f"Unsupported data source: {source}")
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+import pandas as pd
+
+# Output formats for tabular data
+FORMAT_RECORDS = "records"
+FORMAT_COLUMNS = "columns"
+OUTPUT_FORMATS = (FORMAT_RECORDS, FORMAT_COLUMNS)
+OUTPUT_FORMAT_PATTERN = f"^({'|'.join(OUTPUT_FORMATS)})$"
+# Internal: return the DataFrame itself, for binary (Arrow/Parquet) responses
+FORMAT_DATAFRAME = "dataframe"
+
+
+def flatten_column_name(column: Any) -> str:
+    """Flatten a DataFrame column label (possibly a MultiIndex tuple) to a string"""
+    if isinstance(column, tuple):
+        return "_".join(str(part) for part in column if part != "")
+    return str(column)
+
+
+def project_columns(df: pd.DataFrame, fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Keep only the requested columns of a DataFrame, in the requested order
+
+    A field matches a column by its flattened name or, for multi-level headers,
+    by its last level. Fields that match no column are ignored, since the
+    providers do not all return the same columns.
+
+    Args:
+        df: DataFrame returned by vnstock
+        fields: Column names to keep; None or empty keeps every column
+
+    Returns:
+        The projected DataFrame
+    """
+    if not fields:
+        return df
+    positions: Dict[str, List[int]] = {}
+    for i, column in enumerate(df.columns):
+        positions.setdefault(flatten_column_name(column), []).append(i)
+        if isinstance(column, tuple) and column:
+            positions.setdefault(str(column[-1]), []).append(i)
+    keep = list(dict.fromkeys(i for field in fields for i in positions.get(field, ())))
+    return df.iloc[:, keep]
+
+
+def project_records(data: Any, fields: Optional[Sequence[str]] = None) -> Any:
+    """Keep only the requested keys of a record or a list of records
+
+    For data that is no longer a DataFrame, e.g. records merged from several
+    providers. Values other than mappings and lists of mappings are returned
+    unchanged.
+
+    Args:
+        data: A record or a list of records
+        fields: Keys to keep; None or empty keeps every key
+
+    Returns:
+        The projected record(s)
+    """
+    if not fields:
+        return data
+    if isinstance(data, Mapping):
+        return {field: data[field] for field in fields if field in data}
+    if isinstance(data, list):
+        return [project_records(record, fields) for record in data]
+    return data
+
+
+def dataframe_to_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """Convert a DataFrame to column arrays plus a schema
+
+    Column names are listed once instead of once per row, and no per-row dicts
+    are allocated.
+
+    Args:
+        df: DataFrame returned by vnstock
+
+    Returns:
+        Dictionary with ``totalCount``, ``schema`` (name and dtype of each column)
+        and ``columns`` (column name to list of values)
+    """
+    names = [flatten_column_name(column) for column in df.columns]
+    return {
+        "totalCount": len(df),
+        "schema": [{"name": name, "type": str(dtype)} for name, dtype in zip(names, df.dtypes)],
+        "columns": {name: df.iloc[:, i].tolist() for i, name in enumerate(names)},
+    }
+
+
+def convert_dataframe(
+    df: Any,
+    output_format: str = FORMAT_RECORDS,
+    fields: Optional[Sequence[str]] = None,
+) -> Union[List[Dict], Dict[str, Any], pd.DataFrame, Any]:
+    """Convert a DataFrame to the requested output format
+
+    The columns are projected first, so conversion only touches the requested
+    fields.
+
+    Args:
+        df: DataFrame returned by vnstock; other values are returned unchanged
+        output_format: "records" for a list of row dicts, "columns" for column arrays,
+            "dataframe" for the DataFrame itself
+        fields: Columns to keep (see project_columns); all columns by default
+
+    Returns:
+        A list of records, a columnar dictionary or the DataFrame
+    """
+    if not isinstance(df, pd.DataFrame):
+        return df
+    df = project_columns(df, fields)
+    if output_format == FORMAT_DATAFRAME:
+        return df
+    if output_format == FORMAT_COLUMNS:
+        return dataframe_to_columns(df)
+    if output_format != FORMAT_RECORDS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return df.to_dict(orient="records")
@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, Tuple
+import logging
+
+from app.datasources.base import (
+    CompanyDataSource,
+    DataSourceFactory as ListingDataSourceFactory,
+    FinancialDataSource,
+    ListingDataSource,
+    QuoteDataSource,
+    TradingDataSource,
+    SOURCE_TCBS,
+    SOURCE_VCI,
+)
+from app.datasources.factory import DataSourceFactory
+from app.infrastructure.client_pool import client_pool
+
+logger = logging.getLogger(__name__)
+
+
+class DataSourceRegistry:
+    """Long-lived datasource instances shared by all requests.
+
+    Exposes the same ``create_*_datasource`` methods as ``DataSourceFactory`` so
+    services can use it in place of the factory, but each (kind, source) is built
+    once and reused. Datasources are stateless apart from their pooled vnstock
+    clients (see ``ClientPool``), so sharing them across requests is safe.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._datasources: Dict[Tuple[str, str], Any] = {}
+
+    def _get(self, kind: str, source: str, create: Callable[[str], Any]) -> Any:
+        """Get the shared datasource for (kind, source), creating it on first use"""
+        key = (kind, source.lower())
+        datasource = self._datasources.get(key)
+        if datasource is None:
+            datasource = create(source)
+            self._datasources[key] = datasource
+        return datasource
+
+    def create_company_datasource(self, source: str) -> CompanyDataSource:
+        """Get the shared company data source
+
+        Args:
+            source: Data source identifier ("tcbs" or "vci")
+
+        Returns:
+            Company data source instance
+        """
+        return self._get("company", source, DataSourceFactory.create_company_datasource)
+
+    def create_financial_datasource(self, source: str) -> FinancialDataSource:
+        """Get the shared financial data source
+
+        Args:
+            source: Data source identifier ("tcbs" or "vci")
+
+        Returns:
+            Financial data source instance
+        """
+        return self._get("financial", source, DataSourceFactory.create_financial_datasource)
+
+    def create_listing_datasource(self, source: str = SOURCE_VCI) -> ListingDataSource:
+        """Get the shared listing data source
+
+        Args:
+            source: Data source identifier ("vci" or "tcbs")
+
+        Returns:
+            Listing data source instance
+        """
+        return self._get("listing", source, ListingDataSourceFactory.create_listing_datasource)
+
+    def create_quote_datasource(self, source: str = SOURCE_VCI) -> QuoteDataSource:
+        """Get the shared quote data source
+
+        Args:
+            source: Data source identifier ("vci" or "tcbs")
+
+        Returns:
+            Quote data source instance
+        """
+        return self._get("quote", source, DataSourceFactory.create_quote_datasource)
+
+    def create_trading_datasource(self, source: str = SOURCE_VCI) -> TradingDataSource:
+        """Get the shared trading data source
+
+        Args:
+            source: Data source identifier ("vci" or "tcbs")
+
+        Returns:
+            Trading data source instance
+        """
+        return self._get("trading", source, DataSourceFactory.create_trading_datasource)
+
+    def start(self) -> None:
+        """Build the datasources for all supported sources ahead of the first request"""
+        for create in (self.create_company_datasource, self.create_financial_datasource, self.create_quote_datasource, self.create_trading_datasource):
+            for source in (SOURCE_TCBS, SOURCE_VCI):
+                create(source)
+        try:
+            self.create_listing_datasource(SOURCE_VCI)
+        except Exception as e:
+            logger.warning(f"Could not create VCI listing datasource at startup: {e}")
+        logger.info(f"Datasource registry started with {len(self._datasources)} datasources")
+
+    def close(self) -> None:
+        """Drop all datasources and pooled vnstock clients"""
+        self._datasources.clear()
+        client_pool.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the registered datasources and client pool statistics"""
+        return {
+            "datasources": sorted(f"{kind}:{source}" for kind, source in self._datasources),
+            "client_pool": client_pool.stats(),
+        }
+
+
+# Created at import, started and closed by the application lifespan
+datasource_registry = DataSourceRegistry()
@@ -3,7 +3,9 @@
 from .company import TcbsCompanyDataSource
 from .financial import TCBSFinancialDataSource
 from app.datasources.tcbs.listing import TCBSListingDataSource
+from app.datasources.tcbs.quote import TCBSQuoteDataSource
+from app.datasources.tcbs.trading import TCBSTradingDataSource
 
-__all__ = ['TcbsCompanyDataSource', 'TCBSFinancialDataSource', 'TCBSListingDataSource']
+__all__ = ['TcbsCompanyDataSource', 'TCBSFinancialDataSource', 'TCBSListingDataSource', 'TCBSQuoteDataSource', 'TCBSTradingDataSource']
 
 # TCBS DataSource package 
\ No newline at end of file
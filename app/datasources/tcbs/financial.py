@@ -1,6 +1,9 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from vnstock.common.data.data_explorer import Finance
 from app.datasources.base import FinancialDataSource, SOURCE_TCBS
+from app.datasources.formats import FORMAT_RECORDS, convert_dataframe
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,11 @@ class TCBSFinancialDataSource(FinancialDataSource):
         """Initialize the TCBS financial data source"""
         self._last_api_logs = None
 
+    def _call_finance(self, symbol: str, method: str, **kwargs: Any) -> Any:
+        """Get a pooled vnstock Finance client and call one of its methods (blocking)"""
+        finance = client_pool.get("finance", symbol, self.SOURCE, lambda: Finance(symbol=symbol, source=self.SOURCE))
+        return getattr(finance, method)(**kwargs)
+
     async def get_balance_sheet(
         self,
         symbol: str,
@@ -22,19 +30,24 @@ class TCBSFinancialDataSource(FinancialDataSource):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get balance sheet data from TCBS API"""
         try:
-            finance = Finance(symbol=symbol, source=self.SOURCE)
-            result = finance.balance_sheet(
+            result = await run_coalesced(
+                self.SOURCE,
+                self._call_finance,
+                symbol,
+                'balance_sheet',
                 period=period,
                 lang=lang,
                 dropna=dropna,
                 to_df=to_df,
                 show_log=show_log
             )
-            return result.to_dict(orient='records')
+            return convert_dataframe(result, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting balance sheet for {symbol}: {str(e)}")
             raise
@@ -46,19 +59,24 @@ class TCBSFinancialDataSource(FinancialDataSource):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get income statement data from TCBS API"""
         try:
-            finance = Finance(symbol=symbol, source=self.SOURCE)
-            result = finance.income_statement(
+            result = await run_coalesced(
+                self.SOURCE,
+                self._call_finance,
+                symbol,
+                'income_statement',
                 period=period,
                 lang=lang,
                 dropna=dropna,
                 to_df=to_df,
                 show_log=show_log
             )
-            return result.to_dict(orient='records')
+            return convert_dataframe(result, output_format, fields)
             
         except Exception as e:
             logger.error(f"Error getting income statement for {symbol}: {str(e)}")
@@ -70,18 +88,23 @@ class TCBSFinancialDataSource(FinancialDataSource):
         period: str = "year",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get cash flow data from TCBS API"""
         try:
-            finance = Finance(symbol=symbol, source=self.SOURCE)
-            result = finance.cash_flow(
+            result = await run_coalesced(
+                self.SOURCE,
+                self._call_finance,
+                symbol,
+                'cash_flow',
                 period=period,
                 dropna=dropna,
                 to_df=to_df,
                 show_log=show_log
             )
-            return result.to_dict(orient='records')
+            return convert_dataframe(result, output_format, fields)
             
         except Exception as e:
             logger.error(f"Error getting cash flow for {symbol}: {str(e)}")
@@ -94,19 +117,24 @@ class TCBSFinancialDataSource(FinancialDataSource):
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get financial ratios data from TCBS API"""
         try:
-            finance = Finance(symbol=symbol, source=self.SOURCE)
-            result = finance.ratio(
+            result = await run_coalesced(
+                self.SOURCE,
+                self._call_finance,
+                symbol,
+                'ratio',
                 period=period,
                 lang=lang,
                 dropna=dropna,
                 to_df=to_df,
                 show_log=show_log
             )
-            return result.to_dict(orient='records')
+            return convert_dataframe(result, output_format, fields)
             
         except Exception as e:
             logger.error(f"Error getting ratios for {symbol}: {str(e)}")
@@ -1,8 +1,11 @@
 import logging
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from vnstock.common.data.data_explorer import Listing
 from app.datasources.base import ListingDataSource, SOURCE_TCBS
+from app.datasources.formats import FORMAT_RECORDS, convert_dataframe, project_columns
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -12,14 +15,26 @@ class TCBSListingDataSource(ListingDataSource):
 
     def __init__(self):
         """Initialize TCBS listing data source."""
-        self.listing = Listing(source=SOURCE_TCBS)
+        # Build the first client eagerly so that unsupported sources fail here
+        self.listing
 
-    def _convert_df_to_dict(self, df: pd.DataFrame) -> Dict:
+    @property
+    def listing(self) -> Listing:
+        """The pooled vnstock Listing client for TCBS"""
+        return client_pool.get("listing", None, SOURCE_TCBS, lambda: Listing(source=SOURCE_TCBS))
+
+    def _convert_df_to_dict(self, df: pd.DataFrame, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Convert DataFrame to dictionary format."""
         if not isinstance(df, pd.DataFrame):
             return df
-    
-        
+
+        # Project before converting, so only the requested columns are converted
+        df = project_columns(df, fields)
+
+        if output_format != FORMAT_RECORDS:
+            # Columnar and raw DataFrame output
+            return convert_dataframe(df, output_format)
+
         records = df.to_dict(orient='records')
         
         return {
@@ -27,42 +42,46 @@ class TCBSListingDataSource(ListingDataSource):
             'records': records
         }
 
-    async def get_all_symbols(self, show_log: bool = False) -> Dict:
+    async def get_all_symbols(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get list of all available symbols from TCBS API."""
         try:
-            df = self.listing.all_symbols(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.all_symbols, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting all symbols from TCBS: {str(e)}")
             raise
 
     async def search_symbols(self, query: str, exchange: Optional[str] = None, 
                             industry: Optional[str] = None, 
-                            show_log: bool = False) -> Dict:
+                            show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Search for symbols based on criteria from TCBS API."""
         try:
-            df = self.listing.search_symbols(
+            df = await run_coalesced(
+                SOURCE_TCBS,
+                self.listing.search_symbols,
                 query=query, 
                 exchange=exchange, 
                 industry=industry, 
                 to_df=True, 
                 show_log=show_log
             )
-            return self._convert_df_to_dict(df)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error searching symbols from TCBS: {str(e)}")
             raise
 
     async def get_symbol_details(self, symbol: str, 
-                                show_log: bool = False) -> Dict:
+                                show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get detailed information for a specific symbol from TCBS API."""
         try:
-            df = self.listing.symbol_details(
+            df = await run_coalesced(
+                SOURCE_TCBS,
+                self.listing.symbol_details,
                 symbol=symbol, 
                 to_df=True, 
                 show_log=show_log
             )
-            return self._convert_df_to_dict(df)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting symbol details from TCBS: {str(e)}")
             raise
@@ -71,11 +90,11 @@ class TCBSListingDataSource(ListingDataSource):
     # Implementation will forward to the vnstock library but may raise NotImplementedError
     
     async def get_symbols_by_industries(self, 
-                                        show_log: bool = False) -> Dict:
+                                        show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by industry from TCBS API."""
         try:
-            df = self.listing.symbols_by_industries(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.symbols_by_industries, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'symbols_by_industries' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -84,11 +103,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_symbols_by_exchange(self, 
-                                     show_log: bool = False) -> Dict:
+                                     show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by exchange from TCBS API."""
         try:
-            df = self.listing.symbols_by_exchange(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.symbols_by_exchange, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'symbols_by_exchange' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -97,11 +116,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_symbols_by_group(self, group: str = 'VN30', 
-                                  show_log: bool = False) -> Dict:
+                                  show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols in a specific group from TCBS API."""
         try:
-            df = self.listing.symbols_by_group(group=group, to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.symbols_by_group, group=group, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'symbols_by_group' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -110,11 +129,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_industries_icb(self, 
-                                show_log: bool = False) -> Dict:
+                                show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get industry classification benchmark data from TCBS API."""
         try:
-            df = self.listing.industries_icb(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.industries_icb, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'industries_icb' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -123,11 +142,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_all_future_indices(self, 
-                                    show_log: bool = False) -> Dict:
+                                    show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all future indices from TCBS API."""
         try:
-            df = self.listing.all_future_indices(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.all_future_indices, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'all_future_indices' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -136,11 +155,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_all_covered_warrant(self, 
-                                     show_log: bool = False) -> Dict:
+                                     show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all covered warrants from TCBS API."""
         try:
-            df = self.listing.all_covered_warrant(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.all_covered_warrant, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'all_covered_warrant' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -149,11 +168,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_all_bonds(self, 
-                           show_log: bool = False) -> Dict:
+                           show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all bonds from TCBS API."""
         try:
-            df = self.listing.all_bonds(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.all_bonds, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'all_bonds' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -162,11 +181,11 @@ class TCBSListingDataSource(ListingDataSource):
             raise
 
     async def get_all_government_bonds(self, 
-                                      show_log: bool = False) -> Dict:
+                                      show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all government bonds from TCBS API."""
         try:
-            df = self.listing.all_government_bonds(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_TCBS, self.listing.all_government_bonds, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except AttributeError:
             logger.error("Method 'all_government_bonds' not supported by TCBS")
             raise NotImplementedError("This method is not supported by TCBS data source")
@@ -0,0 +1,40 @@
+import logging
+from typing import Any, List
+import pandas as pd
+from vnstock.common.data.data_explorer import Trading
+from app.datasources.base import TradingDataSource, SOURCE_TCBS
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
+
+logger = logging.getLogger(__name__)
+
+# Symbol column of the TCBS price board
+_SYMBOL_COLUMN = 'Mã CP'
+
+
+class TCBSTradingDataSource(TradingDataSource):
+    """TCBS implementation of the TradingDataSource interface"""
+
+    SOURCE = SOURCE_TCBS
+
+    def _call_trading(self, method: str, symbols: tuple, **kwargs: Any) -> Any:
+        """Get the pooled vnstock Trading client and call one of its methods (blocking)"""
+        trading = client_pool.get("trading", None, self.SOURCE, lambda: Trading(source=self.SOURCE))
+        return getattr(trading, method)(list(symbols), **kwargs)
+
+    async def get_price_board(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the price board from TCBS API"""
+        try:
+            # A tuple, so identical concurrent polls share one upstream call
+            df = await run_coalesced(
+                self.SOURCE,
+                self._call_trading,
+                'price_board',
+                tuple(symbols),
+                std_columns=True
+            )
+            df = df.rename(columns={_SYMBOL_COLUMN: 'symbol'})
+            return df[['symbol'] + [column for column in df.columns if column != 'symbol']] if 'symbol' in df.columns else df
+        except Exception as e:
+            logger.error(f"Error getting price board for {len(symbols)} symbols: {str(e)}")
+            raise
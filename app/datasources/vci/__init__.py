@@ -2,7 +2,9 @@
 
 from app.datasources.vci.company import VciCompanyDataSource
 from app.datasources.vci.listing import VCIListingDataSource
+from app.datasources.vci.quote import VCIQuoteDataSource
+from app.datasources.vci.trading import VCITradingDataSource
 
-__all__ = ['VciCompanyDataSource', 'VCIListingDataSource']
+__all__ = ['VciCompanyDataSource', 'VCIListingDataSource', 'VCIQuoteDataSource', 'VCITradingDataSource']
 
 # VCI DataSource package 
\ No newline at end of file
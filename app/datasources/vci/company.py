@@ -1,7 +1,9 @@
-from typing import Dict, List
+from typing import Any, Dict, List
 import logging
 from vnstock.common.data.data_explorer import Company
 from app.datasources.base import CompanyDataSource, SOURCE_VCI
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
 
 logger = logging.getLogger(__name__)
 
@@ -10,31 +12,17 @@ class VciCompanyDataSource(CompanyDataSource):
     
     # Define the source as a class attribute
     SOURCE = SOURCE_VCI
+
+    def _call_company(self, symbol: str, method: str, **kwargs: Any) -> Any:
+        """Get a pooled vnstock Company client and call one of its methods (blocking)"""
+        company = client_pool.get("company", symbol, self.SOURCE, lambda: Company(symbol=symbol, source=self.SOURCE))
+        return getattr(company, method)(**kwargs)
     
     async def get_company_info(self, symbol: str) -> Dict:
         """Get comprehensive company information from VCI data source"""
         try:
-            # Gather all individual data points
-            profile = await self.get_company_profile(symbol)
-            officers = await self.get_company_officers(symbol)
-            shareholders = await self.get_shareholders(symbol)
-            insider_transactions = await self.get_insider_trading(symbol)
-            subsidiaries = await self.get_subsidiaries(symbol)
-            events = await self.get_company_events(symbol)
-            news = await self.get_company_news(symbol)
-            dividends = await self.get_dividends(symbol)
-            
-            # Combine into comprehensive info
-            return {
-                "profile": profile,
-                "listKeyOfficer": officers,
-                "listShareHolder": shareholders,
-                "listInsiderDealing": insider_transactions,
-                "listSubCompany": subsidiaries,
-                "listEventNews": events,
-                "listActivityNews": news,
-                "listDividendPaymentHis": dividends
-            }
+            # Fetch all sections concurrently; failed sections come back as error markers
+            return await self._gather_company_info(symbol)
         except Exception as e:
             logger.error(f"Error getting company info for {symbol} from VCI: {e}")
             raise
@@ -42,8 +30,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_company_profile(self, symbol: str) -> Dict:
         """Get company profile information from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            result = company.overview()
+            result = await run_coalesced(self.SOURCE, self._call_company, symbol, 'overview')
             company_overviews = result.to_dict(orient='records')
             return company_overviews[0]
         except Exception as e:
@@ -53,8 +40,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_company_officers(self, symbol: str) -> List[Dict]:
         """Get company officers information from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            company_officers = company.officers()
+            company_officers = await run_coalesced(self.SOURCE, self._call_company, symbol, 'officers')
             return company_officers.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting company officers for {symbol} from VCI: {e}")
@@ -63,8 +49,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_shareholders(self, symbol: str) -> List[Dict]:
         """Get major shareholders information from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            shareholders = company.shareholders()
+            shareholders = await run_coalesced(self.SOURCE, self._call_company, symbol, 'shareholders')
             return shareholders.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting shareholders for {symbol} from VCI: {e}")
@@ -73,8 +58,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_insider_trading(self, symbol: str) -> List[Dict]:
         """Get insider trading information from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            insider_trading = company.insider_transactions()
+            insider_trading = await run_coalesced(self.SOURCE, self._call_company, symbol, 'insider_transactions')
             return insider_trading.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting insider trading for {symbol} from VCI: {e}")
@@ -83,8 +67,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_subsidiaries(self, symbol: str) -> List[Dict]:
         """Get company subsidiaries information from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            subsidiaries = company.subsidiaries()
+            subsidiaries = await run_coalesced(self.SOURCE, self._call_company, symbol, 'subsidiaries')
             return subsidiaries.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting subsidiaries for {symbol} from VCI: {e}")
@@ -93,8 +76,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_company_events(self, symbol: str) -> List[Dict]:
         """Get company events from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            events = company.events()
+            events = await run_coalesced(self.SOURCE, self._call_company, symbol, 'events')
             return events.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting company events for {symbol} from VCI: {e}")
@@ -103,8 +85,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_company_news(self, symbol: str) -> List[Dict]:
         """Get company news from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            news = company.news()
+            news = await run_coalesced(self.SOURCE, self._call_company, symbol, 'news')
             return news.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting company news for {symbol} from VCI: {e}")
@@ -113,8 +94,7 @@ class VciCompanyDataSource(CompanyDataSource):
     async def get_dividends(self, symbol: str) -> List[Dict]:
         """Get dividend history from VCI data source"""
         try:
-            company = Company(symbol=symbol, source=self.SOURCE)
-            dividends = company.dividends()
+            dividends = await run_coalesced(self.SOURCE, self._call_company, symbol, 'dividends')
             return dividends.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error getting dividends for {symbol} from VCI: {e}")
@@ -1,8 +1,11 @@
 import logging
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from vnstock.common.data.data_explorer import Listing
 from app.datasources.base import ListingDataSource, SOURCE_VCI
+from app.datasources.formats import FORMAT_RECORDS, convert_dataframe, project_columns
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -12,13 +15,26 @@ class VCIListingDataSource(ListingDataSource):
 
     def __init__(self):
         """Initialize VCI listing data source."""
-        self.listing = Listing(source=SOURCE_VCI)
+        # Build the first client eagerly so that unsupported sources fail here
+        self.listing
 
-    def _convert_df_to_dict(self, df: pd.DataFrame) -> Dict:
+    @property
+    def listing(self) -> Listing:
+        """The pooled vnstock Listing client for VCI"""
+        return client_pool.get("listing", None, SOURCE_VCI, lambda: Listing(source=SOURCE_VCI))
+
+    def _convert_df_to_dict(self, df: pd.DataFrame, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Convert DataFrame to dictionary format."""
         if not isinstance(df, pd.DataFrame):
             return df
-        
+
+        # Project before converting, so only the requested columns are converted
+        df = project_columns(df, fields)
+
+        if output_format != FORMAT_RECORDS:
+            # Columnar and raw DataFrame output
+            return convert_dataframe(df, output_format)
+
         records = df.to_dict(orient='records')
         
         return {
@@ -26,11 +42,11 @@ class VCIListingDataSource(ListingDataSource):
             'records': records
         }
 
-    async def get_all_symbols(self, show_log: bool = False) -> Dict:
+    async def get_all_symbols(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get list of all available symbols from VCI API."""
         try:
-            df = self.listing.all_symbols(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.all_symbols, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting all symbols from VCI: {str(e)}")
             raise
@@ -38,74 +54,74 @@ class VCIListingDataSource(ListingDataSource):
     # Note: VCI does not support search_symbols and get_symbol_details
     # These methods are handled by the base class which raises NotImplementedError
 
-    async def get_symbols_by_industries(self, show_log: bool = False) -> Dict:
+    async def get_symbols_by_industries(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by industry from VCI API."""
         try:
-            df = self.listing.symbols_by_industries(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.symbols_by_industries, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting symbols by industries from VCI: {str(e)}")
             raise
 
-    async def get_symbols_by_exchange(self, show_log: bool = False) -> Dict:
+    async def get_symbols_by_exchange(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by exchange from VCI API."""
         try:
-            df = self.listing.symbols_by_exchange(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.symbols_by_exchange, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting symbols by exchange from VCI: {str(e)}")
             raise
 
-    async def get_symbols_by_group(self, group: str = 'VN30', show_log: bool = False) -> Dict:
+    async def get_symbols_by_group(self, group: str = 'VN30', show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols in a specific group from VCI API."""
         try:
-            df = self.listing.symbols_by_group(group=group, to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.symbols_by_group, group=group, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting symbols by group from VCI: {str(e)}")
             raise
 
-    async def get_industries_icb(self, show_log: bool = False) -> Dict:
+    async def get_industries_icb(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get industry classification benchmark data from VCI API."""
         try:
-            df = self.listing.industries_icb(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.industries_icb, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting industries ICB from VCI: {str(e)}")
             raise
 
-    async def get_all_future_indices(self, show_log: bool = False) -> Dict:
+    async def get_all_future_indices(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all future indices from VCI API."""
         try:
-            df = self.listing.all_future_indices(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.all_future_indices, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting future indices from VCI: {str(e)}")
             raise
 
-    async def get_all_covered_warrant(self, show_log: bool = False) -> Dict:
+    async def get_all_covered_warrant(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all covered warrants from VCI API."""
         try:
-            df = self.listing.all_covered_warrant(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.all_covered_warrant, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting covered warrants from VCI: {str(e)}")
             raise
 
-    async def get_all_bonds(self, show_log: bool = False) -> Dict:
+    async def get_all_bonds(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all bonds from VCI API."""
         try:
-            df = self.listing.all_bonds(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.all_bonds, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting bonds from VCI: {str(e)}")
             raise
 
-    async def get_all_government_bonds(self, show_log: bool = False) -> Dict:
+    async def get_all_government_bonds(self, show_log: bool = False, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all government bonds from VCI API."""
         try:
-            df = self.listing.all_government_bonds(to_df=True, show_log=show_log)
-            return self._convert_df_to_dict(df)
+            df = await run_coalesced(SOURCE_VCI, self.listing.all_government_bonds, to_df=True, show_log=show_log)
+            return self._convert_df_to_dict(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting government bonds from VCI: {str(e)}")
             raise 
\ No newline at end of file
@@ -0,0 +1,38 @@
+import logging
+from typing import Any
+import pandas as pd
+from vnstock.common.data.data_explorer import Quote
+from app.datasources.base import QuoteDataSource, SOURCE_VCI
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
+
+logger = logging.getLogger(__name__)
+
+
+class VCIQuoteDataSource(QuoteDataSource):
+    """VCI implementation of the QuoteDataSource interface"""
+
+    SOURCE = SOURCE_VCI
+
+    def _call_quote(self, symbol: str, method: str, **kwargs: Any) -> Any:
+        """Get a pooled vnstock Quote client and call one of its methods (blocking)"""
+        quote = client_pool.get("quote", symbol, self.SOURCE, lambda: Quote(symbol=symbol, source=self.SOURCE))
+        return getattr(quote, method)(**kwargs)
+
+    async def get_history(self, symbol: str, start: str, end: str, interval: str = "1D") -> pd.DataFrame:
+        """Get OHLCV bars from VCI API"""
+        try:
+            return await run_coalesced(
+                self.SOURCE,
+                self._call_quote,
+                symbol,
+                'history',
+                start=start,
+                end=end,
+                interval=interval,
+                to_df=True,
+                show_log=False
+            )
+        except Exception as e:
+            logger.error(f"Error getting price history for {symbol}: {str(e)}")
+            raise
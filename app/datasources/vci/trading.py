@@ -0,0 +1,42 @@
+import logging
+from typing import Any, List
+import pandas as pd
+from vnstock.common.data.data_explorer import Trading
+from app.datasources.base import TradingDataSource, SOURCE_VCI
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.singleflight import run_coalesced
+
+logger = logging.getLogger(__name__)
+
+
+class VCITradingDataSource(TradingDataSource):
+    """VCI implementation of the TradingDataSource interface"""
+
+    SOURCE = SOURCE_VCI
+
+    def _call_trading(self, method: str, symbols: tuple, **kwargs: Any) -> Any:
+        """Get the pooled vnstock Trading client and call one of its methods (blocking)"""
+        trading = client_pool.get("trading", None, self.SOURCE, lambda: Trading(source=self.SOURCE))
+        return getattr(trading, method)(list(symbols), **kwargs)
+
+    async def get_price_board(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the price board from VCI API
+
+        Columns keep their section as a prefix (listing_, bid_ask_, match_),
+        except the symbol.
+        """
+        try:
+            # A tuple, so identical concurrent polls share one upstream call
+            df = await run_coalesced(
+                self.SOURCE,
+                self._call_trading,
+                'price_board',
+                tuple(symbols),
+                flatten_columns=True,
+                separator='_'
+            )
+            df = df.rename(columns={'listing_symbol': 'symbol'})
+            return df[['symbol'] + [column for column in df.columns if column != 'symbol']] if 'symbol' in df.columns else df
+        except Exception as e:
+            logger.error(f"Error getting price board for {len(symbols)} symbols: {str(e)}")
+            raise
@@ -0,0 +1 @@
+"""Infrastructure components shared across services and datasources."""
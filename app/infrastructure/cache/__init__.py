@@ -0,0 +1,18 @@
+"""Tiered response cache: in-process LRU (L1) backed by an optional Redis (L2)."""
+
+from app.infrastructure.cache.decorators import Uncached, cache_key, cached
+from app.infrastructure.cache.memory import LRUCache
+from app.infrastructure.cache.redis import RedisCache
+from app.infrastructure.cache.tiered import TieredCache, close_cache, get_cache, set_cache
+
+__all__ = [
+    "LRUCache",
+    "RedisCache",
+    "TieredCache",
+    "Uncached",
+    "cache_key",
+    "cached",
+    "close_cache",
+    "get_cache",
+    "set_cache",
+]
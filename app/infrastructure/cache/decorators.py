@@ -0,0 +1,131 @@
+from typing import Any, Callable, Dict, Optional, Union
+import functools
+import hashlib
+import inspect
+import json
+import logging
+
+from app.infrastructure.cache.tiered import get_cache
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(
+    service: str,
+    method: str,
+    symbol: Optional[str] = None,
+    source: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build a cache key from (service, method, symbol, source, params)
+
+    Args:
+        service: Service name ("company", "financial", "listing")
+        method: Service method name
+        symbol: Stock symbol, normalized to upper case
+        source: Data source identifier, normalized to lower case
+        params: Remaining call arguments; hashed in a stable order
+
+    Returns:
+        A ``service:method:symbol:source:params-hash`` key
+    """
+    params_json = json.dumps(params or {}, sort_keys=True, default=str)
+    params_hash = hashlib.sha1(params_json.encode()).hexdigest()[:16]
+    return ":".join([
+        service,
+        method,
+        symbol.upper() if symbol else "-",
+        source.lower() if source else "-",
+        params_hash,
+    ])
+
+
+class Uncached:
+    """Result of a ``@cached`` method that is returned to the caller but not stored
+
+    For results that are usable but known to be partial, e.g. a unified
+    answer built while one provider was failing.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _unwrap(value: Any) -> Any:
+    return value.value if isinstance(value, Uncached) else value
+
+
+def cached(
+    service: str,
+    ttl: Union[float, Callable[[Dict[str, Any]], float]],
+    should_cache: Optional[Callable[[Any], bool]] = None,
+    hard_ttl: Optional[float] = None,
+) -> Callable:
+    """Cache the result of an async service method in the shared response cache
+
+    The ``symbol`` argument and the ``source`` argument (or the service's
+    ``source`` attribute) become part of the key; all other arguments are hashed
+    as params. None results are never cached, and neither are results the
+    method wraps in ``Uncached``.
+
+    With ``hard_ttl`` the entry is served stale-while-revalidate: ``ttl`` is the
+    soft TTL after which the cached copy is still returned immediately but a
+    background refresh is scheduled, and ``hard_ttl`` bounds how long a stale copy
+    may be served. Failed refreshes are retried with backoff (see ``Revalidator``).
+
+    Args:
+        service: Service name used in the key
+        ttl: Lifetime of cached results in seconds, or a callable computing it from the call params
+        should_cache: Optional predicate; results for which it returns False are not cached
+        hard_ttl: Maximum age of a served entry in seconds; enables stale-while-revalidate
+
+    Returns:
+        A decorator for async methods
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return _unwrap(await func(self, *args, **kwargs))
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("self", None)
+            symbol = params.pop("symbol", None)
+            source = params.pop("source", None) or getattr(self, "source", None)
+            key = cache_key(service, func.__name__, symbol, source, params)
+            soft_ttl = ttl(params) if callable(ttl) else ttl
+
+            async def fetch_and_store():
+                value = await func(self, *args, **kwargs)
+                if isinstance(value, Uncached):
+                    return value.value
+                if value is not None and (should_cache is None or should_cache(value)):
+                    if hard_ttl is None:
+                        await cache.set(key, value, soft_ttl)
+                    else:
+                        entry = {"value": value, "fresh_until": cache.now() + soft_ttl}
+                        await cache.set(key, entry, max(hard_ttl, soft_ttl))
+                return value
+
+            cached_value = await cache.get(key)
+            if hard_ttl is None:
+                if cached_value is not None:
+                    return cached_value
+                return await fetch_and_store()
+
+            if not isinstance(cached_value, dict) or "fresh_until" not in cached_value:
+                return await fetch_and_store()
+            if cached_value["fresh_until"] <= cache.now():
+                cache.revalidator.schedule(key, fetch_and_store)
+            return cached_value["value"]
+
+        return wrapper
+
+    return decorator
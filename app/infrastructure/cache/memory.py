@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import time
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with per-entry expiry.
+
+    Entries are evicted in least-recently-used order once ``max_entries`` is
+    reached, and expired entries are dropped lazily on access. The cache is meant
+    to be used from the event loop thread only.
+    """
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.time):
+        """Initialize the cache
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            clock: Time source returning seconds since the epoch
+        """
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired"""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Get a ``(value, expires_at)`` pair, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds"""
+        self.set_entry(key, value, self._clock() + ttl)
+
+    def set_entry(self, key: str, value: Any, expires_at: float) -> None:
+        """Store a value until the absolute time ``expires_at``"""
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get current size and capacity"""
+        return {"size": len(self._entries), "max_entries": self.max_entries}
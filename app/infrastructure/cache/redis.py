@@ -0,0 +1,147 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+import base64
+import json
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Key of the JSON object standing in for a DataFrame
+FRAME_KEY = "__arrow__"
+
+
+def encode_frame(df: pd.DataFrame) -> Dict[str, str]:
+    """Encode a DataFrame as base64 Arrow IPC, keeping dtypes, index and multi-level columns
+
+    Raises:
+        TypeError: If pyarrow is not installed or the frame has no Arrow representation
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise TypeError("DataFrames are only stored in Redis when pyarrow is installed")
+    try:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    except (pa.ArrowException, ValueError) as e:
+        raise TypeError(f"DataFrame is not stored in Redis: {e}")
+    return {FRAME_KEY: base64.b64encode(sink.getvalue().to_pybytes()).decode()}
+
+
+def _decode_object(value: Dict[str, Any]) -> Any:
+    """json object hook restoring DataFrames written by ``encode_frame``"""
+    if len(value) == 1 and FRAME_KEY in value:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ValueError("cached DataFrame needs pyarrow")
+        return pa.ipc.open_stream(base64.b64decode(value[FRAME_KEY])).read_all().to_pandas()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values produced by DataFrame.to_dict that json does not handle"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return encode_frame(value)
+    if isinstance(value, pd.Series):
+        raise TypeError("Series is not stored in Redis")
+    return str(value)
+
+
+def encode(value: Any, expires_at: float) -> str:
+    """Serialize a cache entry to JSON"""
+    return json.dumps({"value": value, "expires_at": expires_at}, default=_json_default)
+
+
+def decode(raw: Any) -> Tuple[Any, float]:
+    """Deserialize a cache entry written by ``encode``"""
+    entry = json.loads(raw, object_hook=_decode_object)
+    return entry["value"], entry["expires_at"]
+
+
+class RedisCache:
+    """Shared second-level cache backed by Redis.
+
+    Values are stored as JSON together with their absolute expiry time so that
+    the in-process cache can be refilled with the remaining lifetime. Redis
+    errors are logged and treated as cache misses; the cache never fails a
+    request.
+    """
+
+    def __init__(self, client: Any, prefix: str = "vnstock-api:"):
+        """Initialize the cache
+
+        Args:
+            client: An asyncio Redis client (``redis.asyncio.Redis`` or compatible)
+            prefix: Prefix applied to every key
+        """
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["RedisCache"]:
+        """Create a Redis cache from application settings, or None if Redis is not configured"""
+        if not settings.REDIS_HOST:
+            return None
+        client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD or None,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+        return cls(client)
+
+    async def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Get a ``(value, expires_at)`` pair, or None on a miss or error"""
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return decode(raw)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    async def set_entry(self, key: str, value: Any, expires_at: float, ttl: float) -> None:
+        """Store a value that expires from Redis after ``ttl`` seconds"""
+        try:
+            raw = encode(value, expires_at)
+        except TypeError as e:
+            logger.debug(f"Not caching {key} in Redis: {e}")
+            return
+        try:
+            await self.client.set(self.prefix + key, raw, ex=max(1, math.ceil(ttl)))
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    async def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis delete failed for {key}: {e}")
+
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        try:
+            await self.client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
@@ -0,0 +1,93 @@
+from typing import Awaitable, Callable, Dict, Set
+import asyncio
+import logging
+import time
+
+from app.infrastructure.scheduler import PRIORITY_BACKGROUND, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+
+class Revalidator:
+    """Runs background refreshes of stale cache entries.
+
+    At most one refresh per key runs at a time. When a refresh fails, further
+    refreshes of that key are suppressed for an exponentially growing backoff
+    period, so a failing upstream is not hammered by every request that is served
+    the stale copy.
+    """
+
+    def __init__(
+        self,
+        backoff: float = 60,
+        backoff_max: float = 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the revalidator
+
+        Args:
+            backoff: Delay before retrying a key after its first failed refresh (seconds)
+            backoff_max: Upper bound for the delay after repeated failures (seconds)
+            clock: Time source returning seconds since the epoch
+        """
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._counters = {"scheduled": 0, "succeeded": 0, "failed": 0}
+
+    def schedule(self, key: str, refresh: Callable[[], Awaitable[None]]) -> bool:
+        """Start a background refresh for ``key`` unless one is running or backing off
+
+        Args:
+            key: Cache key being refreshed
+            refresh: Zero-argument coroutine function that fetches and stores the new value
+
+        Returns:
+            True if a refresh was started
+        """
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            return False
+        if self._retry_at.get(key, 0) > self._clock():
+            return False
+
+        self._counters["scheduled"] += 1
+        self._tasks[key] = asyncio.get_running_loop().create_task(self._run(key, refresh))
+        return True
+
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[None]]) -> None:
+        """Run one refresh and record its outcome"""
+        try:
+            # Refreshes queue behind interactive requests for upstream rate limit tokens
+            with upstream_priority(PRIORITY_BACKGROUND):
+                await refresh()
+        except Exception as e:
+            failures = self._failures.get(key, 0) + 1
+            delay = min(self.backoff * 2 ** (failures - 1), self.backoff_max)
+            self._failures[key] = failures
+            self._retry_at[key] = self._clock() + delay
+            self._counters["failed"] += 1
+            logger.warning(f"Background refresh of {key} failed ({failures} in a row), retrying in {delay:.0f}s: {e}")
+        else:
+            self._failures.pop(key, None)
+            self._retry_at.pop(key, None)
+            self._counters["succeeded"] += 1
+        finally:
+            self._tasks.pop(key, None)
+
+    async def drain(self) -> None:
+        """Wait for all running refreshes to finish"""
+        tasks: Set[asyncio.Task] = set(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Get refresh counters"""
+        return {
+            **self._counters,
+            "in_progress": len(self._tasks),
+            "backing_off": sum(1 for retry_at in self._retry_at.values() if retry_at > self._clock()),
+        }
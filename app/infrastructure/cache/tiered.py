@@ -0,0 +1,128 @@
+from typing import Any, Callable, Dict, Optional
+import logging
+import time
+
+from app.core.config import settings
+from app.infrastructure.cache.memory import LRUCache
+from app.infrastructure.cache.redis import RedisCache
+from app.infrastructure.cache.swr import Revalidator
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache:
+    """Two-level cache: an in-process LRU (L1) in front of an optional Redis (L2).
+
+    Reads check L1 first, then L2; an L2 hit refills L1 with the entry's remaining
+    lifetime. Writes go to both levels.
+    """
+
+    def __init__(
+        self,
+        l1: LRUCache,
+        l2: Optional[RedisCache] = None,
+        clock: Callable[[], float] = time.time,
+        revalidator: Optional[Revalidator] = None,
+    ):
+        """Initialize the cache
+
+        Args:
+            l1: In-process cache
+            l2: Shared Redis cache, or None to run with L1 only
+            clock: Time source returning seconds since the epoch
+            revalidator: Background refresher for stale-while-revalidate entries
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self._clock = clock
+        self.revalidator = revalidator or Revalidator(clock=clock)
+        self._counters = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "TieredCache":
+        """Create a cache from the CACHE_* and REDIS_* settings"""
+        return cls(
+            l1=LRUCache(max_entries=settings.CACHE_L1_MAX_ENTRIES),
+            l2=RedisCache.from_settings(settings),
+            revalidator=Revalidator(
+                backoff=settings.CACHE_SWR_REFRESH_BACKOFF,
+                backoff_max=settings.CACHE_SWR_REFRESH_BACKOFF_MAX,
+            ),
+        )
+
+    def now(self) -> float:
+        """Current time according to the cache clock"""
+        return self._clock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value from L1 or L2, or None on a miss"""
+        entry = self.l1.get_entry(key)
+        if entry is not None:
+            self._counters["l1_hits"] += 1
+            return entry[0]
+
+        if self.l2 is not None:
+            entry = await self.l2.get_entry(key)
+            if entry is not None and entry[1] > self._clock():
+                value, expires_at = entry
+                self.l1.set_entry(key, value, expires_at)
+                self._counters["l2_hits"] += 1
+                return value
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value in both levels for ``ttl`` seconds"""
+        expires_at = self._clock() + ttl
+        self.l1.set_entry(key, value, expires_at)
+        if self.l2 is not None:
+            await self.l2.set_entry(key, value, expires_at, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Remove a value from both levels"""
+        self.l1.delete(key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
+
+    async def close(self) -> None:
+        """Release the L2 connection"""
+        if self.l2 is not None:
+            await self.l2.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters, L1 occupancy and background refresh counters"""
+        return {
+            **self._counters,
+            "l1": self.l1.stats(),
+            "l2_enabled": self.l2 is not None,
+            "revalidation": self.revalidator.stats(),
+        }
+
+
+_cache: Optional[TieredCache] = None
+
+
+def get_cache() -> Optional[TieredCache]:
+    """Get the shared response cache, or None if caching is disabled"""
+    global _cache
+    if not settings.CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = TieredCache.from_settings(settings)
+        logger.info(f"Response cache enabled (L2 {'redis' if _cache.l2 else 'disabled'})")
+    return _cache
+
+
+def set_cache(cache: Optional[TieredCache]) -> None:
+    """Replace the shared response cache (used by tests and at shutdown)"""
+    global _cache
+    _cache = cache
+
+
+async def close_cache() -> None:
+    """Close and drop the shared response cache"""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
@@ -0,0 +1,268 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple, TypeVar
+import asyncio
+import json
+import logging
+import time
+
+from starlette.exceptions import HTTPException
+
+from app.core.config import settings
+from app.infrastructure.scheduler import UpstreamThrottledError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, provider: str, operation: str, retry_in: float):
+        self.provider = provider
+        self.operation = operation
+        self.retry_in = retry_in
+        super().__init__(f"Circuit for {provider}:{operation} is open, retry in {retry_in:.0f}s")
+
+
+def is_client_error(error: BaseException) -> bool:
+    """Whether a failed call is the request's fault (bad argument, unknown symbol) rather than the provider's
+
+    Client errors say nothing about the provider's health, so breakers and
+    router stats record no outcome for them. Responses that cannot be decoded
+    are the provider's fault even though they surface as ValueError.
+    """
+    if isinstance(error, HTTPException):
+        return 400 <= error.status_code < 500
+    if isinstance(error, (json.JSONDecodeError, UnicodeError)):
+        return False
+    return isinstance(error, (ValueError, NotImplementedError))
+
+
+class CircuitBreaker:
+    """Error-rate and latency circuit breaker for one (provider, operation).
+
+    The outcomes of the last ``window_size`` calls are kept. A call is bad if it
+    raised or took longer than ``slow_call_seconds``. Once at least ``min_calls``
+    outcomes are known and the share of bad calls reaches ``failure_rate``, the
+    circuit opens and calls are rejected for ``open_seconds``. After that up to
+    ``half_open_probes`` calls are let through: a good probe closes the circuit,
+    a bad one opens it again for twice as long (up to ``open_seconds_max``).
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        open_seconds: float = 30,
+        open_seconds_max: float = 300,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit
+
+        Args:
+            name: Name used in log messages, e.g. "tcbs:get_balance_sheet"
+            window_size: Number of recent calls considered
+            min_calls: Calls needed in the window before the circuit can open
+            failure_rate: Share of bad calls (0-1) that opens the circuit
+            slow_call_seconds: Calls slower than this count as bad
+            open_seconds: How long the circuit stays open the first time
+            open_seconds_max: Upper bound for the open period after repeated failed probes
+            half_open_probes: Concurrent trial calls allowed while half-open
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.open_seconds_max = open_seconds_max
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self.state = STATE_CLOSED
+        self._window: Deque[Tuple[bool, float]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._open_for = open_seconds
+        self._probes = 0
+        self._counters = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; a granted half-open probe must be recorded"""
+        if self.state == STATE_OPEN:
+            if self._clock() - self._opened_at < self._open_for:
+                self._counters["rejected"] += 1
+                return False
+            self.state = STATE_HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit {self.name} half-open, probing")
+        if self.state == STATE_HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self._counters["rejected"] += 1
+                return False
+            self._probes += 1
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_for - self._clock())
+
+    def record(self, ok: bool, latency: float) -> None:
+        """Record the outcome of an allowed call
+
+        Args:
+            ok: Whether the call succeeded
+            latency: Call duration in seconds
+        """
+        slow = latency > self.slow_call_seconds
+        good = ok and not slow
+        self._counters["calls"] += 1
+        self._counters["failures"] += not ok
+        self._counters["slow"] += slow
+
+        if self.state == STATE_HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if good:
+                logger.info(f"Circuit {self.name} closed after a successful probe")
+                self.state = STATE_CLOSED
+                self._open_for = self.open_seconds
+                self._window.clear()
+            else:
+                self._open(min(self._open_for * 2, self.open_seconds_max))
+            return
+
+        self._window.append((good, latency))
+        if self.state == STATE_CLOSED and len(self._window) >= self.min_calls:
+            bad = sum(1 for g, _ in self._window if not g)
+            if bad / len(self._window) >= self.failure_rate:
+                self._open(self.open_seconds)
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that ended without an outcome (cancelled or shed)"""
+        if self.state == STATE_HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _open(self, duration: float) -> None:
+        """Open the circuit for ``duration`` seconds"""
+        self.state = STATE_OPEN
+        self._opened_at = self._clock()
+        self._open_for = duration
+        self._counters["opened"] += 1
+        self._window.clear()
+        logger.warning(f"Circuit {self.name} opened for {duration:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the state, recent error rate and latency, and lifetime counters"""
+        latencies = sorted(latency for _, latency in self._window)
+        bad = sum(1 for good, _ in self._window if not good)
+        return {
+            "state": self.state,
+            "retry_in": round(self.retry_in(), 1),
+            "window_calls": len(self._window),
+            "error_rate": round(bad / len(self._window), 3) if self._window else 0.0,
+            "latency_avg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "latency_max": round(latencies[-1], 3) if latencies else None,
+            **self._counters,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by (provider, operation), created on first use"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, **options: Any):
+        """Initialize an empty registry
+
+        Args:
+            clock: Monotonic time source passed to every breaker
+            **options: Keyword arguments for every CircuitBreaker
+        """
+        self._clock = clock
+        self._options = options
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "CircuitBreakerRegistry":
+        """Create a registry configured from application settings"""
+        return cls(
+            window_size=settings.CIRCUIT_WINDOW_SIZE,
+            min_calls=settings.CIRCUIT_MIN_CALLS,
+            failure_rate=settings.CIRCUIT_FAILURE_RATE,
+            slow_call_seconds=settings.CIRCUIT_SLOW_CALL_SECONDS,
+            open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            open_seconds_max=settings.CIRCUIT_OPEN_SECONDS_MAX,
+            half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+        )
+
+    def get(self, provider: str, operation: str) -> CircuitBreaker:
+        """Get the breaker for (provider, operation)"""
+        key = (provider, operation)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(name=f"{provider}:{operation}", clock=self._clock, **self._options)
+            self._breakers[key] = breaker
+        return breaker
+
+    def is_open(self, provider: str, operation: str) -> bool:
+        """Whether calls to (provider, operation) are currently being rejected"""
+        breaker = self._breakers.get((provider, operation))
+        return breaker is not None and breaker.state == STATE_OPEN and breaker.retry_in() > 0
+
+    async def call(self, provider: str, operation: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Call ``func`` through the (provider, operation) breaker
+
+        Args:
+            provider: Provider identifier
+            operation: Operation name, usually the datasource method
+            func: Zero-argument coroutine function making the call
+
+        Returns:
+            The result of ``func``
+
+        A call shed by the upstream scheduler never reached the provider, and
+        a client error (see ``is_client_error``) is not the provider's fault,
+        so neither counts as a success or a failure.
+
+        Raises:
+            CircuitOpenError: If the circuit is open; ``func`` is not called
+        """
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return await func()
+        breaker = self.get(provider, operation)
+        if not breaker.allow():
+            raise CircuitOpenError(provider, operation, breaker.retry_in())
+        start = self._clock()
+        try:
+            result = await func()
+        except (asyncio.CancelledError, UpstreamThrottledError):
+            breaker.release()
+            raise
+        except Exception as e:
+            if is_client_error(e):
+                breaker.release()
+            else:
+                breaker.record(False, self._clock() - start)
+            raise
+        breaker.record(True, self._clock() - start)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the stats of every breaker, keyed by "provider:operation" """
+        return {f"{provider}:{operation}": breaker.stats() for (provider, operation), breaker in sorted(self._breakers.items())}
+
+    def reset(self) -> None:
+        """Drop all breakers"""
+        self._breakers.clear()
+
+
+# Shared by all services
+circuit_breakers = CircuitBreakerRegistry.from_settings(settings)
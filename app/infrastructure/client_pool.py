@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PoolKey = Tuple[str, Optional[str], str]
+
+
+class ClientPool:
+    """Bounded pool of vnstock client objects keyed by (kind, symbol, source).
+
+    vnstock clients are cheap to reuse but not to build: constructing one loads the
+    provider module and, for some providers, fetches metadata over the network.
+    The pool keeps recently used clients and evicts the least recently used one
+    once ``max_size`` is reached.
+
+    The vnstock wrappers memoize their methods per instance with ``lru_cache``, so
+    a client kept forever would serve the same data forever. Clients are therefore
+    rebuilt once they are older than ``max_age`` seconds.
+
+    The pool is accessed from executor threads and is guarded by a lock. Clients
+    are built outside the lock; if two threads build the same key concurrently,
+    the first one stored wins.
+    """
+
+    def __init__(self, max_size: int = 256, max_age: float = 300, clock: Callable[[], float] = time.monotonic):
+        """Initialize the pool
+
+        Args:
+            max_size: Maximum number of clients kept
+            max_age: Maximum age of a client in seconds before it is rebuilt
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[PoolKey, Tuple[Any, float]]" = OrderedDict()
+        self._counters = {"hits": 0, "created": 0, "expired": 0, "evicted": 0}
+
+    def get(self, kind: str, symbol: Optional[str], source: str, factory: Callable[[], T]) -> T:
+        """Get a pooled client, building it with ``factory`` if needed
+
+        Args:
+            kind: Client kind ("company", "finance", "listing")
+            symbol: Stock symbol, or None for clients that are not per-symbol
+            source: Data source identifier
+            factory: Zero-argument callable that builds the client
+
+        Returns:
+            The pooled client
+        """
+        key = (kind, symbol.upper() if symbol else None, source.lower())
+        now = self._clock()
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                if now - entry[1] < self.max_age:
+                    self._clients.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[0]
+                del self._clients[key]
+                self._counters["expired"] += 1
+
+        client = factory()
+
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and now - entry[1] < self.max_age:
+                return entry[0]
+            self._clients[key] = (client, now)
+            self._clients.move_to_end(key)
+            self._counters["created"] += 1
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self._counters["evicted"] += 1
+        return client
+
+    def clear(self) -> None:
+        """Drop all pooled clients"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool size and hit/creation counters"""
+        with self._lock:
+            return {**self._counters, "size": len(self._clients), "max_size": self.max_size}
+
+
+# Shared by all datasources
+client_pool = ClientPool(
+    max_size=settings.VNSTOCK_CLIENT_POOL_SIZE,
+    max_age=settings.VNSTOCK_CLIENT_MAX_AGE,
+)
@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import logging
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorRegistry:
+    """Per-source thread pools for running blocking vnstock calls.
+
+    vnstock performs synchronous HTTP requests, so every call made from an
+    ``async def`` must be moved off the event loop. Each provider gets its own
+    bounded pool so that a slow upstream can only exhaust its own workers.
+    """
+
+    def __init__(self, max_workers: Optional[Dict[str, int]] = None, default_max_workers: int = 4):
+        """Initialize the registry
+
+        Args:
+            max_workers: Worker limit per source identifier
+            default_max_workers: Worker limit for sources without an explicit entry
+        """
+        self._max_workers = dict(max_workers or {})
+        self._default_max_workers = default_max_workers
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get_executor(self, source: str) -> ThreadPoolExecutor:
+        """Get (or lazily create) the thread pool for a source"""
+        source = source.lower()
+        executor = self._executors.get(source)
+        if executor is not None:
+            return executor
+
+        with self._lock:
+            executor = self._executors.get(source)
+            if executor is None:
+                workers = self._max_workers.get(source, self._default_max_workers)
+                executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix=f"vnstock-{source}",
+                )
+                self._executors[source] = executor
+                logger.info(f"Created executor for source '{source}' with {workers} workers")
+            return executor
+
+    async def run(self, source: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the source's thread pool
+
+        Args:
+            source: Data source identifier used to select the pool
+            func: Blocking callable to execute
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            The value returned by ``func``
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_executor(source), partial(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get worker limits and current queue depth per source"""
+        return {
+            source: {
+                "max_workers": executor._max_workers,
+                "queued": executor._work_queue.qsize(),
+            }
+            for source, executor in self._executors.items()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all thread pools"""
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for source, executor in executors.items():
+            logger.info(f"Shutting down executor for source '{source}'")
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Shared registry used by all datasources
+executor_registry = ExecutorRegistry(
+    # Keys match the SOURCE_* constants in app.datasources.base, which cannot be
+    # imported here without a circular import through the datasource package.
+    max_workers={
+        "tcbs": settings.EXECUTOR_TCBS_MAX_WORKERS,
+        "vci": settings.EXECUTOR_VCI_MAX_WORKERS,
+    },
+    default_max_workers=settings.EXECUTOR_DEFAULT_MAX_WORKERS,
+)
+
+
+async def run_blocking(source: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking vnstock call on the shared executor for ``source``"""
+    return await executor_registry.run(source, func, *args, **kwargs)
@@ -0,0 +1,121 @@
+from typing import Awaitable, Callable, Dict, Sequence, Tuple, TypeVar
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AllCallsFailedError(Exception):
+    """Raised by ``first_successful`` when every call failed"""
+
+    def __init__(self, errors: Dict[str, BaseException]):
+        self.errors = errors
+        details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        super().__init__(f"All calls failed ({details})")
+
+
+async def first_successful(
+    calls: Sequence[Tuple[str, Callable[[], Awaitable[T]]]],
+    budget: float,
+) -> Tuple[str, T]:
+    """Run calls concurrently and return the first good answer, honouring preference order
+
+    All calls start at once. Until ``budget`` seconds have passed, a call's answer
+    is only taken once every call listed before it has failed, so the preferred
+    call wins whenever it succeeds within the budget. After the budget the first
+    successful answer wins; answers that are already in are taken in preference
+    order. The remaining calls are cancelled.
+
+    Cancelling a call only cancels its awaiting coroutine. A vnstock call already
+    running in the executor finishes in the background and still feeds any
+    coalesced callers.
+
+    Args:
+        calls: ``(name, coroutine function)`` pairs, most preferred first
+        budget: Seconds to wait for a more preferred call before taking a less preferred answer
+
+    Returns:
+        ``(name, result)`` of the winning call
+
+    Raises:
+        AllCallsFailedError: If every call failed
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget
+    order = [(name, asyncio.ensure_future(func())) for name, func in calls]
+    pending = {task for _, task in order}
+    try:
+        while True:
+            expired = loop.time() >= deadline
+            for name, task in order:
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    return name, task.result()
+                if not task.done() and not expired:
+                    # A more preferred call may still answer within the budget
+                    break
+            if not pending:
+                raise AllCallsFailedError({
+                    name: task.exception() if not task.cancelled() else asyncio.CancelledError()
+                    for name, task in order
+                })
+            timeout = None if expired else deadline - loop.time()
+            _, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for name, task in order:
+            if not task.done():
+                logger.debug(f"Cancelling hedged call to {name}")
+                task.cancel()
+            elif not task.cancelled():
+                # Mark losing failures as retrieved
+                task.exception()
+
+
+async def hedged(
+    calls: Sequence[Tuple[str, Callable[[], Awaitable[T]]]],
+    delays: Sequence[float],
+) -> Tuple[str, T, int]:
+    """Start calls one after another and return the first good answer
+
+    The first call starts immediately. The next one starts when every running
+    call has failed, or when the most recently started call has not answered
+    within its delay. Running calls are not cancelled by a later start; the first
+    successful answer wins and the others are cancelled then.
+
+    Args:
+        calls: ``(name, coroutine function)`` pairs in the order they should be tried
+        delays: Seconds to wait for each call before starting the next one
+
+    Returns:
+        ``(name, result, calls started)`` of the winning call
+
+    Raises:
+        AllCallsFailedError: If every call failed
+    """
+    names: Dict[asyncio.Future, str] = {}
+    running = set()
+    errors: Dict[str, BaseException] = {}
+    try:
+        for index, (name, func) in enumerate(calls):
+            task = asyncio.ensure_future(func())
+            names[task] = name
+            running.add(task)
+            last = index == len(calls) - 1
+            while running:
+                done, running = await asyncio.wait(
+                    running, timeout=None if last else delays[index], return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The latest call is slow: start the next one
+                    break
+                for finished in done:
+                    if finished.exception() is None:
+                        return names[finished], finished.result(), len(names)
+                    errors[names[finished]] = finished.exception()
+        raise AllCallsFailedError(errors)
+    finally:
+        for task, name in names.items():
+            if not task.done():
+                logger.debug(f"Cancelling hedged call to {name}")
+                task.cancel()
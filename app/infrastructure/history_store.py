@@ -0,0 +1,236 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bar fields in the order of the rows of a partition; "time" is stored as epoch seconds
+BAR_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+DateRange = Tuple[date, date]
+
+# Ticker symbols the store accepts (case-insensitive); they become directory names
+SYMBOL_PATTERN = "^[A-Za-z0-9]{1,10}$"
+# Source and interval names, also used as directory names
+_SEGMENT = re.compile("^[A-Za-z0-9]+$")
+
+_DAY_SECONDS = 86400
+
+
+def _epoch_seconds(day: date) -> int:
+    return (day - date(1970, 1, 1)).days * _DAY_SECONDS
+
+
+def merge_ranges(ranges: Sequence[DateRange]) -> List[DateRange]:
+    """Merge overlapping and adjacent inclusive date ranges"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: Sequence[DateRange], start: date, end: date) -> List[DateRange]:
+    """The parts of [start, end] not in ``covered`` (merged, sorted ranges)"""
+    gaps: List[DateRange] = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def bars_to_array(df: pd.DataFrame) -> np.ndarray:
+    """Convert OHLCV bars returned by vnstock to a (6, n) float64 array sorted by time"""
+    if df is None or df.empty:
+        return np.empty((len(BAR_COLUMNS), 0))
+    times = pd.to_datetime(df["time"])
+    if times.dt.tz is not None:
+        times = times.dt.tz_localize(None)
+    rows = [times.to_numpy(dtype="datetime64[s]").astype(np.int64)]
+    rows += [pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64) for column in BAR_COLUMNS[1:]]
+    array = np.vstack(rows).astype(np.float64)
+    return array[:, np.argsort(array[0], kind="stable")]
+
+
+def array_to_bars(array: np.ndarray) -> pd.DataFrame:
+    """Convert a (6, n) partition slice back to an OHLCV DataFrame"""
+    df = pd.DataFrame({column: array[i] for i, column in enumerate(BAR_COLUMNS)})
+    df["time"] = pd.to_datetime(array[0].astype(np.int64), unit="s")
+    df["volume"] = array[5].astype(np.int64)
+    return df
+
+
+class HistoryStore:
+    """On-disk columnar store of OHLCV bars, partitioned by symbol and year.
+
+    Each partition ``<root>/<source>/<interval>/<SYMBOL>/<year>.npy`` is a
+    float64 array of shape (6, n): one row per field of BAR_COLUMNS, bars
+    sorted by time. Every field is contiguous on disk, so a window is read by
+    memory-mapping the partition, binary-searching the time row and copying
+    only the slice. Bars are unique per time; a bar written again replaces the
+    stored one.
+
+    ``coverage.json`` next to the partitions lists the date ranges that were
+    fetched from the provider. Coverage, not the bars, decides what has to be
+    fetched: a covered range without bars (holidays, before the listing) is
+    not asked for again.
+
+    Partitions and coverage are written to a temporary file and renamed into
+    place, so readers, which may be other processes, never see a partial
+    file. Writers in this process are serialized by a lock.
+    """
+
+    def __init__(self, root: str):
+        """Initialize the store
+
+        Args:
+            root: Directory the partitions are kept in; created on first write
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._counters = {"reads": 0, "writes": 0, "bars_written": 0}
+
+    @classmethod
+    def from_settings(cls, config: Any = settings) -> "HistoryStore":
+        """Build the store configured by QUOTE_STORE_DIR"""
+        return cls(config.QUOTE_STORE_DIR or os.path.join(tempfile.gettempdir(), "vnstock-api", "quotes"))
+
+    def _dir(self, source: str, interval: str, symbol: str) -> Path:
+        """Directory of a series
+
+        Raises:
+            ValueError: If a part is not a plain name, so no path can leave the root
+        """
+        if not re.match(SYMBOL_PATTERN, symbol) or not _SEGMENT.match(source) or not _SEGMENT.match(interval):
+            raise ValueError(f"Invalid history series {source}/{interval}/{symbol!r}")
+        return self.root / source.lower() / interval / symbol.upper()
+
+    def coverage(self, source: str, interval: str, symbol: str) -> List[DateRange]:
+        """Date ranges of a series already fetched from the provider, merged and sorted"""
+        path = self._dir(source, interval, symbol) / "coverage.json"
+        try:
+            ranges = json.loads(path.read_text())
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable history coverage {path}: {e}")
+            return []
+        return merge_ranges([(date.fromisoformat(start), date.fromisoformat(end)) for start, end in ranges])
+
+    def missing(self, source: str, interval: str, symbol: str, start: date, end: date) -> List[DateRange]:
+        """Date ranges within [start, end] that have not been fetched yet"""
+        return missing_ranges(self.coverage(source, interval, symbol), start, end)
+
+    @staticmethod
+    def _replace(path: Path, write) -> None:
+        """Write a file next to ``path`` and rename it into place"""
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def write(self, source: str, interval: str, symbol: str, bars: pd.DataFrame, covered: Optional[DateRange] = None) -> int:
+        """Merge fetched bars into the partitions of their years
+
+        Args:
+            source: Data source identifier
+            interval: Bar interval, e.g. "1D"
+            symbol: Stock ticker symbol
+            bars: Bars with the columns of BAR_COLUMNS
+            covered: Date range the bars were fetched for, recorded as complete;
+                None for a range that may still change (today's session)
+
+        Returns:
+            Number of bars written
+        """
+        array = bars_to_array(bars)
+        directory = self._dir(source, interval, symbol)
+        with self._lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            years = array[0].astype(np.int64).astype("datetime64[s]").astype("datetime64[Y]").astype(np.int64) + 1970
+            for year in np.unique(years):
+                path = directory / f"{year}.npy"
+                part = array[:, years == year]
+                if path.exists():
+                    part = np.concatenate([np.load(path), part], axis=1)
+                    part = part[:, np.argsort(part[0], kind="stable")]
+                    # Keep the last of equal times: the bar written now
+                    keep = np.append(part[0, 1:] != part[0, :-1], True)
+                    part = part[:, keep]
+                self._replace(path, lambda f: np.save(f, np.ascontiguousarray(part)))
+            if covered is not None:
+                ranges = merge_ranges(self.coverage(source, interval, symbol) + [covered])
+                payload = json.dumps([[start.isoformat(), end.isoformat()] for start, end in ranges]).encode()
+                self._replace(directory / "coverage.json", lambda f: f.write(payload))
+            self._counters["writes"] += 1
+            self._counters["bars_written"] += array.shape[1]
+        return array.shape[1]
+
+    def read(self, source: str, interval: str, symbol: str, start: date, end: date) -> pd.DataFrame:
+        """Read the stored bars of [start, end] (inclusive dates)
+
+        Returns:
+            Bars sorted by time with the columns of BAR_COLUMNS; empty if none are stored
+        """
+        directory = self._dir(source, interval, symbol)
+        lower, upper = _epoch_seconds(start), _epoch_seconds(end + timedelta(days=1))
+        slices = []
+        for year in range(start.year, end.year + 1):
+            path = directory / f"{year}.npy"
+            if not path.exists():
+                continue
+            part = np.load(path, mmap_mode="r")
+            lo, hi = np.searchsorted(part[0], [lower, upper], side="left")
+            slices.append(np.array(part[:, lo:hi]))
+        self._counters["reads"] += 1
+        array = np.concatenate(slices, axis=1) if slices else np.empty((len(BAR_COLUMNS), 0))
+        return array_to_bars(array)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the store location and read/write counters"""
+        return {"root": str(self.root), **self._counters}
+
+
+_store: Optional[HistoryStore] = None
+
+
+def get_history_store() -> HistoryStore:
+    """Get the shared quote history store, creating it on first use"""
+    global _store
+    if _store is None:
+        _store = HistoryStore.from_settings(settings)
+        logger.info(f"Quote history store at {_store.root}")
+    return _store
+
+
+def set_history_store(store: Optional[HistoryStore]) -> None:
+    """Replace the shared quote history store (used by tests)"""
+    global _store
+    _store = store
@@ -0,0 +1,267 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+import asyncio
+import logging
+import random
+import time
+
+from app.core.config import settings
+from app.infrastructure.circuit_breaker import CircuitOpenError, circuit_breakers, is_client_error
+from app.infrastructure.hedge import hedged
+from app.infrastructure.scheduler import UpstreamThrottledError
+from app.infrastructure.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted ``values``, or None when empty"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+    return values[index]
+
+
+class ProviderStats:
+    """Rolling latency and success rate of one (provider, operation).
+
+    Keeps the last ``window_size`` samples. A call cancelled before it finished
+    (the loser of a hedge) adds its elapsed time as a latency sample but does not
+    count towards the success rate, so a provider that keeps losing hedges still
+    looks slow.
+    """
+
+    def __init__(self, window_size: int = 100):
+        """Initialize empty stats
+
+        Args:
+            window_size: Number of recent samples kept
+        """
+        self._samples: Deque[Tuple[Optional[bool], float]] = deque(maxlen=window_size)
+
+    def record(self, ok: Optional[bool], latency: float) -> None:
+        """Record a sample; ``ok`` is None for a cancelled or shed call, or a client error"""
+        self._samples.append((ok, latency))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def latency(self, q: float) -> Optional[float]:
+        """Latency percentile (0-1) in seconds over the window"""
+        return _percentile(sorted(latency for _, latency in self._samples), q)
+
+    def success_rate(self) -> float:
+        """Share of finished calls that succeeded; 1.0 without samples"""
+        finished = [ok for ok, _ in self._samples if ok is not None]
+        return sum(finished) / len(finished) if finished else 1.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the sample count, p50/p95 latency and success rate"""
+        p50, p95 = self.latency(0.5), self.latency(0.95)
+        return {
+            "samples": len(self._samples),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "success_rate": round(self.success_rate(), 3),
+        }
+
+
+class ProviderRouter:
+    """Latency-aware choice between interchangeable providers.
+
+    For an operation that any of several providers can answer, ``ranked`` orders
+    the providers by expected latency (p50 divided by success rate). Until every
+    provider has ``min_samples`` samples, the provider with the fewest samples
+    goes first (ties keep the given preference order). Providers with an open
+    circuit go last. A small share of calls (``explore_rate``) puts another
+    provider first, so the stats of a provider that is not currently chosen do
+    not go stale.
+
+    ``call`` sends the request to the best provider only and starts the next one
+    when the current one fails or has not answered within its hedge delay (its
+    p95 latency), so usually one upstream call is made instead of one per
+    provider.
+
+    Calls given a ``key`` are shared by concurrent callers, so one upstream
+    failure is recorded once however many requests were waiting on it.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 100,
+        min_samples: int = 10,
+        hedge_delay: float = 1.0,
+        hedge_delay_min: float = 0.2,
+        explore_rate: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        """Initialize the router
+
+        Args:
+            window_size: Samples kept per (provider, operation)
+            min_samples: Samples needed before a provider's stats are trusted
+            hedge_delay: Hedge delay used while a provider has too few samples (seconds)
+            hedge_delay_min: Lower bound for the p95-based hedge delay (seconds)
+            explore_rate: Share of calls that try a provider other than the best one first
+            clock: Monotonic time source
+            rng: Random source for exploration
+        """
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.hedge_delay = hedge_delay
+        self.hedge_delay_min = hedge_delay_min
+        self.explore_rate = explore_rate
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._stats: Dict[Tuple[str, str], ProviderStats] = {}
+        self._counters = {"calls": 0, "hedged": 0, "explored": 0}
+        # Concurrent keyed calls to the same provider share one breaker call
+        self._flight = SingleFlight()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "ProviderRouter":
+        """Create a router configured from application settings"""
+        return cls(
+            window_size=settings.UNIFIED_ROUTER_WINDOW,
+            min_samples=settings.UNIFIED_ROUTER_MIN_SAMPLES,
+            hedge_delay=settings.UNIFIED_HEDGE_DELAY,
+            hedge_delay_min=settings.UNIFIED_HEDGE_DELAY_MIN,
+            explore_rate=settings.UNIFIED_ROUTER_EXPLORE_RATE,
+        )
+
+    def get(self, provider: str, operation: str) -> ProviderStats:
+        """Get the stats for (provider, operation), created on first use"""
+        key = (provider, operation)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = ProviderStats(self.window_size)
+            self._stats[key] = stats
+        return stats
+
+    def _score(self, provider: str, operation: str) -> Optional[float]:
+        """Expected latency of a provider, or None while it has too few samples"""
+        stats = self.get(provider, operation)
+        if len(stats) < self.min_samples:
+            return None
+        return stats.latency(0.5) / max(stats.success_rate(), 0.05)
+
+    def ranked(self, operation: str, providers: Sequence[str]) -> List[str]:
+        """Order providers from best to worst for ``operation``
+
+        Args:
+            operation: Operation name, usually the datasource method
+            providers: Candidate providers in preference order
+
+        Returns:
+            The providers, best first
+        """
+        scores = [self._score(provider, operation) for provider in providers]
+        # sorted() is stable, so ties keep the preference order
+        if any(score is None for score in scores):
+            # Cold start: the provider with the fewest samples goes first until all have enough
+            ranking = sorted(providers, key=lambda provider: len(self.get(provider, operation)))
+        else:
+            ranking = [provider for _, provider in sorted(zip(scores, providers), key=lambda item: item[0])]
+            if len(ranking) > 1 and self._rng.random() < self.explore_rate:
+                self._counters["explored"] += 1
+                ranking.insert(0, ranking.pop(self._rng.randrange(1, len(ranking))))
+        return sorted(ranking, key=lambda provider: circuit_breakers.is_open(provider, operation))
+
+    def hedge_delay_for(self, provider: str, operation: str) -> float:
+        """Seconds to wait for ``provider`` before starting the next provider"""
+        stats = self.get(provider, operation)
+        if len(stats) < self.min_samples:
+            return self.hedge_delay
+        return max(self.hedge_delay_min, stats.latency(0.95))
+
+    async def timed_call(
+        self,
+        provider: str,
+        operation: str,
+        func: Callable[[], Awaitable[T]],
+        key: Optional[Hashable] = None,
+    ) -> T:
+        """Run one provider call through its circuit breaker and record its latency
+
+        Args:
+            provider: Provider identifier
+            operation: Operation name, usually the datasource method
+            func: Zero-argument coroutine function making the call
+            key: Arguments of the call; concurrent calls with the same key share
+                one call, whose outcome is recorded once. A shared call runs to
+                the end even if its callers are cancelled
+
+        Returns:
+            The result of ``func``
+        """
+        if key is not None:
+            return await self._flight.do((provider, operation, key), lambda: self.timed_call(provider, operation, func))
+        start = self._clock()
+        try:
+            result = await circuit_breakers.call(provider, operation, func)
+        except CircuitOpenError:
+            raise
+        except (asyncio.CancelledError, UpstreamThrottledError):
+            # Shed locally: says nothing about the provider
+            self.get(provider, operation).record(None, self._clock() - start)
+            raise
+        except Exception as e:
+            self.get(provider, operation).record(None if is_client_error(e) else False, self._clock() - start)
+            raise
+        self.get(provider, operation).record(True, self._clock() - start)
+        return result
+
+    async def call(
+        self,
+        operation: str,
+        providers: Sequence[str],
+        make_call: Callable[[str], Callable[[], Awaitable[T]]],
+        key: Optional[Hashable] = None,
+    ) -> Tuple[str, T]:
+        """Call the best provider, hedging to the next one when it is slow or fails
+
+        Args:
+            operation: Operation name, usually the datasource method
+            providers: Candidate providers in preference order
+            make_call: Returns the zero-argument coroutine function calling a provider
+            key: Arguments of the call, for sharing it with concurrent callers (see ``timed_call``)
+
+        Returns:
+            ``(provider, result)`` of the first successful call
+
+        Raises:
+            AllCallsFailedError: If every provider failed
+        """
+        self._counters["calls"] += 1
+        ranking = self.ranked(operation, providers)
+        calls = [
+            (provider, lambda provider=provider: self.timed_call(provider, operation, make_call(provider), key))
+            for provider in ranking
+        ]
+        delays = [self.hedge_delay_for(provider, operation) for provider in ranking]
+        provider, result, launched = await hedged(calls, delays)
+        if launched > 1:
+            self._counters["hedged"] += 1
+        return provider, result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get router counters and per "provider:operation" latency stats"""
+        return {
+            **self._counters,
+            "providers": {
+                f"{provider}:{operation}": stats.stats()
+                for (provider, operation), stats in sorted(self._stats.items())
+            },
+        }
+
+    def reset(self) -> None:
+        """Drop all stats and counters"""
+        self._stats.clear()
+        self._counters = {"calls": 0, "hedged": 0, "explored": 0}
+
+
+# Shared by all services
+provider_router = ProviderRouter.from_settings(settings)
@@ -0,0 +1,235 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import math
+import time
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _window_estimate(previous: float, current: float, elapsed: float, window: float) -> float:
+    """Sliding-window count: all of the current window plus the overlapping share of the previous one"""
+    return previous * (1 - elapsed / window) + current
+
+
+def _retry_after(previous: float, current: float, elapsed: float, window: float, cost: float, limit: float) -> float:
+    """Seconds until a call of ``cost`` fits under ``limit``, assuming no other calls"""
+    if current + cost > limit:
+        # Does not fit before the next window, where the current count becomes the previous one
+        wait = window - elapsed
+        if current > max(0.0, limit - cost):
+            wait += window * (1 - max(0.0, limit - cost) / current)
+        return wait
+    if not previous:
+        return 0.0
+    # Solve previous * (1 - t / window) + current + cost <= limit for t
+    fits_at = window * (1 - (limit - current - cost) / previous)
+    return max(0.0, fits_at - elapsed)
+
+
+class SlidingWindowLimiter:
+    """In-process sliding-window rate limiter.
+
+    Uses the sliding window counter approximation: a count per fixed window,
+    with the previous window weighted by how much of it still overlaps the
+    sliding window. Memory is two counters per client, and each check is O(1).
+    Calls are weighted by ``cost``.
+    """
+
+    def __init__(self, window: float = 60, clock: Callable[[], float] = time.time):
+        """Initialize the limiter
+
+        Args:
+            window: Window length in seconds
+            clock: Time source returning seconds since the epoch
+        """
+        self.window = window
+        self._clock = clock
+        self._counts: Dict[str, Tuple[int, float, float]] = {}  # identity -> (window index, previous, current)
+
+    async def hit(self, identity: str, cost: float, limit: float) -> Tuple[bool, float, float]:
+        """Count a call of ``cost`` against ``identity`` if it fits under ``limit``
+
+        Args:
+            identity: Client identity, e.g. "ip:1.2.3.4"
+            cost: Weight of the call
+            limit: Allowed weight per window
+
+        Returns:
+            ``(allowed, remaining, retry_after)``; a rejected call is not counted
+        """
+        now = self._clock()
+        index, elapsed = divmod(now, self.window)
+        index = int(index)
+        last, previous, current = self._counts.get(identity, (index, 0.0, 0.0))
+        if last != index:
+            previous, current = (current if last == index - 1 else 0.0), 0.0
+        estimate = _window_estimate(previous, current, elapsed, self.window)
+        if estimate + cost > limit:
+            self._counts[identity] = (index, previous, current)
+            return False, max(0.0, limit - estimate), _retry_after(previous, current, elapsed, self.window, cost, limit)
+        self._counts[identity] = (index, previous, current + cost)
+        if len(self._counts) > settings.RATE_LIMIT_MAX_CLIENTS:
+            self._evict(index)
+        return True, max(0.0, limit - estimate - cost), 0.0
+
+    def _evict(self, index: int) -> None:
+        """Drop clients that have not been seen in the current or previous window"""
+        self._counts = {identity: entry for identity, entry in self._counts.items() if entry[0] >= index - 1}
+
+    async def close(self) -> None:
+        """Nothing to release"""
+
+
+class RedisSlidingWindowLimiter:
+    """Sliding-window rate limiter shared by all workers through Redis.
+
+    Same approximation as ``SlidingWindowLimiter``, with one Redis counter per
+    client and window. The call is counted first and taken back if it went over
+    the limit, so concurrent workers never both slip under it. Redis errors are
+    logged and the call is allowed: the limiter never fails a request.
+    """
+
+    def __init__(self, client: Any, window: float = 60, prefix: str = "vnstock-api:rl:", clock: Callable[[], float] = time.time):
+        """Initialize the limiter
+
+        Args:
+            client: An asyncio Redis client (``redis.asyncio.Redis`` or compatible)
+            window: Window length in seconds
+            prefix: Prefix applied to every key
+            clock: Time source returning seconds since the epoch
+        """
+        self.client = client
+        self.window = window
+        self.prefix = prefix
+        self._clock = clock
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "RedisSlidingWindowLimiter":
+        """Create a Redis-backed limiter from application settings"""
+        client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD or None,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+        return cls(client)
+
+    async def hit(self, identity: str, cost: float, limit: float) -> Tuple[bool, float, float]:
+        """Count a call of ``cost`` against ``identity`` if it fits under ``limit`` (see SlidingWindowLimiter.hit)"""
+        now = self._clock()
+        index, elapsed = divmod(now, self.window)
+        index = int(index)
+        current_key = f"{self.prefix}{identity}:{index}"
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.incrby(current_key, math.ceil(cost))
+                pipe.expire(current_key, math.ceil(self.window * 2))
+                pipe.get(f"{self.prefix}{identity}:{index - 1}")
+                current, _, previous = await pipe.execute()
+            current, previous = float(current), float(previous or 0)
+            estimate = _window_estimate(previous, current, elapsed, self.window)
+            if estimate > limit:
+                await self.client.decrby(current_key, math.ceil(cost))
+                current -= cost
+                return False, max(0.0, limit - estimate + cost), _retry_after(previous, current, elapsed, self.window, cost, limit)
+            return True, max(0.0, limit - estimate), 0.0
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed for {identity}, allowing the request: {e}")
+            return True, limit, 0.0
+
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        try:
+            await self.client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
+
+
+class ConcurrencyLimiter:
+    """Counts requests in flight, in total and per client, for admission control"""
+
+    def __init__(self, max_in_flight: int, max_per_client: int):
+        """Initialize the limiter
+
+        Args:
+            max_in_flight: Requests allowed in flight in this process
+            max_per_client: Requests allowed in flight per client identity
+        """
+        self.max_in_flight = max_in_flight
+        self.max_per_client = max_per_client
+        self.in_flight = 0
+        self._per_client: Dict[str, int] = {}
+        self._counters = {"admitted": 0, "rejected_overload": 0, "rejected_client": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "ConcurrencyLimiter":
+        """Create a limiter configured from application settings"""
+        return cls(settings.ADMISSION_MAX_IN_FLIGHT, settings.ADMISSION_MAX_IN_FLIGHT_PER_CLIENT)
+
+    def try_acquire(self, identity: str) -> Optional[str]:
+        """Admit a request, or say why not
+
+        Returns:
+            None if admitted (call ``release`` when done), "overload" if the
+            process is full, "client" if the client has too many requests in flight
+        """
+        if self.in_flight >= self.max_in_flight:
+            self._counters["rejected_overload"] += 1
+            return "overload"
+        if self._per_client.get(identity, 0) >= self.max_per_client:
+            self._counters["rejected_client"] += 1
+            return "client"
+        self.in_flight += 1
+        self._per_client[identity] = self._per_client.get(identity, 0) + 1
+        self._counters["admitted"] += 1
+        return None
+
+    def release(self, identity: str) -> None:
+        """Finish an admitted request"""
+        self.in_flight -= 1
+        remaining = self._per_client.get(identity, 1) - 1
+        if remaining > 0:
+            self._per_client[identity] = remaining
+        else:
+            self._per_client.pop(identity, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the requests in flight and admission counters"""
+        return {"in_flight": self.in_flight, "clients": len(self._per_client), **self._counters}
+
+
+# Shared by the rate limit middleware
+admission_control = ConcurrencyLimiter.from_settings(settings)
+
+_limiter: Optional[Any] = None
+
+
+def get_rate_limiter() -> Any:
+    """Get the shared rate limiter, in-process or Redis depending on RATE_LIMIT_BACKEND"""
+    global _limiter
+    if _limiter is None:
+        if settings.RATE_LIMIT_BACKEND == "redis" and settings.REDIS_HOST:
+            _limiter = RedisSlidingWindowLimiter.from_settings(settings)
+        else:
+            _limiter = SlidingWindowLimiter()
+        logger.info(f"Rate limiter backend: {type(_limiter).__name__}")
+    return _limiter
+
+
+def set_rate_limiter(limiter: Optional[Any]) -> None:
+    """Replace the shared rate limiter (used by tests and at shutdown)"""
+    global _limiter
+    _limiter = limiter
+
+
+async def close_rate_limiter() -> None:
+    """Close and drop the shared rate limiter"""
+    global _limiter
+    if _limiter is not None:
+        await _limiter.close()
+        _limiter = None
@@ -0,0 +1,382 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Priority classes for upstream calls; lower is served first
+PRIORITY_INTERACTIVE = 0  # API requests a client is waiting for
+PRIORITY_BACKGROUND = 1  # stale-while-revalidate refreshes
+PRIORITY_BATCH = 2  # bulk jobs such as POST /financial/batch
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+    PRIORITY_BATCH: "batch",
+}
+
+_priority: ContextVar[int] = ContextVar("upstream_priority", default=PRIORITY_INTERACTIVE)
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+class UpstreamThrottledError(Exception):
+    """Raised instead of queueing an upstream call that could not start before its deadline"""
+
+    def __init__(self, provider: str, wait: float):
+        self.provider = provider
+        self.wait = wait
+        super().__init__(f"Upstream {provider} is rate limited, expected wait {wait:.1f}s exceeds the deadline")
+
+
+@contextmanager
+def upstream_priority(priority: int, timeout: Optional[float] = None) -> Iterator[None]:
+    """Make the upstream calls started in this context use a priority class and queue deadline
+
+    Tasks created inside the context inherit it. A call coalesced into one
+    that is still queued lends it its priority but keeps its own deadline
+    (see ``UpstreamScheduler.join``).
+
+    Args:
+        priority: One of the PRIORITY_* classes
+        timeout: Longest time (seconds) a call may wait for a token; defaults to the class's setting
+    """
+    if timeout is None:
+        timeout = UpstreamScheduler.default_timeout(priority)
+    priority_token = _priority.set(priority)
+    deadline_token = _deadline.set(time.monotonic() + timeout)
+    try:
+        yield
+    finally:
+        _deadline.reset(deadline_token)
+        _priority.reset(priority_token)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst`` tokens"""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        """Tokens available now"""
+        self._refill()
+        return self.tokens
+
+    def try_take(self) -> bool:
+        """Take a token if one is available"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def give_back(self) -> None:
+        """Return a token taken for a call that was not made"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def time_until(self, tokens: float) -> float:
+        """Seconds until ``tokens`` tokens are available, assuming none are taken meanwhile"""
+        return max(0.0, (tokens - self.available()) / self.rate)
+
+
+class ProviderScheduler:
+    """Token-bucket admission of upstream calls to one provider, by priority.
+
+    A call takes a token and starts immediately when nobody is waiting. Otherwise
+    it joins a queue ordered by priority class, then arrival. Each time a token
+    becomes available it goes to the first waiter. Waiters whose expected start
+    time (from their queue position and the refill rate) is past their deadline
+    are shed with ``UpstreamThrottledError``, both on arrival and when
+    higher-priority calls overtake them. Queued calls started with a key can
+    be joined by identical calls (see ``join``).
+    """
+
+    def __init__(self, name: str, rate_per_min: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize the scheduler
+
+        Args:
+            name: Provider name used in errors and logs
+            rate_per_min: Sustained calls per minute
+            burst: Calls that may start back to back after an idle period
+            clock: Monotonic time source; deadlines use the same clock
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate_per_min / 60.0, burst, clock)
+        self._clock = clock
+        self._waiters: List[List[Any]] = []  # heap of [priority, seq, deadline, future]
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queued: Dict[Hashable, List[Any]] = {}  # waiters of keyed calls
+        self._counters = {"immediate": 0, "queued": 0, "shed": 0, "promoted": 0}
+        self._waited = {name: 0.0 for name in PRIORITY_NAMES.values()}
+
+    def _expected_wait(self, ahead: int) -> float:
+        """Seconds until a waiter with ``ahead`` waiters in front of it gets a token"""
+        return self.bucket.time_until(ahead + 1)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drop waiters left behind by a different (closed) event loop"""
+        if self._loop is not loop:
+            self._waiters.clear()
+            self._queued.clear()
+            self._timer = None
+            self._loop = loop
+
+    async def acquire(
+        self, priority: int = PRIORITY_INTERACTIVE, deadline: Optional[float] = None, key: Optional[Hashable] = None
+    ) -> None:
+        """Wait for a token
+
+        Args:
+            priority: PRIORITY_* class of the call
+            deadline: Latest start time on the scheduler's clock; None waits indefinitely
+            key: Identity of the call, so that identical calls can ``join`` it while it waits
+
+        Raises:
+            UpstreamThrottledError: If the call could not start before ``deadline``
+        """
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        if not self._waiters and self.bucket.try_take():
+            self._counters["immediate"] += 1
+            return
+
+        ahead = sum(1 for waiter in self._waiters if waiter[0] <= priority and not waiter[3].done())
+        wait = self._expected_wait(ahead)
+        if deadline is not None and self._clock() + wait > deadline:
+            self._counters["shed"] += 1
+            raise UpstreamThrottledError(self.name, wait)
+
+        self._counters["queued"] += 1
+        start = self._clock()
+        future = loop.create_future()
+        waiter = [priority, next(self._seq), deadline, future]
+        heapq.heappush(self._waiters, waiter)
+        if key is not None:
+            self._queued[key] = waiter
+        self._schedule_pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller went away
+                self.bucket.give_back()
+            self._schedule_pump()
+            raise
+        finally:
+            if key is not None and self._queued.get(key) is waiter:
+                del self._queued[key]
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            self._waited[name] = self._waited.get(name, 0.0) + self._clock() - start
+
+    async def join(self, key: Hashable, priority: int = PRIORITY_INTERACTIVE, deadline: Optional[float] = None) -> None:
+        """Wait until the queued call ``key`` gets its token, moving it up to ``priority``
+
+        The queued call keeps its own deadline; only the joining caller gives
+        up at ``deadline``. Returns at once when no such call is queued.
+
+        Args:
+            key: Identity of the queued call, as passed to ``acquire``
+            priority: PRIORITY_* class of the joining caller
+            deadline: Latest start time acceptable to the joining caller
+
+        Raises:
+            UpstreamThrottledError: If the call will not, or did not, start before ``deadline``
+        """
+        self._bind(asyncio.get_running_loop())
+        waiter = self._queued.get(key)
+        if waiter is None or waiter[3].done():
+            return
+        if priority < waiter[0]:
+            waiter[0] = priority
+            heapq.heapify(self._waiters)
+            self._counters["promoted"] += 1
+        ahead = sum(1 for other in self._waiters if other[:2] < waiter[:2] and not other[3].done())
+        wait = self._expected_wait(ahead)
+        now = self._clock()
+        if deadline is not None and now + wait > deadline:
+            self._counters["shed"] += 1
+            raise UpstreamThrottledError(self.name, wait)
+        done, _ = await asyncio.wait({waiter[3]}, timeout=None if deadline is None else deadline - now)
+        if not done:
+            self._counters["shed"] += 1
+            raise UpstreamThrottledError(self.name, self._clock() - now)
+
+    def _schedule_pump(self) -> None:
+        """Arrange for ``_pump`` to run when the next token is available"""
+        if self._timer is not None or not self._waiters or self._loop is None:
+            return
+        self._timer = self._loop.call_later(self.bucket.time_until(1), self._pump)
+
+    def _pump(self) -> None:
+        """Hand out available tokens in queue order and shed waiters that would miss their deadline"""
+        self._timer = None
+        # Cancelled waiters are dropped without using a token
+        while self._waiters and (self._waiters[0][3].done() or self.bucket.try_take()):
+            _, _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+        if self._waiters:
+            now = self._clock()
+            ahead = 0
+            for waiter in sorted(self._waiters):
+                _, _, deadline, future = waiter
+                if future.done():
+                    continue
+                wait = self._expected_wait(ahead)
+                if deadline is not None and now + wait > deadline:
+                    self._counters["shed"] += 1
+                    future.set_exception(UpstreamThrottledError(self.name, wait))
+                else:
+                    ahead += 1
+            self._waiters = [waiter for waiter in self._waiters if not waiter[3].done()]
+            heapq.heapify(self._waiters)
+        self._schedule_pump()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the rate, tokens available, queue length and counters"""
+        return {
+            "rate_per_min": round(self.bucket.rate * 60, 3),
+            "burst": self.bucket.burst,
+            "tokens": round(self.bucket.available(), 3),
+            "waiting": sum(1 for waiter in self._waiters if not waiter[3].done()),
+            **self._counters,
+            "waited_seconds": {name: round(seconds, 3) for name, seconds in self._waited.items()},
+        }
+
+
+class UpstreamScheduler:
+    """Provider schedulers keyed by provider, created on first use"""
+
+    def __init__(
+        self,
+        rates_per_min: Optional[Dict[str, float]] = None,
+        default_rate_per_min: float = 300,
+        burst: float = 10,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the registry
+
+        Args:
+            rates_per_min: Sustained calls per minute per provider
+            default_rate_per_min: Rate for providers without an explicit entry
+            burst: Bucket size of every provider
+            enabled: Whether calls are rate limited at all
+            clock: Monotonic time source
+        """
+        self._rates = dict(rates_per_min or {})
+        self._default_rate = default_rate_per_min
+        self._burst = burst
+        self.enabled = enabled
+        self._clock = clock
+        self._schedulers: Dict[str, ProviderScheduler] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "UpstreamScheduler":
+        """Create a registry configured from application settings"""
+        return cls(
+            # Keys match the SOURCE_* constants in app.datasources.base (see executor.py)
+            rates_per_min={
+                "tcbs": settings.UPSTREAM_TCBS_RATE_PER_MIN,
+                "vci": settings.UPSTREAM_VCI_RATE_PER_MIN,
+            },
+            default_rate_per_min=settings.UPSTREAM_DEFAULT_RATE_PER_MIN,
+            burst=settings.UPSTREAM_BURST,
+            enabled=settings.UPSTREAM_RATE_LIMIT_ENABLED,
+        )
+
+    @staticmethod
+    def default_timeout(priority: int) -> float:
+        """Queue timeout (seconds) of a priority class from the settings"""
+        if priority == PRIORITY_INTERACTIVE:
+            return settings.UPSTREAM_QUEUE_TIMEOUT
+        if priority == PRIORITY_BACKGROUND:
+            return settings.UPSTREAM_BACKGROUND_QUEUE_TIMEOUT
+        return settings.UPSTREAM_BATCH_QUEUE_TIMEOUT
+
+    def get(self, provider: str) -> ProviderScheduler:
+        """Get the scheduler for a provider"""
+        provider = provider.lower()
+        scheduler = self._schedulers.get(provider)
+        if scheduler is None:
+            rate = self._rates.get(provider, self._default_rate)
+            scheduler = ProviderScheduler(provider, rate, self._burst, self._clock)
+            self._schedulers[provider] = scheduler
+        return scheduler
+
+    def _admission(self) -> Tuple[int, float]:
+        """Priority and deadline of the current context"""
+        priority = _priority.get()
+        deadline = _deadline.get()
+        if deadline is None:
+            deadline = self._clock() + self.default_timeout(priority)
+        return priority, deadline
+
+    async def run(self, provider: str, func: Callable[[], Awaitable[T]], key: Optional[Hashable] = None) -> T:
+        """Wait for a token of ``provider`` under the current priority and deadline, then call ``func``
+
+        Without ``upstream_priority`` in effect, calls are interactive with the
+        default interactive queue timeout.
+
+        Args:
+            provider: Provider identifier
+            func: Zero-argument coroutine function making the upstream call
+            key: Identity of the call, for callers that ``join`` it while it is queued
+
+        Returns:
+            The result of ``func``
+
+        Raises:
+            UpstreamThrottledError: If the call could not start before its deadline
+        """
+        if self.enabled:
+            await self.get(provider).acquire(*self._admission(), key=key)
+        return await func()
+
+    async def join(self, provider: str, key: Hashable) -> None:
+        """Lend the current priority to the queued call ``key`` and wait for it to start
+
+        A caller coalescing into a call started under a lower priority (e.g.
+        an interactive request joining a batch fetch) moves that call up the
+        queue and gives up at its own deadline instead of the originator's.
+
+        Args:
+            provider: Provider identifier
+            key: Identity of the call, as passed to ``run``
+
+        Raises:
+            UpstreamThrottledError: If the call could not start before the current deadline
+        """
+        if self.enabled:
+            await self.get(provider).join(key, *self._admission())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the stats of every provider scheduler"""
+        return {provider: scheduler.stats() for provider, scheduler in sorted(self._schedulers.items())}
+
+    def reset(self) -> None:
+        """Drop all schedulers"""
+        self._schedulers.clear()
+
+
+# Shared by all datasources
+upstream_scheduler = UpstreamScheduler.from_settings(settings)
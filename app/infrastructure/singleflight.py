@@ -0,0 +1,106 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+import asyncio
+import logging
+
+from app.infrastructure.executor import run_blocking
+from app.infrastructure.scheduler import upstream_scheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight task.
+
+    The first caller for a key (the originator) starts the call; callers that
+    arrive while it is still running await the same task instead of starting
+    their own. The task is shielded, so a cancelled caller does not cancel the
+    call for the others. Results and exceptions are shared by all callers.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._counters = {"originated": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` unless an identical call is already in flight
+
+        Args:
+            key: Identity of the call
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        loop = asyncio.get_running_loop()
+        if self.in_flight(key):
+            task = self._inflight[key]
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["originated"] += 1
+            # Started eagerly, so the call is already queued for a token when a second caller arrives
+            task = asyncio.Task(func(), loop=loop, eager_start=True)
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for ``key`` is running on the current event loop"""
+        task = self._inflight.get(key)
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished task, unless a newer one already replaced it"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Get originated/coalesced counters and the number of calls in flight"""
+        return {**self._counters, "in_flight": len(self._inflight)}
+
+    def reset_stats(self) -> None:
+        """Reset the counters"""
+        self._counters = {"originated": 0, "coalesced": 0}
+
+
+def upstream_key(source: str, func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """Build the single-flight key for an upstream call
+
+    The function is identified by its qualified name rather than its identity, so
+    calls made through different datasource instances coalesce.
+    """
+    name = getattr(func, "__qualname__", repr(func))
+    return (source.lower(), name, args, tuple(sorted(kwargs.items())))
+
+
+# Shared by all datasources
+upstream_flight = SingleFlight()
+
+
+async def run_coalesced(source: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking upstream call on the source's executor, sharing identical concurrent calls
+
+    The originating call waits for a token from the source's rate limiter (see
+    ``upstream_scheduler``); coalesced callers do not use one. A caller joining
+    a call that is still queued lends it its priority and gives up at its own
+    queue deadline, so an interactive request never waits out a batch deadline.
+
+    Args:
+        source: Data source identifier ("tcbs", "vci")
+        func: Blocking callable performing the upstream request
+        *args: Positional arguments for ``func``; must be hashable
+        **kwargs: Keyword arguments for ``func``; values must be hashable
+
+    Returns:
+        The value returned by ``func``, shared with any coalesced callers
+    """
+    key = upstream_key(source, func, args, kwargs)
+    if upstream_flight.in_flight(key):
+        await upstream_scheduler.join(source, key)
+    return await upstream_flight.do(
+        key, lambda: upstream_scheduler.run(source, lambda: run_blocking(source, func, *args, **kwargs), key=key)
+    )
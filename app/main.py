@@ -1,8 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from app.api.graphql import router as graphql_router
+from app.api.middleware import RateLimitMiddleware
 from app.api.rest.v1 import v1_router
+from app.datasources.registry import datasource_registry
+from app.infrastructure.cache import close_cache
+from app.infrastructure.executor import executor_registry
+from app.infrastructure.rate_limit import close_rate_limiter
+from app.services.price_board import price_board_hub
 
 # Configure logging
 logging.basicConfig(
@@ -11,13 +19,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and tear down shared application resources"""
+    # Build the shared datasources once instead of per request
+    datasource_registry.start()
+    yield
+    # Stop the price board pollers before the datasources they call go away
+    await price_board_hub.close()
+    datasource_registry.close()
+    # Stop the worker threads used for blocking vnstock calls
+    executor_registry.shutdown(wait=False)
+    # Release the Redis connection used by the response cache
+    await close_cache()
+    await close_rate_limiter()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="VNStock API",
     description="API for Vietnamese stock market data",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Rate limits and admission control; added first so CORS headers also go on rejections
+app.add_middleware(RateLimitMiddleware)
+
 # Set up CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +58,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(v1_router, prefix="/api")
+app.include_router(graphql_router, tags=["GraphQL"])
 
 # Root endpoint
 @app.get("/", tags=["Root"])
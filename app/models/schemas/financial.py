@@ -0,0 +1,50 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.config import settings
+
+StatementType = Literal["balance_sheet", "income_statement", "cash_flow", "ratios"]
+STATEMENT_TYPES: List[str] = ["balance_sheet", "income_statement", "cash_flow", "ratios"]
+
+
+class FinancialBatchRequest(BaseModel):
+    """Request body for fetching statements of several companies at once"""
+    symbols: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.FINANCIAL_BATCH_MAX_SYMBOLS,
+        description="Stock ticker symbols",
+    )
+    statements: List[StatementType] = Field(
+        default_factory=lambda: list(STATEMENT_TYPES),
+        min_length=1,
+        description="Statement types to fetch (balance_sheet, income_statement, cash_flow, ratios)",
+    )
+    period: Literal["year", "quarter"] = Field("year", description="Period type (year or quarter)")
+    lang: str = Field("vi", description="Language (vi or en)")
+    dropna: bool = Field(True, description="Drop rows with all NaN values")
+
+    @field_validator("symbols")
+    @classmethod
+    def normalize_symbols(cls, symbols: List[str]) -> List[str]:
+        """Upper-case symbols and drop blanks and duplicates, keeping the request order"""
+        normalized = [symbol.strip().upper() for symbol in symbols if symbol.strip()]
+        if not normalized:
+            raise ValueError("at least one symbol is required")
+        return list(dict.fromkeys(normalized))
+
+    @field_validator("statements")
+    @classmethod
+    def dedupe_statements(cls, statements: List[str]) -> List[str]:
+        """Drop duplicate statement types"""
+        return list(dict.fromkeys(statements))
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbols": ["FPT", "VNM", "VCB"],
+                "statements": ["balance_sheet", "income_statement"],
+                "period": "year",
+            }
+        }
+    }
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import List, Optional
+import re
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.config import settings
+from app.services.indicators import parse_indicators
+from app.services.quote_service import QUOTE_INTERVAL_PATTERN, SYMBOL_PATTERN
+
+
+class IndicatorBatchRequest(BaseModel):
+    """Request body for evaluating indicators over several symbols at once"""
+    symbols: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.QUOTE_BATCH_MAX_SYMBOLS,
+        description="Stock ticker symbols",
+    )
+    indicators: str = Field(
+        ...,
+        description="Comma-separated indicators with optional parameters, e.g. sma:20,ema:50,rsi:14,macd:12:26:9,bbands:20:2,atr:14",
+    )
+    start: date = Field(..., description="First day of the window")
+    end: Optional[date] = Field(None, description="Last day of the window (inclusive); today by default")
+    interval: str = Field("1D", pattern=QUOTE_INTERVAL_PATTERN, description="Bar interval")
+
+    @field_validator("symbols")
+    @classmethod
+    def normalize_symbols(cls, symbols: List[str]) -> List[str]:
+        """Upper-case symbols and drop blanks and duplicates, keeping the request order"""
+        normalized = [symbol.strip().upper() for symbol in symbols if symbol.strip()]
+        if not normalized:
+            raise ValueError("at least one symbol is required")
+        invalid = [symbol for symbol in normalized if not re.match(SYMBOL_PATTERN, symbol)]
+        if invalid:
+            raise ValueError(f"invalid symbols: {', '.join(invalid)}")
+        return list(dict.fromkeys(normalized))
+
+    @field_validator("indicators")
+    @classmethod
+    def validate_indicators(cls, indicators: str) -> str:
+        """Check the indicator list and normalize it to the canonical spelling"""
+        return ",".join(str(spec) for spec in parse_indicators(indicators))
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbols": ["FPT", "VNM", "VCB"],
+                "indicators": "sma:20,sma:50,rsi:14",
+                "start": "2024-01-01",
+                "interval": "1D",
+            }
+        }
+    }
@@ -1,6 +1,18 @@
-from typing import Dict, List, Optional, Any
-from app.datasources.factory import DataSourceFactory
-from app.datasources.base import CompanyDataSource, SOURCE_UNIFIED, SOURCE_TCBS, SOURCE_VCI
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.datasources.registry import datasource_registry
+from app.datasources.base import (
+    CompanyDataSource,
+    COMPANY_INFO_SECTIONS,
+    SOURCE_UNIFIED,
+    SOURCE_TCBS,
+    SOURCE_VCI,
+    is_section_error,
+)
+from app.core.config import settings
+from app.infrastructure.cache import Uncached, cached
+from app.infrastructure.hedge import AllCallsFailedError, first_successful
+from app.infrastructure.provider_router import provider_router
+from app.services.merge import SECTION_KEYS, merge_fields, merge_records
 import logging
 import asyncio
 from functools import reduce
@@ -8,12 +20,29 @@ from functools import reduce
 logger = logging.getLogger(__name__)
 
 
+# How source=unified answers single-section requests
+STRATEGY_ADAPTIVE = "adaptive"  # only the provider with the best recent latency, hedged when it is slow
+STRATEGY_ALL = "all"  # query both providers, use VCI unless it failed
+STRATEGY_FASTEST = "fastest"  # VCI if it answers within the budget, else the first good answer
+UNIFIED_STRATEGIES = (STRATEGY_ADAPTIVE, STRATEGY_ALL, STRATEGY_FASTEST)
+UNIFIED_STRATEGY_PATTERN = f"^({'|'.join(UNIFIED_STRATEGIES)})$"
+
+# Provider preference for single-section requests in unified mode
+SECTION_PROVIDERS = (SOURCE_VCI, SOURCE_TCBS)
+
+
+def _has_no_section_errors(info: Dict) -> bool:
+    """Whether an aggregated company info result is complete enough to cache"""
+    return bool(info) and not any(is_section_error(value) for value in info.values())
+
+
 class CompanyService:
     """Service for company-related operations"""
 
-    def __init__(self, data_source_factory=DataSourceFactory()):
+    def __init__(self, data_source_factory=datasource_registry):
         self.data_source_factory = data_source_factory
 
+    @cached("company", ttl=settings.CACHE_TTL_NEWS, should_cache=_has_no_section_errors)
     async def get_company_info(self, symbol: str, source: str = SOURCE_UNIFIED) -> Dict:
         """Get comprehensive company information
         
@@ -26,22 +55,22 @@ class CompanyService:
         """
         try:
             if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
+                # Get data from both sources, skipping a provider whose circuit is open
                 tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_company_info(symbol),
-                    vci_source.get_company_info(symbol),
+                    self._guarded_call(SOURCE_TCBS, "get_company_info", symbol)(),
+                    self._guarded_call(SOURCE_VCI, "get_company_info", symbol)(),
                     return_exceptions=True
                 )
                 
                 # Combine data
-                return self._unify_company_info({
+                info = self._unify_company_info({
                     SOURCE_TCBS: tcbs_data if not isinstance(tcbs_data, Exception) else None,
                     SOURCE_VCI: vci_data if not isinstance(vci_data, Exception) else None
                 })
+                # One provider's answer alone is served but not cached, so the next request asks both again
+                if isinstance(tcbs_data, Exception) or isinstance(vci_data, Exception):
+                    return Uncached(info)
+                return info
             else:
                 # Get data from a specific source
                 data_source = self.data_source_factory.create_company_datasource(source)
@@ -51,6 +80,7 @@ class CompanyService:
             logger.error(f"Error in company service get_company_info: {e}")
             raise
 
+    @cached("company", ttl=settings.CACHE_DEFAULT_TIMEOUT, hard_ttl=settings.CACHE_HARD_TTL_PROFILE)
     async def get_company_profile(self, symbol: str, source: str = SOURCE_UNIFIED) -> Dict:
         """Get company profile information
         
@@ -64,14 +94,10 @@ class CompanyService:
         try:
             print(f"Getting company profile for {symbol} from {source}")
             if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
+                # Get data from both sources, skipping a provider whose circuit is open
                 tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_company_profile(symbol),
-                    vci_source.get_company_profile(symbol),
+                    self._guarded_call(SOURCE_TCBS, "get_company_profile", symbol)(),
+                    self._guarded_call(SOURCE_VCI, "get_company_profile", symbol)(),
                     return_exceptions=True
                 )
                 
@@ -79,11 +105,12 @@ class CompanyService:
                 if isinstance(tcbs_data, Dict) and isinstance(vci_data, Dict):
                     # Combine properties from both sources, with TCBS taking precedence for duplicates
                     return {**tcbs_data, **vci_data}
-                # Prioritize TCBS data if available, otherwise use VCI
+                # Prioritize TCBS data if available, otherwise use VCI; one provider's
+                # answer alone is served but not cached, so the next request asks both again
                 elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
+                    return Uncached(tcbs_data)
                 elif not isinstance(vci_data, Exception):
-                    return vci_data
+                    return Uncached(vci_data)
                 else:
                     # Both failed
                     raise Exception("Failed to get company profile from any source")
@@ -96,279 +123,210 @@ class CompanyService:
             logger.error(f"Error in company service get_company_profile: {e}")
             raise
 
-    async def get_company_officers(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_DEFAULT_TIMEOUT)
+    async def get_company_officers(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get company officers information
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Company officers information
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_company_officers(symbol),
-                    vci_source.get_company_officers(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get company officers from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_company_officers(symbol)
-                return data
+            return await self._get_single_section("get_company_officers", symbol, source, strategy, "company officers")
         except Exception as e:
             logger.error(f"Error in company service get_company_officers: {e}")
             raise
 
-    async def get_shareholders(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_DEFAULT_TIMEOUT)
+    async def get_shareholders(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get major shareholders information
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Major shareholders information
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_shareholders(symbol),
-                    vci_source.get_shareholders(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get shareholders from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_shareholders(symbol)
-                return data
+            return await self._get_single_section("get_shareholders", symbol, source, strategy, "shareholders")
         except Exception as e:
             logger.error(f"Error in company service get_shareholders: {e}")
             raise
 
-    async def get_insider_trading(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_TTL_NEWS)
+    async def get_insider_trading(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get insider trading information
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Insider trading information
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_insider_trading(symbol),
-                    vci_source.get_insider_trading(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get insider trading from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_insider_trading(symbol)
-                return data
+            return await self._get_single_section("get_insider_trading", symbol, source, strategy, "insider trading")
         except Exception as e:
             logger.error(f"Error in company service get_insider_trading: {e}")
             raise
 
-    async def get_subsidiaries(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_DEFAULT_TIMEOUT)
+    async def get_subsidiaries(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get company subsidiaries information
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Company subsidiaries information
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_subsidiaries(symbol),
-                    vci_source.get_subsidiaries(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get subsidiaries from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_subsidiaries(symbol)
-                return data
+            return await self._get_single_section("get_subsidiaries", symbol, source, strategy, "subsidiaries")
         except Exception as e:
             logger.error(f"Error in company service get_subsidiaries: {e}")
             raise
 
-    async def get_company_events(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_TTL_NEWS)
+    async def get_company_events(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get company events
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Company events
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_company_events(symbol),
-                    vci_source.get_company_events(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get company events from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_company_events(symbol)
-                return data
+            return await self._get_single_section("get_company_events", symbol, source, strategy, "company events")
         except Exception as e:
             logger.error(f"Error in company service get_company_events: {e}")
             raise
 
-    async def get_company_news(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_TTL_NEWS)
+    async def get_company_news(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get company news
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Company news
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_company_news(symbol),
-                    vci_source.get_company_news(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get company news from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_company_news(symbol)
-                return data
+            return await self._get_single_section("get_company_news", symbol, source, strategy, "company news")
         except Exception as e:
             logger.error(f"Error in company service get_company_news: {e}")
             raise
 
-    async def get_dividends(self, symbol: str, source: str = SOURCE_UNIFIED) -> List[Dict]:
+    @cached("company", ttl=settings.CACHE_DEFAULT_TIMEOUT)
+    async def get_dividends(self, symbol: str, source: str = SOURCE_UNIFIED, strategy: str = STRATEGY_ADAPTIVE) -> List[Dict]:
         """Get dividend history
         
         Args:
             symbol: Stock ticker symbol
             source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: How "unified" picks a provider ("adaptive", "all" or "fastest")
             
         Returns:
             Dividend history
         """
         try:
-            if source == SOURCE_UNIFIED:
-                # Get data sources
-                tcbs_source = self.data_source_factory.create_company_datasource(SOURCE_TCBS)
-                vci_source = self.data_source_factory.create_company_datasource(SOURCE_VCI)
-                
-                # Get data from both sources
-                tcbs_data, vci_data = await asyncio.gather(
-                    tcbs_source.get_dividends(symbol),
-                    vci_source.get_dividends(symbol),
-                    return_exceptions=True
-                )
-                
-                # Use VCI data if available, otherwise fall back to TCBS
-                if not isinstance(vci_data, Exception):
-                    return vci_data
-                elif not isinstance(tcbs_data, Exception):
-                    return tcbs_data
-                else:
-                    raise Exception("Failed to get dividends from any source")
-            else:
-                # Get data from a specific source
-                data_source = self.data_source_factory.create_company_datasource(source)
-                data = await data_source.get_dividends(symbol)
-                return data
+            return await self._get_single_section("get_dividends", symbol, source, strategy, "dividends")
         except Exception as e:
             logger.error(f"Error in company service get_dividends: {e}")
             raise
     
+    async def _get_single_section(self, method: str, symbol: str, source: str, strategy: str, description: str) -> Any:
+        """Fetch one section from a single source, or from both providers in unified mode
+
+        Args:
+            method: Name of the CompanyDataSource method
+            symbol: Stock ticker symbol
+            source: Data source identifier ("tcbs", "vci", or "unified")
+            strategy: STRATEGY_ADAPTIVE, STRATEGY_ALL or STRATEGY_FASTEST, used for "unified"
+            description: Section name used in error messages
+
+        Returns:
+            Section data
+        """
+        if source != SOURCE_UNIFIED:
+            data_source = self.data_source_factory.create_company_datasource(source)
+            return await getattr(data_source, method)(symbol)
+
+        if strategy == STRATEGY_ADAPTIVE:
+            try:
+                provider, data = await provider_router.call(
+                    method,
+                    SECTION_PROVIDERS,
+                    lambda provider: self._fetcher(provider, method, symbol),
+                    key=symbol,
+                )
+            except AllCallsFailedError as e:
+                raise Exception(f"Failed to get {description} from any source") from e
+            logger.debug(f"{description} for {symbol} answered by {provider}")
+            return data
+
+        calls = [(provider, self._guarded_call(provider, method, symbol)) for provider in SECTION_PROVIDERS]
+        if strategy == STRATEGY_FASTEST:
+            try:
+                provider, data = await first_successful(calls, budget=settings.UNIFIED_FASTEST_BUDGET)
+            except AllCallsFailedError as e:
+                raise Exception(f"Failed to get {description} from any source") from e
+            logger.debug(f"{description} for {symbol} answered by {provider}")
+            return data
+        if strategy != STRATEGY_ALL:
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        # Use the first provider in preference order that succeeded
+        results = await asyncio.gather(*(call() for _, call in calls), return_exceptions=True)
+        for data in results:
+            if not isinstance(data, Exception):
+                return data
+        raise Exception(f"Failed to get {description} from any source")
+
+    def _fetcher(self, provider: str, method: str, symbol: str) -> Callable[[], Awaitable[Any]]:
+        """Build a plain call to one provider's datasource method"""
+        fetch = getattr(self.data_source_factory.create_company_datasource(provider), method)
+        return lambda: fetch(symbol)
+
+    def _guarded_call(self, provider: str, method: str, symbol: str) -> Callable[[], Awaitable[Any]]:
+        """Build a call to one provider that goes through its circuit breaker
+
+        While the (provider, method) circuit is open the call fails immediately
+        with CircuitOpenError, so unified requests fall back without waiting. The
+        call's latency feeds the provider router's stats. Concurrent calls for
+        the same symbol share one breaker call, so a failure counts once.
+        """
+        return lambda: provider_router.timed_call(provider, method, self._fetcher(provider, method, symbol), key=symbol)
+
+    @staticmethod
+    def _field_precedence(section: str) -> Dict[str, List[str]]:
+        """Per-field provider precedence for a section from UNIFIED_MERGE_FIELD_PRECEDENCE
+
+        Keys are "field" (every section) or "section.field"; the latter wins.
+        """
+        precedence = {}
+        for key, order in sorted(settings.UNIFIED_MERGE_FIELD_PRECEDENCE.items(), key=lambda item: "." in item[0]):
+            prefix, dot, field = key.rpartition(".")
+            if not dot:
+                precedence[key] = order
+            elif prefix == section:
+                precedence[field] = order
+        return precedence
+
     def _unify_company_info(self, data: Dict[str, Dict]) -> Dict:
         """Unify company info data from multiple sources"""
         try:
@@ -387,26 +345,29 @@ class CompanyService:
             # If both sources available, merge them
             result = {}
             
-            # For profile, merge properties from both sources with TCBS taking precedence
-            result["profile"] = {}
-            if "profile" in data[SOURCE_VCI] and data[SOURCE_VCI]["profile"]:
-                result["profile"].update(data[SOURCE_VCI]["profile"])
-            if "profile" in data[SOURCE_TCBS] and data[SOURCE_TCBS]["profile"]:
-                result["profile"].update(data[SOURCE_TCBS]["profile"])
-            
-            # For list sections, combine from both sources
-            for section in ["listKeyOfficer", "listShareHolder", "listInsiderDealing", 
-                          "listSubCompany", "listEventNews", "listActivityNews", 
-                          "listDividendPaymentHis"]:
-                result[section] = []
+            for section in COMPANY_INFO_SECTIONS:
+                tcbs_value = data[SOURCE_TCBS].get(section)
+                vci_value = data[SOURCE_VCI].get(section)
                 
-                # Add TCBS data
-                if section in data[SOURCE_TCBS] and data[SOURCE_TCBS][section]:
-                    result[section].extend(data[SOURCE_TCBS][section])
+                # Keep the error marker only when the section failed on both sources
+                if is_section_error(tcbs_value) and is_section_error(vci_value):
+                    result[section] = tcbs_value
+                    continue
+                if is_section_error(tcbs_value):
+                    tcbs_value = None
+                if is_section_error(vci_value):
+                    vci_value = None
                 
-                # Add VCI data
-                if section in data[SOURCE_VCI] and data[SOURCE_VCI][section]:
-                    result[section].extend(data[SOURCE_VCI][section])
+                values = {SOURCE_TCBS: tcbs_value, SOURCE_VCI: vci_value}
+                field_precedence = self._field_precedence(section)
+                if section == "profile":
+                    # For profile, merge properties field by field
+                    result[section] = merge_fields(values, settings.UNIFIED_MERGE_PRECEDENCE, field_precedence)
+                else:
+                    # For list sections, drop records both sources returned
+                    result[section] = merge_records(
+                        values, SECTION_KEYS[section], settings.UNIFIED_MERGE_PRECEDENCE, field_precedence
+                    )
             
             return result
             
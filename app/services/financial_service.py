@@ -1,6 +1,12 @@
-from typing import Dict, List
-from app.datasources.factory import DataSourceFactory
-from app.datasources.base import SOURCE_TCBS
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from app.datasources.registry import datasource_registry
+from app.datasources.base import SOURCE_TCBS, SOURCE_UNIFIED, SOURCE_VCI
+from app.datasources.formats import FORMAT_DATAFRAME, FORMAT_RECORDS, convert_dataframe, flatten_column_name
+from app.core.config import settings
+from app.infrastructure.cache import cached
+from app.infrastructure.provider_router import provider_router
+from app.infrastructure.scheduler import PRIORITY_BATCH, upstream_priority
 import logging
 import asyncio
 from datetime import datetime
@@ -8,6 +14,63 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
+def _statement_ttl(params: Dict) -> int:
+    """Cache lifetime for a financial statement, following its reporting cycle"""
+    if params.get("period") == "quarter":
+        return settings.CACHE_TTL_FINANCIAL_QUARTER
+    return settings.CACHE_TTL_FINANCIAL_YEAR
+
+
+# Statement type -> service method used by get_statements_batch
+STATEMENT_METHODS = {
+    "balance_sheet": "get_balance_sheet",
+    "income_statement": "get_income_statement",
+    "cash_flow": "get_cash_flow",
+    "ratios": "get_ratios",
+}
+
+# Provider preference for source=unified; statements are not merged, the first good answer is used
+FINANCIAL_PROVIDERS = (SOURCE_TCBS, SOURCE_VCI)
+
+# Upstream column names of the identifying fields (TCBS, VCI English, VCI Vietnamese)
+_SYMBOL_COLUMNS = {"ticker", "symbol", "CP"}
+_YEAR_COLUMNS = {"year", "yearReport", "Năm"}
+_QUARTER_COLUMNS = {"quarter", "lengthReport", "Kỳ"}
+
+LONG_COLUMNS = ["symbol", "statement", "year", "quarter", "item", "value"]
+
+
+def statement_to_long(df: Any, symbol: str, statement: str) -> pd.DataFrame:
+    """Melt a wide statement into one row per (period, line item)
+
+    Args:
+        df: Statement DataFrame returned by vnstock (one row per period)
+        symbol: Stock ticker symbol
+        statement: Statement type
+
+    Returns:
+        DataFrame with the columns in LONG_COLUMNS; missing values are dropped
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    # VCI statements have two header levels; the identifying fields are in the last one
+    labels = [column[-1] if isinstance(column, tuple) else column for column in df.columns]
+    wide = pd.DataFrame({"year": pd.NA, "quarter": pd.NA}, index=df.index)
+    items = {}
+    for i, label in enumerate(labels):
+        if label in _YEAR_COLUMNS:
+            wide["year"] = df.iloc[:, i]
+        elif label in _QUARTER_COLUMNS:
+            wide["quarter"] = df.iloc[:, i]
+        elif label not in _SYMBOL_COLUMNS:
+            items[flatten_column_name(df.columns[i])] = df.iloc[:, i]
+    wide = pd.concat([wide, pd.DataFrame(items, index=df.index)], axis=1)
+    long = wide.melt(id_vars=["year", "quarter"], var_name="item", value_name="value").dropna(subset=["value"])
+    long.insert(0, "statement", statement)
+    long.insert(0, "symbol", symbol)
+    return long[LONG_COLUMNS].reset_index(drop=True)
+
+
 class FinancialService:
     """Service for financial-related operations"""
 
@@ -17,9 +80,60 @@ class FinancialService:
         Args:
             source: Data source identifier ("tcbs", "vci", or "unified")
         """
-        self.data_source_factory = DataSourceFactory()
+        self.data_source_factory = datasource_registry
         self.source = source
 
+    async def _fetch(self, method: str, symbol: str, **kwargs: Any) -> Any:
+        """Call a FinancialDataSource method on the configured source
+
+        With source "unified" the providers in FINANCIAL_PROVIDERS are tried in
+        order through their circuit breakers: a provider whose circuit is open is
+        skipped immediately and a failed call falls back to the next provider.
+
+        Args:
+            method: Name of the FinancialDataSource method
+            symbol: Stock ticker symbol
+            **kwargs: Arguments for the method
+
+        Returns:
+            Result of the first provider that succeeded
+        """
+        if self.source != SOURCE_UNIFIED:
+            data_source = self.data_source_factory.create_financial_datasource(self.source)
+            return await getattr(data_source, method)(symbol=symbol, **kwargs)
+
+        errors = []
+        for provider in FINANCIAL_PROVIDERS:
+            fetch = getattr(self.data_source_factory.create_financial_datasource(provider), method)
+            try:
+                # Concurrent fetches with the same arguments share one breaker call, so a failure counts once
+                return await provider_router.timed_call(
+                    provider, method, lambda: fetch(symbol=symbol, **kwargs), key=(symbol, tuple(sorted(kwargs.items())))
+                )
+            except Exception as e:
+                logger.warning(f"{method} for {symbol} failed on {provider}: {e}")
+                errors.append(f"{provider}: {e}")
+        raise Exception(f"{method} for {symbol} failed on every source ({'; '.join(errors)})")
+
+    @cached("financial", ttl=_statement_ttl, hard_ttl=settings.CACHE_HARD_TTL_FINANCIAL)
+    async def _statement(self, method: str, symbol: str, period: str = "year", **kwargs: Any) -> Any:
+        """Fetch a statement as a DataFrame, cached by the upstream parameters only
+
+        Projection and output format are applied by the public methods after
+        the cache lookup, so every ``fields`` and format variant shares one
+        entry and one upstream fetch.
+
+        Args:
+            method: Name of the FinancialDataSource method
+            symbol: Stock ticker symbol
+            period: Period type ("year" or "quarter")
+            **kwargs: Remaining upstream arguments of the method
+
+        Returns:
+            The statement DataFrame
+        """
+        return await self._fetch(method, symbol=symbol, period=period, output_format=FORMAT_DATAFRAME, **kwargs)
+
     async def get_balance_sheet(
         self,
         symbol: str,
@@ -27,7 +141,9 @@ class FinancialService:
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get balance sheet data for a company
         
@@ -38,19 +154,17 @@ class FinancialService:
             dropna: Whether to drop rows with all NaN values
             to_df: Whether to return as DataFrame
             show_log: Whether to show debug logs
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
             
         Returns:
             Balance sheet data
         """
         try:
-            return await self.data_source_factory.create_financial_datasource(self.source).get_balance_sheet(
-                symbol=symbol,
-                period=period,
-                lang=lang,
-                dropna=dropna,
-                to_df=to_df,
-                show_log=show_log
+            df = await self._statement(
+                "get_balance_sheet", symbol, period, lang=lang, dropna=dropna, to_df=to_df, show_log=show_log
             )
+            return convert_dataframe(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting balance sheet for {symbol}: {str(e)}")
             raise
@@ -62,7 +176,9 @@ class FinancialService:
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get income statement data for a company
         
@@ -73,19 +189,17 @@ class FinancialService:
             dropna: Whether to drop rows with all NaN values
             to_df: Whether to return as DataFrame
             show_log: Whether to show debug logs
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
             
         Returns:
             Income statement data
         """
         try:
-            return await self.data_source_factory.create_financial_datasource(self.source).get_income_statement(
-                symbol=symbol,
-                period=period,
-                lang=lang,
-                dropna=dropna,
-                to_df=to_df,
-                show_log=show_log
+            df = await self._statement(
+                "get_income_statement", symbol, period, lang=lang, dropna=dropna, to_df=to_df, show_log=show_log
             )
+            return convert_dataframe(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting income statement for {symbol}: {str(e)}")
             raise
@@ -96,7 +210,9 @@ class FinancialService:
         period: str = "year",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get cash flow data for a company
         
@@ -106,18 +222,17 @@ class FinancialService:
             dropna: Whether to drop rows with all NaN values
             to_df: Whether to return as DataFrame
             show_log: Whether to show debug logs
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
             
         Returns:
             Cash flow data
         """
         try:
-            return await self.data_source_factory.create_financial_datasource(self.source).get_cash_flow(
-                symbol=symbol,
-                period=period,
-                dropna=dropna,
-                to_df=to_df,
-                show_log=show_log
+            df = await self._statement(
+                "get_cash_flow", symbol, period, dropna=dropna, to_df=to_df, show_log=show_log
             )
+            return convert_dataframe(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting cash flow for {symbol}: {str(e)}")
             raise
@@ -129,7 +244,9 @@ class FinancialService:
         lang: str = "vi",
         dropna: bool = True,
         to_df: bool = True,
-        show_log: bool = False
+        show_log: bool = False,
+        output_format: str = FORMAT_RECORDS,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """Get financial ratios data for a company
         
@@ -140,19 +257,74 @@ class FinancialService:
             dropna: Whether to drop rows with all NaN values
             to_df: Whether to return as DataFrame
             show_log: Whether to show debug logs
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
             
         Returns:
             Financial ratios data
         """
         try:
-            return await self.data_source_factory.create_financial_datasource(self.source).get_ratios(
-                symbol=symbol,
-                period=period,
-                lang=lang,
-                dropna=dropna,
-                to_df=to_df,
-                show_log=show_log
+            df = await self._statement(
+                "get_ratios", symbol, period, lang=lang, dropna=dropna, to_df=to_df, show_log=show_log
             )
+            return convert_dataframe(df, output_format, fields)
         except Exception as e:
             logger.error(f"Error getting ratios for {symbol}: {str(e)}")
-            raise 
\ No newline at end of file
+            raise 
+
+    async def get_statements_batch(
+        self,
+        symbols: List[str],
+        statements: List[str],
+        period: str = "year",
+        lang: str = "vi",
+        dropna: bool = True,
+        output_format: str = FORMAT_RECORDS,
+        concurrency: Optional[int] = None
+    ) -> Tuple[Any, List[Dict[str, str]]]:
+        """Get several statement types for several companies as one long-format table
+
+        Each (symbol, statement) pair goes through the cached single-statement
+        method, so cached statements are not refetched. At most ``concurrency``
+        pairs are fetched at a time. A failed pair does not fail the batch; it is
+        reported in the error list instead.
+
+        Args:
+            symbols: Stock ticker symbols
+            statements: Statement types (keys of STATEMENT_METHODS)
+            period: Period type ("year" or "quarter")
+            lang: Language ("vi" or "en")
+            dropna: Whether to drop rows with all NaN values
+            output_format: "records", "columns" or "dataframe"
+            concurrency: Maximum concurrent fetches, defaults to FINANCIAL_BATCH_CONCURRENCY
+
+        Returns:
+            The table (columns symbol, statement, year, quarter, item, value) in
+            ``output_format``, and a list of ``{"symbol", "statement", "error"}`` entries
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.FINANCIAL_BATCH_CONCURRENCY)
+
+        async def fetch(symbol: str, statement: str) -> pd.DataFrame:
+            kwargs = {"symbol": symbol, "period": period, "dropna": dropna, "output_format": FORMAT_DATAFRAME}
+            if statement != "cash_flow":
+                kwargs["lang"] = lang
+            async with semaphore:
+                df = await getattr(self, STATEMENT_METHODS[statement])(**kwargs)
+            return statement_to_long(df, symbol, statement)
+
+        pairs = [(symbol, statement) for symbol in symbols for statement in statements]
+        # Upstream calls of a batch queue behind interactive requests
+        with upstream_priority(PRIORITY_BATCH):
+            results = await asyncio.gather(*(fetch(*pair) for pair in pairs), return_exceptions=True)
+
+        frames = []
+        errors = []
+        for (symbol, statement), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Batch fetch of {statement} for {symbol} failed: {result}")
+                errors.append({"symbol": symbol, "statement": statement, "error": str(result) or type(result).__name__})
+            else:
+                frames.append(result)
+        frames = [frame for frame in frames if not frame.empty]
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LONG_COLUMNS)
+        return convert_dataframe(table, output_format), errors
@@ -0,0 +1,271 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Columns = Dict[str, np.ndarray]
+
+# Carry of a seeded exponential smoothing: (last value or None, values collected for the seed)
+Smoothing = Tuple[Optional[float], List[float]]
+
+
+def _smooth(x: np.ndarray, period: int, alpha: float, carry: Optional[Smoothing] = None) -> Tuple[np.ndarray, Smoothing]:
+    """Exponential smoothing seeded with the mean of the first ``period`` values
+
+    This is the TA-Lib convention for EMA and Wilder's smoothing. Leading NaNs
+    (the warm-up of an input that is itself an indicator) are skipped.
+
+    Args:
+        x: Values to smooth
+        period: Values averaged for the seed
+        alpha: Smoothing factor
+        carry: Carry returned for the values before ``x``; None to start over
+
+    Returns:
+        The smoothed values (NaN until seeded) and the carry to continue with
+    """
+    out = np.full(len(x), np.nan)
+    value, pending = carry or (None, [])
+    start = 0
+    if value is None:
+        valid = np.flatnonzero(~np.isnan(x))
+        need = period - len(pending)
+        if len(valid) < need:
+            return out, (None, pending + x[valid].tolist())
+        start = valid[need - 1]
+        value = (sum(pending) + x[valid[:need]].sum()) / period
+        out[start] = value
+        start += 1
+    if start < len(x):
+        out[start:] = pd.Series(np.r_[value, x[start:]]).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+        value = float(out[-1])
+    return out, (value, [])
+
+
+def _rolling(x: np.ndarray, period: int, tail: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Windows of ``period`` values ending at each value of ``x``, continuing after ``tail``
+
+    Returns:
+        A (len(x), period) view with NaN rows where the window is incomplete,
+        and the tail to continue with
+    """
+    tail = np.empty(0) if tail is None else tail
+    values = np.r_[np.full(max(period - 1 - len(tail), 0), np.nan), tail, x]
+    windows = sliding_window_view(values, period)[-len(x):] if len(x) else np.empty((0, period))
+    return windows, values[len(values) - (period - 1):] if period > 1 else np.empty(0)
+
+
+def _diff(x: np.ndarray, previous: Optional[float]) -> np.ndarray:
+    return np.diff(np.r_[np.nan if previous is None else previous, x])
+
+
+def sma(bars: Columns, state: Optional[Dict], period: int) -> Tuple[Columns, Dict]:
+    windows, tail = _rolling(bars["close"], period, state and state["tail"])
+    return {f"sma_{period}": windows.mean(axis=1)}, {"tail": tail}
+
+
+def ema(bars: Columns, state: Optional[Dict], period: int) -> Tuple[Columns, Dict]:
+    values, carry = _smooth(bars["close"], period, 2 / (period + 1), state and state["ema"])
+    return {f"ema_{period}": values}, {"ema": carry}
+
+
+def rsi(bars: Columns, state: Optional[Dict], period: int) -> Tuple[Columns, Dict]:
+    close = bars["close"]
+    change = _diff(close, state and state["close"])
+    gain, gain_carry = _smooth(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), period, 1 / period, state and state["gain"])
+    loss, loss_carry = _smooth(np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0)), period, 1 / period, state and state["loss"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+    values[np.isnan(gain) | np.isnan(loss)] = np.nan
+    last = float(close[-1]) if len(close) else (state and state["close"])
+    return {f"rsi_{period}": values}, {"close": last, "gain": gain_carry, "loss": loss_carry}
+
+
+def macd(bars: Columns, state: Optional[Dict], fast: int, slow: int, signal: int) -> Tuple[Columns, Dict]:
+    close = bars["close"]
+    fast_values, fast_carry = _smooth(close, fast, 2 / (fast + 1), state and state["fast"])
+    slow_values, slow_carry = _smooth(close, slow, 2 / (slow + 1), state and state["slow"])
+    line = fast_values - slow_values
+    signal_values, signal_carry = _smooth(line, signal, 2 / (signal + 1), state and state["signal"])
+    suffix = f"{fast}_{slow}_{signal}"
+    return (
+        {f"macd_{suffix}": line, f"macd_signal_{suffix}": signal_values, f"macd_hist_{suffix}": line - signal_values},
+        {"fast": fast_carry, "slow": slow_carry, "signal": signal_carry},
+    )
+
+
+def bbands(bars: Columns, state: Optional[Dict], period: int, width: float) -> Tuple[Columns, Dict]:
+    windows, tail = _rolling(bars["close"], period, state and state["tail"])
+    middle = windows.mean(axis=1)
+    deviation = windows.std(axis=1)
+    suffix = f"{period}_{width:g}"
+    return (
+        {f"bb_upper_{suffix}": middle + width * deviation, f"bb_middle_{suffix}": middle, f"bb_lower_{suffix}": middle - width * deviation},
+        {"tail": tail},
+    )
+
+
+def atr(bars: Columns, state: Optional[Dict], period: int) -> Tuple[Columns, Dict]:
+    high, low, close = bars["high"], bars["low"], bars["close"]
+    previous = np.r_[np.nan if not state or state["close"] is None else state["close"], close[:-1]]
+    with np.errstate(invalid="ignore"):
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+    values, carry = _smooth(true_range, period, 1 / period, state and state["atr"])
+    last = float(close[-1]) if len(close) else (state and state["close"])
+    return {f"atr_{period}": values}, {"close": last, "atr": carry}
+
+
+# Indicator name -> (function, default parameters); a parameter's type is that of its default
+INDICATORS: Dict[str, Tuple[Callable[..., Tuple[Columns, Dict]], Tuple[Any, ...]]] = {
+    "sma": (sma, (20,)),
+    "ema": (ema, (20,)),
+    "rsi": (rsi, (14,)),
+    "macd": (macd, (12, 26, 9)),
+    "bbands": (bbands, (20, 2.0)),
+    "atr": (atr, (14,)),
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """One indicator with its parameters, e.g. ``rsi:14`` or ``macd:12:26:9``"""
+
+    name: str
+    params: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        return ":".join([self.name] + [f"{param:g}" if isinstance(param, float) else str(param) for param in self.params])
+
+    def compute(self, bars: Columns, state: Optional[Dict] = None) -> Tuple[Columns, Dict]:
+        """Compute the indicator over ``bars``, continuing from ``state`` if given"""
+        return INDICATORS[self.name][0](bars, state, *self.params)
+
+
+def parse_indicators(text: str) -> List[IndicatorSpec]:
+    """Parse a comma-separated indicator list such as ``sma:20,rsi,macd:12:26:9``
+
+    Omitted parameters take the defaults of INDICATORS.
+
+    Raises:
+        ValueError: If an indicator is unknown or a parameter is not a positive number
+    """
+    specs = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, *values = item.lower().split(":")
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{name}'; available: {', '.join(INDICATORS)}")
+        defaults = INDICATORS[name][1]
+        if len(values) > len(defaults):
+            raise ValueError(f"{name} takes at most {len(defaults)} parameters")
+        params = []
+        for default, value in zip(defaults, values + [None] * (len(defaults) - len(values))):
+            try:
+                param = default if value in (None, "") else type(default)(value)
+            except ValueError:
+                raise ValueError(f"Invalid parameter '{value}' for {name}")
+            if param <= 0 or (isinstance(param, int) and param > 1000):
+                raise ValueError(f"Parameter {param} of {name} is out of range")
+            params.append(param)
+        specs.append(IndicatorSpec(name, tuple(params)))
+    if not specs:
+        raise ValueError("At least one indicator is required")
+    return list(dict.fromkeys(specs))
+
+
+def compute_indicators(specs: Sequence[IndicatorSpec], bars: Columns, states: Optional[Sequence[Optional[Dict]]] = None) -> Tuple[Columns, List[Dict]]:
+    """Compute several indicators over the same bars
+
+    Args:
+        specs: Indicators to compute
+        bars: Arrays "high", "low" and "close" of the new bars
+        states: State of each indicator after the bars before these; None to start over
+
+    Returns:
+        The indicator columns and the state of each indicator after the bars
+    """
+    columns: Columns = {}
+    new_states = []
+    for spec, state in zip(specs, states or [None] * len(specs)):
+        values, new_state = spec.compute(bars, state)
+        columns.update(values)
+        new_states.append(new_state)
+    return columns, new_states
+
+
+@dataclass
+class IndicatorSeries:
+    """Indicators computed over the closed bars of a window, with the state to extend them"""
+
+    times: np.ndarray
+    columns: Columns
+    states: List[Dict]
+
+
+class IndicatorCache:
+    """Bounded LRU of computed indicator series.
+
+    A series is keyed by everything its values depend on: source, interval,
+    symbol, window start and the indicators. Only closed bars are kept, so a
+    later request for the same series extends it with the bars that arrived
+    since instead of computing it again from the start.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache
+
+        Args:
+            max_entries: Series kept before the least recently used one is dropped
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._series: "OrderedDict[Hashable, IndicatorSeries]" = OrderedDict()
+        self._counters = {"hits": 0, "extended": 0, "misses": 0, "evicted": 0}
+
+    @classmethod
+    def from_settings(cls, config: Any = settings) -> "IndicatorCache":
+        """Build the cache sized by INDICATOR_CACHE_MAX_ENTRIES"""
+        return cls(max_entries=config.INDICATOR_CACHE_MAX_ENTRIES)
+
+    def get(self, key: Hashable) -> Optional[IndicatorSeries]:
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+            return series
+
+    def put(self, key: Hashable, series: IndicatorSeries) -> None:
+        with self._lock:
+            self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_entries:
+                self._series.popitem(last=False)
+                self._counters["evicted"] += 1
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup as a hit, an extension or a miss"""
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def reset(self) -> None:
+        """Drop all series and zero the counters"""
+        with self._lock:
+            self._series.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters and the number of series kept"""
+        with self._lock:
+            return {**self._counters, "size": len(self._series), "max_entries": self.max_entries}
+
+
+# Shared by all QuoteService instances
+indicator_cache = IndicatorCache.from_settings(settings)
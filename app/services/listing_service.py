@@ -1,6 +1,11 @@
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 import logging
-from app.datasources.base import DataSourceFactory, ListingDataSource
+import pandas as pd
+from app.core.config import settings
+from app.datasources.base import ListingDataSource
+from app.datasources.formats import FORMAT_DATAFRAME, FORMAT_RECORDS, convert_dataframe, project_columns
+from app.datasources.registry import datasource_registry
+from app.infrastructure.cache import cached
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +19,7 @@ class ListingService:
             source: The data source to use (default: "vci")
         """
         self.source = source
-        self.datasource = DataSourceFactory.create_listing_datasource(source)
+        self.datasource = datasource_registry.create_listing_datasource(source)
 
     async def _format_response(self, data: Dict) -> Dict:
         """Format the response data with totalCount and records fields.
@@ -25,6 +30,10 @@ class ListingService:
         Returns:
             Formatted data with totalCount and records fields
         """
+        if isinstance(data, pd.DataFrame) or "columns" in data:
+            # Raw frames and columnar output are returned as they are
+            return data
+
         if "records" in data:
             # Already formatted, just ensure totalCount is present
             if "totalCount" not in data:
@@ -46,122 +55,191 @@ class ListingService:
             "records": records
         }
 
-    async def get_all_symbols(self) -> Dict:
+    @cached("listing", ttl=settings.CACHE_TTL_LISTING)
+    async def _frame(self, method: str, **kwargs: Any) -> Any:
+        """Fetch a listing as a DataFrame, cached by the upstream parameters only
+
+        Projection and output format are applied by ``_view`` after the cache
+        lookup, so every ``fields`` and format variant shares one entry and one
+        upstream fetch.
+
+        Args:
+            method: Name of the ListingDataSource method
+            **kwargs: Upstream arguments of the method
+
+        Returns:
+            The listing DataFrame, or what the datasource returned if it is not tabular
+        """
+        return await getattr(self.datasource, method)(output_format=FORMAT_DATAFRAME, **kwargs)
+
+    async def _view(self, data: Any, output_format: str, fields: Optional[List[str]]) -> Any:
+        """Project and convert a listing returned by ``_frame``
+
+        Args:
+            data: The listing DataFrame
+            output_format: "records", "columns" or "dataframe"
+            fields: Columns to return; all columns by default
+
+        Returns:
+            The listing in ``output_format``; records come with totalCount
+        """
+        if not isinstance(data, pd.DataFrame):
+            return await self._format_response(data)
+        if output_format != FORMAT_RECORDS:
+            return convert_dataframe(data, output_format, fields)
+        df = project_columns(data, fields)
+        return {"totalCount": len(df), "records": df.to_dict(orient="records")}
+
+    async def get_all_symbols(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get list of all available symbols.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing all symbols with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_all_symbols()
-            return await self._format_response(data)
+            data = await self._frame("get_all_symbols")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_all_symbols: {str(e)}")
             raise
 
-    async def get_symbols_by_industries(self) -> Dict:
+    async def get_symbols_by_industries(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by industry.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing symbols organized by industries with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_symbols_by_industries()
-            return await self._format_response(data)
+            data = await self._frame("get_symbols_by_industries")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_symbols_by_industries: {str(e)}")
             raise
 
-    async def get_symbols_by_exchange(self) -> Dict:
+    async def get_symbols_by_exchange(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols grouped by exchange.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing symbols organized by exchanges with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_symbols_by_exchange()
-            return await self._format_response(data)
+            data = await self._frame("get_symbols_by_exchange")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_symbols_by_exchange: {str(e)}")
             raise
 
-    async def get_symbols_by_group(self, group: str = 'VN30') -> Dict:
+    async def get_symbols_by_group(self, group: str = 'VN30', output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get symbols in a specific group.
         
         Args:
             group: Group name (e.g., VN30, HNX30)
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
             
         Returns:
             Dictionary containing symbols in the specified group with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_symbols_by_group(group=group)
-            return await self._format_response(data)
+            data = await self._frame("get_symbols_by_group", group=group)
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_symbols_by_group: {str(e)}")
             raise
 
-    async def get_industries_icb(self) -> Dict:
+    async def get_industries_icb(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get industry classification benchmark data.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing industry classification data with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_industries_icb()
-            return await self._format_response(data)
+            data = await self._frame("get_industries_icb")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_industries_icb: {str(e)}")
             raise
 
-    async def get_all_future_indices(self) -> Dict:
+    async def get_all_future_indices(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all future indices.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing future indices data with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_all_future_indices()
-            return await self._format_response(data)
+            data = await self._frame("get_all_future_indices")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_all_future_indices: {str(e)}")
             raise
 
-    async def get_all_covered_warrant(self) -> Dict:
+    async def get_all_covered_warrant(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all covered warrants.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing covered warrants data with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_all_covered_warrant()
-            return await self._format_response(data)
+            data = await self._frame("get_all_covered_warrant")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_all_covered_warrant: {str(e)}")
             raise
 
-    async def get_all_bonds(self) -> Dict:
+    async def get_all_bonds(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all bonds.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing bonds data with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_all_bonds()
-            return await self._format_response(data)
+            data = await self._frame("get_all_bonds")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_all_bonds: {str(e)}")
             raise
 
-    async def get_all_government_bonds(self) -> Dict:
+    async def get_all_government_bonds(self, output_format: str = FORMAT_RECORDS, fields: Optional[List[str]] = None) -> Dict:
         """Get all government bonds.
         
+        Args:
+            output_format: "records" for row dicts or "columns" for column arrays
+            fields: Columns to return, projected before conversion; all columns by default
+            
         Returns:
             Dictionary containing government bonds data with totalCount and records fields
         """
         try:
-            data = await self.datasource.get_all_government_bonds()
-            return await self._format_response(data)
+            data = await self._frame("get_all_government_bonds")
+            return await self._view(data, output_format, fields)
         except Exception as e:
             logger.error(f"Error in get_all_government_bonds: {str(e)}")
             raise 
\ No newline at end of file
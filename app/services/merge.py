@@ -0,0 +1,179 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import math
+
+# Added to every merged list record: the providers that returned it, in precedence order
+PROVENANCE_FIELD = "_sources"
+
+# Natural key of each company info list section. Each key part lists the field
+# names the providers use for it (TCBS and VCI differ for some sections); the
+# first one present in a record is used.
+SECTION_KEYS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "listKeyOfficer": (("officer_name", "name"), ("officer_position", "position")),
+    "listShareHolder": (("share_holder", "name"),),
+    "listInsiderDealing": (
+        ("deal_announce_date", "dealAnnounceDate", "an_date", "anDate"),
+        ("name", "insider_name", "trader_name"),
+        ("deal_quantity", "dealQuantity", "quantity", "share_volume"),
+    ),
+    "listSubCompany": (("sub_company_name", "organ_name", "company_name", "companyName"),),
+    "listEventNews": (
+        ("notify_date", "public_date", "exer_date"),
+        ("event_code", "event_list_code", "event_name", "event_title"),
+    ),
+    "listActivityNews": (("title", "news_title"), ("publish_date", "public_date")),
+    "listDividendPaymentHis": (
+        ("exercise_date", "exer_date"),
+        ("issue_method", "event_code"),
+        ("cash_dividend_percentage", "ratio"),
+    ),
+}
+
+
+def _normalize(value: Any) -> Any:
+    """Reduce a key value to a form that compares equal across providers"""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        # 5.0 and 5 are the same key
+        return int(value) if value.is_integer() else round(value, 6)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()[:10]
+    if isinstance(value, str):
+        text = " ".join(value.split()).casefold()
+        if len(text) >= 10 and text[4] == "-" and text[7] == "-":
+            # "2024-05-01 00:00:00" and "2024-05-01" are the same date
+            return text[:10]
+        return text or None
+    return value
+
+
+def natural_key(record: Mapping[str, Any], key_fields: Sequence[Sequence[str]]) -> Optional[Tuple]:
+    """Build the natural key of a record
+
+    Args:
+        record: One list record
+        key_fields: Alternative field names for each key part
+
+    Returns:
+        The normalized key, or None if any key part is missing (the record is then never deduplicated)
+    """
+    parts = []
+    for candidates in key_fields:
+        value = next((record[name] for name in candidates if name in record), None)
+        value = _normalize(value)
+        if value is None:
+            return None
+        parts.append(value)
+    return tuple(parts)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class _Merged:
+    """A merged record and, per field, the provider its value came from"""
+
+    __slots__ = ("record", "owners", "sources")
+
+    def __init__(self, record: Mapping[str, Any], provider: str):
+        self.record = dict(record)
+        self.owners = dict.fromkeys(self.record, provider)
+        self.sources = [provider]
+
+    def absorb(self, record: Mapping[str, Any], provider: str, rank: Mapping[str, Mapping[str, int]]) -> None:
+        """Take the fields of a duplicate record where its provider has precedence"""
+        if provider not in self.sources:
+            self.sources.append(provider)
+        for field, value in record.items():
+            if _is_missing(value):
+                continue
+            if field not in self.record or _is_missing(self.record[field]):
+                take = True
+            else:
+                order = rank.get(field, rank[""])
+                take = order.get(provider, len(order)) < order.get(self.owners[field], len(order))
+            if take:
+                self.record[field] = value
+                self.owners[field] = provider
+
+
+def _ranks(precedence: Sequence[str], field_precedence: Mapping[str, Sequence[str]]) -> Dict[str, Dict[str, int]]:
+    """Provider rank per field; "" holds the default order"""
+    ranks = {"": {provider: i for i, provider in enumerate(precedence)}}
+    for field, order in field_precedence.items():
+        ranks[field] = {provider: i for i, provider in enumerate(order)}
+    return ranks
+
+
+def merge_records(
+    records: Mapping[str, Optional[Sequence[Mapping[str, Any]]]],
+    key_fields: Sequence[Sequence[str]],
+    precedence: Sequence[str],
+    field_precedence: Optional[Mapping[str, Sequence[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """Merge list records from several providers, dropping duplicates
+
+    Records are indexed by natural key in a dict, so the merge is linear in the
+    number of records. Records with the same key are merged into one: a field
+    keeps the value of the provider that comes first in its precedence order,
+    and missing values (None/NaN) are filled from the other providers. Every
+    merged record gets a ``PROVENANCE_FIELD`` list of the providers that
+    returned it. Records without a complete key are kept as they are.
+
+    Args:
+        records: Records per provider; None for a provider without data
+        key_fields: Alternative field names for each natural key part
+        precedence: Providers in default precedence order
+        field_precedence: Provider order for individual fields, overriding ``precedence``
+
+    Returns:
+        Merged records, in the order first seen (providers taken in precedence order)
+    """
+    rank = _ranks(precedence, field_precedence or {})
+    providers = sorted(records, key=lambda provider: rank[""].get(provider, len(precedence)))
+    merged: List[_Merged] = []
+    index: Dict[Tuple, _Merged] = {}
+    for provider in providers:
+        for record in records[provider] or []:
+            key = natural_key(record, key_fields)
+            existing = index.get(key) if key is not None else None
+            if existing is not None:
+                existing.absorb(record, provider, rank)
+                continue
+            entry = _Merged(record, provider)
+            merged.append(entry)
+            if key is not None:
+                index[key] = entry
+    return [{**entry.record, PROVENANCE_FIELD: entry.sources} for entry in merged]
+
+
+def merge_fields(
+    records: Mapping[str, Optional[Mapping[str, Any]]],
+    precedence: Sequence[str],
+    field_precedence: Optional[Mapping[str, Sequence[str]]] = None,
+) -> Dict[str, Any]:
+    """Merge one record (such as a company profile) from several providers, field by field
+
+    Args:
+        records: The record per provider; None for a provider without data
+        precedence: Providers in default precedence order
+        field_precedence: Provider order for individual fields, overriding ``precedence``
+
+    Returns:
+        The merged record, without provenance
+    """
+    rank = _ranks(precedence, field_precedence or {})
+    merged: Optional[_Merged] = None
+    for provider in sorted(records, key=lambda provider: rank[""].get(provider, len(precedence))):
+        record = records[provider]
+        if not record:
+            continue
+        if merged is None:
+            merged = _Merged(record, provider)
+        else:
+            merged.absorb(record, provider, rank)
+    return merged.record if merged is not None else {}
@@ -0,0 +1,298 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Set, Tuple
+import asyncio
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.datasources.registry import datasource_registry
+from app.infrastructure.scheduler import PRIORITY_BACKGROUND, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+# symbol -> field -> value; None for missing values
+Rows = Dict[str, Dict[str, Any]]
+
+
+def board_state(board: pd.DataFrame, previous: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Price board indexed by symbol, keeping the rows of ``previous`` that ``board`` lacks
+
+    A symbol missing from one poll keeps its last known values instead of
+    being reported as changed when it comes back.
+    """
+    board = board.drop_duplicates("symbol", keep="last").set_index("symbol")
+    if previous is None or previous.empty:
+        return board
+    return pd.concat([previous.drop(board.index, errors="ignore"), board])
+
+
+def diff_boards(previous: Optional[pd.DataFrame], current: pd.DataFrame) -> Rows:
+    """Fields of ``current`` that differ from ``previous``, both indexed by symbol
+
+    Missing values equal each other, so a field that stays empty is not
+    reported; symbols and columns new in ``current`` report their non-empty
+    fields.
+    """
+    if previous is None:
+        previous = pd.DataFrame(index=current.index[:0])
+    before = previous.reindex(index=current.index, columns=current.columns)
+    now = current.to_numpy(dtype=object)
+    then = before.to_numpy(dtype=object)
+    missing_now = current.isna().to_numpy()
+    missing_then = before.isna().to_numpy()
+    changed = (missing_now != missing_then) | (~missing_now & ~missing_then & (now != then))
+    changes: Rows = {}
+    columns = current.columns
+    for row, column in zip(*np.nonzero(changed)):
+        changes.setdefault(current.index[row], {})[columns[column]] = None if missing_now[row, column] else now[row, column]
+    return changes
+
+
+def board_rows(state: pd.DataFrame) -> Rows:
+    """Full rows of a board state, missing values as None"""
+    values = state.astype(object).where(state.notna(), None)
+    return {symbol: row for symbol, row in zip(values.index, values.to_dict(orient="records"))}
+
+
+class Subscriber:
+    """One client of a price board poller.
+
+    Changes are merged into a pending set instead of queued: a consumer that
+    falls behind receives one update with the latest value of every field
+    that changed since its last delivery (conflation). The poller never
+    waits for a subscriber, and a subscriber never holds more than one
+    board's worth of pending changes.
+    """
+
+    def __init__(self):
+        self._pending: Rows = {}
+        self._error: Optional[str] = None
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.conflated = 0
+
+    def publish(self, changes: Rows) -> None:
+        """Merge changes into the pending update"""
+        if self._pending:
+            self.conflated += 1
+        for symbol, fields in changes.items():
+            self._pending.setdefault(symbol, {}).update(fields)
+        self._ready.set()
+
+    def publish_error(self, detail: str) -> None:
+        """Report a failed poll; the latest error replaces an unsent one"""
+        self._error = detail
+        self._ready.set()
+
+    async def next(self) -> Tuple[Rows, Optional[str]]:
+        """Wait for the next update
+
+        Returns:
+            The pending changes (possibly empty) and the pending error, if any
+        """
+        await self._ready.wait()
+        self._ready.clear()
+        changes, self._pending = self._pending, {}
+        error, self._error = self._error, None
+        if changes:
+            self.delivered += 1
+        return changes, error
+
+
+class PriceBoardPoller:
+    """Polls the price board of one symbol set and fans the changes out to its subscribers"""
+
+    def __init__(self, source: str, symbols: Tuple[str, ...], interval: float):
+        """Initialize the poller
+
+        Args:
+            source: Data source identifier ("vci" or "tcbs")
+            symbols: Symbols of the board, sorted
+            interval: Seconds between the starts of two polls
+        """
+        self.source = source
+        self.symbols = symbols
+        self.interval = interval
+        self.subscribers: Set[Subscriber] = set()
+        # Clients holding the poller, including those waiting for the first poll
+        self.clients = 0
+        self.ready = asyncio.Event()
+        self.state: Optional[pd.DataFrame] = None
+        self.last_error: Optional[str] = None
+        self.polls = 0
+        self.errors = 0
+        self._rows: Optional[Rows] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def snapshot(self) -> Rows:
+        """Full rows of the latest board, shared by the subscribers joining before the next poll"""
+        if self._rows is None:
+            self._rows = board_rows(self.state) if self.state is not None else {}
+        return self._rows
+
+    def subscribe(self) -> Subscriber:
+        """Add a subscriber; the caller sends it ``snapshot()`` first"""
+        subscriber = Subscriber()
+        if self.last_error is not None:
+            subscriber.publish_error(self.last_error)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    async def poll(self) -> None:
+        """Fetch the board once and publish what changed"""
+        datasource = datasource_registry.create_trading_datasource(self.source)
+        try:
+            # Polls run on their own, so they queue behind requests a client is waiting for
+            with upstream_priority(PRIORITY_BACKGROUND):
+                board = await datasource.get_price_board(list(self.symbols))
+            state = board_state(board, self.state)
+            changes = diff_boards(self.state, state)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e) or type(e).__name__
+            logger.warning(f"Price board poll of {len(self.symbols)} symbols on {self.source} failed: {self.last_error}")
+            for subscriber in self.subscribers:
+                subscriber.publish_error(self.last_error)
+        else:
+            # No await in between, so a subscriber joining sees either the old snapshot and these changes, or the new snapshot
+            self.state, self._rows, self.last_error = state, None, None
+            if changes:
+                for subscriber in self.subscribers:
+                    subscriber.publish(changes)
+        finally:
+            self.polls += 1
+            self.ready.set()
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await self.poll()
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "symbols": len(self.symbols),
+            "subscribers": len(self.subscribers),
+            "polls": self.polls,
+            "errors": self.errors,
+            "delivered": sum(subscriber.delivered for subscriber in self.subscribers),
+            "conflated": sum(subscriber.conflated for subscriber in self.subscribers),
+        }
+
+
+class BoardLimitError(Exception):
+    """Raised when a new board would exceed the number of boards polled at once"""
+
+
+class PriceBoardHub:
+    """Shares one poller between all clients watching the same symbol set.
+
+    N clients of the VN30 board cost one upstream poll per interval. A poller
+    starts with its first client and stops when its last client leaves. At
+    most ``max_boards`` distinct boards are polled at once.
+    """
+
+    def __init__(self, interval: float = 3.0, max_boards: int = 50):
+        """Initialize the hub
+
+        Args:
+            interval: Seconds between two polls of a board
+            max_boards: Boards polled at once before new ones are refused
+        """
+        self.interval = interval
+        self.max_boards = max_boards
+        self._pollers: Dict[Tuple[str, Tuple[str, ...]], PriceBoardPoller] = {}
+        self._counters = {"subscriptions": 0, "pollers_started": 0, "rejected": 0}
+
+    @classmethod
+    def from_settings(cls, config: Any = settings) -> "PriceBoardHub":
+        """Build the hub polling every PRICE_BOARD_POLL_INTERVAL seconds, up to PRICE_BOARD_MAX_BOARDS boards"""
+        return cls(interval=config.PRICE_BOARD_POLL_INTERVAL, max_boards=config.PRICE_BOARD_MAX_BOARDS)
+
+    @asynccontextmanager
+    async def subscribe(self, source: str, symbols: Sequence[str]) -> AsyncIterator[Tuple[Rows, Subscriber]]:
+        """Watch the board of a symbol set
+
+        Waits for the first poll of a new board, then yields the full rows and
+        a subscriber receiving the changes after them.
+
+        Args:
+            source: Data source identifier ("vci" or "tcbs")
+            symbols: Symbols to watch; the order does not matter
+
+        Yields:
+            The current rows and the subscriber
+
+        Raises:
+            BoardLimitError: If the board is not polled yet and max_boards boards already are
+        """
+        key = (source, tuple(sorted(set(symbols))))
+        poller = self._pollers.get(key)
+        if poller is None:
+            if len(self._pollers) >= self.max_boards:
+                self._counters["rejected"] += 1
+                raise BoardLimitError(f"At most {self.max_boards} price boards are watched at once")
+            poller = PriceBoardPoller(source, key[1], self.interval)
+            self._pollers[key] = poller
+            self._counters["pollers_started"] += 1
+            poller.start()
+        poller.clients += 1
+        self._counters["subscriptions"] += 1
+        subscriber = None
+        try:
+            await poller.ready.wait()
+            subscriber = poller.subscribe()
+            yield poller.snapshot(), subscriber
+        finally:
+            poller.subscribers.discard(subscriber)
+            poller.clients -= 1
+            if poller.clients == 0 and self._pollers.get(key) is poller:
+                del self._pollers[key]
+                await poller.stop()
+
+    async def close(self) -> None:
+        """Stop every poller"""
+        pollers, self._pollers = list(self._pollers.values()), {}
+        for poller in pollers:
+            await poller.stop()
+
+    def reset(self) -> None:
+        """Forget all pollers and zero the counters; pollers still running are cancelled"""
+        for poller in self._pollers.values():
+            poller.cancel()
+        self._pollers = {}
+        self._counters = {"subscriptions": 0, "pollers_started": 0, "rejected": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the counters and the state of each running poller"""
+        return {
+            **self._counters,
+            "interval": self.interval,
+            "max_boards": self.max_boards,
+            "boards": [poller.stats() for poller in self._pollers.values()],
+        }
+
+
+# Shared by all WebSocket connections
+price_board_hub = PriceBoardHub.from_settings(settings)
@@ -0,0 +1,270 @@
+from datetime import date, timedelta
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.datasources.base import SOURCE_VCI
+from app.core.config import settings
+from app.datasources.formats import FORMAT_DATAFRAME, FORMAT_RECORDS, convert_dataframe, project_columns
+from app.datasources.registry import datasource_registry
+from app.infrastructure.executor import run_blocking
+from app.infrastructure.history_store import SYMBOL_PATTERN, DateRange, get_history_store
+from app.infrastructure.scheduler import PRIORITY_BATCH, upstream_priority
+from app.services.indicators import Columns, IndicatorSeries, IndicatorSpec, compute_indicators, indicator_cache
+from app.services.listing_service import ListingService
+from app.services.resample import INTRADAY_MINUTES, INTERVALS, is_finer, normalize_exchange, period_end, period_start, resample_bars
+
+logger = logging.getLogger(__name__)
+
+# Intervals kept in the history store; bars of these never straddle two days
+HISTORY_INTERVALS = ("1m", "5m", "15m", "30m", "1H", "1D")
+
+# Intervals served; 1W and 1M are always resampled from finer bars
+QUOTE_INTERVALS = INTERVALS
+QUOTE_INTERVAL_PATTERN = f"^({'|'.join(QUOTE_INTERVALS)})$"
+
+# Executor the store's file I/O runs on, apart from the provider executors
+STORE_EXECUTOR = "history_store"
+
+# Bar fields the indicators are computed from
+INDICATOR_INPUTS = ("high", "low", "close")
+
+
+def _concat(head: Columns, tail: Columns) -> Columns:
+    return {name: np.concatenate([head[name], values]) for name, values in tail.items()} if head else tail
+
+
+def closed_bars(bars: pd.DataFrame, interval: str) -> int:
+    """Number of leading bars whose period has ended before today, i.e. that will not change any more"""
+    days = bars["time"].dt.date
+    ends = days if interval not in ("1W", "1M") else days.map(lambda day: period_end(day, interval))
+    return int((ends < date.today()).sum())
+
+
+class QuoteService:
+    """Service for price history, served from the on-disk history store.
+
+    A request only goes to the provider for the parts of its window the store
+    has not fetched before; everything else is read from disk. Overlapping
+    windows, e.g. the repeated runs of a backtest, therefore download each
+    day once.
+
+    Intervals the store does not cover for a window are resampled from the
+    finest stored interval that does, so e.g. 15m and 1H bars come from
+    cached 1m bars without another download. 1W and 1M bars are always
+    resampled, from 1D bars unless finer ones are stored.
+    """
+
+    def __init__(self, source: str = "vci"):
+        """Initialize the quote service
+
+        Args:
+            source: The data source to use (default: "vci")
+        """
+        self.source = source
+        self.datasource = datasource_registry.create_quote_datasource(source)
+        self.store = get_history_store()
+
+    async def _fill(self, symbol: str, interval: str, start: date, end: date) -> List[DateRange]:
+        """Fetch the parts of [start, end] the store does not cover yet
+
+        Today's session is still trading: its bars are stored but the day is
+        not recorded as covered, so it is fetched again by the next request.
+
+        Returns:
+            The date ranges fetched from the provider
+        """
+        gaps = await run_blocking(STORE_EXECUTOR, self.store.missing, self.source, interval, symbol, start, end)
+        if not gaps:
+            return gaps
+        logger.info(f"Fetching {interval} history of {symbol} from {self.source} for {len(gaps)} missing ranges")
+        results = await asyncio.gather(
+            *(self.datasource.get_history(symbol, gap_start.isoformat(), gap_end.isoformat(), interval) for gap_start, gap_end in gaps)
+        )
+        last_closed = date.today() - timedelta(days=1)
+        for (gap_start, gap_end), bars in zip(gaps, results):
+            covered = (gap_start, min(gap_end, last_closed)) if gap_start <= last_closed else None
+            await run_blocking(STORE_EXECUTOR, self.store.write, self.source, interval, symbol, bars, covered)
+        return gaps
+
+    async def _exchange(self, symbol: str) -> str:
+        """Exchange whose trading sessions apply to the symbol; HOSE if it cannot be looked up"""
+        try:
+            listing = await ListingService(SOURCE_VCI).get_symbols_by_exchange(output_format=FORMAT_DATAFRAME, fields=["symbol", "exchange"])
+            match = listing.loc[listing["symbol"] == symbol, "exchange"]
+            return normalize_exchange(match.iloc[0] if len(match) else None)
+        except Exception as e:
+            logger.warning(f"Could not look up the exchange of {symbol}, using HOSE sessions: {e}")
+            return normalize_exchange(None)
+
+    async def _bars(self, symbol: str, interval: str, start: date, end: date, exchange: Optional[str]) -> pd.DataFrame:
+        """Bars of the window, read from the store or resampled from the finest stored interval"""
+        stored = interval in HISTORY_INTERVALS
+        if not stored or await run_blocking(STORE_EXECUTOR, self.store.missing, self.source, interval, symbol, start, end):
+            for finer in HISTORY_INTERVALS:
+                if not is_finer(finer, interval):
+                    break
+                if not await run_blocking(STORE_EXECUTOR, self.store.missing, self.source, finer, symbol, start, end):
+                    logger.debug(f"Resampling {interval} history of {symbol} from stored {finer} bars")
+                    return await self._resample(symbol, finer, interval, start, end, exchange)
+        if stored:
+            await self._fill(symbol, interval, start, end)
+            return await run_blocking(STORE_EXECUTOR, self.store.read, self.source, interval, symbol, start, end)
+        await self._fill(symbol, "1D", start, end)
+        return await self._resample(symbol, "1D", interval, start, end, exchange)
+
+    async def _resample(self, symbol: str, finer: str, interval: str, start: date, end: date, exchange: Optional[str]) -> pd.DataFrame:
+        bars = await run_blocking(STORE_EXECUTOR, self.store.read, self.source, finer, symbol, start, end)
+        if interval in INTRADAY_MINUTES:
+            exchange = exchange or await self._exchange(symbol)
+        return resample_bars(bars, interval, exchange)
+
+    async def get_history(
+        self,
+        symbol: str,
+        start: date,
+        end: Optional[date] = None,
+        interval: str = "1D",
+        fields: Optional[List[str]] = None,
+        exchange: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Get OHLCV bars of a symbol
+
+        A 1W or 1M window is widened to whole weeks or months (up to today),
+        so its first and last bars are complete.
+
+        Args:
+            symbol: Stock ticker symbol
+            start: First day of the window
+            end: Last day of the window (inclusive); today by default, later days are ignored
+            interval: Bar interval, one of QUOTE_INTERVALS
+            fields: Columns to return; all columns by default
+            exchange: Exchange whose sessions intraday bars are resampled by (HOSE, HNX, UPCOM);
+                looked up from the listing by default
+
+        Returns:
+            Bars sorted by time with the columns time, open, high, low, close, volume
+
+        Raises:
+            ValueError: If the interval is not supported or the window is empty
+        """
+        if interval not in QUOTE_INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        symbol = symbol.upper()
+        end = min(end or date.today(), date.today())
+        if start > end:
+            raise ValueError("start must not be after end")
+        start, end = period_start(start, interval), min(period_end(end, interval), date.today())
+        bars = await self._bars(symbol, interval, start, end, exchange)
+        return project_columns(bars, fields)
+
+    def _indicator_columns(self, key: Hashable, bars: pd.DataFrame, interval: str, indicators: Sequence[IndicatorSpec]) -> Columns:
+        """Indicator columns of the bars, extending the cached series of ``key`` where possible"""
+        times = bars["time"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+        inputs = {name: bars[name].to_numpy(dtype=np.float64) for name in INDICATOR_INPUTS}
+        series = indicator_cache.get(key)
+        computed, columns, states = 0, {}, None
+        if series is not None and len(series.times) >= len(times) and np.array_equal(series.times[:len(times)], times):
+            # An earlier end than the cached series: every bar is closed and computed already
+            indicator_cache.record("hits")
+            return {name: values[:len(times)] for name, values in series.columns.items()}
+        if series is not None and np.array_equal(series.times, times[:len(series.times)]):
+            computed, columns, states = len(series.times), series.columns, series.states
+        closed = max(closed_bars(bars, interval), computed)
+        indicator_cache.record("misses" if not computed else "hits" if computed == closed else "extended")
+        if closed > computed:
+            new, states = compute_indicators(indicators, {name: values[computed:closed] for name, values in inputs.items()}, states)
+            columns = _concat(columns, new)
+            indicator_cache.put(key, IndicatorSeries(times[:closed].copy(), columns, states))
+        if len(times) > closed:
+            # Bars of the current session change until it closes; they are computed but not cached
+            new, _ = compute_indicators(indicators, {name: values[closed:] for name, values in inputs.items()}, states)
+            columns = _concat(columns, new)
+        return columns
+
+    async def get_indicators(
+        self,
+        symbol: str,
+        start: date,
+        indicators: Sequence[IndicatorSpec],
+        end: Optional[date] = None,
+        interval: str = "1D",
+        exchange: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Get technical indicators over the price history of a symbol
+
+        The values depend on the whole window from ``start``, e.g. an EMA is
+        seeded with the first bars. Series over closed bars are cached by
+        window start, so a later request with the same start only computes
+        the bars added since.
+
+        Args:
+            symbol: Stock ticker symbol
+            start: First day of the window
+            indicators: Indicators to compute, from parse_indicators
+            end: Last day of the window (inclusive); today by default
+            interval: Bar interval, one of QUOTE_INTERVALS
+            exchange: Exchange whose sessions intraday bars are resampled by
+
+        Returns:
+            Columns time and close plus the indicator columns, NaN during each indicator's warm-up
+        """
+        symbol = symbol.upper()
+        bars = await self.get_history(symbol, start, end, interval=interval, exchange=exchange)
+        key = (self.source, interval, symbol, period_start(start, interval), tuple(indicators))
+        columns = self._indicator_columns(key, bars, interval, indicators)
+        return pd.DataFrame({"time": bars["time"], "close": bars["close"], **columns})
+
+    async def get_indicators_batch(
+        self,
+        symbols: List[str],
+        start: date,
+        indicators: Sequence[IndicatorSpec],
+        end: Optional[date] = None,
+        interval: str = "1D",
+        output_format: str = FORMAT_RECORDS,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[object, List[Dict[str, str]]]:
+        """Get the same indicators for several symbols as one table
+
+        At most ``concurrency`` symbols are evaluated at a time. A failed
+        symbol does not fail the batch; it is reported in the error list.
+
+        Args:
+            symbols: Stock ticker symbols
+            start: First day of the window
+            indicators: Indicators to compute, from parse_indicators
+            end: Last day of the window (inclusive); today by default
+            interval: Bar interval, one of QUOTE_INTERVALS
+            output_format: "records", "columns" or "dataframe"
+            concurrency: Maximum symbols evaluated at once, defaults to QUOTE_BATCH_CONCURRENCY
+
+        Returns:
+            The table (a symbol column followed by the columns of get_indicators)
+            in ``output_format``, and a list of ``{"symbol", "error"}`` entries
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.QUOTE_BATCH_CONCURRENCY)
+
+        async def evaluate(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                frame = await self.get_indicators(symbol, start, indicators, end=end, interval=interval)
+            frame.insert(0, "symbol", symbol.upper())
+            return frame
+
+        # Upstream calls of a batch queue behind interactive requests
+        with upstream_priority(PRIORITY_BATCH):
+            results = await asyncio.gather(*(evaluate(symbol) for symbol in symbols), return_exceptions=True)
+
+        frames = []
+        errors = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Batch indicators for {symbol} failed: {result}")
+                errors.append({"symbol": symbol, "error": str(result) or type(result).__name__})
+            elif not result.empty:
+                frames.append(result)
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["symbol", "time", "close"])
+        return convert_dataframe(table, output_format), errors
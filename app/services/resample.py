@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.history_store import BAR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+EXCHANGE_HOSE = "HOSE"
+EXCHANGE_HNX = "HNX"
+EXCHANGE_UPCOM = "UPCOM"
+
+# Trading sessions per exchange as (start, end) minutes after midnight, local time. Continuous
+# trading, the opening and closing auctions belong to the session; the lunch break does not.
+SESSIONS: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    EXCHANGE_HOSE: ((9 * 60, 11 * 60 + 30), (13 * 60, 14 * 60 + 45)),
+    EXCHANGE_HNX: ((9 * 60, 11 * 60 + 30), (13 * 60, 15 * 60)),  # post-close session until 15:00
+    EXCHANGE_UPCOM: ((9 * 60, 11 * 60 + 30), (13 * 60, 15 * 60)),
+}
+
+# Exchange codes used by the providers for the same exchange
+EXCHANGE_ALIASES = {"HSX": EXCHANGE_HOSE, "HASTC": EXCHANGE_HNX}
+
+# Width in minutes of the intraday intervals; the others are calendar periods
+INTRADAY_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1H": 60}
+CALENDAR_INTERVALS = ("1D", "1W", "1M")
+
+# All intervals from finest to coarsest
+INTERVALS = tuple(INTRADAY_MINUTES) + CALENDAR_INTERVALS
+
+_DAY_SECONDS = 86400
+
+
+def normalize_exchange(exchange: Optional[str]) -> str:
+    """The SESSIONS key of an exchange code; HOSE for unknown codes"""
+    code = EXCHANGE_ALIASES.get((exchange or "").upper(), (exchange or "").upper())
+    return code if code in SESSIONS else EXCHANGE_HOSE
+
+
+def is_finer(interval: str, than: str) -> bool:
+    """Check whether bars of ``interval`` can be resampled to ``than``"""
+    return INTERVALS.index(interval) < INTERVALS.index(than)
+
+
+def period_start(day: date, interval: str) -> date:
+    """First day of the calendar period of ``interval`` containing ``day``"""
+    if interval == "1W":
+        return day - timedelta(days=day.weekday())
+    if interval == "1M":
+        return day.replace(day=1)
+    return day
+
+
+def period_end(day: date, interval: str) -> date:
+    """Last day of the calendar period of ``interval`` containing ``day``"""
+    if interval == "1W":
+        return period_start(day, interval) + timedelta(days=6)
+    if interval == "1M":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return day
+
+
+def bin_labels(times: np.ndarray, interval: str, exchange: str = EXCHANGE_HOSE) -> np.ndarray:
+    """Label each bar with the start of the bar of ``interval`` it belongs to
+
+    Intraday bins are anchored to the session start and end with the
+    session: the last bin of the morning is cut short by the lunch break
+    rather than spanning it. Bars outside the sessions (pre-open prints, the
+    closing auction stamped at the session end) join the nearest bin of the
+    session before them, or the first bin of the day.
+
+    Args:
+        times: Bar times in epoch seconds (local time), sorted
+        interval: Target interval, one of INTERVALS
+        exchange: Exchange whose sessions apply to intraday intervals
+
+    Returns:
+        Epoch seconds of the bin start of each bar; non-decreasing
+    """
+    days = times // _DAY_SECONDS
+    if interval == "1D":
+        return days * _DAY_SECONDS
+    if interval == "1W":
+        return (days - (days + 3) % 7) * _DAY_SECONDS
+    if interval == "1M":
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        return months.astype("datetime64[D]").astype(np.int64) * _DAY_SECONDS
+    width = INTRADAY_MINUTES[interval]
+    sessions = np.array(SESSIONS[normalize_exchange(exchange)])
+    starts, ends = sessions[:, 0], sessions[:, 1]
+    minutes = (times % _DAY_SECONDS) // 60
+    session = np.maximum(np.searchsorted(starts, minutes, side="right") - 1, 0)
+    offset = np.maximum(minutes - starts[session], 0)
+    last_bin = (ends[session] - starts[session] - 1) // width
+    bins = np.minimum(offset // width, last_bin)
+    return days * _DAY_SECONDS + (starts[session] + bins * width) * 60
+
+
+def resample_bars(bars: pd.DataFrame, interval: str, exchange: str = EXCHANGE_HOSE) -> pd.DataFrame:
+    """Aggregate OHLCV bars to a coarser interval
+
+    Consecutive bars with the same bin label form one segment, and every
+    field is reduced over all segments at once with ``ufunc.reduceat``:
+    open is the first value, high the maximum, low the minimum, close the
+    last value and volume the sum. Missing highs and lows are ignored.
+
+    Args:
+        bars: Bars sorted by time with the columns of BAR_COLUMNS
+        interval: Target interval, one of INTERVALS
+        exchange: Exchange whose sessions apply to intraday intervals
+
+    Returns:
+        One bar per bin, labelled with the bin start
+    """
+    if bars.empty:
+        return bars.loc[:, list(BAR_COLUMNS)]
+    times = bars["time"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    labels = bin_labels(times, interval, exchange)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    last = np.r_[starts[1:], len(labels)] - 1
+    return pd.DataFrame({
+        "time": pd.to_datetime(labels[starts], unit="s"),
+        "open": bars["open"].to_numpy(dtype=np.float64)[starts],
+        "high": np.fmax.reduceat(bars["high"].to_numpy(dtype=np.float64), starts),
+        "low": np.fmin.reduceat(bars["low"].to_numpy(dtype=np.float64), starts),
+        "close": bars["close"].to_numpy(dtype=np.float64)[last],
+        "volume": np.add.reduceat(bars["volume"].to_numpy(dtype=np.int64), starts),
+    })
@@ -0,0 +1,423 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import ast
+import logging
+import math
+import operator
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.datasources.formats import flatten_column_name
+from app.infrastructure.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Short names accepted in filters for the TCBS ratio columns
+ALIASES = {
+    "pe": "price_to_earning",
+    "pb": "price_to_book",
+    "ps": "price_to_sales",
+    "ev_ebitda": "value_before_ebitda",
+    "bvps": "book_value_per_share",
+}
+
+# Columns identifying the reporting period of a ratio row, newest first after sorting
+PERIOD_COLUMNS = ("period", "year", "quarter")
+
+# Compiled filters kept per table
+MAX_COMPILED_FILTERS = 256
+
+Mask = Callable[[], np.ndarray]
+
+_COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+def latest_period(df: pd.DataFrame) -> Dict[str, Any]:
+    """Values of the most recent reporting period of a ratio table
+
+    Args:
+        df: Ratios returned by FinancialService.get_ratios as a DataFrame (one row per period)
+
+    Returns:
+        Column name -> value of the newest row; numeric values only, as floats
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return {}
+    df = df.reset_index() if df.index.name in PERIOD_COLUMNS else df
+    df = df.set_axis([flatten_column_name(column) for column in df.columns], axis=1)
+    keys = [column for column in PERIOD_COLUMNS if column in df.columns]
+    if keys:
+        df = df.sort_values(keys, ascending=False, key=lambda values: values.astype(str), kind="stable")
+    row = df.iloc[0]
+    return {
+        column: float(value)
+        for column, value in row.items()
+        if column not in PERIOD_COLUMNS and isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+    }
+
+
+class ScreenerTable:
+    """Columnar snapshot of the screening universe, one row per symbol.
+
+    Numeric columns are float64 arrays (NaN where a value is missing); text
+    columns are stored as integer codes into their distinct values, so
+    ``exchange == 'HOSE'`` compares integers instead of strings. Filters are
+    compiled once per expression into a tree of NumPy operations over these
+    arrays.
+    """
+
+    def __init__(self, frame: pd.DataFrame, built_on: Optional[date] = None):
+        """Build the table
+
+        Args:
+            frame: One row per symbol; a "symbol" column is required
+            built_on: Day the data was collected; today by default
+        """
+        self.frame = frame.reset_index(drop=True)
+        self.built_on = built_on or date.today()
+        self.numeric: Dict[str, np.ndarray] = {}
+        self.text: Dict[str, Tuple[np.ndarray, Dict[str, int]]] = {}
+        for column in self.frame.columns:
+            values = self.frame[column]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                self.numeric[column] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                codes, categories = pd.factorize(values.astype("string"))
+                self.text[column] = (codes, {str(category): code for code, category in enumerate(categories)})
+        self._lock = threading.Lock()
+        self._compiled: "OrderedDict[str, Mask]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        """Column name -> "number" or "text", aliases excluded"""
+        return {column: "number" if column in self.numeric else "text" for column in self.frame.columns}
+
+    def resolve(self, name: str) -> str:
+        """Column for a name used in a filter or sort
+
+        Raises:
+            ValueError: If there is no such column
+        """
+        column = name if name in self.frame.columns else ALIASES.get(name.lower(), name.lower())
+        if column not in self.frame.columns:
+            raise ValueError(f"Unknown column '{name}'")
+        return column
+
+    def compile(self, expression: str) -> Mask:
+        """Compile a filter expression into a function returning its boolean mask
+
+        Compiled filters are kept per table, so an expression is parsed once
+        per snapshot however often it is evaluated.
+
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        with self._lock:
+            mask = self._compiled.get(expression)
+            if mask is not None:
+                self._compiled.move_to_end(expression)
+                return mask
+        mask = compile_filter(expression, self)
+        with self._lock:
+            self._compiled[expression] = mask
+            while len(self._compiled) > MAX_COMPILED_FILTERS:
+                self._compiled.popitem(last=False)
+        return mask
+
+    def select(
+        self,
+        expression: Optional[str] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[pd.DataFrame, int]:
+        """Rows matching a filter
+
+        Args:
+            expression: Filter such as ``pe < 20 and roe > 0.15``; all rows if None
+            sort: Column to sort by, prefixed with "-" for descending; missing values come last
+            limit: Maximum rows returned
+            fields: Columns returned, "symbol" always included; names matching no column are ignored
+
+        Returns:
+            The selected rows and the number of rows that matched before ``limit``
+
+        Raises:
+            ValueError: If the expression or the sort column is invalid
+        """
+        rows = np.flatnonzero(self.compile(expression)()) if expression else np.arange(len(self))
+        matched = len(rows)
+        if sort:
+            descending = sort.startswith("-")
+            column = self.resolve(sort.lstrip("+-"))
+            if column in self.numeric:
+                values = self.numeric[column][rows]
+                order = np.argsort(-values if descending else values, kind="stable")
+            else:
+                order = np.argsort(self.frame[column].to_numpy()[rows].astype(str), kind="stable")
+                order = order[::-1] if descending else order
+            rows = rows[order]
+        if limit is not None:
+            rows = rows[:limit]
+        columns = list(self.frame.columns)
+        if fields:
+            known = [field for field in fields if field in self.frame.columns or ALIASES.get(field.lower(), field.lower()) in self.frame.columns]
+            columns = list(dict.fromkeys(["symbol"] + [self.resolve(field) for field in known]))
+        return self.frame.iloc[rows][columns].reset_index(drop=True), matched
+
+
+def compile_filter(expression: str, table: ScreenerTable) -> Mask:
+    """Compile a filter expression over the columns of a table
+
+    The expression uses Python syntax restricted to column names, numbers,
+    strings, lists, arithmetic (+ - * /), comparisons (chained ones included),
+    ``in``/``not in`` and ``and``/``or``/``not``. A comparison with a missing
+    value is false, ``!=`` and ``not in`` included; ``not`` negates a whole
+    condition, so ``not pe < 5`` matches rows without a P/E.
+
+    Args:
+        expression: Filter such as ``pe < 20 and roe > 0.15 and exchange == 'HOSE'``
+        table: Table whose columns the names refer to
+
+    Returns:
+        A function returning the boolean mask of the matching rows
+
+    Raises:
+        ValueError: If the expression is not valid or refers to unknown columns
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter: {e.msg}")
+    kind, node = _compile(tree.body, table)
+    if kind != "bool":
+        raise ValueError("The filter must be a condition, e.g. pe < 20")
+    return node
+
+
+def _constant(node: ast.AST) -> Any:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        value = _constant(node.operand)
+        if isinstance(value, str):
+            raise ValueError(f"'-' applies to numbers: {ast.unparse(node)}")
+        return -value
+    raise ValueError("Only numbers and strings may be listed after 'in'")
+
+
+def _compile(node: ast.AST, table: ScreenerTable) -> Tuple[str, Any]:
+    """Compile one node into (kind, value)
+
+    The kind is "number" (a function returning a float array), "text" (a
+    column name), "bool" (a function returning a mask) or "constant".
+    """
+    if isinstance(node, ast.BoolOp):
+        parts = []
+        for value in node.values:
+            kind, part = _compile(value, table)
+            if kind != "bool":
+                raise ValueError("'and' and 'or' combine conditions")
+            parts.append(part)
+        reduce = np.logical_and.reduce if isinstance(node.op, ast.And) else np.logical_or.reduce
+        return "bool", lambda: reduce([part() for part in parts])
+    if isinstance(node, ast.UnaryOp):
+        kind, operand = _compile(node.operand, table)
+        if isinstance(node.op, ast.Not) and kind == "bool":
+            return "bool", lambda: ~operand()
+        if isinstance(node.op, ast.USub) and kind == "constant" and not isinstance(operand, str):
+            return "constant", -operand
+        if isinstance(node.op, ast.USub) and kind == "number":
+            return "number", lambda: -operand()
+        raise ValueError("'not' applies to conditions and '-' to numbers")
+    if isinstance(node, ast.Compare):
+        comparisons = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            comparisons.append(_comparison(op, left, right, table))
+            left = right
+        if len(comparisons) == 1:
+            return "bool", comparisons[0]
+        return "bool", lambda: np.logical_and.reduce([comparison() for comparison in comparisons])
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        apply = _ARITHMETIC[type(node.op)]
+        left, right = _numeric(node.left, table), _numeric(node.right, table)
+
+        def arithmetic() -> np.ndarray:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return apply(left(), right())
+
+        return "number", arithmetic
+    if isinstance(node, ast.Name):
+        column = table.resolve(node.id)
+        if column in table.numeric:
+            values = table.numeric[column]
+            return "number", lambda: values
+        return "text", column
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and not isinstance(node.value, bool):
+        return "constant", node.value
+    raise ValueError(f"Unsupported filter syntax: {ast.unparse(node)}")
+
+
+def _numeric(node: ast.AST, table: ScreenerTable) -> Callable[[], Any]:
+    return _as_numbers(node, *_compile(node, table))
+
+
+def _as_numbers(node: ast.AST, kind: str, value: Any) -> Callable[[], Any]:
+    if kind == "number":
+        return value
+    if kind == "constant" and not isinstance(value, str):
+        return lambda: value
+    raise ValueError(f"Expected a number: {ast.unparse(node)}")
+
+
+def _comparison(op: ast.cmpop, left: ast.AST, right: ast.AST, table: ScreenerTable) -> Mask:
+    """Compile one comparison of a (possibly chained) Compare node"""
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if not isinstance(right, (ast.List, ast.Tuple, ast.Set)):
+            raise ValueError("'in' takes a list, e.g. exchange in ['HOSE', 'HNX']")
+        values = [_constant(element) for element in right.elts]
+        kind, operand = _compile(left, table)
+        if kind == "text":
+            codes, categories = table.text[operand]
+            # One flag per category plus a last, false one that code -1 (missing) indexes
+            lookup = np.zeros(len(categories) + 1, dtype=bool)
+            lookup[[categories[value] for value in values if isinstance(value, str) and value in categories]] = True
+            test = lambda: lookup[codes]
+            present = lambda: codes >= 0
+        elif kind == "number":
+            wanted = np.array([value for value in values if not isinstance(value, str)], dtype=np.float64)
+            test = lambda: np.isin(operand(), wanted)
+            present = lambda: ~np.isnan(operand())
+        else:
+            raise ValueError("'in' tests a column")
+        # A missing value is in no list and not outside one either
+        return (lambda: ~test() & present()) if isinstance(op, ast.NotIn) else test
+    if type(op) not in _COMPARISONS:
+        raise ValueError("Unsupported comparison; use <, <=, >, >=, ==, !=, in or not in")
+    compare = _COMPARISONS[type(op)]
+    left_kind, left_value = _compile(left, table)
+    right_kind, right_value = _compile(right, table)
+    if "text" in (left_kind, right_kind):
+        return _text_comparison(op, (left_kind, left_value), (right_kind, right_value), table)
+    left_numbers, right_numbers = _as_numbers(left, left_kind, left_value), _as_numbers(right, right_kind, right_value)
+
+    def numeric() -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return np.asarray(compare(left_numbers(), right_numbers()))
+
+    if not isinstance(op, ast.NotEq):
+        # NaN already fails <, <=, >, >= and ==
+        return numeric
+
+    def not_equal() -> np.ndarray:
+        left_array, right_array = left_numbers(), right_numbers()
+        with np.errstate(invalid="ignore"):
+            return np.asarray((left_array != right_array) & ~np.isnan(left_array) & ~np.isnan(right_array))
+
+    return not_equal
+
+
+def _text_comparison(op: ast.cmpop, left: Tuple[str, Any], right: Tuple[str, Any], table: ScreenerTable) -> Mask:
+    """== and != between a text column and a string, compared by category code"""
+    if not isinstance(op, (ast.Eq, ast.NotEq)):
+        raise ValueError("Text columns only support ==, != and in")
+    (column_kind, column), (value_kind, value) = (left, right) if left[0] == "text" else (right, left)
+    if value_kind != "constant" or not isinstance(value, str):
+        raise ValueError(f"Column '{column}' is text and compares with a string")
+    codes, categories = table.text[column]
+    code = categories.get(value, -2)  # -1 marks missing values; -2 matches nothing
+    if isinstance(op, ast.Eq):
+        return lambda: codes == code
+    return lambda: (codes != code) & (codes >= 0)
+
+
+class SnapshotUnavailableError(Exception):
+    """Raised when no screener snapshot can be served yet"""
+
+
+class ScreenerSnapshots:
+    """Latest screener table of each ratio source, with build statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, ScreenerTable] = {}
+        self._failed: Dict[str, List[str]] = {}
+        self._attempts: Dict[Tuple[str, str], float] = {}
+        self._builds: Dict[str, Dict[str, Any]] = {}
+        # Concurrent requests for a missing or stale table share one build
+        self.flight = SingleFlight()
+
+    def get(self, source: str) -> Optional[ScreenerTable]:
+        with self._lock:
+            return self._tables.get(source)
+
+    def failed(self, source: str) -> List[str]:
+        """Symbols of the current table whose ratios could not be fetched"""
+        with self._lock:
+            return list(self._failed.get(source, ()))
+
+    def attempt(self, source: str, kind: str = "build") -> None:
+        """Record that a build or a retry ("build" or "retry") of a source starts now
+
+        Builds and retries are timed separately, so a retry of failed symbols
+        never delays the rebuild of a snapshot from an earlier day.
+        """
+        with self._lock:
+            self._attempts[(source, kind)] = time.monotonic()
+
+    def since_attempt(self, source: str, kind: str = "build") -> float:
+        """Seconds since the last build or retry of a source started; infinite if none has"""
+        with self._lock:
+            started = self._attempts.get((source, kind))
+        return math.inf if started is None else time.monotonic() - started
+
+    def put(self, source: str, table: ScreenerTable, failed: Sequence[str], seconds: float) -> None:
+        """Replace the table of a source and record how its build went"""
+        with self._lock:
+            self._tables[source] = table
+            self._failed[source] = list(failed)
+            self._builds[source] = {
+                "built_on": table.built_on.isoformat(),
+                "symbols": len(table),
+                "columns": len(table.frame.columns),
+                "failed_symbols": len(failed),
+                "build_seconds": round(seconds, 3),
+            }
+
+    def reset(self) -> None:
+        """Drop all tables"""
+        with self._lock:
+            self._tables.clear()
+            self._failed.clear()
+            self._attempts.clear()
+            self._builds.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the latest build of each source and the builds in flight"""
+        with self._lock:
+            return {"tables": {source: dict(build) for source, build in self._builds.items()}, "building": self.flight.stats()["in_flight"]}
+
+
+# Shared by all ScreenerService instances
+screener_snapshots = ScreenerSnapshots()
@@ -0,0 +1,154 @@
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import pandas as pd
+
+from app.core.config import settings
+from app.datasources.base import SOURCE_VCI
+from app.datasources.formats import FORMAT_DATAFRAME
+from app.infrastructure.scheduler import PRIORITY_BATCH, upstream_priority
+from app.services.financial_service import FinancialService
+from app.services.listing_service import ListingService
+from app.services.resample import EXCHANGE_ALIASES, SESSIONS
+from app.services.screener import ScreenerTable, SnapshotUnavailableError, latest_period, screener_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Listing metadata kept in the screener table, when the listing has them
+LISTING_COLUMNS = ("symbol", "exchange", "organ_name", "icb_name2", "icb_name3", "icb_name4")
+
+
+def _log_refresh_failure(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Screener snapshot refresh failed: {task.exception()}")
+
+
+class ScreenerService:
+    """Service for screening the stock universe with ad-hoc filters.
+
+    Filters run in process over a snapshot taken once a day: the listing
+    metadata of every stock plus its latest financial ratios. Building a
+    snapshot fetches the ratios of each symbol through the cached
+    FinancialService.get_ratios; evaluating a filter touches no provider.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        """Initialize the screener service
+
+        Args:
+            source: Source of the financial ratios ("tcbs" or "vci"), defaults to SCREENER_SOURCE
+        """
+        self.source = source or settings.SCREENER_SOURCE
+        self.financial = FinancialService(source=self.source)
+
+    async def _universe(self) -> pd.DataFrame:
+        """Listed stocks of HOSE, HNX and UPCOM with their exchange and industry"""
+        listing = ListingService(SOURCE_VCI)
+        stocks = await listing.get_symbols_by_exchange(output_format=FORMAT_DATAFRAME)
+        if "type" in stocks.columns:
+            stocks = stocks[stocks["type"] == "STOCK"]
+        stocks = stocks.assign(exchange=stocks["exchange"].replace(EXCHANGE_ALIASES))
+        stocks = stocks[stocks["exchange"].isin(SESSIONS)]
+        try:
+            industries = await listing.get_symbols_by_industries(output_format=FORMAT_DATAFRAME)
+            extra = [column for column in industries.columns if column in LISTING_COLUMNS and column not in stocks.columns]
+            stocks = stocks.merge(industries[["symbol"] + extra].drop_duplicates("symbol"), on="symbol", how="left")
+        except Exception as e:
+            logger.warning(f"Screener snapshot without industries: {e}")
+        columns = [column for column in LISTING_COLUMNS if column in stocks.columns]
+        return stocks[columns].drop_duplicates("symbol").sort_values("symbol").reset_index(drop=True)
+
+    async def _ratios(self, symbols: Sequence[str]) -> Tuple[List[Dict[str, float]], List[str]]:
+        """Latest ratios of each symbol (empty for symbols that failed) and the symbols that failed"""
+        semaphore = asyncio.Semaphore(settings.SCREENER_CONCURRENCY)
+
+        async def fetch(symbol: str) -> Dict[str, float]:
+            async with semaphore:
+                # Each fetch queues behind interactive requests with its own deadline,
+                # taken once it is in flight rather than when the build started
+                with upstream_priority(PRIORITY_BATCH):
+                    df = await self.financial.get_ratios(symbol=symbol, period=settings.SCREENER_RATIO_PERIOD, output_format=FORMAT_DATAFRAME)
+            return latest_period(df)
+
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+
+        rows = []
+        failed = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Screener snapshot without ratios for {symbol}: {result}")
+                failed.append(symbol)
+                result = {}
+            rows.append(result)
+        return rows, failed
+
+    async def _build(self) -> ScreenerTable:
+        started = time.perf_counter()
+        screener_snapshots.attempt(self.source, "build")
+        universe = await self._universe()
+        logger.info(f"Building the {self.source} screener snapshot of {len(universe)} symbols")
+        rows, failed = await self._ratios(universe["symbol"].tolist())
+        if len(failed) > settings.SCREENER_MAX_FAILED_RATIO * len(universe):
+            raise SnapshotUnavailableError(f"Ratios failed for {len(failed)} of {len(universe)} symbols")
+        ratios = pd.DataFrame(rows, index=universe.index).drop(columns=list(universe.columns), errors="ignore")
+        table = ScreenerTable(pd.concat([universe, ratios], axis=1))
+        screener_snapshots.put(self.source, table, failed, time.perf_counter() - started)
+        logger.info(f"Screener snapshot of {len(table)} symbols built; ratios missing for {len(failed)}")
+        return table
+
+    async def _retry(self) -> ScreenerTable:
+        """Refetch the symbols whose ratios failed and patch them into the current table"""
+        started = time.perf_counter()
+        screener_snapshots.attempt(self.source, "retry")
+        table = screener_snapshots.get(self.source)
+        symbols = screener_snapshots.failed(self.source)
+        rows, failed = await self._ratios(symbols)
+        recovered = pd.DataFrame([row for row in rows if row], index=[symbol for symbol, row in zip(symbols, rows) if row])
+        if recovered.empty:
+            return table
+        frame = table.frame.set_index("symbol")
+        frame = frame.reindex(columns=frame.columns.union(recovered.columns, sort=False))
+        frame.update(recovered)
+        patched = ScreenerTable(frame.reset_index(), table.built_on)
+        screener_snapshots.put(self.source, patched, failed, time.perf_counter() - started)
+        logger.info(f"Screener snapshot retry recovered {len(symbols) - len(failed)} of {len(symbols)} symbols")
+        return patched
+
+    def _refresh(self, key: str, func: Callable[[], Awaitable[ScreenerTable]]) -> asyncio.Future:
+        """Run a build or retry in the background, shared with any already in flight"""
+        refresh = asyncio.ensure_future(screener_snapshots.flight.do(key, func))
+        refresh.add_done_callback(_log_refresh_failure)
+        return refresh
+
+    async def get_table(self) -> ScreenerTable:
+        """The current snapshot, built on first use and rebuilt once a day
+
+        A snapshot from an earlier day is returned while today's is built in
+        the background, so filters never wait for a rebuild once one exists.
+        Symbols whose ratios failed are refetched in the background, and a
+        failed build is retried, at most every SCREENER_RETRY_SECONDS.
+
+        Raises:
+            SnapshotUnavailableError: If there is no snapshot yet and the first
+                build failed recently or outlasts SCREENER_BUILD_WAIT_SECONDS
+        """
+        table = screener_snapshots.get(self.source)
+        build_due = screener_snapshots.since_attempt(self.source, "build") >= settings.SCREENER_RETRY_SECONDS
+        retry_due = screener_snapshots.since_attempt(self.source, "retry") >= settings.SCREENER_RETRY_SECONDS
+        if table is not None:
+            if table.built_on != date.today():
+                if build_due:
+                    self._refresh(self.source, self._build)
+            elif retry_due and screener_snapshots.failed(self.source):
+                self._refresh(f"{self.source}:retry", self._retry)
+            return table
+        if not build_due and not screener_snapshots.flight.in_flight(self.source):
+            raise SnapshotUnavailableError("The screener snapshot failed to build; retry later")
+        build = self._refresh(self.source, self._build)
+        try:
+            return await asyncio.wait_for(asyncio.shield(build), settings.SCREENER_BUILD_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise SnapshotUnavailableError("The screener snapshot is being built; retry later")
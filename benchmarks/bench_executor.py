@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent request throughput with and without the executor layer.
+
+A local HTTP server stands in for the TCBS upstream and answers every request
+after a fixed delay. The vnstock Company client is replaced by a stub that calls
+this server with ``requests`` (blocking, like vnstock does), and the API is driven
+in-process through httpx.
+
+"before" runs the blocking call directly on the event loop, which is what the
+datasources did before calls were routed through the executor.
+"after" uses the shared per-source executor.
+
+Usage:
+    python -m benchmarks.bench_executor [--requests 50] [--delay 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pandas as pd
+import requests
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.datasources.tcbs import company as tcbs_company
+from app.main import app
+
+
+def start_stub_upstream(delay: float) -> ThreadingHTTPServer:
+    """Start a local HTTP server that replies after ``delay`` seconds."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps([{"name": "Officer", "position": "CEO"}]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_stub_company(base_url: str):
+    """Build a Company replacement that fetches from the stub upstream."""
+
+    class StubCompany:
+        def __init__(self, symbol, source):
+            self.symbol = symbol
+
+        def officers(self, **kwargs):
+            response = requests.get(f"{base_url}/officers/{self.symbol}", timeout=10)
+            return pd.DataFrame(response.json())
+
+    return StubCompany
+
+
+async def run_inline(source, func, *args, **kwargs):
+    """Pre-executor behaviour: call the blocking function on the event loop."""
+    return func(*args, **kwargs)
+
+
+async def measure(total: int) -> float:
+    """Fire ``total`` concurrent requests and return requests per second."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.get(f"/api/v1/companies/S{i:03d}/officers", params={"source": "tcbs"})
+            for i in range(total)
+        ))
+        elapsed = time.perf_counter() - start
+    failed = [r.status_code for r in responses if r.status_code != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} requests failed: {failed[:5]}")
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50, help="Concurrent requests per run")
+    parser.add_argument("--delay", type=float, default=0.05, help="Stub upstream latency (seconds)")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Both runs request the same symbols; keep the response cache out of the measurement
+    settings.CACHE_ENABLED = False
+
+    server = start_stub_upstream(args.delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    tcbs_company.Company = make_stub_company(base_url)
+
+    original_run_coalesced = tcbs_company.run_coalesced
+    try:
+        tcbs_company.run_coalesced = run_inline
+        before = asyncio.run(measure(args.requests))
+
+        tcbs_company.run_coalesced = original_run_coalesced
+        after = asyncio.run(measure(args.requests))
+    finally:
+        tcbs_company.run_coalesced = original_run_coalesced
+        server.shutdown()
+
+    print(f"Upstream latency: {args.delay * 1000:.0f} ms, concurrent requests: {args.requests}")
+    print(f"before (inline blocking call): {before:8.1f} req/s")
+    print(f"after  (per-source executor):  {after:8.1f} req/s")
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
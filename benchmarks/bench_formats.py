@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare the records, columns and Arrow IPC output formats on wide TCBS statements.
+
+Each sample in ``docs/datasources/sample-data/tcbs`` is loaded into a DataFrame
+with its rows repeated ``--repeat`` times. The benchmark measures conversion plus
+serialization time, and the encoded payload size, for ``format=records``,
+``format=columns`` (both orjson) and an Arrow IPC stream (requires pyarrow).
+
+Usage:
+    python -m benchmarks.bench_formats [--repeat 20] [--iterations 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.rest.responses import MEDIA_TYPE_ARROW_STREAM, FastJSONResponse, dataframe_response
+from app.datasources.formats import FORMAT_COLUMNS, FORMAT_RECORDS, convert_dataframe
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "docs", "datasources", "sample-data", "tcbs",
+)
+SAMPLES = ["balance_sheet", "income_statement", "cash_flow", "financial_ratios"]
+
+
+def measure(df: pd.DataFrame, output_format: str, iterations: int):
+    """Return (mean milliseconds, encoded bytes) for converting and encoding ``df``."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = FastJSONResponse({"data": convert_dataframe(df, output_format)}).body
+    return (time.perf_counter() - start) / iterations * 1000, len(body)
+
+
+def measure_arrow(df: pd.DataFrame, iterations: int):
+    """Return (mean milliseconds, encoded bytes) for writing ``df`` as an Arrow IPC stream."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = dataframe_response(df, MEDIA_TYPE_ARROW_STREAM, {}).body
+    return (time.perf_counter() - start) / iterations * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Times each sample's rows are repeated")
+    parser.add_argument("--iterations", type=int, default=200, help="Conversions per sample and format")
+    args = parser.parse_args()
+
+    print(f"{'payload':<18}{'rows x cols':>13}{'records':>18}{'columns':>18}{'arrow':>18}")
+    for name in SAMPLES:
+        with open(os.path.join(SAMPLE_DIR, f"{name}.json"), encoding="utf-8") as f:
+            df = pd.DataFrame(json.load(f) * args.repeat)
+        records_ms, records_bytes = measure(df, FORMAT_RECORDS, args.iterations)
+        columns_ms, columns_bytes = measure(df, FORMAT_COLUMNS, args.iterations)
+        arrow_ms, arrow_bytes = measure_arrow(df, args.iterations)
+        print(
+            f"{name:<18}{f'{df.shape[0]} x {df.shape[1]}':>13}"
+            f"{f'{records_bytes // 1024} KB {records_ms:.2f} ms':>18}"
+            f"{f'{columns_bytes // 1024} KB {columns_ms:.2f} ms':>18}"
+            f"{f'{arrow_bytes // 1024} KB {arrow_ms:.2f} ms':>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
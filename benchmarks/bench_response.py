@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of response serialization: ApiResponse vs the orjson fast path.
+
+Each TCBS sample payload in ``docs/datasources/sample-data/tcbs`` is loaded into a
+DataFrame and expanded with ``to_dict(orient='records')``, the same way the
+datasources build responses. The rows are repeated ``--repeat`` times to reach
+the size of a real listing response.
+
+Two routes serve the same payload:
+- "before" returns ``ApiResponse(data=..., meta=...)``, so FastAPI validates it
+  against ``response_model`` and encodes it with the default JSON encoder
+- "after" returns ``api_response(...)``, which serializes the dicts with orjson
+
+Usage:
+    python -m benchmarks.bench_response [--repeat 80] [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import sys
+import time
+
+import httpx
+import pandas as pd
+from fastapi import FastAPI
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.rest.responses import api_response
+from app.models.schemas.listing import ApiResponse
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "docs", "datasources", "sample-data", "tcbs",
+)
+
+
+def load_payloads(repeat: int) -> dict:
+    """Load the sample files that hold record lists as to_dict payloads."""
+    payloads = {}
+    for path in sorted(glob.glob(os.path.join(SAMPLE_DIR, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        if isinstance(raw, dict):
+            # Sections such as {"listKeyOfficer": [...]} hold the records in their only list
+            lists = [value for value in raw.values() if isinstance(value, list) and value]
+            if not lists:
+                continue
+            raw = lists[0]
+        if not raw or not isinstance(raw[0], dict):
+            continue
+        df = pd.DataFrame(raw * repeat)
+        payloads[os.path.splitext(os.path.basename(path))[0]] = {
+            "totalCount": len(df),
+            "records": df.to_dict(orient="records"),
+        }
+    return payloads
+
+
+def build_app(payloads: dict) -> FastAPI:
+    """Build an app serving each payload through both response paths."""
+    app = FastAPI()
+    meta = {"version": "1.0", "source": "tcbs"}
+
+    @app.get("/before/{name}", response_model=ApiResponse)
+    async def before(name: str):
+        return ApiResponse(data=payloads[name], meta=meta)
+
+    @app.get("/after/{name}", response_model=ApiResponse)
+    async def after(name: str):
+        return api_response(data=payloads[name], meta=meta)
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> float:
+    """Return the mean latency of ``path`` in milliseconds."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path)
+        response.raise_for_status()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await client.get(path)
+        return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=80, help="Times each sample's rows are repeated")
+    parser.add_argument("--iterations", type=int, default=50, help="Requests per payload and path")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    payloads = load_payloads(args.repeat)
+    app = build_app(payloads)
+
+    print(f"{'payload':<22}{'rows':>7}{'before ms':>12}{'after ms':>11}{'speedup':>10}")
+    for name, payload in payloads.items():
+        before = asyncio.run(measure(app, f"/before/{name}", args.iterations))
+        after = asyncio.run(measure(app, f"/after/{name}", args.iterations))
+        print(f"{name:<22}{payload['totalCount']:>7}{before:>12.2f}{after:>11.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark screener filter evaluation over a universe the size of HOSE, HNX and UPCOM.
+
+A snapshot of random ratios and listing metadata is generated for ~1,600
+symbols. Each filter is compiled once by ``ScreenerTable`` and its mask is
+then evaluated repeatedly; for comparison the same filter runs through
+``DataFrame.query`` on the frame behind the table.
+
+Usage:
+    python -m benchmarks.bench_screener [--symbols 1600] [--iterations 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.screener import ScreenerTable
+
+# (screener filter, the same filter for DataFrame.query)
+FILTERS = [
+    ("pe < 20 and roe > 0.15 and exchange == 'HOSE'", "price_to_earning < 20 and roe > 0.15 and exchange == 'HOSE'"),
+    ("5 < pe < 15 and pb < 1.5", "5 < price_to_earning < 15 and price_to_book < 1.5"),
+    ("exchange in ['HNX', 'UPCOM'] and icb_name2 == 'Ngân hàng'", "exchange in ['HNX', 'UPCOM'] and icb_name2 == 'Ngân hàng'"),
+    ("roe / pb > 0.1 or not dividend > 0", "roe / price_to_book > 0.1 or not dividend > 0"),
+]
+
+
+def snapshot(symbols: int, seed: int = 0) -> pd.DataFrame:
+    """Random ratios for ``symbols`` symbols; one in ten lacks its ratios"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "symbol": [f"S{i:04d}" for i in range(symbols)],
+        "exchange": rng.choice(["HOSE", "HNX", "UPCOM"], symbols, p=[0.25, 0.2, 0.55]),
+        "icb_name2": rng.choice(["Ngân hàng", "Bất động sản", "Công nghệ Thông tin", "Hàng & Dịch vụ Công nghiệp"], symbols),
+    })
+    for column, mean, spread in [("price_to_earning", 15, 8), ("price_to_book", 1.8, 0.8), ("roe", 0.12, 0.1), ("roa", 0.05, 0.04), ("dividend", 0.03, 0.03)]:
+        values = rng.normal(mean, spread, symbols)
+        values[rng.random(symbols) < 0.1] = np.nan
+        frame[column] = values
+    return frame
+
+
+def measure(func, iterations: int) -> float:
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=1600, help="Symbols in the snapshot")
+    parser.add_argument("--iterations", type=int, default=10000, help="Evaluations per filter")
+    args = parser.parse_args()
+
+    frame = snapshot(args.symbols)
+    table = ScreenerTable(frame)
+    print(f"{len(table)} symbols, {len(frame.columns)} columns")
+    print(f"{'filter':<60}{'matches':>9}{'mask':>11}{'query':>12}{'speedup':>9}")
+    for expression, query in FILTERS:
+        mask = table.compile(expression)
+        assert mask().sum() == len(frame.query(query))
+        mask_us = measure(mask, args.iterations)
+        query_us = measure(lambda: frame.query(query), max(args.iterations // 100, 10))
+        print(f"{expression:<60}{int(mask().sum()):>9}{f'{mask_us:.1f} us':>11}{f'{query_us:.0f} us':>12}{f'{query_us / mask_us:.0f}x':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,4 +12,106 @@ from app.main import app
 def client():
     """Return a TestClient for the FastAPI application."""
     with TestClient(app) as test_client:
-        yield test_client 
\ No newline at end of file
+        yield test_client 
+
+class FakePipeline:
+    """Queues FakeRedis commands until ``execute``."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """In-memory stand-in for ``redis.asyncio.Redis`` (get/set/delete/incrby with expiry, pipelines)."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+        self.now = 0.0
+
+    async def get(self, key):
+        if key in self.expiry and self.expiry[key] <= self.now:
+            self.store.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        if ex is not None:
+            self.expiry[key] = self.now + ex
+        return True
+
+    async def delete(self, key):
+        self.expiry.pop(key, None)
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    async def incrby(self, key, amount=1):
+        value = int(await self.get(key) or 0) + amount
+        self.store[key] = str(value).encode()
+        return value
+
+    async def decrby(self, key, amount=1):
+        return await self.incrby(key, -amount)
+
+    async def expire(self, key, seconds):
+        self.expiry[key] = self.now + seconds
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    """Return an in-memory fake Redis client."""
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def reset_response_cache():
+    """Give every test an empty response cache, client pool, indicator cache, no screener snapshots or price board pollers, closed circuits, no latency history and full rate limits."""
+    from app.infrastructure.cache import set_cache
+    from app.infrastructure.circuit_breaker import circuit_breakers
+    from app.infrastructure.client_pool import client_pool
+    from app.infrastructure.provider_router import provider_router
+    from app.infrastructure.rate_limit import set_rate_limiter
+    from app.infrastructure.scheduler import upstream_scheduler
+    from app.services.indicators import indicator_cache
+    from app.services.price_board import price_board_hub
+    from app.services.screener import screener_snapshots
+
+    set_cache(None)
+    set_rate_limiter(None)
+    client_pool.clear()
+    circuit_breakers.reset()
+    provider_router.reset()
+    upstream_scheduler.reset()
+    indicator_cache.reset()
+    screener_snapshots.reset()
+    price_board_hub.reset()
+    yield
+    set_rate_limiter(None)
+    set_cache(None)
+    client_pool.clear()
+    circuit_breakers.reset()
+    provider_router.reset()
+    upstream_scheduler.reset()
+    indicator_cache.reset()
+    screener_snapshots.reset()
+    price_board_hub.reset()
@@ -0,0 +1,89 @@
+import asyncio
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.api.rest.responses import (
+    MEDIA_TYPE_ARROW_STREAM,
+    MEDIA_TYPE_JSON,
+    MEDIA_TYPE_PARQUET,
+    negotiate_media_type,
+)
+from app.datasources.tcbs import financial as tcbs_financial
+from app.datasources.vci import listing as vci_listing
+from app.infrastructure.cache import RedisCache
+from app.infrastructure.client_pool import client_pool
+
+
+class StubListing:
+    def __init__(self, source):
+        pass
+
+    def all_symbols(self, **kwargs):
+        return pd.DataFrame({"symbol": ["FPT", "VNM"], "organ_name": ["FPT Corp", "Vinamilk"]})
+
+
+class StubFinance:
+    def __init__(self, symbol, source):
+        pass
+
+    def balance_sheet(self, **kwargs):
+        return pd.DataFrame({"ticker": ["FPT", "FPT"], "year": [2023, 2024], "cash": [1.5, np.nan]})
+
+
+def test_negotiate_media_type():
+    """JSON stays the default; binary types win only when preferred."""
+    assert negotiate_media_type(None) == MEDIA_TYPE_JSON
+    assert negotiate_media_type("*/*") == MEDIA_TYPE_JSON
+    assert negotiate_media_type(MEDIA_TYPE_ARROW_STREAM) == MEDIA_TYPE_ARROW_STREAM
+    assert negotiate_media_type(f"{MEDIA_TYPE_PARQUET}, */*;q=0.1") == MEDIA_TYPE_PARQUET
+    assert negotiate_media_type(f"application/json, {MEDIA_TYPE_PARQUET};q=0.5") == MEDIA_TYPE_JSON
+
+
+def test_listing_route_returns_arrow_stream(client, monkeypatch):
+    """The Arrow IPC stream carries the DataFrame columns and the response meta."""
+    monkeypatch.setattr(vci_listing, "Listing", StubListing)
+    client_pool.clear()
+
+    response = client.get("/api/v1/listing/symbols", headers={"Accept": MEDIA_TYPE_ARROW_STREAM})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MEDIA_TYPE_ARROW_STREAM
+    assert response.headers["x-total-count"] == "2"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("symbol").to_pylist() == ["FPT", "VNM"]
+    assert b'"source":"vci"' in table.schema.metadata[b"vnstock_api.meta"]
+
+
+def test_financial_route_returns_parquet(client, monkeypatch):
+    """Parquet keeps numeric dtypes and missing values."""
+    monkeypatch.setattr(tcbs_financial, "Finance", StubFinance)
+    client_pool.clear()
+
+    response = client.get("/api/v1/financial/FPT/balance-sheets", headers={"Accept": MEDIA_TYPE_PARQUET})
+
+    assert response.status_code == 200
+    df = pq.read_table(io.BytesIO(response.content)).to_pandas()
+    assert df["year"].tolist() == [2023, 2024]
+    assert np.isnan(df["cash"][1])
+
+    # JSON is unaffected by the cached DataFrame
+    data = client.get("/api/v1/financial/FPT/balance-sheets").json()["data"]
+    assert data["records"][0] == {"ticker": "FPT", "year": 2023, "cash": 1.5}
+
+
+def test_redis_round_trips_dataframes(fake_redis):
+    """Raw DataFrames are shared through Redis with their dtypes and multi-level columns."""
+    cache = RedisCache(fake_redis)
+    df = pd.DataFrame(
+        [[pd.Timestamp("2024-03-31"), 1.5], [pd.Timestamp("2024-06-30"), None]],
+        columns=pd.MultiIndex.from_tuples([("Meta", "date"), ("Chỉ tiêu", "ROE")]),
+    )
+
+    asyncio.run(cache.set_entry("k", {"value": df, "fresh_until": 10}, expires_at=0, ttl=60))
+    value, _ = asyncio.run(cache.get_entry("k"))
+
+    pd.testing.assert_frame_equal(value["value"], df)
@@ -0,0 +1,290 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.cache import LRUCache, RedisCache, TieredCache, cache_key, cached, set_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_and_expires():
+    """The L1 cache is bounded and honours TTLs."""
+    clock = Clock()
+    lru = LRUCache(max_entries=2, clock=clock)
+    lru.set("a", 1, ttl=10)
+    lru.set("b", 2, ttl=10)
+    lru.get("a")
+    lru.set("c", 3, ttl=10)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+
+    clock.now += 11
+    assert lru.get("a") is None
+    assert len(lru) == 1
+
+
+def test_cache_key_normalizes_symbol_and_source_and_hashes_params():
+    """Keys are stable across argument order and symbol case."""
+    key = cache_key("financial", "get_ratios", "fpt", "TCBS", {"period": "year", "lang": "vi"})
+
+    assert key.startswith("financial:get_ratios:FPT:tcbs:")
+    assert key == cache_key("financial", "get_ratios", "FPT", "tcbs", {"lang": "vi", "period": "year"})
+    assert key != cache_key("financial", "get_ratios", "FPT", "tcbs", {"lang": "vi", "period": "quarter"})
+
+
+def test_l2_hit_refills_l1_with_remaining_ttl(fake_redis):
+    """A value written by one process is served from Redis to another and then from memory."""
+    clock = Clock()
+    writer = TieredCache(LRUCache(clock=clock), RedisCache(fake_redis), clock=clock)
+    reader = TieredCache(LRUCache(clock=clock), RedisCache(fake_redis), clock=clock)
+
+    asyncio.run(writer.set("k", {"records": [1, 2]}, ttl=60))
+    clock.now += 20
+
+    assert asyncio.run(reader.get("k")) == {"records": [1, 2]}
+    assert reader.stats()["l2_hits"] == 1
+    assert reader.l1.get_entry("k")[1] == 1060.0
+
+    assert asyncio.run(reader.get("k")) == {"records": [1, 2]}
+    assert reader.stats()["l1_hits"] == 1
+
+
+def test_redis_encodes_dataframe_values(fake_redis):
+    """Values produced by DataFrame.to_dict survive the JSON round trip."""
+    records = pd.DataFrame({
+        "date": [pd.Timestamp("2024-03-31")],
+        "value": [np.int64(7)],
+        "ratio": [np.nan],
+    }).to_dict(orient="records")
+    cache = RedisCache(fake_redis)
+
+    asyncio.run(cache.set_entry("k", records, expires_at=2000.0, ttl=60))
+    value, expires_at = asyncio.run(cache.get_entry("k"))
+
+    assert value[0]["date"] == "2024-03-31T00:00:00"
+    assert value[0]["value"] == 7
+    assert np.isnan(value[0]["ratio"])
+    assert expires_at == 2000.0
+
+
+def test_redis_errors_are_treated_as_misses():
+    """An unreachable Redis degrades to L1-only caching."""
+
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ex=None):
+            raise ConnectionError("down")
+
+    cache = TieredCache(LRUCache(), RedisCache(BrokenRedis()))
+    asyncio.run(cache.set("k", [1], ttl=60))
+
+    assert asyncio.run(cache.get("k")) == [1]
+    assert asyncio.run(cache.get("other")) is None
+
+
+class CountingService:
+    def __init__(self, source="tcbs"):
+        self.source = source
+        self.calls = 0
+
+    @cached("financial", ttl=lambda params: 10 if params["period"] == "quarter" else 100)
+    async def get_ratios(self, symbol, period="year"):
+        self.calls += 1
+        return [{"symbol": symbol, "period": period}]
+
+    @cached("company", ttl=60, should_cache=lambda value: value["complete"])
+    async def get_company_info(self, symbol, source="unified", complete=True):
+        self.calls += 1
+        return {"complete": complete}
+
+
+def test_cached_decorator_keys_on_symbol_source_and_params(fake_redis):
+    """Repeated calls are served from cache; different params or sources are not shared."""
+    clock = Clock()
+    set_cache(TieredCache(LRUCache(clock=clock), RedisCache(fake_redis), clock=clock))
+    service = CountingService()
+
+    asyncio.run(service.get_ratios("FPT"))
+    asyncio.run(service.get_ratios(symbol="fpt", period="year"))
+    assert service.calls == 1
+
+    asyncio.run(service.get_ratios("FPT", period="quarter"))
+    asyncio.run(CountingService(source="vci").get_ratios("FPT"))
+    assert service.calls == 2
+
+    clock.now += 11
+    asyncio.run(service.get_ratios("FPT", period="quarter"))
+    asyncio.run(service.get_ratios("FPT"))
+    assert service.calls == 3
+
+
+def test_cached_decorator_respects_should_cache():
+    """Incomplete results are not cached."""
+    service = CountingService()
+
+    asyncio.run(service.get_company_info("FPT", complete=False))
+    asyncio.run(service.get_company_info("FPT", complete=False))
+    asyncio.run(service.get_company_info("FPT"))
+    asyncio.run(service.get_company_info("FPT"))
+
+    assert service.calls == 3
+
+
+def test_cache_disabled_bypasses_cache(monkeypatch):
+    """CACHE_ENABLED=false calls through every time."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    service = CountingService()
+
+    asyncio.run(service.get_ratios("FPT"))
+    asyncio.run(service.get_ratios("FPT"))
+
+    assert service.calls == 2
+
+
+class SlowStatementService:
+    def __init__(self, delay=0.0):
+        self.source = "tcbs"
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    @cached("financial", ttl=10, hard_ttl=100)
+    async def get_balance_sheet(self, symbol, period="year"):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return [{"symbol": symbol, "version": self.calls}]
+
+
+def swr_cache(clock, backoff=30, backoff_max=120):
+    from app.infrastructure.cache.swr import Revalidator
+
+    cache = TieredCache(LRUCache(clock=clock), clock=clock,
+                        revalidator=Revalidator(backoff=backoff, backoff_max=backoff_max, clock=clock))
+    set_cache(cache)
+    return cache
+
+
+def test_stale_entry_is_served_immediately_and_refreshed_in_background():
+    """Past the soft TTL, callers get the cached copy without waiting for the upstream."""
+    clock = Clock()
+    cache = swr_cache(clock)
+    service = SlowStatementService()
+
+    async def main():
+        first = await service.get_balance_sheet("FPT")
+        clock.now += 11
+        service.delay = 0.2
+
+        start = time.perf_counter()
+        stale = await service.get_balance_sheet("FPT")
+        again = await service.get_balance_sheet("FPT")
+        elapsed = time.perf_counter() - start
+
+        await cache.revalidator.drain()
+        fresh = await service.get_balance_sheet("FPT")
+        return first, stale, again, elapsed, fresh
+
+    first, stale, again, elapsed, fresh = asyncio.run(main())
+
+    assert stale == first == again == [{"symbol": "FPT", "version": 1}]
+    assert elapsed < 0.1
+    assert fresh == [{"symbol": "FPT", "version": 2}]
+    assert service.calls == 2
+    assert cache.revalidator.stats()["succeeded"] == 1
+
+
+def test_hard_ttl_bounds_staleness():
+    """Past the hard TTL the entry is gone and the caller waits for a fresh fetch."""
+    clock = Clock()
+    swr_cache(clock)
+    service = SlowStatementService()
+
+    async def main():
+        await service.get_balance_sheet("FPT")
+        clock.now += 101
+        return await service.get_balance_sheet("FPT")
+
+    assert asyncio.run(main()) == [{"symbol": "FPT", "version": 2}]
+
+
+def test_failed_refresh_backs_off_and_keeps_serving_stale():
+    """A failing upstream is retried only after the backoff, with the stale copy served meanwhile."""
+    clock = Clock()
+    cache = swr_cache(clock, backoff=30, backoff_max=120)
+    service = SlowStatementService()
+
+    async def request():
+        value = await service.get_balance_sheet("FPT")
+        await cache.revalidator.drain()
+        return value
+
+    async def main():
+        await request()
+        service.fail = True
+        clock.now += 11
+        values = [await request() for _ in range(3)]
+        calls_during_backoff = service.calls
+        clock.now += 31
+        await request()
+        return values, calls_during_backoff
+
+    values, calls_during_backoff = asyncio.run(main())
+
+    assert all(value == [{"symbol": "FPT", "version": 1}] for value in values)
+    assert calls_during_backoff == 2
+    assert service.calls == 3
+    stats = cache.revalidator.stats()
+    assert stats["failed"] == 2
+    assert stats["backing_off"] == 1
+
+
+class CountingRatios:
+    """Financial datasource returning a fixed ratios frame"""
+
+    calls = 0
+
+    def create_financial_datasource(self, source):
+        return self
+
+    async def get_ratios(self, symbol, output_format, **kwargs):
+        CountingRatios.calls += 1
+        return pd.DataFrame({"year": [2024], "roe": [0.2], "pe": [12.0]})
+
+
+def test_projections_and_formats_share_one_entry():
+    """fields and output_format are applied after the lookup; only upstream parameters key the cache."""
+    from app.datasources.formats import FORMAT_COLUMNS, FORMAT_DATAFRAME
+    from app.services.financial_service import FinancialService
+
+    service = FinancialService()
+    service.data_source_factory = CountingRatios()
+    CountingRatios.calls = 0
+
+    async def scenario():
+        return [
+            await service.get_ratios("FPT", fields=["roe", "pe"]),
+            await service.get_ratios("FPT", fields=["pe", "roe"]),
+            await service.get_ratios("FPT", output_format=FORMAT_COLUMNS),
+            await service.get_ratios("FPT", output_format=FORMAT_DATAFRAME),
+        ]
+
+    projected, reordered, columns, frame = asyncio.run(scenario())
+
+    assert CountingRatios.calls == 1
+    assert list(projected[0]) == ["roe", "pe"] and list(reordered[0]) == ["pe", "roe"]
+    assert columns["columns"]["year"] == [2024] and list(frame.columns) == ["year", "roe", "pe"]
@@ -0,0 +1,214 @@
+import asyncio
+import json
+
+import pytest
+
+from app.datasources.base import SOURCE_TCBS, SOURCE_UNIFIED, SOURCE_VCI
+from app.infrastructure.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    circuit_breakers,
+    is_client_error,
+)
+from app.core.config import settings
+from app.core.exceptions import StockSymbolNotFoundError
+from app.infrastructure.provider_router import provider_router
+from app.infrastructure.scheduler import UpstreamThrottledError
+from app.services.company_service import CompanyService
+from app.services.financial_service import FinancialService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuit_opens_on_error_rate_and_recovers_after_probe():
+    """Closed -> open at the failure rate, half-open after the open period, closed on a good probe."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=4, min_calls=4, failure_rate=0.5, open_seconds=10, clock=clock)
+
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok, 0.1)
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_failed_probe_doubles_open_period_and_slow_calls_count():
+    """Slow calls are bad calls; a failed probe reopens for longer."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=2, min_calls=2, slow_call_seconds=1, open_seconds=10, open_seconds_max=15, clock=clock)
+
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    assert breaker.state == STATE_OPEN
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == 15
+
+
+def test_registry_fails_fast_while_open():
+    """An open circuit rejects calls without running them."""
+    registry = CircuitBreakerRegistry(window_size=1, min_calls=1)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise RuntimeError("down")
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await registry.call(SOURCE_TCBS, "get_ratios", failing)
+        with pytest.raises(CircuitOpenError):
+            await registry.call(SOURCE_TCBS, "get_ratios", failing)
+
+    asyncio.run(run())
+    assert calls == [1]
+    assert registry.stats()["tcbs:get_ratios"]["state"] == STATE_OPEN
+
+
+def test_shed_calls_do_not_open_the_circuit():
+    """Calls shed by our own scheduler never reached the provider and are not its failures."""
+    async def shed():
+        raise UpstreamThrottledError(SOURCE_TCBS, 12.0)
+
+    async def run():
+        for _ in range(settings.CIRCUIT_MIN_CALLS):
+            with pytest.raises(UpstreamThrottledError):
+                await provider_router.timed_call(SOURCE_TCBS, "get_company_overview", shed)
+
+    asyncio.run(run())
+    assert circuit_breakers.stats()["tcbs:get_company_overview"]["state"] == STATE_CLOSED
+    assert not circuit_breakers.is_open(SOURCE_TCBS, "get_company_overview")
+    assert provider_router.get(SOURCE_TCBS, "get_company_overview").success_rate() == 1.0
+
+
+def test_coalesced_failure_counts_once():
+    """Concurrent requests sharing one failed upstream call record one failure, not one per request."""
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("TCBS down")
+
+    async def run():
+        requests = [
+            provider_router.timed_call(SOURCE_TCBS, "get_company_profile", failing, key="FPT")
+            for _ in range(settings.CIRCUIT_MIN_CALLS)
+        ]
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == [1]
+    assert circuit_breakers.stats()["tcbs:get_company_profile"]["state"] == STATE_CLOSED
+    assert len(provider_router.get(SOURCE_TCBS, "get_company_profile")) == 1
+
+
+@pytest.mark.parametrize("error", [ValueError("Unknown symbol ZZZ"), StockSymbolNotFoundError("ZZZ")])
+def test_client_errors_do_not_open_the_circuit(error):
+    async def unknown_symbol():
+        raise error
+
+    async def run():
+        for _ in range(settings.CIRCUIT_MIN_CALLS):
+            with pytest.raises(type(error)):
+                await provider_router.timed_call(SOURCE_VCI, "get_ratios", unknown_symbol)
+
+    asyncio.run(run())
+    assert not circuit_breakers.is_open(SOURCE_VCI, "get_ratios")
+    assert provider_router.get(SOURCE_VCI, "get_ratios").success_rate() == 1.0
+
+
+def test_undecodable_responses_are_provider_failures():
+    assert is_client_error(ValueError("Unknown symbol"))
+    assert not is_client_error(json.JSONDecodeError("Expecting value", "<html>", 0))
+    assert not is_client_error(RuntimeError("TCBS down"))
+
+
+class SickTcbsFactory:
+    """TCBS always fails, VCI answers"""
+
+    def __init__(self):
+        self.tcbs_calls = 0
+
+    def create_company_datasource(self, source):
+        return self._source(source)
+
+    def create_financial_datasource(self, source):
+        return self._source(source)
+
+    def _source(self, source):
+        factory = self
+
+        class Source:
+            async def get_company_profile(self, symbol):
+                return self._answer({"source": source})
+
+            async def get_ratios(self, symbol, **kwargs):
+                return self._answer([{"source": source}])
+
+            def _answer(self, value):
+                if source == SOURCE_TCBS:
+                    factory.tcbs_calls += 1
+                    raise RuntimeError("TCBS down")
+                return value
+
+        return Source()
+
+
+def test_financial_unified_falls_back_and_skips_open_circuit(monkeypatch):
+    """FinancialService(unified) falls back to VCI and stops calling TCBS once its circuit opens."""
+    factory = SickTcbsFactory()
+    service = FinancialService(source=SOURCE_UNIFIED)
+    service.data_source_factory = factory
+    monkeypatch.setattr(circuit_breakers, "_options", {"window_size": 2, "min_calls": 2})
+
+    for _ in range(5):
+        ratios = asyncio.run(service._statement.__wrapped__(service, "get_ratios", "FPT"))
+        assert ratios == [{"source": SOURCE_VCI}]
+
+    assert factory.tcbs_calls == 2
+    assert circuit_breakers.stats()["tcbs:get_ratios"]["state"] == STATE_OPEN
+
+
+def test_company_profile_skips_open_circuit(monkeypatch):
+    """Unified profile requests stop waiting for a provider whose circuit is open."""
+    factory = SickTcbsFactory()
+    service = CompanyService(factory)
+    monkeypatch.setattr(circuit_breakers, "_options", {"window_size": 1, "min_calls": 1})
+
+    for _ in range(3):
+        assert asyncio.run(service.get_company_profile("FPT")) == {"source": SOURCE_VCI}
+
+    assert factory.tcbs_calls == 1
+
+
+def test_ops_circuits_endpoint(client):
+    """Circuit states are exposed on the ops router."""
+    circuit_breakers.get(SOURCE_VCI, "get_company_news").record(True, 0.2)
+
+    data = client.get("/api/v1/ops/circuits").json()["data"]
+
+    assert data["vci:get_company_news"]["state"] == STATE_CLOSED
+    assert data["vci:get_company_news"]["calls"] == 1
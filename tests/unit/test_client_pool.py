@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pandas as pd
+
+from app.datasources.registry import DataSourceRegistry, datasource_registry
+from app.datasources.tcbs import company as tcbs_company
+from app.datasources.tcbs.company import TcbsCompanyDataSource
+from app.infrastructure.client_pool import ClientPool, client_pool
+from app.services.listing_service import ListingService
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pool_reuses_clients_per_symbol_and_source():
+    """One client per (kind, symbol, source); symbol case does not matter."""
+    pool = ClientPool(max_size=10, max_age=60)
+    built = []
+
+    def factory():
+        built.append(1)
+        return object()
+
+    first = pool.get("company", "fpt", "TCBS", factory)
+    assert pool.get("company", "FPT", "tcbs", factory) is first
+    assert pool.get("company", "FPT", "vci", factory) is not first
+    assert pool.get("finance", "FPT", "tcbs", factory) is not first
+    assert len(built) == 3
+    assert pool.stats()["hits"] == 1
+
+
+def test_pool_rebuilds_clients_after_max_age():
+    """vnstock memoizes per client, so old clients are replaced."""
+    clock = Clock()
+    pool = ClientPool(max_size=10, max_age=60, clock=clock)
+
+    first = pool.get("listing", None, "vci", object)
+    clock.now += 61
+    second = pool.get("listing", None, "vci", object)
+
+    assert second is not first
+    assert pool.stats()["expired"] == 1
+
+
+def test_pool_is_bounded():
+    """The least recently used client is evicted."""
+    pool = ClientPool(max_size=2, max_age=60)
+    a = pool.get("company", "AAA", "tcbs", object)
+    pool.get("company", "BBB", "tcbs", object)
+    pool.get("company", "AAA", "tcbs", object)
+    pool.get("company", "CCC", "tcbs", object)
+
+    assert pool.get("company", "AAA", "tcbs", object) is a
+    assert pool.stats()["evicted"] == 1
+    assert pool.stats()["size"] == 2
+
+
+def test_datasource_calls_reuse_pooled_company_client(monkeypatch):
+    """Sequential requests for one symbol build the vnstock client once."""
+    constructed = []
+    lock = threading.Lock()
+
+    class StubCompany:
+        def __init__(self, symbol, source):
+            with lock:
+                constructed.append(symbol)
+
+        def officers(self, **kwargs):
+            return pd.DataFrame([{"name": "Officer"}])
+
+        def shareholders(self, **kwargs):
+            return pd.DataFrame([{"name": "Holder"}])
+
+    monkeypatch.setattr(tcbs_company, "Company", StubCompany)
+    datasource = TcbsCompanyDataSource()
+
+    async def main():
+        await datasource.get_company_officers("FPT")
+        await datasource.get_shareholders("FPT")
+        await TcbsCompanyDataSource().get_company_officers("FPT")
+
+    asyncio.run(main())
+
+    assert constructed == ["FPT"]
+
+
+def test_registry_returns_shared_datasources():
+    """Services get the same datasource instance on every request."""
+    registry = DataSourceRegistry()
+
+    assert registry.create_company_datasource("tcbs") is registry.create_company_datasource("TCBS")
+    assert registry.create_financial_datasource("vci") is registry.create_financial_datasource("vci")
+    assert ListingService("vci").datasource is ListingService("vci").datasource
+    assert "listing:vci" in datasource_registry.stats()["datasources"]
+
+
+def test_registry_is_started_by_lifespan(client):
+    """Company and financial datasources exist before the first request."""
+    datasources = client.get("/api/v1/ops/stats").json()["data"]["registry"]["datasources"]
+
+    assert {"company:tcbs", "company:vci", "financial:tcbs", "financial:vci"} <= set(datasources)
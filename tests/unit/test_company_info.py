@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from app.datasources.base import COMPANY_INFO_SECTIONS, SOURCE_TCBS, SOURCE_VCI, is_section_error
+from app.datasources.tcbs.company import TcbsCompanyDataSource
+from app.services.company_service import CompanyService
+
+
+class SlowCompanyDataSource(TcbsCompanyDataSource):
+    """Company datasource whose sections sleep instead of calling vnstock"""
+
+    def __init__(self, delay=0.1, failing=(), hanging=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.hanging = set(hanging)
+
+    async def _section(self, name, value):
+        if name in self.hanging:
+            await asyncio.sleep(10)
+        await asyncio.sleep(self.delay)
+        if name in self.failing:
+            raise RuntimeError(f"{name} unavailable")
+        return value
+
+    async def get_company_profile(self, symbol):
+        return await self._section("profile", {"ticker": symbol})
+
+    async def get_company_officers(self, symbol):
+        return await self._section("listKeyOfficer", [{"name": "A"}])
+
+    async def get_shareholders(self, symbol):
+        return await self._section("listShareHolder", [{"name": "B"}])
+
+    async def get_insider_trading(self, symbol):
+        return await self._section("listInsiderDealing", [])
+
+    async def get_subsidiaries(self, symbol):
+        return await self._section("listSubCompany", [])
+
+    async def get_company_events(self, symbol):
+        return await self._section("listEventNews", [])
+
+    async def get_company_news(self, symbol):
+        return await self._section("listActivityNews", [{"title": "News"}])
+
+    async def get_dividends(self, symbol):
+        return await self._section("listDividendPaymentHis", [])
+
+
+def test_sections_are_fetched_concurrently():
+    """Latency is close to one section, not the sum of all eight."""
+    datasource = SlowCompanyDataSource(delay=0.1)
+
+    start = time.perf_counter()
+    info = asyncio.run(datasource.get_company_info("FPT"))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.4
+    assert list(info) == list(COMPANY_INFO_SECTIONS)
+    assert info["profile"] == {"ticker": "FPT"}
+
+
+def test_failed_and_timed_out_sections_become_error_markers():
+    """Failing sections do not fail the aggregate."""
+    datasource = SlowCompanyDataSource(
+        delay=0.01, failing={"listShareHolder"}, hanging={"listActivityNews"}
+    )
+
+    info = asyncio.run(datasource._gather_company_info("FPT", timeout=0.2))
+
+    assert info["listShareHolder"]["error"]["code"] == "SECTION_FETCH_FAILED"
+    assert info["listActivityNews"]["error"]["code"] == "SECTION_TIMEOUT"
+    assert info["listKeyOfficer"] == [{"name": "A"}]
+
+
+def test_all_sections_failing_raises():
+    """The aggregate fails only when nothing could be fetched."""
+    datasource = SlowCompanyDataSource(delay=0, failing=set(COMPANY_INFO_SECTIONS))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(datasource.get_company_info("FPT"))
+
+
+def test_unify_skips_error_markers():
+    """Unified info uses the healthy provider for sections that failed on the other."""
+    tcbs = asyncio.run(SlowCompanyDataSource(delay=0, failing={"listKeyOfficer"}).get_company_info("FPT"))
+    vci = asyncio.run(SlowCompanyDataSource(delay=0, failing={"listKeyOfficer", "profile"}).get_company_info("FPT"))
+
+    result = CompanyService()._unify_company_info({SOURCE_TCBS: tcbs, SOURCE_VCI: vci})
+
+    assert result["profile"] == {"ticker": "FPT"}
+    assert is_section_error(result["listKeyOfficer"])
+    # Both providers returned the same shareholder: it is listed once
+    assert result["listShareHolder"] == [{"name": "B", "_sources": [SOURCE_TCBS, SOURCE_VCI]}]
+
+
+class StubCompanyFactory:
+    """Datasource factory serving SlowCompanyDataSource per provider; every section fails for those in ``down``"""
+
+    def __init__(self, down=()):
+        self.down = set(down)
+        self.calls = 0
+
+    def create_company_datasource(self, provider):
+        self.calls += 1
+        return SlowCompanyDataSource(delay=0, failing=set(COMPANY_INFO_SECTIONS) if provider in self.down else ())
+
+
+@pytest.mark.parametrize("down", [{SOURCE_TCBS}, {SOURCE_TCBS, SOURCE_VCI}])
+def test_unified_info_is_not_cached_while_a_provider_fails(down):
+    """One provider's answer is served but asked again next time; an empty result is never cached."""
+    factory = StubCompanyFactory(down=down)
+    service = CompanyService(data_source_factory=factory)
+
+    first = asyncio.run(service.get_company_info("FPT"))
+    asyncio.run(service.get_company_info("FPT"))
+
+    assert bool(first) == (len(down) == 1)
+    assert factory.calls == 4
+
+
+def test_unified_profile_is_not_cached_while_a_provider_fails():
+    """A profile from one provider is served, and both are asked again on the next request."""
+    factory = StubCompanyFactory(down={SOURCE_VCI})
+    service = CompanyService(data_source_factory=factory)
+
+    first = asyncio.run(service.get_company_profile("FPT"))
+    factory.down.clear()
+    second = asyncio.run(service.get_company_profile("FPT"))
+    asyncio.run(service.get_company_profile("FPT"))
+
+    assert first == second == {"ticker": "FPT"}
+    assert factory.calls == 4
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+from app.datasources.tcbs import company as tcbs_company
+from app.datasources.tcbs.company import TcbsCompanyDataSource
+from app.infrastructure.executor import ExecutorRegistry
+
+
+class StubCompany:
+    """Stand-in for the vnstock Company client that blocks like a real HTTP call"""
+
+    calls = []
+
+    def __init__(self, symbol, source):
+        self.symbol = symbol
+
+    def officers(self):
+        StubCompany.calls.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return pd.DataFrame([{"ticker": self.symbol, "name": "Officer"}])
+
+
+def test_run_uses_source_thread_pool():
+    """Blocking calls run on a worker thread named after the source."""
+    registry = ExecutorRegistry(max_workers={"tcbs": 2}, default_max_workers=1)
+    try:
+        name = asyncio.run(registry.run("TCBS", lambda: threading.current_thread().name))
+        assert name.startswith("vnstock-tcbs")
+        assert registry.stats()["tcbs"]["max_workers"] == 2
+    finally:
+        registry.shutdown()
+
+
+def test_blocking_calls_do_not_block_event_loop():
+    """Concurrent blocking calls overlap instead of running back to back."""
+    registry = ExecutorRegistry(max_workers={"vci": 4})
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(registry.run("vci", time.sleep, 0.1) for _ in range(4)))
+        return time.perf_counter() - start
+
+    try:
+        assert asyncio.run(main()) < 0.3
+    finally:
+        registry.shutdown()
+
+
+def test_shutdown_recreates_executor_lazily():
+    """A registry can still be used after shutdown."""
+    registry = ExecutorRegistry()
+    registry.shutdown()
+    assert asyncio.run(registry.run("tcbs", lambda: 42)) == 42
+    registry.shutdown()
+
+
+def test_datasource_calls_go_through_executor(monkeypatch):
+    """Company datasource methods call vnstock off the event loop."""
+    monkeypatch.setattr(tcbs_company, "Company", StubCompany)
+    StubCompany.calls = []
+
+    officers = asyncio.run(TcbsCompanyDataSource().get_company_officers("FPT"))
+
+    assert officers == [{"ticker": "FPT", "name": "Officer"}]
+    assert StubCompany.calls[0].startswith("vnstock-tcbs")
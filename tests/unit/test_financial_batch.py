@@ -0,0 +1,95 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from app.datasources.formats import FORMAT_DATAFRAME
+from app.datasources.tcbs import financial as tcbs_financial
+from app.infrastructure.client_pool import client_pool
+from app.services.financial_service import FinancialService, statement_to_long
+
+
+class StubFinance:
+    def __init__(self, symbol, source):
+        if symbol == "BAD":
+            raise ValueError("no data for BAD")
+        self.symbol = symbol
+
+    def balance_sheet(self, **kwargs):
+        return pd.DataFrame({"ticker": [self.symbol] * 2, "quarter": [5, 5], "year": [2023, 2024], "cash": [1.5, np.nan]})
+
+    def income_statement(self, **kwargs):
+        return pd.DataFrame({"ticker": [self.symbol], "quarter": [5], "year": [2024], "revenue": [10.0]})
+
+
+def test_statement_to_long_handles_vci_headers():
+    """Two-level VCI headers are flattened and the identifying columns kept."""
+    df = pd.DataFrame(
+        [["FPT", 2024, 1, 0.5]],
+        columns=pd.MultiIndex.from_tuples([("Meta", "CP"), ("Meta", "Năm"), ("Meta", "Kỳ"), ("Chỉ tiêu", "ROE")]),
+    )
+
+    long = statement_to_long(df, "FPT", "ratios")
+
+    assert long.to_dict(orient="records") == [
+        {"symbol": "FPT", "statement": "ratios", "year": 2024, "quarter": 1, "item": "Chỉ tiêu_ROE", "value": 0.5}
+    ]
+
+
+def test_batch_route_returns_long_table_with_errors(client, monkeypatch):
+    """Successful symbols are melted into one table; failures are reported per symbol."""
+    monkeypatch.setattr(tcbs_financial, "Finance", StubFinance)
+    client_pool.clear()
+
+    response = client.post(
+        "/api/v1/financial/batch",
+        json={"symbols": ["fpt", "VNM", "BAD", "FPT"], "statements": ["balance_sheet", "income_statement"]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    data = body["data"]
+    assert body["meta"]["symbols"] == ["FPT", "VNM", "BAD"]
+    # 2 symbols x (1 non-null cash row + 1 revenue row); the NaN cash value is dropped
+    assert data["totalCount"] == 4
+    assert {"symbol": "VNM", "statement": "income_statement", "year": 2024, "quarter": 5, "item": "revenue", "value": 10.0} in data["records"]
+    assert sorted((e["symbol"], e["statement"]) for e in data["errors"]) == [
+        ("BAD", "balance_sheet"), ("BAD", "income_statement"),
+    ]
+
+
+def test_batch_rejects_empty_symbols(client):
+    """At least one symbol is required."""
+    response = client.post("/api/v1/financial/batch", json={"symbols": []})
+
+    assert response.status_code == 422
+
+
+def test_batch_concurrency_is_bounded():
+    """No more than ``concurrency`` statements are fetched at once."""
+    service = FinancialService()
+    active = 0
+    peak = 0
+
+    async def fake_statement(symbol, output_format, **kwargs):
+        nonlocal active, peak
+        assert output_format == FORMAT_DATAFRAME
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return pd.DataFrame({"year": [2024], "cash": [1.0]})
+
+    service.get_balance_sheet = fake_statement
+    service.get_cash_flow = fake_statement
+
+    table, errors = asyncio.run(service.get_statements_batch(
+        symbols=[f"S{i}" for i in range(10)],
+        statements=["balance_sheet", "cash_flow"],
+        output_format=FORMAT_DATAFRAME,
+        concurrency=3,
+    ))
+
+    assert peak == 3
+    assert errors == []
+    assert len(table) == 20
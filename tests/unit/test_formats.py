@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.datasources.formats import (
+    FORMAT_COLUMNS,
+    convert_dataframe,
+    dataframe_to_columns,
+    project_columns,
+    project_records,
+)
+from app.datasources.tcbs import financial as tcbs_financial
+from app.datasources.vci import listing as vci_listing
+from app.services.company_service import CompanyService
+from app.infrastructure.client_pool import client_pool
+
+
+def test_columns_format_has_schema_and_column_arrays():
+    """Column names appear once; values are grouped per column."""
+    df = pd.DataFrame({"ticker": ["FPT", "VNM"], "year": [2023, 2024], "cash": [1.5, np.nan]})
+
+    result = dataframe_to_columns(df)
+
+    assert result["totalCount"] == 2
+    assert result["schema"] == [
+        {"name": "ticker", "type": "object"},
+        {"name": "year", "type": "int64"},
+        {"name": "cash", "type": "float64"},
+    ]
+    assert result["columns"]["ticker"] == ["FPT", "VNM"]
+    assert result["columns"]["year"] == [2023, 2024]
+    assert np.isnan(result["columns"]["cash"][1])
+
+
+def test_multiindex_columns_are_flattened():
+    """Statement columns with two header levels get a single name."""
+    df = pd.DataFrame([[1, 2]], columns=pd.MultiIndex.from_tuples([("Meta", "ticker"), ("Assets", "cash")]))
+
+    assert list(dataframe_to_columns(df)["columns"]) == ["Meta_ticker", "Assets_cash"]
+
+
+def test_convert_dataframe_defaults_to_records_and_rejects_unknown_formats():
+    """Existing callers keep getting row dicts."""
+    df = pd.DataFrame({"ticker": ["FPT"]})
+
+    assert convert_dataframe(df) == [{"ticker": "FPT"}]
+    assert convert_dataframe({"raw": True}, FORMAT_COLUMNS) == {"raw": True}
+    with pytest.raises(ValueError):
+        convert_dataframe(df, "rows")
+
+
+def test_projection_keeps_requested_columns_in_order():
+    """Fields match flattened names or the last header level; unknown fields are ignored."""
+    df = pd.DataFrame([[1, 2, 3]], columns=pd.MultiIndex.from_tuples([("Meta", "ticker"), ("Ratios", "roe"), ("Ratios", "pe")]))
+
+    assert list(project_columns(df, ["pe", "Meta_ticker", "missing"]).columns) == [("Ratios", "pe"), ("Meta", "ticker")]
+    assert project_columns(df, None) is df
+    assert convert_dataframe(pd.DataFrame({"a": [1], "b": [2]}), FORMAT_COLUMNS, ["b"])["columns"] == {"b": [2]}
+    assert project_records([{"a": 1, "b": 2}], ["b", "c"]) == [{"b": 2}]
+
+
+class StubFinance:
+    def __init__(self, symbol, source):
+        self.symbol = symbol
+
+    def ratio(self, **kwargs):
+        return pd.DataFrame({"ticker": [self.symbol], "year": [2024], "roe": [0.2], "pe": [12.5], "pb": [2.1]})
+
+
+def test_fields_parameter_projects_financial_and_company_routes(client, monkeypatch):
+    """?fields= narrows ratios (before conversion) and company sections to the listed columns."""
+    monkeypatch.setattr(tcbs_financial, "Finance", StubFinance)
+    client_pool.clear()
+
+    async def profile(self, symbol, source="unified"):
+        return {"symbol": symbol, "exchange": "HOSE", "industry": "Tech"}
+
+    monkeypatch.setattr(CompanyService, "get_company_profile", profile)
+
+    ratios = client.get("/api/v1/financial/FPT/ratios", params={"fields": "year, roe,roe"}).json()["data"]
+    company = client.get("/api/v1/companies/FPT/profile", params={"fields": "exchange"}).json()["data"]
+
+    assert ratios["records"] == [{"year": 2024, "roe": 0.2}]
+    assert company == {"exchange": "HOSE"}
+
+
+class StubListing:
+    def __init__(self, source):
+        pass
+
+    def all_symbols(self, **kwargs):
+        return pd.DataFrame({"symbol": ["FPT", "VNM"], "organ_name": ["FPT Corp", "Vinamilk"]})
+
+
+def test_listing_route_returns_columns(client, monkeypatch):
+    """format=columns keeps the totalCount envelope and returns column arrays."""
+    monkeypatch.setattr(vci_listing, "Listing", StubListing)
+    # The app lifespan already pooled a real client
+    client_pool.clear()
+
+    columns = client.get("/api/v1/listing/symbols", params={"format": "columns"}).json()["data"]
+    records = client.get("/api/v1/listing/symbols").json()["data"]
+
+    assert columns["totalCount"] == records["totalCount"] == 2
+    assert columns["columns"]["symbol"] == ["FPT", "VNM"]
+    assert records["records"][0] == {"symbol": "FPT", "organ_name": "FPT Corp"}
+    projected = client.get("/api/v1/listing/symbols", params={"fields": "symbol"}).json()["data"]
+    assert projected["records"] == [{"symbol": "FPT"}, {"symbol": "VNM"}]
+
+
+def test_invalid_format_is_rejected(client):
+    """Unknown formats fail validation."""
+    response = client.get("/api/v1/listing/symbols", params={"format": "rows"})
+
+    assert response.status_code == 422
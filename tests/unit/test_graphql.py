@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime
+
+from graphql import parse
+
+from app.api.graphql.planning import plan_query
+from app.api.graphql.types import CompanyOfficer, InsiderTrading, Shareholder, from_record, from_records
+from app.core.config import settings
+from app.services.company_service import CompanyService
+
+TICKERS = [f"T{i:02d}" for i in range(20)]
+
+
+def stub_company_service(monkeypatch, failing=()):
+    """Replace the CompanyService sections used below with counting stubs"""
+    calls = []
+    state = {"running": 0, "peak": 0}
+
+    async def track(method, symbol, result):
+        calls.append((method, symbol))
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        if symbol in failing:
+            raise RuntimeError(f"{symbol} unavailable")
+        return result
+
+    async def profile(self, symbol, source="unified"):
+        return await track("profile", symbol, {"symbol": symbol, "exchange": "HOSE", "no_employees": 10.0})
+
+    async def officers(self, symbol, source="unified", strategy="adaptive"):
+        return await track("officers", symbol, [{"officer_name": "A", "officer_position": "CEO", "officer_own_percent": 0.1}])
+
+    monkeypatch.setattr(CompanyService, "get_company_profile", profile)
+    monkeypatch.setattr(CompanyService, "get_company_officers", officers)
+    return calls, state
+
+
+def test_from_record_maps_provider_columns():
+    """TCBS and VCI column names map onto the GraphQL fields."""
+    officer = from_record(CompanyOfficer, {"officer_name": "A", "officer_position": "CEO", "quantity": 5.0, "update_date": "2024-06-01"})
+    holder = from_record(Shareholder, {"share_holder": "B", "share_own_percent": float("nan")})
+    [deal] = from_records(InsiderTrading, [{"deal_announce_date": "2024-01-02", "deal_quantity": 100, "deal_price": 2.5}])
+
+    assert (officer.name, officer.position, officer.shares) == ("A", "CEO", 5)
+    assert officer.update_date == datetime(2024, 6, 1)
+    assert holder.percentage is None
+    assert deal.value == 250.0
+
+
+def test_companies_query_batches_one_call_per_symbol_and_section(client, monkeypatch):
+    """20 tickers' profiles and officers cost one concurrent service call per (symbol, section)."""
+    calls, state = stub_company_service(monkeypatch)
+    symbols = ", ".join(f'"{ticker}"' for ticker in TICKERS + ["t00"])
+    query = f"""{{
+        companies(symbols: [{symbols}]) {{ symbol profile {{ exchange noEmployees }} officers {{ name ownPercent }} }}
+        again: companyProfile(symbol: "T00") {{ exchange }}
+    }}"""
+
+    response = client.post("/graphql", json={"query": query})
+
+    body = response.json()
+    assert "errors" not in body
+    assert len(body["data"]["companies"]) == 20
+    assert body["data"]["companies"][0]["profile"] == {"exchange": "HOSE", "noEmployees": 10}
+    assert body["data"]["companies"][0]["officers"] == [{"name": "A", "ownPercent": 0.1}]
+    assert sorted(calls) == sorted([(method, ticker) for method in ("profile", "officers") for ticker in TICKERS])
+    assert state["peak"] >= 20
+
+
+def test_failed_section_only_fails_its_field(client, monkeypatch):
+    """A symbol whose fetch fails gets a field error; the other symbols still resolve."""
+    stub_company_service(monkeypatch, failing={"T01"})
+
+    response = client.post("/graphql", json={"query": '{ companies(symbols: ["T00", "T01"]) { symbol profile { exchange } } }'})
+
+    body = response.json()
+    assert body["data"]["companies"][0]["profile"] == {"exchange": "HOSE"}
+    assert body["data"]["companies"][1]["profile"] is None
+    assert body["errors"][0]["path"] == ["companies", 1, "profile"]
+
+
+def test_profile_is_fetched_from_the_providers_the_fields_need(client, monkeypatch):
+    """TCBS-only fields skip VCI, `symbol` alone fetches nothing, and a failed provider falls back to unified."""
+    calls = []
+
+    async def profile(self, symbol, source="unified"):
+        calls.append((symbol, source))
+        if symbol == "DOWN" and source == "tcbs":
+            raise RuntimeError("TCBS unavailable")
+        return {"symbol": symbol, "exchange": "HOSE", "icb_name3": "Tech", "charter_capital": 5.0}
+
+    monkeypatch.setattr(CompanyService, "get_company_profile", profile)
+    query = """{
+        a: companyProfile(symbol: "FPT") { exchange industry }
+        b: companyProfile(symbol: "VNM") { symbol }
+        c: company(symbol: "VCB") { profile { ...Both } }
+        d: companyProfile(symbol: "DOWN") { exchange }
+    }
+    fragment Both on CompanyProfile { exchange charterCapital }"""
+
+    body = client.post("/graphql", json={"query": query}).json()
+
+    assert "errors" not in body
+    assert body["data"]["a"] == {"exchange": "HOSE", "industry": "Tech"}
+    assert body["data"]["b"] == {"symbol": "VNM"}
+    assert body["data"]["c"]["profile"] == {"exchange": "HOSE", "charterCapital": 5.0}
+    assert body["data"]["d"] == {"exchange": "HOSE"}
+    assert sorted(calls) == [("DOWN", "tcbs"), ("DOWN", "unified"), ("FPT", "tcbs"), ("VCB", "unified")]
+
+
+def test_plan_counts_deduplicated_loads():
+    """The plan follows variables and fragments and counts each (section, symbol, source) once."""
+    document = parse("""query($symbols: [String!]!) {
+        companies(symbols: $symbols) { symbol ...Sections }
+        companyOfficers(symbol: "fpt", source: TCBS) { name }
+    }
+    fragment Sections on Company { profile { website } officers { name } }""")
+
+    plan = plan_query(document, {"symbols": ["FPT", "fpt", "VNM"]})
+
+    assert plan.loads == {
+        ("get_company_profile", "FPT", "tcbs"),
+        ("get_company_profile", "VNM", "tcbs"),
+        ("get_company_officers", "FPT", "unified"),
+        ("get_company_officers", "VNM", "unified"),
+        ("get_company_officers", "FPT", "tcbs"),
+    }
+    assert plan.cost == 5
+    assert plan.complexity == 2 * 6 + 2
+
+
+def test_expensive_query_is_rejected_before_any_fetch(client, monkeypatch):
+    """A query over the cost limit fails as a whole and calls no provider."""
+    calls, _ = stub_company_service(monkeypatch)
+    monkeypatch.setattr(settings, "GRAPHQL_MAX_COST", 30)
+    symbols = ", ".join(f'"{ticker}"' for ticker in TICKERS)
+
+    body = client.post("/graphql", json={"query": f"{{ companies(symbols: [{symbols}]) {{ profile {{ exchange }} officers {{ name }} }} }}"}).json()
+
+    assert body["data"] is None
+    assert body["errors"][0]["extensions"]["code"] == "QUERY_TOO_EXPENSIVE"
+    assert body["extensions"]["cost"]["requested"] == 40
+    assert calls == []
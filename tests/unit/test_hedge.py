@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from app.datasources.base import SOURCE_TCBS, SOURCE_VCI
+from app.infrastructure.hedge import AllCallsFailedError, first_successful
+from app.services.company_service import STRATEGY_ALL, STRATEGY_FASTEST, CompanyService
+
+
+def answer(value, delay, fail=False, cancelled=None):
+    async def call():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(value)
+            raise
+        if fail:
+            raise RuntimeError(f"{value} failed")
+        return value
+    return call
+
+
+def run(calls, budget):
+    return asyncio.run(first_successful(calls, budget=budget))
+
+
+def test_preferred_answer_within_budget_wins():
+    """A slower preferred answer still wins if it arrives within the budget."""
+    assert run([("vci", answer("vci", 0.05)), ("tcbs", answer("tcbs", 0.01))], budget=0.2) == ("vci", "vci")
+
+
+def test_first_good_answer_after_budget_and_loser_is_cancelled():
+    """Past the budget the fastest answer wins and the slow call is cancelled."""
+    cancelled = []
+
+    start = time.perf_counter()
+    result = run([("vci", answer("vci", 1, cancelled=cancelled)), ("tcbs", answer("tcbs", 0.01))], budget=0.05)
+
+    assert result == ("tcbs", "tcbs")
+    assert time.perf_counter() - start < 0.5
+    assert cancelled == ["vci"]
+
+
+def test_preferred_failure_falls_through_without_waiting_for_budget():
+    """A failed preferred call does not hold back the next answer."""
+    start = time.perf_counter()
+    result = run([("vci", answer("vci", 0.01, fail=True)), ("tcbs", answer("tcbs", 0.02))], budget=1)
+
+    assert result == ("tcbs", "tcbs")
+    assert time.perf_counter() - start < 0.5
+
+
+def test_all_failures_raise():
+    """Every error is reported when no call succeeds."""
+    with pytest.raises(AllCallsFailedError) as excinfo:
+        run([("vci", answer("vci", 0, fail=True)), ("tcbs", answer("tcbs", 0, fail=True))], budget=0.1)
+
+    assert set(excinfo.value.errors) == {"vci", "tcbs"}
+
+
+class StubSource:
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+
+    async def get_company_news(self, symbol):
+        await asyncio.sleep(self.delay)
+        return [{"source": self.name}]
+
+
+class StubFactory:
+    def __init__(self, delays):
+        self.delays = delays
+
+    def create_company_datasource(self, source):
+        return StubSource(source, self.delays[source])
+
+
+def test_fastest_strategy_does_not_wait_for_slow_provider(monkeypatch):
+    """With strategy=fastest a slow VCI no longer sets the latency."""
+    monkeypatch.setattr("app.services.company_service.settings.UNIFIED_FASTEST_BUDGET", 0.05)
+    service = CompanyService(StubFactory({SOURCE_VCI: 1, SOURCE_TCBS: 0.01}))
+
+    start = time.perf_counter()
+    news = asyncio.run(service.get_company_news("FPT", strategy=STRATEGY_FASTEST))
+
+    assert news == [{"source": SOURCE_TCBS}]
+    assert time.perf_counter() - start < 0.5
+    # strategy=all still prefers VCI
+    assert asyncio.run(service.get_company_news("VNM", strategy=STRATEGY_ALL)) == [{"source": SOURCE_VCI}]
+
+
+def test_strategy_is_validated(client):
+    """Unknown strategies are rejected by the route."""
+    assert client.get("/api/v1/companies/FPT/news", params={"strategy": "random"}).status_code == 422
@@ -0,0 +1,112 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.datasources.vci import quote as vci_quote
+from app.infrastructure.history_store import HistoryStore, merge_ranges, missing_ranges, set_history_store
+
+
+def daily_bars(start, end, close=10.0):
+    """Business-day bars of [start, end]"""
+    times = pd.bdate_range(start, end)
+    n = len(times)
+    return pd.DataFrame({
+        "time": times,
+        "open": np.full(n, close),
+        "high": np.full(n, close + 1),
+        "low": np.full(n, close - 1),
+        "close": np.full(n, close),
+        "volume": np.arange(n) + 1000,
+    })
+
+
+class StubQuote:
+    """Counts history calls and answers with business-day bars"""
+
+    calls = []
+
+    def __init__(self, symbol, source="VCI"):
+        self.symbol = symbol
+
+    def history(self, start, end, interval="1D", **kwargs):
+        StubQuote.calls.append((self.symbol, start, end, interval))
+        return daily_bars(start, end)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    set_history_store(store)
+    yield store
+    set_history_store(None)
+
+
+def test_ranges_merge_and_gaps():
+    """Adjacent ranges merge; gaps are the uncovered parts of the window."""
+    covered = merge_ranges([(date(2024, 1, 11), date(2024, 1, 20)), (date(2024, 1, 1), date(2024, 1, 10))])
+
+    assert covered == [(date(2024, 1, 1), date(2024, 1, 20))]
+    assert missing_ranges(covered, date(2023, 12, 25), date(2024, 2, 1)) == [
+        (date(2023, 12, 25), date(2023, 12, 31)),
+        (date(2024, 1, 21), date(2024, 2, 1)),
+    ]
+    assert missing_ranges(covered, date(2024, 1, 5), date(2024, 1, 6)) == []
+
+
+def test_store_partitions_by_year_and_replaces_bars(store, tmp_path):
+    """Bars land in one file per year, windows span partitions and a rewritten bar replaces the stored one."""
+    store.write("vci", "1D", "fpt", daily_bars("2023-12-20", "2024-01-10"), covered=(date(2023, 12, 20), date(2024, 1, 10)))
+    store.write("vci", "1D", "FPT", daily_bars("2024-01-10", "2024-01-10", close=99.0))
+
+    window = store.read("vci", "1D", "FPT", date(2023, 12, 29), date(2024, 1, 10))
+
+    assert sorted(p.name for p in (tmp_path / "vci" / "1D" / "FPT").glob("*.npy")) == ["2023.npy", "2024.npy"]
+    assert list(window.columns) == ["time", "open", "high", "low", "close", "volume"]
+    assert window["time"].tolist() == list(pd.bdate_range("2023-12-29", "2024-01-10"))
+    assert window["close"].iloc[-1] == 99.0
+    assert window["volume"].dtype == np.int64
+    assert store.coverage("vci", "1D", "FPT") == [(date(2023, 12, 20), date(2024, 1, 10))]
+
+
+def test_history_route_fetches_only_missing_ranges(client, store, monkeypatch):
+    """Overlapping windows are served from disk; only never-fetched days go to the provider."""
+    StubQuote.calls = []
+    monkeypatch.setattr(vci_quote, "Quote", StubQuote)
+
+    first = client.get("/api/v1/quotes/fpt/history", params={"start": "2023-01-01", "end": "2023-12-31"})
+    second = client.get("/api/v1/quotes/FPT/history", params={"start": "2023-06-01", "end": "2024-03-31"})
+    third = client.get("/api/v1/quotes/FPT/history", params={"start": "2023-03-01", "end": "2024-02-01", "fields": "time,close"})
+
+    assert first.status_code == 200
+    assert first.json()["data"]["totalCount"] == len(pd.bdate_range("2023-01-01", "2023-12-31"))
+    assert second.json()["data"]["totalCount"] == len(pd.bdate_range("2023-06-01", "2024-03-31"))
+    assert set(third.json()["data"]["records"][0]) == {"time", "close"}
+    assert StubQuote.calls == [
+        ("FPT", "2023-01-01", "2023-12-31", "1D"),
+        ("FPT", "2024-01-01", "2024-03-31", "1D"),
+    ]
+
+
+def test_history_route_rejects_reversed_window(client, store):
+    response = client.get("/api/v1/quotes/FPT/history", params={"start": "2024-02-01", "end": "2024-01-01"})
+
+    assert response.status_code == 400
+
+
+def test_symbols_cannot_leave_the_store(client, store, tmp_path):
+    """Path-like symbols are rejected by the store, the history route and the batch body."""
+    with pytest.raises(ValueError):
+        store.coverage("vci", "1D", "../..")
+    with pytest.raises(ValueError):
+        store.write("vci", "1D", "..", daily_bars(date(2024, 1, 1), date(2024, 1, 5)))
+
+    history = client.get("/api/v1/quotes/%2E%2E/history", params={"start": "2024-01-01"})
+    batch = client.post(
+        "/api/v1/quotes/indicators/batch",
+        json={"symbols": ["FPT", "../.."], "indicators": "sma:5", "start": "2024-01-01"},
+    )
+
+    assert history.status_code == 422 and batch.status_code == 422
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.datasources.vci import quote as vci_quote
+from app.infrastructure.history_store import HistoryStore, set_history_store
+from app.services.indicators import compute_indicators, indicator_cache, parse_indicators
+
+SPECS = "sma:20,ema:10,rsi,macd,bbands,atr"
+
+
+def random_bars(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, n))
+    return {"high": close + 1, "low": close - 1, "close": close}
+
+
+class StubQuote:
+    """Deterministic daily bars; symbols starting with X fail"""
+
+    def __init__(self, symbol, source="VCI"):
+        self.symbol = symbol
+
+    def history(self, start, end, interval="1D", **kwargs):
+        if self.symbol.startswith("X"):
+            raise ValueError("no data")
+        days = pd.bdate_range(start, end)
+        close = 20 + np.sin(days.dayofyear.to_numpy() / 7.0) * 3
+        return pd.DataFrame({"time": days, "open": close, "high": close + 0.5, "low": close - 0.5, "close": close, "volume": 1000})
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(vci_quote, "Quote", StubQuote)
+    store = HistoryStore(str(tmp_path))
+    set_history_store(store)
+    yield store
+    set_history_store(None)
+
+
+def test_indicators_match_reference_values():
+    bars = random_bars(300)
+    columns, _ = compute_indicators(parse_indicators(SPECS), bars)
+    close = pd.Series(bars["close"])
+
+    assert np.allclose(columns["sma_20"][19:], close.rolling(20).mean()[19:])
+    assert np.allclose(columns["bb_middle_20_2"][19:] + 2 * close.rolling(20).std(ddof=0)[19:], columns["bb_upper_20_2"][19:])
+    assert np.isnan(columns["ema_10"][:9]).all() and columns["ema_10"][9] == pytest.approx(bars["close"][:10].mean())
+    assert np.nanmin(columns["rsi_14"]) >= 0 and np.nanmax(columns["rsi_14"]) <= 100
+    assert np.allclose(columns["atr_14"][13:], 2.0, atol=1.5)
+    assert np.allclose(columns["macd_hist_12_26_9"][33:], columns["macd_12_26_9"][33:] - columns["macd_signal_12_26_9"][33:])
+
+
+def test_extending_a_series_equals_computing_it_at_once():
+    """State carried across chunks gives the same values as one pass, warm-ups split across chunks included."""
+    bars = random_bars(400)
+    specs = parse_indicators(SPECS)
+    full, _ = compute_indicators(specs, bars)
+
+    parts, states = [], None
+    for start, stop in [(0, 7), (7, 30), (30, 31), (31, 400)]:
+        columns, states = compute_indicators(specs, {name: values[start:stop] for name, values in bars.items()}, states)
+        parts.append(columns)
+
+    for name, values in full.items():
+        assert np.array_equal(values, np.concatenate([part[name] for part in parts]), equal_nan=True)
+
+
+def test_parse_indicators():
+    assert [str(spec) for spec in parse_indicators("SMA:50, rsi, macd::30, bbands:20:2.5, sma:50")] == ["sma:50", "rsi:14", "macd:12:30:9", "bbands:20:2.5"]
+    with pytest.raises(ValueError):
+        parse_indicators("vwap:20")
+    with pytest.raises(ValueError):
+        parse_indicators("sma:0")
+
+
+def test_indicator_route_extends_the_cached_series(client, store):
+    """A later end with the same start only computes the new bars; the shared rows keep their values."""
+    params = {"start": "2023-01-02", "indicators": "sma:5,ema:5,rsi:5"}
+
+    first = client.get("/api/v1/quotes/FPT/indicators", params={**params, "end": "2023-06-30"}).json()["data"]["records"]
+    second = client.get("/api/v1/quotes/FPT/indicators", params={**params, "end": "2023-09-29"}).json()["data"]["records"]
+    earlier = client.get("/api/v1/quotes/FPT/indicators", params={**params, "end": "2023-03-31"}).json()["data"]["records"]
+
+    assert set(first[0]) == {"time", "close", "sma_5", "ema_5", "rsi_5"}
+    assert second[: len(first)] == first
+    assert earlier == first[: len(earlier)]
+    assert indicator_cache.stats()["misses"] == 1
+    assert indicator_cache.stats()["extended"] == 1
+    assert indicator_cache.stats()["hits"] == 1
+
+
+def test_indicator_route_rejects_unknown_indicators(client, store):
+    response = client.get("/api/v1/quotes/FPT/indicators", params={"start": "2023-01-02", "indicators": "vwap"})
+
+    assert response.status_code == 400
+
+
+def test_indicator_batch_reports_failed_symbols(client, store):
+    response = client.post(
+        "/api/v1/quotes/indicators/batch",
+        json={"symbols": ["fpt", "VNM", "XXX"], "indicators": "sma:5,rsi", "start": "2023-01-02", "end": "2023-03-31"},
+    )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["meta"]["indicators"] == ["sma:5", "rsi:14"]
+    assert {record["symbol"] for record in body["data"]["records"]} == {"FPT", "VNM"}
+    assert body["data"]["errors"][0]["symbol"] == "XXX"
@@ -0,0 +1,91 @@
+import math
+import time
+
+from app.core.config import settings
+from app.datasources.base import SOURCE_TCBS, SOURCE_VCI
+from app.services.company_service import CompanyService
+from app.services.merge import PROVENANCE_FIELD, SECTION_KEYS, merge_fields, merge_records, natural_key
+
+PRECEDENCE = [SOURCE_TCBS, SOURCE_VCI]
+OFFICER_KEY = SECTION_KEYS["listKeyOfficer"]
+
+
+def test_natural_key_normalizes_across_providers():
+    """Case, whitespace, date suffixes and 5.0 vs 5 do not make keys differ."""
+    event_key = SECTION_KEYS["listEventNews"]
+    tcbs = {"notify_date": "2024-05-01 00:00:00", "event_code": "DIV"}
+    vci = {"public_date": "2024-05-01", "event_list_code": " div "}
+
+    assert natural_key(tcbs, event_key) == natural_key(vci, event_key) == ("2024-05-01", "div")
+    assert natural_key({"share_holder": "X", "q": 5.0}, [["share_holder"], ["q"]]) == ("x", 5)
+    assert natural_key({"officer_name": "A", "officer_position": math.nan}, OFFICER_KEY) is None
+
+
+def test_duplicates_merged_with_provenance_and_default_precedence():
+    """A record both providers return is listed once; TCBS values win, gaps are filled from VCI."""
+    records = {
+        SOURCE_VCI: [
+            {"officer_name": "Nguyen Van A", "officer_position": "CEO", "officer_own_percent": 0.02, "update_date": "2024-06-01"},
+            {"officer_name": "Tran B", "officer_position": "CFO", "officer_own_percent": 0.01},
+        ],
+        SOURCE_TCBS: [
+            {"officer_name": "nguyen van a", "officer_position": "CEO ", "officer_own_percent": None},
+        ],
+    }
+
+    merged = merge_records(records, OFFICER_KEY, PRECEDENCE)
+
+    assert merged == [
+        {
+            "officer_name": "nguyen van a",
+            "officer_position": "CEO ",
+            "officer_own_percent": 0.02,
+            "update_date": "2024-06-01",
+            PROVENANCE_FIELD: [SOURCE_TCBS, SOURCE_VCI],
+        },
+        {"officer_name": "Tran B", "officer_position": "CFO", "officer_own_percent": 0.01, PROVENANCE_FIELD: [SOURCE_VCI]},
+    ]
+
+
+def test_field_precedence_overrides_default():
+    """A per-field order takes that field from the other provider."""
+    records = {
+        SOURCE_TCBS: [{"share_holder": "X", "share_own_percent": 0.1}],
+        SOURCE_VCI: [{"share_holder": "X", "share_own_percent": 0.2}],
+    }
+
+    merged = merge_records(records, SECTION_KEYS["listShareHolder"], PRECEDENCE, {"share_own_percent": [SOURCE_VCI]})
+
+    assert merged[0]["share_own_percent"] == 0.2
+    assert merge_fields({SOURCE_TCBS: {"a": 1, "b": None}, SOURCE_VCI: {"a": 2, "b": 3}}, PRECEDENCE) == {"a": 1, "b": 3}
+
+
+def test_unify_uses_section_field_precedence(monkeypatch):
+    """"section.field" settings apply to that section only."""
+    monkeypatch.setattr(settings, "UNIFIED_MERGE_FIELD_PRECEDENCE", {"listShareHolder.share_own_percent": [SOURCE_VCI]})
+    holder = {"share_holder": "X"}
+    data = {
+        SOURCE_TCBS: {"profile": {"a": 1}, "listShareHolder": [{**holder, "share_own_percent": 0.1}]},
+        SOURCE_VCI: {"profile": {"a": 2}, "listShareHolder": [{**holder, "share_own_percent": 0.2}]},
+    }
+
+    result = CompanyService()._unify_company_info(data)
+
+    assert result["profile"] == {"a": 1}
+    assert result["listShareHolder"] == [{**holder, "share_own_percent": 0.2, PROVENANCE_FIELD: [SOURCE_TCBS, SOURCE_VCI]}]
+
+
+def test_merge_is_linear():
+    """Merging 10x the records takes roughly 10x the time, not 100x."""
+    def timed(n):
+        records = {
+            provider: [{"title": f"news {i}", "publish_date": "2024-01-01"} for i in range(n)]
+            for provider in PRECEDENCE
+        }
+        start = time.perf_counter()
+        merged = merge_records(records, SECTION_KEYS["listActivityNews"], PRECEDENCE)
+        assert len(merged) == n
+        return time.perf_counter() - start
+
+    timed(1000)
+    assert timed(20000) < timed(2000) * 40
@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.datasources.vci import trading as vci_trading
+from app.api.rest.v1.ws import routes as ws_routes
+from app.core.config import settings
+from app.infrastructure.client_pool import client_pool
+from app.infrastructure.rate_limit import admission_control
+from app.infrastructure.scheduler import PRIORITY_BACKGROUND, upstream_scheduler
+from app.services.price_board import PriceBoardPoller, Subscriber, board_state, diff_boards, price_board_hub
+
+
+def board(**columns):
+    return pd.DataFrame({"symbol": ["FPT", "VCB"], **columns})
+
+
+class StubTrading:
+    """Board whose FPT match price rises by 100 on every poll"""
+
+    calls = 0
+
+    def __init__(self, symbol="VN30F1M", source="VCI"):
+        pass
+
+    def price_board(self, symbols_list, **kwargs):
+        StubTrading.calls += 1
+        rows = pd.DataFrame({"listing_symbol": sorted(symbols_list)})
+        rows["listing_ceiling"] = 1000.0
+        rows["match_match_price"] = np.where(rows["listing_symbol"] == "FPT", 100.0 * StubTrading.calls, 500.0)
+        return rows
+
+
+@pytest.fixture
+def stub_board(client, monkeypatch):
+    monkeypatch.setattr(vci_trading, "Trading", StubTrading)
+    monkeypatch.setattr(price_board_hub, "interval", 0.02)
+    client_pool.clear()
+    StubTrading.calls = 0
+
+
+def test_diff_reports_only_changed_fields():
+    """Empty fields that stay empty are not changes; a symbol missing from one poll keeps its values."""
+    first = board_state(board(price=[10.0, 20.0], bid=[np.nan, 1.0]))
+    second = board_state(board(price=[10.0, 21.0], bid=[np.nan, np.nan]), first)
+    third = board_state(pd.DataFrame({"symbol": ["FPT"], "price": [11.0], "bid": [np.nan]}), second)
+
+    assert diff_boards(None, first) == {"FPT": {"price": 10.0}, "VCB": {"price": 20.0, "bid": 1.0}}
+    assert diff_boards(first, second) == {"VCB": {"price": 21.0, "bid": None}}
+    assert diff_boards(second, third) == {"FPT": {"price": 11.0}}
+    assert third.loc["VCB", "price"] == 21.0
+
+
+def test_slow_subscribers_receive_merged_changes():
+    async def scenario():
+        subscriber = Subscriber()
+        subscriber.publish({"FPT": {"price": 1, "volume": 5}})
+        subscriber.publish({"FPT": {"price": 2}, "VCB": {"price": 7}})
+        return await subscriber.next(), subscriber.conflated
+
+    (changes, error), conflated = asyncio.run(scenario())
+
+    assert changes == {"FPT": {"price": 2, "volume": 5}, "VCB": {"price": 7}}
+    assert error is None and conflated == 1
+
+
+def test_clients_of_the_same_board_share_one_poller(client, stub_board):
+    """Both clients get the full board, then only the changed field; polls do not grow with clients."""
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT,VCB") as first:
+        with client.websocket_connect("/api/v1/ws/price-board?symbols=vcb,fpt") as second:
+            snapshots = [first.receive_json(), second.receive_json()]
+            updates = [first.receive_json(), second.receive_json()]
+            stats = price_board_hub.stats()
+
+    assert all(snapshot["type"] == "snapshot" for snapshot in snapshots)
+    assert snapshots[0]["data"]["VCB"] == {"listing_ceiling": 1000.0, "match_match_price": 500.0}
+    assert [update["type"] for update in updates] == ["update", "update"]
+    assert all(list(update["data"]) == ["FPT"] and list(update["data"]["FPT"]) == ["match_match_price"] for update in updates)
+    assert stats["pollers_started"] == 1 and stats["subscriptions"] == 2
+    assert StubTrading.calls == stats["boards"][0]["polls"]
+    assert price_board_hub.stats()["boards"] == []
+
+
+def test_invalid_subscriptions_are_closed(client, stub_board):
+    with client.websocket_connect("/api/v1/ws/price-board") as websocket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+
+    assert closed.value.code == 1008
+
+
+def test_polls_run_at_background_priority(client, stub_board, monkeypatch):
+    priorities = []
+    admission = upstream_scheduler._admission
+
+    def spy():
+        priority, deadline = admission()
+        priorities.append(priority)
+        return priority, deadline
+
+    monkeypatch.setattr(upstream_scheduler, "_admission", spy)
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as websocket:
+        websocket.receive_json()
+
+    assert priorities and set(priorities) == {PRIORITY_BACKGROUND}
+
+
+def test_new_boards_beyond_the_cap_are_refused(client, stub_board, monkeypatch):
+    """Clients of a polled board still join; a new symbol set is closed with 1013."""
+    monkeypatch.setattr(price_board_hub, "max_boards", 1)
+
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as first:
+        first.receive_json()
+        with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as same:
+            assert same.receive_json()["type"] == "snapshot"
+        with client.websocket_connect("/api/v1/ws/price-board?symbols=VCB") as other:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                other.receive_json()
+
+    assert closed.value.code == 1013
+    assert price_board_hub.stats()["rejected"] == 1
+
+
+def test_connections_count_against_client_admission(client, stub_board, monkeypatch):
+    """An open board holds one of the client's admission slots until it closes."""
+    monkeypatch.setattr(admission_control, "max_per_client", 1)
+
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as websocket:
+        websocket.receive_json()
+        with pytest.raises(WebSocketDisconnect) as refused:
+            with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT"):
+                pass
+
+    assert refused.value.code == 1008
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as websocket:
+        assert websocket.receive_json()["type"] == "snapshot"
+
+
+def test_stream_errors_close_the_socket(client, stub_board, monkeypatch):
+    def broken(self):
+        raise RuntimeError("bad board")
+
+    monkeypatch.setattr(PriceBoardPoller, "snapshot", broken)
+    with client.websocket_connect("/api/v1/ws/price-board?symbols=FPT") as websocket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+
+    assert closed.value.code == 1011
+
+
+def test_closing_a_stalled_client_is_bounded(monkeypatch):
+    """A close frame the client never reads does not hold the handler past PRICE_BOARD_SEND_TIMEOUT."""
+    class StalledSocket:
+        async def close(self, code, reason):
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(settings, "PRICE_BOARD_SEND_TIMEOUT", 0.01)
+
+    started = time.perf_counter()
+    asyncio.run(ws_routes._close(StalledSocket(), 1013, "Client too slow"))
+
+    assert time.perf_counter() - started < 1
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+
+from app.datasources.base import SOURCE_TCBS, SOURCE_VCI
+from app.infrastructure.circuit_breaker import circuit_breakers
+from app.infrastructure.hedge import hedged
+from app.infrastructure.provider_router import ProviderRouter, provider_router
+from app.services.company_service import CompanyService
+
+
+def answer(value, delay, calls=None, fail=False):
+    async def call():
+        if calls is not None:
+            calls.append(value)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{value} failed")
+        return value
+    return call
+
+
+def warm(router, provider, operation, latency, count=10, ok=True):
+    for _ in range(count):
+        router.get(provider, operation).record(ok, latency)
+
+
+def test_ranking_follows_latency_and_success_rate():
+    """Cold providers keep the preference order; warm ones are ranked by expected latency."""
+    router = ProviderRouter(min_samples=10, explore_rate=0)
+    providers = [SOURCE_VCI, SOURCE_TCBS]
+
+    assert router.ranked("get_company_news", providers) == providers
+
+    warm(router, SOURCE_VCI, "get_company_news", 0.8)
+    warm(router, SOURCE_TCBS, "get_company_news", 0.2)
+    assert router.ranked("get_company_news", providers) == [SOURCE_TCBS, SOURCE_VCI]
+
+    # A fast provider that mostly fails loses to a slower reliable one
+    warm(router, SOURCE_TCBS, "get_company_news", 0.2, count=90, ok=False)
+    assert router.ranked("get_company_news", providers) == providers
+
+
+def test_exploration_tries_another_provider_first():
+    """Explored calls put a provider other than the best one first."""
+    router = ProviderRouter(min_samples=1, explore_rate=1.0, rng=random.Random(0))
+    warm(router, SOURCE_VCI, "get_dividends", 0.8, count=1)
+    warm(router, SOURCE_TCBS, "get_dividends", 0.1, count=1)
+
+    assert router.ranked("get_dividends", [SOURCE_VCI, SOURCE_TCBS]) == [SOURCE_VCI, SOURCE_TCBS]
+    assert router.stats()["explored"] == 1
+
+
+def test_open_circuit_goes_last():
+    """A provider whose circuit is open is never tried first."""
+    router = ProviderRouter(explore_rate=0)
+    breaker = circuit_breakers.get(SOURCE_VCI, "get_dividends")
+    for _ in range(breaker.min_calls):
+        breaker.record(False, 0.1)
+
+    assert router.ranked("get_dividends", [SOURCE_VCI, SOURCE_TCBS]) == [SOURCE_TCBS, SOURCE_VCI]
+
+
+def test_hedged_only_calls_second_provider_when_first_is_slow():
+    """A fast first call is the only call; a slow one triggers the next after its delay."""
+    calls = []
+    result = asyncio.run(hedged([("a", answer("a", 0.01, calls)), ("b", answer("b", 0.01, calls))], [0.2, 0.2]))
+    assert result == ("a", "a", 1)
+    assert calls == ["a"]
+
+    calls = []
+    start = time.perf_counter()
+    result = asyncio.run(hedged([("a", answer("a", 1, calls)), ("b", answer("b", 0.01, calls))], [0.05, 0.05]))
+    assert result == ("b", "b", 2)
+    assert calls == ["a", "b"]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_hedged_moves_on_immediately_after_a_failure():
+    """A failed call starts the next one without waiting for the delay."""
+    start = time.perf_counter()
+    result = asyncio.run(hedged([("a", answer("a", 0, fail=True)), ("b", answer("b", 0.01))], [5, 5]))
+
+    assert result == ("b", "b", 2)
+    assert time.perf_counter() - start < 0.5
+
+
+class CountingFactory:
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+
+    def create_company_datasource(self, source):
+        factory = self
+
+        class Source:
+            async def get_company_officers(self, symbol):
+                factory.calls.append(source)
+                await asyncio.sleep(factory.delays[source])
+                return [{"source": source}]
+
+        return Source()
+
+
+def test_adaptive_strategy_halves_upstream_calls(monkeypatch):
+    """The default unified strategy asks one provider per request once it knows which is faster."""
+    factory = CountingFactory({SOURCE_VCI: 0.03, SOURCE_TCBS: 0.005})
+    service = CompanyService(factory)
+    monkeypatch.setattr(provider_router, "min_samples", 3)
+    monkeypatch.setattr(provider_router, "explore_rate", 0)
+    monkeypatch.setattr(provider_router, "hedge_delay", 1.0)
+
+    async def run():
+        return [await service.get_company_officers.__wrapped__(service, "FPT") for _ in range(10)]
+
+    results = asyncio.run(run())
+
+    assert len(factory.calls) == 10
+    # Cold start alternates to sample both providers; later requests use the faster one
+    assert results[0] == [{"source": SOURCE_VCI}]
+    assert results[-1] == [{"source": SOURCE_TCBS}]
+    assert provider_router.stats()["providers"]["tcbs:get_company_officers"]["samples"] >= 3
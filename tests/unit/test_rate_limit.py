@@ -0,0 +1,111 @@
+import asyncio
+
+from app.api.middleware import RateLimitMiddleware, compile_costs
+from app.core.config import settings
+from app.infrastructure.rate_limit import (
+    ConcurrencyLimiter,
+    RedisSlidingWindowLimiter,
+    SlidingWindowLimiter,
+    admission_control,
+)
+from app.services.company_service import CompanyService
+
+
+class Clock:
+    def __init__(self, now=6000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_sliding_window_weights_previous_window():
+    """The previous window counts by its remaining overlap; rejected calls are not counted."""
+    clock = Clock()
+    limiter = SlidingWindowLimiter(window=60, clock=clock)
+
+    async def scenario():
+        assert (await limiter.hit("ip:a", 8, 10))[0]
+        allowed, remaining, retry_after = await limiter.hit("ip:a", 8, 10)
+        assert not allowed and remaining == 2 and retry_after > 60
+        clock.now += 90  # half of the previous window (8 calls) still overlaps: 4
+        assert (await limiter.hit("ip:a", 6, 10))[0]
+        assert not (await limiter.hit("ip:a", 1, 10))[0]
+        assert (await limiter.hit("ip:b", 10, 10))[0]
+
+    asyncio.run(scenario())
+
+
+def test_redis_limiter_counts_and_takes_back(fake_redis):
+    """The Redis limiter shares counts through Redis and undoes a rejected increment."""
+    clock = Clock()
+    first = RedisSlidingWindowLimiter(fake_redis, clock=clock)
+    second = RedisSlidingWindowLimiter(fake_redis, clock=clock)
+
+    async def scenario():
+        assert (await first.hit("ip:a", 8, 10))[0]
+        assert not (await second.hit("ip:a", 8, 10))[0]
+        return await second.hit("ip:a", 2, 10)
+
+    assert asyncio.run(scenario()) == (True, 0, 0.0)
+
+
+def test_concurrency_limiter():
+    """Admission stops at the per-client and the global limit and frees slots on release."""
+    limiter = ConcurrencyLimiter(max_in_flight=3, max_per_client=2)
+
+    assert limiter.try_acquire("a") is None
+    assert limiter.try_acquire("a") is None
+    assert limiter.try_acquire("a") == "client"
+    assert limiter.try_acquire("b") is None
+    assert limiter.try_acquire("c") == "overload"
+    limiter.release("a")
+    assert limiter.try_acquire("c") is None
+    assert limiter.stats()["in_flight"] == 3
+
+
+def test_endpoint_costs_and_api_keys(monkeypatch):
+    """Path templates match one segment; known API keys get their own identity and limit."""
+    costs = compile_costs({"/api/v1/companies/{symbol}": 8})
+    assert costs[0][0].match("/api/v1/companies/FPT")
+    assert not costs[0][0].match("/api/v1/companies/FPT/officers")
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", ["secret"])
+    middleware = RateLimitMiddleware(app=None)
+    scope = {"headers": [(b"x-api-key", b"secret")], "client": ("1.2.3.4", 1)}
+    identity, limit = middleware.identify(scope)
+    assert identity.startswith("key:") and "secret" not in identity
+    assert limit == settings.RATE_LIMIT_API_KEY_PER_MIN
+    assert middleware.identify({**scope, "headers": [(b"x-api-key", b"guess")]}) == ("ip:1.2.3.4", settings.RATE_LIMIT_PER_MIN)
+
+
+def test_middleware_rejects_over_limit(client, monkeypatch):
+    """/companies/{symbol} costs 8, so a 16-per-minute client gets two calls, then 429."""
+    async def fake_info(self, symbol, source="unified"):
+        return {"profile": {"ticker": symbol}}
+
+    monkeypatch.setattr(CompanyService, "get_company_info", fake_info)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MIN", 16)
+
+    first = client.get("/api/v1/companies/FPT")
+    client.get("/api/v1/companies/FPT")
+    rejected = client.get("/api/v1/companies/FPT")
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "8"
+    assert rejected.status_code == 429
+    assert rejected.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert int(rejected.headers["Retry-After"]) > 0
+    # Ops endpoints are exempt
+    assert client.get("/api/v1/ops/stats").status_code == 200
+
+
+def test_middleware_sheds_on_overload(client, monkeypatch):
+    """With no admission slots left the API answers 503 at once."""
+    monkeypatch.setattr(admission_control, "max_in_flight", 0)
+
+    response = client.get("/api/v1/companies/FPT")
+
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == "SERVICE_OVERLOADED"
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.datasources.vci import quote as vci_quote
+from app.infrastructure.history_store import HistoryStore, set_history_store
+from app.services.quote_service import QuoteService
+from app.services.resample import period_end, resample_bars
+
+
+def minute_bars(day, sessions=(("09:00", "11:30"), ("13:00", "14:45"))):
+    """1-minute bars of one day with close = minute index and volume 1 per bar"""
+    times = pd.DatetimeIndex([])
+    for start, end in sessions:
+        times = times.append(pd.date_range(f"{day} {start}", f"{day} {end}", freq="1min"))
+    n = len(times)
+    close = np.arange(n, dtype=float)
+    return pd.DataFrame({"time": times, "open": close, "high": close + 0.5, "low": close - 0.5, "close": close, "volume": np.ones(n, dtype=np.int64)})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    set_history_store(store)
+    yield store
+    set_history_store(None)
+
+
+def test_intraday_bins_follow_the_sessions():
+    """1H bins restart after lunch and the closing auction joins the last bin instead of opening one."""
+    bars = minute_bars("2024-03-04")
+
+    hourly = resample_bars(bars, "1H", "HOSE")
+
+    assert [t.strftime("%H:%M") for t in hourly["time"]] == ["09:00", "10:00", "11:00", "13:00", "14:00"]
+    assert hourly["volume"].tolist() == [60, 60, 31, 60, 46]
+    first = bars.iloc[:60]
+    assert hourly.iloc[0][["open", "high", "low", "close"]].tolist() == [first["open"].iloc[0], first["high"].max(), first["low"].min(), first["close"].iloc[-1]]
+
+
+def test_hnx_post_close_bars_form_their_own_bins():
+    bars = minute_bars("2024-03-04", sessions=(("13:00", "15:00"),))
+
+    assert resample_bars(bars, "15m", "HNX")["time"].dt.strftime("%H:%M").tolist()[-2:] == ["14:30", "14:45"]
+    assert resample_bars(bars, "15m", "HOSE")["time"].dt.strftime("%H:%M").tolist()[-1] == "14:30"
+
+
+def test_calendar_bins():
+    days = pd.bdate_range("2024-01-29", "2024-02-09")
+    bars = pd.DataFrame({"time": days, "open": 1.0, "high": np.arange(len(days)) + 2.0, "low": 0.5, "close": 1.5, "volume": 10})
+
+    weekly = resample_bars(bars, "1W")
+    monthly = resample_bars(bars, "1M")
+
+    assert weekly["time"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-29", "2024-02-05"]
+    assert weekly["volume"].tolist() == [50, 50]
+    assert monthly["time"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-02-01"]
+    assert monthly["high"].tolist() == [4.0, 11.0]
+    assert period_end(date(2024, 2, 10), "1M") == date(2024, 2, 29)
+
+
+def test_coarser_intervals_are_resampled_from_stored_bars(store, monkeypatch):
+    """Stored 1m bars answer 15m requests, and weekly bars come from daily bars without a weekly download."""
+    calls = []
+
+    class StubQuote:
+        def __init__(self, symbol, source="VCI"):
+            pass
+
+        def history(self, start, end, interval="1D", **kwargs):
+            calls.append((start, end, interval))
+            days = pd.bdate_range(start, end)
+            return pd.DataFrame({"time": days, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100})
+
+    monkeypatch.setattr(vci_quote, "Quote", StubQuote)
+    store.write("vci", "1m", "FPT", minute_bars("2024-03-04"), covered=(date(2024, 3, 4), date(2024, 3, 4)))
+    service = QuoteService("vci")
+
+    quarter_hours = asyncio.run(service.get_history("FPT", date(2024, 3, 4), date(2024, 3, 4), interval="15m", exchange="HOSE"))
+    weekly = asyncio.run(service.get_history("FPT", date(2024, 1, 3), date(2024, 1, 17), interval="1W"))
+
+    assert len(quarter_hours) == 10 + 7
+    assert weekly["time"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-01-08", "2024-01-15"]
+    assert weekly["volume"].tolist() == [500, 500, 500]
+    assert calls == [("2024-01-01", "2024-01-21", "1D")]
+
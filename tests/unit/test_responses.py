@@ -0,0 +1,142 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.rest.responses import (
+    FastJSONResponse,
+    StaleCursorError,
+    _ndjson_chunks,
+    api_response,
+    decode_cursor,
+    encode_cursor,
+)
+from app.datasources.vci import listing as vci_listing
+from app.infrastructure.client_pool import client_pool
+from app.services.listing_service import ListingService
+
+
+def test_fast_response_encodes_dataframe_values():
+    """NaN/NaT become null, numpy scalars become numbers and timestamps ISO strings."""
+    records = pd.DataFrame({
+        "ticker": ["FPT", "VNM"],
+        "date": [pd.Timestamp("2024-03-31"), pd.NaT],
+        "revenue": [np.int64(1000), np.int64(2000)],
+        "ratio": [np.float64(1.5), np.nan],
+        "listed": [np.bool_(True), np.bool_(False)],
+    }).to_dict(orient="records")
+
+    body = json.loads(FastJSONResponse({"records": records}).body)
+
+    assert body["records"][0] == {
+        "ticker": "FPT", "date": "2024-03-31T00:00:00", "revenue": 1000, "ratio": 1.5, "listed": True,
+    }
+    assert body["records"][1]["date"] is None
+    assert body["records"][1]["ratio"] is None
+
+
+def test_fast_response_encodes_numpy_scalars_outside_records():
+    """Values that to_dict leaves as numpy types are encoded too."""
+    body = json.loads(FastJSONResponse({"count": np.int32(3), "mean": np.float32(0.5)}).body)
+
+    assert body == {"count": 3, "mean": 0.5}
+
+
+def test_api_response_keeps_envelope():
+    """The body has the same data/meta envelope as ApiResponse."""
+    response = api_response(data={"totalCount": 0, "records": []}, meta={"version": "1.0"})
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"data": {"totalCount": 0, "records": []}, "meta": {"version": "1.0"}}
+
+
+def test_routes_return_fast_response_and_keep_openapi_schema(client, monkeypatch):
+    """Listing routes serialize through orjson and still document ApiResponse."""
+
+    async def get_all_symbols(self, output_format="records", fields=None):
+        return {"totalCount": 1, "records": [{"symbol": "FPT", "price": np.float64("nan")}]}
+
+    monkeypatch.setattr(ListingService, "get_all_symbols", get_all_symbols)
+
+    response = client.get("/api/v1/listing/symbols")
+    assert response.status_code == 200
+    assert response.json()["data"]["records"] == [{"symbol": "FPT", "price": None}]
+
+    schema = client.get("/openapi.json").json()
+    content = schema["paths"]["/api/v1/listing/symbols"]["get"]["responses"]["200"]["content"]
+    assert content["application/json"]["schema"]["$ref"] == "#/components/schemas/ApiResponse"
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Cursors are opaque offsets plus the key of the row before; anything else is rejected."""
+    assert decode_cursor(encode_cursor(2000)) == (2000, None)
+    assert decode_cursor(encode_cursor(2, "FPT")) == (2, "FPT")
+    for cursor in ("nope", encode_cursor(-1), "eyJ4IjoxfQ", "WzFd"):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_ndjson_is_written_in_chunks():
+    """Each chunk holds at most chunk_rows lines; NaN becomes null."""
+    df = pd.DataFrame({"symbol": ["A", "B", "C"], "price": [1.0, np.nan, 3.0]})
+
+    chunks = list(_ndjson_chunks(df, 2))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"symbol": "A", "price": 1.0}, {"symbol": "B", "price": None}, {"symbol": "C", "price": 3.0},
+    ]
+
+
+class CountingListing:
+    calls = 0
+
+    def __init__(self, source):
+        pass
+
+    def all_symbols(self, **kwargs):
+        CountingListing.calls += 1
+        return pd.DataFrame({"symbol": [f"S{i}" for i in range(5)], "organ_name": ["x"] * 5})
+
+
+def test_listing_pages_and_streams_from_one_cached_frame(client, monkeypatch):
+    """Pages follow nextCursor to the end; NDJSON streams every row; upstream is called once."""
+    monkeypatch.setattr(vci_listing, "Listing", CountingListing)
+    CountingListing.calls = 0
+    client_pool.clear()
+
+    symbols, cursor = [], None
+    while True:
+        params = {"limit": 2, "fields": "symbol", **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/listing/symbols", params=params).json()
+        assert body["data"]["totalCount"] == 5
+        symbols += [record["symbol"] for record in body["data"]["records"]]
+        cursor = body["meta"]["pagination"]["nextCursor"]
+        if cursor is None:
+            break
+    stream = client.get("/api/v1/listing/symbols", params={"fields": "symbol"}, headers={"Accept": "application/x-ndjson"})
+
+    assert symbols == [f"S{i}" for i in range(5)]
+    assert stream.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["symbol"] for line in stream.text.splitlines()] == symbols
+    assert CountingListing.calls == 1
+    assert client.get("/api/v1/listing/symbols", params={"cursor": "nope"}).status_code == 400
+
+
+def test_cursor_continues_after_its_row_when_the_list_changes():
+    """A refreshed list shifts offsets; the cursor resumes after its last row, or is rejected once that row is gone."""
+    from app.api.rest.responses import Page, paginate
+
+    first, cursor = paginate(pd.DataFrame({"symbol": ["S0", "S1", "S2", "S3"]}), Page(limit=2))
+    offset, after = decode_cursor(cursor)
+    refreshed = pd.DataFrame({"symbol": ["A", "S1", "S2", "S3", "S4"]})
+    second, _ = paginate(refreshed.iloc[1:], Page(limit=2, offset=offset, after=after))
+    shifted, _ = paginate(refreshed, Page(limit=2, offset=offset, after=after))
+
+    assert first["symbol"].tolist() == ["S0", "S1"] and after == "S1"
+    assert second["symbol"].tolist() == ["S2", "S3"]
+    assert shifted["symbol"].tolist() == ["S2", "S3"]
+    with pytest.raises(StaleCursorError):
+        paginate(refreshed[refreshed["symbol"] != "S1"], Page(limit=2, offset=offset, after=after))
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+from app.infrastructure.scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    ProviderScheduler,
+    TokenBucket,
+    UpstreamScheduler,
+    UpstreamThrottledError,
+    upstream_priority,
+)
+from app.infrastructure.singleflight import run_coalesced, upstream_scheduler
+
+
+def test_burst_then_refill_rate():
+    """The burst starts at once; later calls are spaced by the refill rate."""
+    async def scenario():
+        scheduler = ProviderScheduler("tcbs", rate_per_min=1200, burst=2)  # one token per 50ms
+        start = time.monotonic()
+        for _ in range(4):
+            await scheduler.acquire()
+        return time.monotonic() - start, scheduler.stats()
+
+    elapsed, stats = asyncio.run(scenario())
+
+    assert 0.08 <= elapsed < 0.5
+    assert stats["immediate"] == 2
+    assert stats["queued"] == 2
+
+
+def test_interactive_overtakes_batch():
+    """A waiting interactive call gets the next token before an earlier batch call."""
+    async def scenario():
+        scheduler = ProviderScheduler("vci", rate_per_min=600, burst=1)
+        await scheduler.acquire()
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        batch = asyncio.ensure_future(call("batch", PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(call("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.gather(batch, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "batch"]
+
+
+def test_shed_when_wait_exceeds_deadline():
+    """A call is rejected on arrival, or later when overtaken, once it cannot start before its deadline."""
+    async def scenario():
+        scheduler = ProviderScheduler("tcbs", rate_per_min=600, burst=1)  # one token per 100ms
+        await scheduler.acquire()
+        now = time.monotonic()
+
+        with pytest.raises(UpstreamThrottledError):
+            await scheduler.acquire(deadline=now + 0.01)
+
+        batch = asyncio.ensure_future(scheduler.acquire(PRIORITY_BATCH, deadline=now + 0.15))
+        await asyncio.sleep(0)
+        interactive = [asyncio.ensure_future(scheduler.acquire()) for _ in range(2)]
+        results = await asyncio.gather(batch, *interactive, return_exceptions=True)
+        return results, scheduler.stats()
+
+    results, stats = asyncio.run(scenario())
+
+    assert isinstance(results[0], UpstreamThrottledError)
+    assert results[1:] == [None, None]
+    assert stats["shed"] == 2
+
+
+def test_joining_moves_a_queued_call_up():
+    """An interactive caller joining a queued batch call gets it served before other batch calls."""
+    async def scenario():
+        scheduler = ProviderScheduler("vci", rate_per_min=1200, burst=1)
+        await scheduler.acquire()
+        order = []
+
+        async def call(name):
+            await scheduler.acquire(PRIORITY_BATCH, key=name)
+            order.append(name)
+
+        calls = [asyncio.ensure_future(call(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        await scheduler.join("second", PRIORITY_INTERACTIVE, time.monotonic() + 1)
+        await asyncio.gather(*calls)
+        return order, scheduler.stats()["promoted"]
+
+    assert asyncio.run(scenario()) == (["second", "first"], 1)
+
+
+def test_coalesced_callers_keep_their_own_deadline():
+    """A joiner is shed at its deadline; the batch call it joined keeps waiting and succeeds."""
+    async def scenario():
+        upstream_scheduler.get("vci").bucket = TokenBucket(rate=10, burst=1)
+        await upstream_scheduler.get("vci").acquire()
+        with upstream_priority(PRIORITY_BATCH):
+            batch = asyncio.ensure_future(run_coalesced("vci", lambda symbol: symbol, "FPT"))
+        await asyncio.sleep(0)
+        with upstream_priority(PRIORITY_INTERACTIVE, timeout=0.01):
+            with pytest.raises(UpstreamThrottledError):
+                await run_coalesced("vci", lambda symbol: symbol, "FPT")
+        return await batch
+
+    assert asyncio.run(scenario()) == "FPT"
+
+
+def test_context_deadline_and_disabled_limiter():
+    """upstream_priority sets the queue deadline; a disabled limiter never waits."""
+    async def noop():
+        return "ok"
+
+    async def scenario():
+        scheduler = UpstreamScheduler(default_rate_per_min=60, burst=1)
+        assert await scheduler.run("tcbs", noop) == "ok"
+        with upstream_priority(PRIORITY_BATCH, timeout=0.01):
+            with pytest.raises(UpstreamThrottledError):
+                await scheduler.run("tcbs", noop)
+        scheduler.enabled = False
+        return await scheduler.run("tcbs", noop)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_datasource_calls_take_tokens():
+    """Upstream calls made through run_coalesced are admitted by the shared scheduler."""
+    asyncio.run(run_coalesced("vci", lambda: "data"))
+
+    assert upstream_scheduler.stats()["vci"]["immediate"] == 1
@@ -0,0 +1,170 @@
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.datasources.tcbs import financial as tcbs_financial
+from app.datasources.vci import listing as vci_listing
+from app.infrastructure.client_pool import client_pool
+from app.services.screener import ScreenerTable, latest_period, screener_snapshots
+from app.services.screener_service import ScreenerService
+
+RATIOS = {"FPT": (18.0, 0.28), "VNM": (16.0, 0.12), "VCB": (14.0, 0.2), "SHS": (9.0, 0.16), "BAD": None}
+
+
+@pytest.fixture
+def table():
+    return ScreenerTable(pd.DataFrame({
+        "symbol": ["FPT", "VNM", "VCB", "SHS", "ACV"],
+        "exchange": ["HOSE", "HOSE", "HOSE", "HNX", "UPCOM"],
+        "price_to_earning": [18.0, 16.0, 14.0, 9.0, np.nan],
+        "roe": [0.28, 0.12, 0.2, 0.16, 0.3],
+        "sector": ["Tech", "Food", "Bank", "Broker", None],
+    }))
+
+
+def matches(table, expression):
+    return table.frame["symbol"][table.compile(expression)()].tolist()
+
+
+class StubListing:
+    def __init__(self, source="VCI"):
+        pass
+
+    def symbols_by_exchange(self, **kwargs):
+        return pd.DataFrame({
+            "symbol": ["FPT", "VNM", "VCB", "SHS", "BAD", "VN30F1M"],
+            "exchange": ["HSX", "HSX", "HSX", "HNX", "UPCOM", "HNX"],
+            "type": ["STOCK", "STOCK", "STOCK", "STOCK", "STOCK", "FU"],
+        })
+
+    def symbols_by_industries(self, **kwargs):
+        return pd.DataFrame({"symbol": ["FPT", "VCB"], "icb_name2": ["Công nghệ Thông tin", "Ngân hàng"]})
+
+
+class StubFinance:
+    calls = 0
+
+    def __init__(self, symbol, source):
+        self.symbol = symbol
+
+    def ratio(self, **kwargs):
+        StubFinance.calls += 1
+        if RATIOS[self.symbol] is None:
+            raise ValueError("no data")
+        pe, roe = RATIOS[self.symbol]
+        periods = pd.Index(["2024-Q2", "2024-Q3"], name="period")
+        return pd.DataFrame({"quarter": [2, 3], "year": ["2024", "2024"], "price_to_earning": [pe + 5, pe], "roe": [roe, roe]}, index=periods)
+
+
+@pytest.fixture
+def stub_upstream(client, monkeypatch):
+    monkeypatch.setattr(vci_listing, "Listing", StubListing)
+    monkeypatch.setattr(tcbs_financial, "Finance", StubFinance)
+    # The app lifespan already pooled a real client
+    client_pool.clear()
+    StubFinance.calls = 0
+
+
+def test_filters_compile_to_masks(table):
+    """Missing values fail every comparison; text columns compare by category."""
+    assert matches(table, "pe < 20 and roe > 0.15 and exchange == 'HOSE'") == ["FPT", "VCB"]
+    assert matches(table, "10 <= pe < 17") == ["VNM", "VCB"]
+    assert matches(table, "exchange in ['HNX', 'UPCOM'] or pe * roe > 6") == ["SHS", "ACV"]
+    assert matches(table, "not exchange != 'HOSE' and -pe < -15") == ["FPT", "VNM"]
+    assert matches(table, "exchange == 'HSX'") == []
+    assert matches(table, "pe != 14 and pe not in [9]") == ["FPT", "VNM"]
+    assert matches(table, "exchange != 'HOSE' and sector != 'Bank'") == ["SHS"]
+    assert matches(table, "not sector == 'Bank'") == ["FPT", "VNM", "SHS", "ACV"]
+    assert table.compile("roe > 0.15") is table.compile("roe > 0.15")
+
+
+@pytest.mark.parametrize("expression", ["pe <", "eps > 1", "exchange > 'A'", "roe", "pe == 'x'", "__import__('os').system('id')", "roe in pe", "exchange in [-'x']", "pe == -'x'"])
+def test_invalid_filters_are_rejected(table, expression):
+    with pytest.raises(ValueError):
+        table.compile(expression)
+
+
+def test_latest_period_takes_the_newest_row():
+    df = StubFinance("FPT", "TCBS").ratio()
+
+    assert latest_period(df.iloc[::-1]) == {"price_to_earning": 18.0, "roe": 0.28}
+
+
+def test_screener_route_filters_the_daily_snapshot(client, stub_upstream):
+    """The snapshot is built once; later filters, sorts and pages run over it without upstream calls."""
+    first = client.get("/api/v1/screener", params={"filter": "pe < 20 and roe > 0.15", "sort": "-roe"}).json()
+    second = client.get("/api/v1/screener", params={"filter": "exchange == 'HOSE'", "sort": "pe", "fields": "pe", "limit": 2}).json()
+
+    assert [record["symbol"] for record in first["data"]["records"]] == ["FPT", "VCB", "SHS"]
+    assert first["data"]["records"][0]["icb_name2"] == "Công nghệ Thông tin"
+    assert first["meta"]["universe"] == 5
+    assert second["data"]["records"] == [{"symbol": "VCB", "price_to_earning": 14.0}, {"symbol": "VNM", "price_to_earning": 16.0}]
+    assert second["data"]["totalCount"] == 3
+    assert StubFinance.calls == 5
+    assert screener_snapshots.stats()["tables"]["tcbs"]["failed_symbols"] == 1
+
+
+def test_screener_route_rejects_invalid_filters(client, stub_upstream):
+    response = client.get("/api/v1/screener", params={"filter": "eps > 1"})
+    fields = client.get("/api/v1/screener/fields").json()["data"]
+
+    assert response.status_code == 400
+    assert fields["columns"]["exchange"] == "text" and fields["aliases"]["pe"] == "price_to_earning"
+
+
+def test_screener_route_discards_builds_with_too_many_failures(client, stub_upstream, monkeypatch):
+    """A build above the failure ratio is not served, and is not retried on every request."""
+    monkeypatch.setattr(settings, "SCREENER_MAX_FAILED_RATIO", 0.1)
+
+    first = client.get("/api/v1/screener")
+    second = client.get("/api/v1/screener")
+
+    assert first.status_code == 503 and "1 of 5" in first.json()["detail"]
+    assert second.status_code == 503 and second.headers["Retry-After"]
+    assert StubFinance.calls == 5
+    assert screener_snapshots.get("tcbs") is None
+
+
+def test_failed_symbols_are_retried_into_the_snapshot(stub_upstream, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENER_RETRY_SECONDS", 0)
+
+    async def scenario():
+        service = ScreenerService()
+        first = await service.get_table()
+        monkeypatch.setitem(RATIOS, "BAD", (5.0, 0.1))
+        served = await service.get_table()
+        await asyncio.sleep(0)
+        while screener_snapshots.flight.in_flight("tcbs:retry"):
+            await asyncio.sleep(0.01)
+        return first, served, screener_snapshots.get("tcbs")
+
+    first, served, patched = asyncio.run(scenario())
+
+    assert served is first
+    assert patched.frame.set_index("symbol").loc["BAD", "price_to_earning"] == 5.0
+    assert patched.frame["symbol"].tolist() == first.frame["symbol"].tolist()
+    assert screener_snapshots.failed("tcbs") == []
+    assert StubFinance.calls == 6
+
+
+def test_a_recent_retry_does_not_delay_the_daily_rebuild(stub_upstream):
+    """Yesterday's snapshot is rebuilt on the next request even right after a retry of its failed symbols."""
+    yesterday = ScreenerTable(pd.DataFrame({"symbol": ["FPT", "BAD"], "roe": [0.28, np.nan]}), date.today() - timedelta(days=1))
+    screener_snapshots.put("tcbs", yesterday, ["BAD"], 0.0)
+    screener_snapshots.attempt("tcbs", "retry")
+
+    async def rebuilt(served):
+        while screener_snapshots.get("tcbs") is served:
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        served = await ScreenerService().get_table()
+        await asyncio.wait_for(rebuilt(served), timeout=5)
+        return served
+
+    assert asyncio.run(scenario()) is yesterday
+    assert screener_snapshots.get("tcbs").built_on == date.today()
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from app.datasources.tcbs import company as tcbs_company
+from app.datasources.tcbs.company import TcbsCompanyDataSource
+from app.infrastructure.singleflight import SingleFlight, run_coalesced, upstream_flight
+
+
+def test_concurrent_identical_calls_share_one_task():
+    """Only the first caller reaches the upstream; the rest wait for its result."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ticker": "FPT"}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("FPT", fetch) for _ in range(20)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(result == {"ticker": "FPT"} for result in results)
+    assert flight.stats() == {"originated": 1, "coalesced": 19, "in_flight": 0}
+
+
+def test_sequential_calls_are_not_coalesced():
+    """Only calls that overlap in time share a result."""
+    flight = SingleFlight()
+
+    async def fetch():
+        return 1
+
+    async def main():
+        await flight.do("FPT", fetch)
+        await flight.do("FPT", fetch)
+
+    asyncio.run(main())
+
+    assert flight.stats()["originated"] == 2
+
+
+def test_exceptions_are_shared_and_not_remembered():
+    """A failed call fails every waiter, and the next call starts fresh."""
+    flight = SingleFlight()
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(flight.do("FPT", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert len(attempts) == 1
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(flight.do("FPT", fetch))
+    assert len(attempts) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    """Waiters still get the result when the originating request goes away."""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("FPT", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("FPT", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_datasource_calls_coalesce_across_instances(monkeypatch):
+    """Concurrent profile requests for one symbol build a single upstream client."""
+    constructed = []
+    lock = threading.Lock()
+
+    class StubCompany:
+        def __init__(self, symbol, source):
+            with lock:
+                constructed.append(symbol)
+
+        def officers(self, **kwargs):
+            time.sleep(0.05)
+            return pd.DataFrame([{"name": "Officer"}])
+
+    monkeypatch.setattr(tcbs_company, "Company", StubCompany)
+    upstream_flight.reset_stats()
+
+    async def main():
+        return await asyncio.gather(*(
+            TcbsCompanyDataSource().get_company_officers("FPT") for _ in range(10)
+        ))
+
+    results = asyncio.run(main())
+
+    assert constructed == ["FPT"]
+    assert all(result == [{"name": "Officer"}] for result in results)
+    assert upstream_flight.stats()["coalesced"] == 9
+
+
+def test_run_coalesced_keys_on_arguments():
+    """Different arguments are different upstream calls."""
+    upstream_flight.reset_stats()
+
+    def fetch(symbol, period="year"):
+        time.sleep(0.02)
+        return (symbol, period)
+
+    async def main():
+        return await asyncio.gather(
+            run_coalesced("tcbs", fetch, "FPT"),
+            run_coalesced("tcbs", fetch, "FPT", period="quarter"),
+            run_coalesced("vci", fetch, "FPT"),
+            run_coalesced("tcbs", fetch, "FPT"),
+        )
+
+    results = asyncio.run(main())
+
+    assert results[1] == ("FPT", "quarter")
+    assert upstream_flight.stats()["originated"] == 3
+    assert upstream_flight.stats()["coalesced"] == 1
+
+
+def test_ops_stats_exposes_coalescing_counters(client):
+    """Counters are available over the ops endpoint."""
+    response = client.get("/api/v1/ops/stats")
+
+    assert response.status_code == 200
+    assert set(response.json()["data"]["singleflight"]) == {"originated", "coalesced", "in_flight"}